@@ -0,0 +1,507 @@
+# *coding:utf-8 *
+
+"""
+Generate synthetic flowsheets of N units (chains, trees and recycle loops of Mixer, Heater, Valve and SimplePump) and ODE networks of N states, reporting build, resolve, compile and solve times and peak memory against N, in order to expose super-linear hot spots.
+
+Usage (from the repository root):
+
+    python benchmarks/flowsheet_generator.py --topologies chain tree recycle ode --sizes 2 4 8 16 32
+    python benchmarks/flowsheet_generator.py --topologies ode --sizes 10 100 1000 --no-memory --output scaling.json
+
+The scaling exponents reported for each stage are the slopes of log(time) and log(peak memory) against log(N), fitted by least squares over all the sizes; exponents above the --superlinear threshold are flagged.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import traceback
+import tracemalloc
+from collections import OrderedDict
+from time import perf_counter
+
+import numpy as np
+import prettytable
+
+from scenarios import _homogeneousMaterialStream, _connectOutletToInlet
+from run_benchmarks import getMachineMetadata
+
+from src.sloth import solvers
+from src.sloth.model import Model
+from src.sloth.problem import Problem
+from src.sloth.simulation import Simulation
+from src.sloth.core.property_package import PropertyPackage
+from src.sloth.unit_op_library import Mixer, Heater, Valve, SimplePump
+from src.sloth.core.equation_operators import *
+from src.sloth.core.template_units import *
+from src.sloth.core.domain import Domain
+
+STAGES = ['build', 'resolve', 'compile', 'solve']
+
+UNIT_SEQUENCE = [Mixer, Heater, Valve, SimplePump]
+
+
+def _createUnit(unit_class, name, property_package):
+
+    """
+    Create one unit operation with the parameters fixed to reasonable values
+    """
+
+    unit = unit_class(name, property_package=property_package)
+
+    if unit_class is Heater:
+
+        unit.Q.setValue(1e5)
+
+        unit.Delta_P.setValue(0.)
+
+    elif unit_class is Valve:
+
+        unit.Delta_P.setValue(1e3)
+
+        unit.perc_open.setValue(.5)
+
+    elif unit_class is SimplePump:
+
+        unit.Delta_P.setValue(1e4)
+
+    unit()
+
+    return unit
+
+
+def _feedUnitFromStreams(prob, unit, sources, recycle_fraction=1.):
+
+    """
+    Connect the sum of several sources (material streams, or the outlets of other units) to the inlet of one unit, using input-mode connections. Sources are tuples (model, suffix), where suffix is '' for material streams and '_out' for units. The last source is weighted by recycle_fraction.
+    """
+
+    def port(source, var_name):
+
+        model_, suffix_ = source
+
+        return getattr(model_, var_name + suffix_)()
+
+    weights = [1.]*(len(sources) - 1) + [recycle_fraction]
+
+    prob.createConnection("", unit, Min(*[port(src_i, 'T') for src_i in sources]), unit.T_in())
+
+    prob.createConnection("", unit, Min(*[port(src_i, 'P') for src_i in sources]), unit.P_in())
+
+    for var_i in ['mdot', 'ndot']:
+
+        total_ = port(sources[0], var_i)*weights[0]
+
+        for src_j, w_j in zip(sources[1:], weights[1:]):
+
+            total_ = total_ + port(src_j, var_i)*w_j
+
+        prob.createConnection("", unit, total_, getattr(unit, var_i + '_in')())
+
+    enthalpy_ = port(sources[0], 'ndot')*port(sources[0], 'H')*weights[0]
+
+    for src_j, w_j in zip(sources[1:], weights[1:]):
+
+        enthalpy_ = enthalpy_ + port(src_j, 'ndot')*port(src_j, 'H')*w_j
+
+    prob.createConnection("", unit, enthalpy_, unit.ndot_in()*unit.H_in())
+
+
+def buildChain(n_units):
+
+    """
+    Build one chain: feed -> Mixer -> Heater -> Valve -> SimplePump -> Mixer -> ... (n_units units)
+    """
+
+    pp_water = PropertyPackage(phases=1, phase_names=['water'])
+
+    feed = _homogeneousMaterialStream("F0", 100., pp_water)
+
+    units = [_createUnit(UNIT_SEQUENCE[i % len(UNIT_SEQUENCE)], "U%d" % i, pp_water) for i in range(n_units)]
+
+    prob = Problem("chain", "Synthetic chain with %d units" % n_units)
+
+    prob.addModels([feed] + units)
+
+    _feedUnitFromStreams(prob, units[0], [(feed, '')])
+
+    for unit_i, unit_j in zip(units[:-1], units[1:]):
+
+        _connectOutletToInlet(prob, unit_i, unit_j)
+
+    return prob
+
+
+def buildTree(n_units):
+
+    """
+    Build one binary tree of n_units mixers (heap layout), in which each mixer receives the outlets of its two children, or two feed streams if it is a leaf
+    """
+
+    pp_water = PropertyPackage(phases=1, phase_names=['water'])
+
+    units = [_createUnit(Mixer, "U%d" % i, pp_water) for i in range(n_units)]
+
+    feeds = []
+
+    prob = Problem("tree", "Synthetic tree with %d mixers" % n_units)
+
+    for i, unit_i in enumerate(units):
+
+        sources_ = []
+
+        for child_j in [2*i + 1, 2*i + 2]:
+
+            if child_j < n_units:
+
+                sources_.append((units[child_j], '_out'))
+
+            else:
+
+                feed_ = _homogeneousMaterialStream("F%d" % len(feeds), 10. + len(feeds), pp_water)
+
+                feeds.append(feed_)
+
+                sources_.append((feed_, ''))
+
+        unit_i._sources = sources_
+
+    prob.addModels(units + feeds)
+
+    for unit_i in units:
+
+        _feedUnitFromStreams(prob, unit_i, unit_i._sources)
+
+    return prob
+
+
+def buildRecycle(n_units, recycle_fraction=.5):
+
+    """
+    Build one recycle loop: the first unit (a Mixer) receives the feed and a fraction of the outlet of the last unit of the chain (the remainder being purged)
+    """
+
+    pp_water = PropertyPackage(phases=1, phase_names=['water'])
+
+    feed = _homogeneousMaterialStream("F0", 100., pp_water)
+
+    units = [_createUnit(UNIT_SEQUENCE[i % len(UNIT_SEQUENCE)], "U%d" % i, pp_water) for i in range(max(n_units, 2))]
+
+    prob = Problem("recycle", "Synthetic recycle loop with %d units" % len(units))
+
+    prob.addModels([feed] + units)
+
+    _feedUnitFromStreams(prob, units[0], [(feed, ''), (units[-1], '_out')], recycle_fraction)
+
+    for unit_i, unit_j in zip(units[:-1], units[1:]):
+
+        _connectOutletToInlet(prob, unit_i, unit_j)
+
+    return prob
+
+
+def buildODENetwork(n_states):
+
+    """
+    Build one network of n_states compartments in series, with first-order transfer between neighbours and a quadratic consumption term:
+
+    dx_0/dt = k*(1 - x_0) - b*x_0**2
+    dx_i/dt = k*(x_{i-1} - x_i) - b*x_i**2
+    """
+
+    class ode_network(Model):
+
+        def __init__(self, name, description):
+
+            super().__init__(name, description)
+
+            self.k = self.createConstant("k", s**-1, "Transfer coefficient")
+            self.b = self.createConstant("b", s**-1, "Consumption coefficient")
+            self.t = self.createVariable("t", s, "time")
+
+            self.k.setValue(1.)
+            self.b.setValue(.1)
+
+            self.dom = Domain("domain", s, self.t, "time domain")
+
+            self.x = [self.createVariable("x_%d" % i, dimless, "State %d" % i) for i in range(n_states)]
+
+            for x_i in self.x:
+
+                x_i.distributeOnDomain(self.dom)
+
+        def DeclareEquations(self):
+
+            for i, x_i in enumerate(self.x):
+
+                upstream_ = self.x[i-1]() if i > 0 else 1.
+
+                self.createEquation("eq_%d" % i, "Balance for state %d" % i,
+                                    x_i.Diff(self.t) == self.k()*(upstream_ - x_i()) - self.b()*x_i()**2)
+
+    mod = ode_network("ODE", "Synthetic ODE network with %d states" % n_states)
+
+    mod()
+
+    prob = Problem("ode", "Synthetic ODE network with %d states" % n_states)
+
+    prob.addModels(mod)
+
+    prob.setTimeVariableName(['t_ODE'])
+
+    prob._synthetic_configurations = {'initial_time': 0.,
+                                      'end_time': 10.,
+                                      'is_dynamic': True,
+                                      'domain': mod.dom,
+                                      'print_output': False,
+                                      'output_headers': ["Time"] + ["x_%d" % i for i in range(n_states)]
+                                      }
+
+    prob._synthetic_initial_conditions = {**{'t_ODE': 0.}, **{'x_%d_ODE' % i: 0. for i in range(n_states)}}
+
+    return prob
+
+
+TOPOLOGIES = OrderedDict({'chain': buildChain,
+                          'tree': buildTree,
+                          'recycle': buildRecycle,
+                          'ode': buildODENetwork
+                          })
+
+
+def measure(topology, size, track_memory=True):
+
+    """
+    Build, resolve, compile and solve one synthetic problem, measuring the elapsed time and the peak of memory allocated by Python in each stage
+
+    :param str topology:
+        Name of the topology, as defined in TOPOLOGIES
+
+    :param int size:
+        Number of units (or states)
+
+    :param bool track_memory:
+        If True, measure peak memory with tracemalloc (which slows down the execution)
+
+    :return:
+        Dictionary with the time (s) and peak memory (MiB) for each stage completed, and the error if any stage failed
+    :rtype dict:
+    """
+
+    measurement = OrderedDict({'time': OrderedDict({}), 'peak_memory': OrderedDict({})})
+
+    state = {}
+
+    def build():
+
+        state['prob'] = TOPOLOGIES[topology](size)
+
+    def resolve():
+
+        state['prob'].resolve()
+
+    def compile_():
+
+        prob_ = state['prob']
+
+        if hasattr(prob_, '_synthetic_initial_conditions'):
+
+            prob_.setInitialConditions(prob_._synthetic_initial_conditions)
+
+        state['sim'] = Simulation(topology)
+
+        state['sim'].setProblem(prob_)
+
+        state['sim'].setConfigurations(**getattr(prob_, '_synthetic_configurations', {}))
+
+        state['solver'] = solvers._createSolver(prob_, state['sim'].configurations)
+
+        state['solver'].prepare()
+
+    def solve():
+
+        state['solver'].solve(state['sim'].configurations)
+
+    measurement['equations'] = None
+
+    for stage_i, fun_i in zip(STAGES, [build, resolve, compile_, solve]):
+
+        if track_memory is True:
+
+            tracemalloc.start()
+
+        start = perf_counter()
+
+        try:
+
+            with contextlib.redirect_stdout(io.StringIO()):
+
+                fun_i()
+
+        except Exception as exc:
+
+            measurement['error'] = OrderedDict({'stage': stage_i,
+                                                'type': type(exc).__name__,
+                                                'message': str(exc),
+                                                'traceback': traceback.format_exc()
+                                                })
+
+            break
+
+        finally:
+
+            if track_memory is True:
+
+                measurement['peak_memory'][stage_i] = tracemalloc.get_traced_memory()[1]/2**20
+
+                tracemalloc.stop()
+
+        measurement['time'][stage_i] = perf_counter() - start
+
+        if stage_i == 'resolve':
+
+            measurement['equations'] = len(state['prob'].equation_block._equations_list)
+
+    return measurement
+
+
+def scalingExponents(sizes, measurements, quantity='time'):
+
+    """
+    Return the exponent p of the fit quantity ~ N**p for each stage, computed by least squares in the log-log space
+
+    :param list(int) sizes:
+        Sizes measured
+
+    :param list(dict) measurements:
+        Measurements returned by measure, in the same order of sizes
+
+    :param str quantity:
+        Quantity fitted ('time' or 'peak_memory')
+
+    :return:
+        Dictionary containing the exponent for each stage (None if there are less than two points available)
+    :rtype dict:
+    """
+
+    exponents = OrderedDict({})
+
+    for stage_i in STAGES:
+
+        points_ = [(n_j, m_j[quantity][stage_i]) for n_j, m_j in zip(sizes, measurements)
+                   if stage_i in m_j[quantity] and m_j[quantity][stage_i] > 0]
+
+        if len(points_) < 2:
+
+            exponents[stage_i] = None
+
+        else:
+
+            log_n, log_t = np.log([p_j[0] for p_j in points_]), np.log([p_j[1] for p_j in points_])
+
+            exponents[stage_i] = float(np.polyfit(log_n, log_t, 1)[0])
+
+    return exponents
+
+
+def runScaling(topologies, sizes, track_memory=True, warmup=True):
+
+    results = OrderedDict({})
+
+    for topology_i in topologies:
+
+        # One untimed run of the smallest problem, so that one-time costs (imports, thermo databases) do not distort the fit
+
+        if warmup is True:
+
+            measure(topology_i, min(sizes), track_memory=False)
+
+        measurements_ = [measure(topology_i, n_j, track_memory) for n_j in sizes]
+
+        results[topology_i] = OrderedDict({'sizes': list(sizes),
+                                           'measurements': measurements_,
+                                           'exponents': scalingExponents(sizes, measurements_),
+                                           'memory_exponents': scalingExponents(sizes, measurements_, 'peak_memory')
+                                           })
+
+    return OrderedDict({'metadata': getMachineMetadata(), 'track_memory': track_memory, 'results': results})
+
+
+def printScaling(results, superlinear=1.2):
+
+    for topology_i, result_i in results['results'].items():
+
+        tab = prettytable.PrettyTable()
+
+        tab.field_names = ["N", "Equations"] + ["%s (s)" % stage_j for stage_j in STAGES] + ["Peak (MiB)", "Status"]
+
+        for n_j, m_j in zip(result_i['sizes'], result_i['measurements']):
+
+            row_ = [n_j, m_j['equations'] if m_j['equations'] is not None else "-"]
+
+            row_ += ["%.4f" % m_j['time'][stage_k] if stage_k in m_j['time'] else "-" for stage_k in STAGES]
+
+            row_.append("%.2f" % max(m_j['peak_memory'].values()) if len(m_j['peak_memory']) > 0 else "-")
+
+            row_.append("FAILED at %s (%s)" % (m_j['error']['stage'], m_j['error']['type']) if 'error' in m_j else "ok")
+
+            tab.add_row(row_)
+
+        print("\nScaling for topology '%s':\n" % topology_i + str(tab))
+
+        for label_j, key_j in [("time", 'exponents'), ("peak memory", 'memory_exponents')]:
+
+            exponents_ = []
+
+            for stage_k, p_k in result_i[key_j].items():
+
+                if p_k is not None:
+
+                    exponents_.append("%s: N^%.2f%s" % (stage_k, p_k, " (SUPER-LINEAR)" if p_k > superlinear else ""))
+
+            if len(exponents_) > 0:
+
+                print("Fitted exponents (%s) -> " % label_j + ", ".join(exponents_))
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Scaling benchmark for synthetic sloth flowsheets")
+
+    parser.add_argument("--topologies", nargs="*", default=list(TOPOLOGIES.keys()), choices=list(TOPOLOGIES.keys()),
+                        help="Topologies to be generated (defaults to all)")
+
+    parser.add_argument("--sizes", nargs="*", type=int, default=[2, 4, 8],
+                        help="Number of units (or states) for each problem")
+
+    parser.add_argument("--no-memory", action="store_true",
+                        help="Do not track peak memory (tracemalloc slows down the execution)")
+
+    parser.add_argument("--no-warmup", action="store_true",
+                        help="Do not perform the untimed run of the smallest problem before the measurements")
+
+    parser.add_argument("--superlinear", type=float, default=1.2,
+                        help="Exponent above which one stage is flagged as super-linear")
+
+    parser.add_argument("--output", default=None,
+                        help="JSON file in which the results will be stored")
+
+    args = parser.parse_args(argv)
+
+    results = runScaling(args.topologies, args.sizes, not args.no_memory, not args.no_warmup)
+
+    printScaling(results, args.superlinear)
+
+    if args.output is not None:
+
+        with open(args.output, "w") as write_file:
+
+            json.dump(results, write_file, indent=2)
+
+    return 0
+
+
+if __name__ == '__main__':
+
+    sys.exit(main())
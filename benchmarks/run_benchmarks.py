@@ -0,0 +1,438 @@
+# *coding:utf-8 *
+
+"""
+Run the benchmark suite, timing separately the stages of each scenario (model construction, Problem.resolve, compilation, solution and result export), storing the results as JSON with machine metadata, and comparing them against a stored baseline.
+
+Usage (from the repository root):
+
+    python benchmarks/run_benchmarks.py --repeat 5 --output bench.json
+    python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json --threshold 0.2
+    python benchmarks/run_benchmarks.py --scenarios mixer_valve lotka_volterra_ode --save-baseline benchmarks/baseline.json
+
+The exit status is 1 if any stage is slower than the baseline by more than the threshold (relative to the baseline median), and 0 otherwise.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import traceback
+from collections import OrderedDict
+from datetime import datetime
+from time import perf_counter
+
+from scenarios import SCENARIOS, INITIAL_CONDITIONS
+
+from src.sloth import solvers
+from src.sloth.print_headings import version as sloth_version
+
+STAGES = ['construction', 'resolve', 'compile', 'solve', 'export']
+
+
+def getMachineMetadata():
+
+    """
+    Return the metadata describing the machine and the software stack used for the benchmark
+
+    :return:
+        Dictionary containing the metadata
+    :rtype dict:
+    """
+
+    metadata = OrderedDict({'timestamp': datetime.now().isoformat(),
+                            'sloth_version': sloth_version,
+                            'python': platform.python_version(),
+                            'implementation': platform.python_implementation(),
+                            'platform': platform.platform(),
+                            'machine': platform.machine(),
+                            'processor': platform.processor(),
+                            'cpu_count': os.cpu_count()
+                            })
+
+    for module_i in ['numpy', 'scipy', 'sympy', 'numba', 'pyneqsys', 'thermo', 'assimulo']:
+
+        try:
+
+            metadata[module_i] = __import__(module_i).__version__
+
+        except Exception:
+
+            metadata[module_i] = None
+
+    try:
+
+        metadata['git_commit'] = subprocess.check_output(['git', 'rev-parse', 'HEAD'],
+                                                         cwd=os.path.dirname(os.path.abspath(__file__)),
+                                                         stderr=subprocess.DEVNULL).decode().strip()
+
+    except Exception:
+
+        metadata['git_commit'] = None
+
+    return metadata
+
+
+def runScenarioOnce(scenario_name, timings):
+
+    """
+    Run one scenario, timing each of its stages
+
+    :param str scenario_name:
+        Name of the scenario, as defined in scenarios.SCENARIOS
+
+    :param dict timings:
+        Dictionary that will receive the elapsed time (in seconds) for each stage, as soon as it is completed. Thus, if one stage fails, the completed stages remain available.
+    """
+
+    start = perf_counter()
+
+    prob, sim, configurations = SCENARIOS[scenario_name]()
+
+    timings['construction'] = perf_counter() - start
+
+    start = perf_counter()
+
+    prob.resolve()
+
+    timings['resolve'] = perf_counter() - start
+
+    if scenario_name in INITIAL_CONDITIONS:
+
+        prob.setInitialConditions(INITIAL_CONDITIONS[scenario_name])
+
+    # Compilation of the kernels is performed during the creation of the solver, except for the symbolic systems and polisher kernels of the algebraic solvers, which are built by prepare() ahead of the solution
+
+    start = perf_counter()
+
+    sim.setProblem(prob)
+
+    sim.setConfigurations(**configurations)
+
+    solver_mechanism = solvers._createSolver(prob, sim.configurations)
+
+    solver_mechanism.prepare()
+
+    timings['compile'] = perf_counter() - start
+
+    start = perf_counter()
+
+    sim.output = solver_mechanism.solve(sim.configurations)
+
+    sim.domain = sim.configurations['domain']
+
+    timings['solve'] = perf_counter() - start
+
+    start = perf_counter()
+
+    json.dumps(sim.getResults('dict'), default=float)
+
+    timings['export'] = perf_counter() - start
+
+
+def runBenchmarks(scenario_names=None, repeat=3, warmup=1, verbose=False):
+
+    """
+    Run the benchmark for each scenario, repeating it the given number of times
+
+    :param list(str) scenario_names:
+        Names of the scenarios to be run. Defaults to None, which runs all the scenarios
+
+    :param int repeat:
+        Number of repetitions for each scenario
+
+    :param int warmup:
+        Number of untimed runs performed before the repetitions (eg: for loading the thermo databases)
+
+    :param bool verbose:
+        If False, the output printed by the simulations is suppressed
+
+    :return:
+        Dictionary containing the metadata and the statistics (min, median, mean, max) for each stage of each scenario. Failed scenarios record the error and the stage in which it occurred.
+    :rtype dict:
+    """
+
+    if scenario_names is None:
+
+        scenario_names = list(SCENARIOS.keys())
+
+    results = OrderedDict({})
+
+    for scenario_i in scenario_names:
+
+        samples = OrderedDict({stage_j: [] for stage_j in STAGES})
+
+        error = None
+
+        for _ in range(warmup):
+
+            try:
+
+                with contextlib.redirect_stdout(sys.stdout if verbose else io.StringIO()):
+
+                    runScenarioOnce(scenario_i, OrderedDict({}))
+
+            except Exception:
+
+                break
+
+        for _ in range(repeat):
+
+            output_ = io.StringIO()
+
+            timings = OrderedDict({})
+
+            try:
+
+                with contextlib.redirect_stdout(sys.stdout if verbose else output_):
+
+                    runScenarioOnce(scenario_i, timings)
+
+            except Exception as exc:
+
+                error = OrderedDict({'type': type(exc).__name__,
+                                     'message': str(exc),
+                                     'stage': next(stage_j for stage_j in STAGES if stage_j not in timings),
+                                     'traceback': traceback.format_exc()
+                                     })
+
+            # Stages completed before one failure are kept
+
+            for stage_j, time_j in timings.items():
+
+                samples[stage_j].append(time_j)
+
+            if error is not None:
+
+                break
+
+        results[scenario_i] = OrderedDict({'stages': OrderedDict({})})
+
+        for stage_j, samples_j in samples.items():
+
+            if len(samples_j) > 0:
+
+                results[scenario_i]['stages'][stage_j] = OrderedDict({'min': min(samples_j),
+                                                                      'median': statistics.median(samples_j),
+                                                                      'mean': statistics.mean(samples_j),
+                                                                      'max': max(samples_j),
+                                                                      'repeats': len(samples_j)
+                                                                      })
+
+        results[scenario_i]['total'] = sum(stat_j['median'] for stat_j in results[scenario_i]['stages'].values())
+
+        if error is not None:
+
+            results[scenario_i]['error'] = error
+
+    return OrderedDict({'metadata': getMachineMetadata(), 'repeat': repeat, 'warmup': warmup, 'results': results})
+
+
+def compareWithBaseline(current, baseline, threshold=0.1, min_delta=1e-3):
+
+    """
+    Compare the benchmark results against a baseline, stage by stage, using the median times. Stages present in the baseline but missing in the current results, and failures absent from the baseline, are always reported as regressions.
+
+    :param dict current:
+        Results returned by runBenchmarks
+
+    :param dict baseline:
+        Results previously stored, with the same structure
+
+    :param float threshold:
+        Relative slowdown (eg: 0.1 for 10%) above which one stage is considered a regression
+
+    :param float min_delta:
+        Absolute slowdown (in seconds) below which one stage is never considered a regression, avoiding false alarms from stages that take a few microseconds
+
+    :return:
+        List of dictionaries (scenario, stage, baseline, current, ratio, regression, status) for each stage present in the baseline, and for each new failure. Status is 'timed', 'missing' or 'error'; current and ratio are None unless the stage was timed.
+    :rtype list(dict):
+    """
+
+    comparison = []
+
+    for scenario_i, baseline_i in baseline['results'].items():
+
+        result_i = current['results'].get(scenario_i)
+
+        # Scenarios not run in the current results (eg: filtered by --scenarios) are not compared
+
+        if result_i is None:
+
+            continue
+
+        for stage_j, baseline_stat_j in baseline_i['stages'].items():
+
+            baseline_time = baseline_stat_j['median']
+
+            if stage_j not in result_i['stages']:
+
+                comparison.append(OrderedDict({'scenario': scenario_i,
+                                               'stage': stage_j,
+                                               'baseline': baseline_time,
+                                               'current': None,
+                                               'ratio': None,
+                                               'regression': True,
+                                               'status': 'missing'
+                                               }))
+
+                continue
+
+            current_time = result_i['stages'][stage_j]['median']
+
+            ratio = current_time/baseline_time if baseline_time > 0 else float('inf')
+
+            comparison.append(OrderedDict({'scenario': scenario_i,
+                                           'stage': stage_j,
+                                           'baseline': baseline_time,
+                                           'current': current_time,
+                                           'ratio': ratio,
+                                           'regression': ratio > 1. + threshold and current_time - baseline_time > min_delta,
+                                           'status': 'timed'
+                                           }))
+
+        if 'error' in result_i and 'error' not in baseline_i:
+
+            comparison.append(OrderedDict({'scenario': scenario_i,
+                                           'stage': result_i['error']['stage'],
+                                           'baseline': None,
+                                           'current': None,
+                                           'ratio': None,
+                                           'regression': True,
+                                           'status': 'error'
+                                           }))
+
+    return comparison
+
+
+def printResults(results, comparison=None):
+
+    import prettytable
+
+    tab = prettytable.PrettyTable()
+
+    tab.field_names = ["Scenario"] + STAGES + ["Total", "Status"]
+
+    for scenario_i, result_i in results['results'].items():
+
+        row_ = [scenario_i]
+
+        for stage_j in STAGES:
+
+            if stage_j in result_i['stages']:
+
+                row_.append("%.4f" % result_i['stages'][stage_j]['median'])
+
+            else:
+
+                row_.append("-")
+
+        row_.append("%.4f" % result_i['total'])
+
+        if 'error' in result_i:
+
+            row_.append("FAILED at %s (%s)" % (result_i['error']['stage'], result_i['error']['type']))
+
+        else:
+
+            row_.append("ok")
+
+        tab.add_row(row_)
+
+    print("\nBenchmark results (median times, in seconds):\n" + str(tab))
+
+    if comparison is not None:
+
+        tab_comp = prettytable.PrettyTable()
+
+        tab_comp.field_names = ["Scenario", "Stage", "Baseline", "Current", "Ratio", "Regression"]
+
+        for comp_i in comparison:
+
+            tab_comp.add_row([comp_i['scenario'],
+                              comp_i['stage'],
+                              "-" if comp_i['baseline'] is None else "%.4f" % comp_i['baseline'],
+                              comp_i['status'].upper() if comp_i['current'] is None else "%.4f" % comp_i['current'],
+                              "-" if comp_i['ratio'] is None else "%.2f" % comp_i['ratio'],
+                              "YES" if comp_i['regression'] else ""
+                              ])
+
+        print("\nComparison against baseline:\n" + str(tab_comp))
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Benchmark suite for sloth")
+
+    parser.add_argument("--scenarios", nargs="*", default=None, choices=list(SCENARIOS.keys()),
+                        help="Scenarios to be run (defaults to all)")
+
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Number of repetitions for each scenario")
+
+    parser.add_argument("--output", default=None,
+                        help="JSON file in which the results will be stored")
+
+    parser.add_argument("--baseline", default=None,
+                        help="JSON file containing the baseline results")
+
+    parser.add_argument("--save-baseline", default=None,
+                        help="Store the current results as baseline in the given JSON file")
+
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Relative slowdown considered as a regression (eg: 0.1 for 10%%)")
+
+    parser.add_argument("--warmup", type=int, default=1,
+                        help="Number of untimed runs performed before the repetitions")
+
+    parser.add_argument("--min-delta", type=float, default=1e-3,
+                        help="Absolute slowdown (in seconds) below which no regression is reported")
+
+    parser.add_argument("--verbose", action="store_true",
+                        help="Show the output printed by the simulations")
+
+    args = parser.parse_args(argv)
+
+    results = runBenchmarks(args.scenarios, args.repeat, args.warmup, args.verbose)
+
+    comparison = None
+
+    if args.baseline is not None:
+
+        with open(args.baseline, "r") as read_file:
+
+            baseline = json.load(read_file)
+
+        comparison = compareWithBaseline(results, baseline, args.threshold, args.min_delta)
+
+        results['comparison'] = OrderedDict({'baseline': args.baseline,
+                                             'threshold': args.threshold,
+                                             'min_delta': args.min_delta,
+                                             'stages': comparison
+                                             })
+
+    printResults(results, comparison)
+
+    for file_name_i in [args.output, args.save_baseline]:
+
+        if file_name_i is not None:
+
+            with open(file_name_i, "w") as write_file:
+
+                json.dump(results, write_file, indent=2)
+
+    if comparison is not None and any(comp_i['regression'] for comp_i in comparison):
+
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+
+    sys.exit(main())
@@ -0,0 +1,393 @@
+# *coding:utf-8 *
+
+"""
+Define the representative scenarios used by the benchmark suite.
+
+Each scenario is a function that builds the models, the Problem and the Simulation (the 'construction' stage), returning a tuple (problem, simulation, configurations), where configurations is the dict of keyword arguments for Simulation.setConfigurations. The remaining stages (resolve, compile, solve and export) are driven by run_benchmarks.py.
+
+The flowsheet scenarios mirror those profiled in prof/ (tests/donot_test_unit_op.py), and the dynamic ones mirror the models from tests/test_differential_model.py and tests/test_differential_algebraic_model.py.
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.sloth.model import Model
+from src.sloth.problem import Problem
+from src.sloth.simulation import Simulation
+from src.sloth.core.property_package import PropertyPackage
+from src.sloth.unit_op_library import Mixer, MultiphasicMaterialStream, Valve, Heater, SimplePump
+from src.sloth.core.equation_operators import *
+from src.sloth.core.template_units import *
+from src.sloth.core.domain import Domain
+
+
+def _homogeneousMaterialStream(name, mdot, property_package, P=101325.):
+
+    """
+    Create a homogeneous material stream, with fixed mass flow, temperature, enthalpy and pressure
+    """
+
+    class homogeneous_material_stream(MultiphasicMaterialStream):
+
+        def __init__(self, name, description="Homogeneous material stream"):
+
+            super().__init__(name, description, property_package)
+
+            self.mdot.setValue(mdot)
+
+            self.T.setValue(298.15)
+
+            self.H.setValue(0.)
+
+            self.P.setValue(P)
+
+    stream = homogeneous_material_stream(name)
+
+    stream()
+
+    return stream
+
+
+def _connectTwoStreamsToMixer(prob, mixer, stream_1, stream_2):
+
+    prob.createConnection("", mixer, Min(stream_1.T(), stream_2.T()), mixer.T_in())
+
+    prob.createConnection("", mixer, stream_1.mdot()+stream_2.mdot(), mixer.mdot_in())
+
+    prob.createConnection("", mixer, stream_1.ndot()+stream_2.ndot(), mixer.ndot_in())
+
+    prob.createConnection("", mixer, Min(stream_1.P(), stream_2.P()), mixer.P_in())
+
+    prob.createConnection("", mixer, stream_1.ndot()*stream_1.H() + stream_2.ndot()*stream_2.H(), mixer.ndot_in()*mixer.H_in())
+
+
+def _connectOutletToInlet(prob, model_1, model_2):
+
+    for var_i in ['T', 'P', 'mdot', 'ndot', 'H']:
+
+        prob.createConnection(model_1, model_2, getattr(model_1, var_i + '_out'), getattr(model_2, var_i + '_in'))
+
+
+def mixerHomogeneousStream():
+
+    pp_water = PropertyPackage(phases=1, phase_names=['water'])
+
+    mixer = Mixer("M0", "Simple mixer", pp_water)
+
+    mixer()
+
+    hms1 = _homogeneousMaterialStream("HMS1", 100., pp_water, P=120e3)
+
+    hms2 = _homogeneousMaterialStream("HMS2", 200., pp_water)
+
+    prob = Problem("prob", "Mixer and homogeneous material streams")
+
+    prob.addModels([mixer, hms1, hms2])
+
+    _connectTwoStreamsToMixer(prob, mixer, hms1, hms2)
+
+    return prob, Simulation("mixer_homogeneous_stream"), {}
+
+
+def mixerValve():
+
+    pp_water = PropertyPackage(phases=1, phase_names=['water'])
+
+    mixer = Mixer("M0", "Simple mixer", pp_water)
+
+    mixer()
+
+    valve = Valve("V0", "Simple valve", pp_water)
+
+    valve.Delta_P.setValue(20e3)
+
+    valve.perc_open.setValue(.5)
+
+    valve()
+
+    hms1 = _homogeneousMaterialStream("HMS1", 100., pp_water, P=120e3)
+
+    hms2 = _homogeneousMaterialStream("HMS2", 200., pp_water)
+
+    prob = Problem("prob", "Mixer and valve")
+
+    prob.addModels([mixer, hms1, hms2, valve])
+
+    _connectTwoStreamsToMixer(prob, mixer, hms1, hms2)
+
+    _connectOutletToInlet(prob, mixer, valve)
+
+    return prob, Simulation("mixer_valve"), {}
+
+
+def mixerHeater():
+
+    pp_water = PropertyPackage(phases=1, phase_names=['water'])
+
+    mixer = Mixer("M0", "Simple mixer", pp_water)
+
+    mixer()
+
+    heater = Heater("H0", "Simple heater", pp_water)
+
+    heater.Q.setValue(1e8)
+
+    heater.Delta_P.setValue(0.)
+
+    heater()
+
+    hms1 = _homogeneousMaterialStream("HMS1", 100., pp_water, P=120e3)
+
+    hms2 = _homogeneousMaterialStream("HMS2", 200., pp_water)
+
+    prob = Problem("prob", "Mixer and heater")
+
+    prob.addModels([mixer, heater, hms1, hms2])
+
+    _connectTwoStreamsToMixer(prob, mixer, hms1, hms2)
+
+    _connectOutletToInlet(prob, mixer, heater)
+
+    return prob, Simulation("mixer_heater"), {}
+
+
+def pumpMixerHeater():
+
+    pp_water = PropertyPackage(phases=1, phase_names=['water'])
+
+    mixer = Mixer("M0", "Simple mixer", pp_water)
+
+    mixer()
+
+    heater = Heater("H0", "Simple heater", pp_water)
+
+    heater.Q.setValue(1e8)
+
+    heater.Delta_P.setValue(0.)
+
+    heater()
+
+    pump = SimplePump("SP0", "Simple pump", pp_water)
+
+    pump.Delta_P.setValue(2*101325.)
+
+    pump()
+
+    hms1 = _homogeneousMaterialStream("HMS1", 100., pp_water, P=120e3)
+
+    hms2 = _homogeneousMaterialStream("HMS2", 200., pp_water)
+
+    prob = Problem("prob", "Pump, mixer and heater chain")
+
+    prob.addModels([pump, mixer, heater, hms1, hms2])
+
+    for var_i in ['T', 'P', 'H', 'mdot', 'ndot']:
+
+        prob.createConnection("", pump, getattr(hms1, var_i)(), getattr(pump, var_i + '_in')())
+
+    prob.createConnection("", mixer, Min(pump.T_out(), hms2.T()), mixer.T_in())
+
+    prob.createConnection("", mixer, pump.mdot_out()+hms2.mdot(), mixer.mdot_in())
+
+    prob.createConnection("", mixer, pump.ndot_out()+hms2.ndot(), mixer.ndot_in())
+
+    prob.createConnection("", mixer, Min(pump.P_out(), hms2.P()), mixer.P_in())
+
+    prob.createConnection("", mixer, pump.ndot_out()*pump.H_out() + hms2.ndot()*hms2.H(), mixer.ndot_in()*mixer.H_in())
+
+    _connectOutletToInlet(prob, mixer, heater)
+
+    return prob, Simulation("pump_mixer_heater"), {}
+
+
+def biphasicMixer():
+
+    pp_water_toluene = PropertyPackage(phases=2, phase_names=['water', 'toluene'])
+
+    mixer = Mixer("BFM0", "Model for biphasic mixer", pp_water_toluene)
+
+    mixer()
+
+    class biphasic_material_stream(MultiphasicMaterialStream):
+
+        def __init__(self, name, ndot, z1, description="Biphasic material stream"):
+
+            super().__init__(name, description, pp_water_toluene)
+
+            self.ndot.setValue(ndot)
+
+            self.z_water.setValue(z1)
+
+            self.z_toluene.setValue(1. - z1)
+
+            mass_water = self.z_water.value*self.ndot.value*self.property_package["water"].MW*1e-3
+
+            mass_toluene = self.z_toluene.value*self.ndot.value*self.property_package["toluene"].MW*1e-3
+
+            self.w_water.setValue(mass_water/(mass_water + mass_toluene))
+
+            self.w_toluene.setValue(1. - self.w_water.value)
+
+            self.T.setValue(298.15)
+
+            self.H.setValue(0.)
+
+            self.P.setValue(101325.)
+
+    streams = [biphasic_material_stream(name_i, ndot_i, z_i) for name_i, ndot_i, z_i in [("BFMS1", 100., .6),
+                                                                                       ("BFMS2", 200., .4),
+                                                                                       ("BFMS3", 500., .8)]]
+
+    for stream_i in streams:
+
+        stream_i()
+
+    s1, s2, s3 = streams
+
+    prob = Problem("prob", "Biphasic mixer")
+
+    prob.addModels([mixer] + streams)
+
+    prob.createConnection("", mixer, Min(s1.T(), s2.T(), s3.T()), mixer.T_in())
+
+    prob.createConnection("", mixer, s1.mdot()+s2.mdot()+s3.mdot(), mixer.mdot_in())
+
+    prob.createConnection("", mixer, s1.ndot()+s2.ndot()+s3.ndot(), mixer.ndot_in())
+
+    prob.createConnection("", mixer, Min(s1.P(), s2.P(), s3.P()), mixer.P_in())
+
+    prob.createConnection("", mixer, s1.H()*s1.ndot() + s2.H()*s2.ndot() + s3.H()*s3.ndot(), mixer.ndot_in()*mixer.H_in())
+
+    prob.createConnection("", mixer, s1.z_water()*s1.ndot() + s2.z_water()*s2.ndot() + s3.z_water()*s3.ndot(), mixer.z_water_in()*mixer.ndot_in())
+
+    prob.createConnection("", mixer, s1.w_water()*s1.mdot() + s2.w_water()*s2.mdot() + s3.w_water()*s3.mdot(), mixer.w_water_in()*mixer.mdot_in())
+
+    return prob, Simulation("biphasic_mixer"), {}
+
+
+def lotkaVolterraODE():
+
+    class lotka_volterra(Model):
+
+        def __init__(self, name, description):
+
+            super().__init__(name, description)
+
+            self.u = self.createVariable("u", dimless, "u")
+            self.v = self.createVariable("v", dimless, "v")
+            self.a = self.createConstant("a", dimless, "A")
+            self.b = self.createConstant("b", dimless, "B")
+            self.c = self.createConstant("c", dimless, "C")
+            self.d = self.createConstant("d", dimless, "D")
+            self.t = self.createVariable("t", dimless, "t")
+
+            self.dom = Domain("domain", dimless, self.t, "generic domain")
+
+            self.u.distributeOnDomain(self.dom)
+            self.v.distributeOnDomain(self.dom)
+
+            self.a.setValue(1.)
+            self.b.setValue(0.1)
+            self.c.setValue(1.5)
+            self.d.setValue(0.75)
+
+        def DeclareEquations(self):
+
+            expr1 = self.u.Diff(self.t) == self.a()*self.u() - self.b()*self.u()*self.v()
+
+            expr2 = self.v.Diff(self.t) == self.d()*self.b()*self.u()*self.v() - self.c()*self.v()
+
+            self.eq1 = self.createEquation("eq1", "Equation 1", expr1)
+            self.eq2 = self.createEquation("eq2", "Equation 2", expr2)
+
+    mod = lotka_volterra("D0", "Lotka-Volterra model")
+
+    mod()
+
+    prob = Problem("prob", "Lotka-Volterra ODE")
+
+    prob.addModels(mod)
+
+    prob.setTimeVariableName(['t_D0'])
+
+    configurations = {'initial_time': 0.,
+                      'end_time': 16.,
+                      'is_dynamic': True,
+                      'domain': mod.dom,
+                      'print_output': False,
+                      'output_headers': ["Time", "Preys(u)", "Predators(v)"]
+                      }
+
+    return prob, Simulation("lotka_volterra_ode"), configurations
+
+
+def pendulumDAE():
+
+    class pendulum(Model):
+
+        def __init__(self, name, description):
+
+            super().__init__(name, description)
+
+            self.y1 = self.createVariable("y1", dimless, "y1")
+            self.y2 = self.createVariable("y2", dimless, "y2")
+            self.y3 = self.createVariable("y3", dimless, "y3")
+            self.y4 = self.createVariable("y4", dimless, "y4")
+            self.y5 = self.createVariable("y5", dimless, "y5")
+            self.t = self.createVariable("t", dimless, "t")
+
+            self.dom = Domain("domain", dimless, self.t, "generic domain")
+
+            for var_i in [self.y1, self.y2, self.y3, self.y4, self.y5]:
+
+                var_i.distributeOnDomain(self.dom)
+
+        def DeclareEquations(self):
+
+            self.eq1 = self.createEquation("eq1", "Eq.1", self.y1.Diff(self.t) - self.y3())
+            self.eq2 = self.createEquation("eq2", "Eq.2", self.y2.Diff(self.t) - self.y4())
+            self.eq3 = self.createEquation("eq3", "Eq.3", self.y3.Diff(self.t) + self.y5()*self.y1())
+            self.eq4 = self.createEquation("eq4", "Eq.4", self.y4.Diff(self.t) + self.y5()*self.y2() + 9.82)
+            self.eq5 = self.createEquation("eq5", "Eq.5", self.y3()**2 + self.y4()**2 - self.y5()*(self.y1()**2+self.y2()**2)-9.82*self.y2())
+
+    mod = pendulum("DA0", "Pendulum DAE model")
+
+    mod()
+
+    prob = Problem("prob", "Pendulum DAE")
+
+    prob.addModels(mod)
+
+    prob.setTimeVariableName(['t_DA0'])
+
+    configurations = {'initial_time': 0.,
+                      'end_time': 5.,
+                      'is_dynamic': True,
+                      'domain': mod.dom,
+                      'number_of_time_steps': 1000,
+                      'time_variable_name': "t_DA0",
+                      'print_output': False,
+                      'output_headers': ["Time", "y1", "y2", "y3", "y4", "y5"]
+                      }
+
+    return prob, Simulation("pendulum_dae"), configurations
+
+
+# Initial conditions can only be set after Problem.resolve, thus they are kept apart from the builders
+
+INITIAL_CONDITIONS = {'lotka_volterra_ode': {'t_D0': 0., 'u_D0': 10., 'v_D0': 5.},
+                      'pendulum_dae': {'y1_DA0_d': 0., 'y2_DA0_d': 0., 'y3_DA0_d': 0., 'y4_DA0_d': -9.82, 'y5_DA0_d': 0.,
+                                       'y5_DA0': 5., 'y4_DA0': 0., 'y3_DA0': 0., 'y2_DA0': 0., 'y1_DA0': 1., 't_DA0': 0.}
+                      }
+
+SCENARIOS = OrderedDict({'mixer_homogeneous_stream': mixerHomogeneousStream,
+                         'mixer_valve': mixerValve,
+                         'mixer_heater': mixerHeater,
+                         'pump_mixer_heater': pumpMixerHeater,
+                         'biphasic_mixer': biphasicMixer,
+                         'lotka_volterra_ode': lotkaVolterraODE,
+                         'pendulum_dae': pendulumDAE
+                         })
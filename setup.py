@@ -30,6 +30,7 @@ REQUIRED = [
 # What packages are optional?
 EXTRAS = {
     # 'fancy feature': ['django'],
+    'symengine': ['symengine'],
 }
 
 # The rest you shouldn't have to touch too much :)
@@ -3,15 +3,103 @@
 """
 Defines Analysis class. The class is responsible for  printing general information about Problem and Models.
 
-Defines DOF_Analysis class. This class is responsible for degrees-of-freedom (DoF) analysisis, avoiding ill-conditioned systems to be executed.
+Defines DOF_Analysis class. This class is responsible for degrees-of-freedom (DoF) analysisis, avoiding ill-conditioned systems to be executed. Besides the count of equations and unknowns, the structure of the system is examined through a maximum bipartite matching between equations and unknowns, so that structurally singular systems are rejected before being solved.
 """
 
 import prettytable
+from collections import OrderedDict
 from .core.variable import Variable
 from .core.constant import Constant
 from .core.parameter import Parameter
+from .core.error_definitions import StructuralSingularityError
 import sympy as sp
 
+
+def _maximumBipartiteMatching(adjacency, n_right):
+
+    """
+    Return one maximum matching of a bipartite graph, found by augmenting paths (iterative depth-first search, starting from a greedy matching)
+
+    :param list(list(int)) adjacency:
+        Indexes of the right vertices adjacent to each left vertex
+
+    :param int n_right:
+        Number of right vertices
+
+    :return:
+        Right vertex matched to each left vertex (or -1) and left vertex matched to each right vertex (or -1)
+    :rtype tuple(list(int), list(int)):
+    """
+
+    match_left = [-1]*len(adjacency)
+
+    match_right = [-1]*n_right
+
+    for (left_i, adjacent_i) in enumerate(adjacency):
+
+        for right_i in adjacent_i:
+
+            if match_right[right_i] == -1:
+
+                match_left[left_i], match_right[right_i] = right_i, left_i
+
+                break
+
+    for root_ in range(len(adjacency)):
+
+        if match_left[root_] != -1:
+
+            continue
+
+        visited_ = [False]*n_right
+
+        # Stack of (left vertex, position of the next adjacent right vertex to be examined)
+
+        stack_ = [[root_, 0]]
+
+        path_ = []
+
+        while len(stack_) > 0:
+
+            left_i, position_ = stack_[-1]
+
+            if position_ == len(adjacency[left_i]):
+
+                stack_.pop()
+
+                if len(path_) > 0:
+
+                    path_.pop()
+
+                continue
+
+            stack_[-1][1] += 1
+
+            right_i = adjacency[left_i][position_]
+
+            if visited_[right_i] is True:
+
+                continue
+
+            visited_[right_i] = True
+
+            path_.append(right_i)
+
+            if match_right[right_i] == -1:
+
+                # Augmenting path found: flip the matching along it
+
+                for (left_j, _), right_j in zip(stack_, path_):
+
+                    match_left[left_j], match_right[right_j] = right_j, left_j
+
+                break
+
+            stack_.append([match_right[right_i], 0])
+
+    return match_left, match_right
+
+
 class DOF_Analysis:
 
     """
@@ -38,6 +126,137 @@ class DOF_Analysis:
 
         assert self._dofTest(), "\n The system is ill-formed. Halt now. "
 
+        assert self._structuralTest(), "\n The system is ill-formed. Halt now. "
+
+    def _getStructuralIncidence(self):
+
+        """
+        Return the unknowns of the problem and the unknowns appearing in each equation, from the incidence index of the EquationBlock. For the differential equations, the derivatives are taken as the unknowns in place of the states, and the independent (time) variables are not unknowns.
+
+        :return:
+            Names of the equations, names of the unknowns and indexes of the unknowns appearing in each equation
+        :rtype tuple(list(str), list(str), list(list(int))):
+        """
+
+        equation_block = self.problem.equation_block
+
+        incidence_ = equation_block.incidence
+
+        states_ = set(incidence_.derivative_states.values())
+
+        time_var_names = set(self.problem.time_variable_name or [])
+
+        unspec_param_names = [par_i.name for par_i in list(equation_block.parameter_dict.values()) if par_i.is_specified is False]
+
+        unknowns_ = [var_i for var_i in list(equation_block._var_list) + unspec_param_names if var_i not in states_ and var_i not in time_var_names]
+
+        unknowns_.extend(str(diff_i) for diff_i in incidence_.derivative_states.keys())
+
+        unknowns_ = list(OrderedDict.fromkeys(unknowns_))
+
+        position_ = {unknown_i: i for (i, unknown_i) in enumerate(unknowns_)}
+
+        equation_names = [eq_i.name for eq_i in equation_block.equations]
+
+        adjacency_ = []
+
+        for eq_name_i in equation_names:
+
+            unknowns_i = [str(diff_i) for diff_i in incidence_.equation_derivatives.get(eq_name_i, [])]
+
+            unknowns_i += sorted(incidence_.equation_symbols_outside_derivatives.get(eq_name_i, []))
+
+            adjacency_.append([position_[unknown_j] for unknown_j in unknowns_i if unknown_j in position_])
+
+        return equation_names, unknowns_, adjacency_
+
+    def getStructuralAnalysis(self):
+
+        """
+        Match the equations of the problem to its unknowns through one maximum bipartite matching of their incidence structure. The equations and the unknowns left unmatched, together with the subsets reachable from them through alternating paths, identify the over-determined and the under-determined parts of a structurally singular system.
+
+        :return:
+            Dictionary containing the structural rank ('rank'), the matching of equations to unknowns ('matching'), the unmatched equations and unknowns ('unmatched_equations', 'unmatched_variables') and the over-determined equations and under-determined unknowns ('overdetermined_equations', 'underdetermined_variables')
+        :rtype dict:
+        """
+
+        equation_names, unknowns_, adjacency_ = self._getStructuralIncidence()
+
+        match_equation, match_unknown = _maximumBipartiteMatching(adjacency_, len(unknowns_))
+
+        unmatched_equations = [i for (i, match_i) in enumerate(match_equation) if match_i == -1]
+
+        unmatched_unknowns = [j for (j, match_j) in enumerate(match_unknown) if match_j == -1]
+
+        # Over-determined subset: equations reachable from the unmatched ones (equation -> any unknown -> its matched equation)
+
+        overdetermined_ = set(unmatched_equations)
+
+        pending_ = list(unmatched_equations)
+
+        while len(pending_) > 0:
+
+            for unknown_j in adjacency_[pending_.pop()]:
+
+                eq_k = match_unknown[unknown_j]
+
+                if eq_k != -1 and eq_k not in overdetermined_:
+
+                    overdetermined_.add(eq_k)
+
+                    pending_.append(eq_k)
+
+        # Under-determined subset: unknowns reachable from the unmatched ones (unknown -> any equation -> its matched unknown)
+
+        equations_of_unknown = [[] for _ in unknowns_]
+
+        for (eq_i, adjacent_i) in enumerate(adjacency_):
+
+            for unknown_j in adjacent_i:
+
+                equations_of_unknown[unknown_j].append(eq_i)
+
+        underdetermined_ = set(unmatched_unknowns)
+
+        pending_ = list(unmatched_unknowns)
+
+        while len(pending_) > 0:
+
+            for eq_k in equations_of_unknown[pending_.pop()]:
+
+                unknown_l = match_equation[eq_k]
+
+                if unknown_l != -1 and unknown_l not in underdetermined_:
+
+                    underdetermined_.add(unknown_l)
+
+                    pending_.append(unknown_l)
+
+        return {'rank': len(equation_names) - len(unmatched_equations),
+                'matching': OrderedDict((equation_names[i], unknowns_[match_i]) for (i, match_i) in enumerate(match_equation) if match_i != -1),
+                'unmatched_equations': [equation_names[i] for i in unmatched_equations],
+                'unmatched_variables': [unknowns_[j] for j in unmatched_unknowns],
+                'overdetermined_equations': [equation_names[i] for i in sorted(overdetermined_)],
+                'underdetermined_variables': [unknowns_[j] for j in sorted(underdetermined_)]
+                }
+
+    def _structuralTest(self):
+
+        """
+        Check if the problem is structurally nonsingular (every equation matched to one unknown and vice-versa), raising StructuralSingularityError otherwise
+        """
+
+        analysis_ = self.getStructuralAnalysis()
+
+        if len(analysis_['unmatched_equations']) > 0 or len(analysis_['unmatched_variables']) > 0:
+
+            raise StructuralSingularityError(analysis_['unmatched_equations'],
+                                             analysis_['unmatched_variables'],
+                                             analysis_['overdetermined_equations'],
+                                             analysis_['underdetermined_variables'])
+
+        return True
+
     def _dofTest(self):
 
         # DoF Check (Number of variables - number of equations)
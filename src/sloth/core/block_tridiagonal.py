@@ -0,0 +1,310 @@
+#coding:utf-8
+
+"""
+Define the solution of block-tridiagonal systems, arising from stage-wise models in which each stage is coupled only to its neighbours (eg: trays of distillation columns, cells of one-dimensional discretisations).
+
+The linear systems are solved by the block-Thomas algorithm (block LU factorisation without fill-in), and the nonlinear ones by Newton iterations over it (Naphtali-Sandholm), so the cost of each iteration grows linearly with the number of stages, instead of one dense solution over all the unknowns.
+"""
+
+import numpy as np
+
+from .error_definitions import UnexpectedValueError, NumericalError
+
+
+def solveBlockTridiagonal(lower, diagonal, upper, rhs):
+
+    """
+    Solve one block-tridiagonal linear system by the block-Thomas algorithm
+
+    :param numpy.ndarray lower:
+        Blocks coupling each stage to the previous one, with shape (number of stages, block size, block size). The first block is not used
+
+    :param numpy.ndarray diagonal:
+        Blocks of each stage, with shape (number of stages, block size, block size)
+
+    :param numpy.ndarray upper:
+        Blocks coupling each stage to the next one, with shape (number of stages, block size, block size). The last block is not used
+
+    :param numpy.ndarray rhs:
+        Right-hand side, with shape (number of stages, block size)
+
+    :return:
+        Solution, with shape (number of stages, block size)
+    :rtype numpy.ndarray:
+    """
+
+    diagonal = np.asarray(diagonal, dtype=np.float64)
+
+    rhs = np.asarray(rhs, dtype=np.float64)
+
+    number_of_stages, block_size = rhs.shape
+
+    if diagonal.shape != (number_of_stages, block_size, block_size) or np.shape(lower) != diagonal.shape or np.shape(upper) != diagonal.shape:
+
+        raise UnexpectedValueError("arrays of blocks with shape (%d, %d, %d)" % (number_of_stages, block_size, block_size))
+
+    # Forward elimination: each stage is reduced to x_j + gamma_j*x_(j+1) = delta_j
+
+    gamma_ = np.zeros_like(diagonal)
+
+    delta_ = np.zeros_like(rhs)
+
+    for j in range(number_of_stages):
+
+        factor_j = diagonal[j]
+
+        rhs_j = rhs[j]
+
+        if j > 0:
+
+            factor_j = factor_j - lower[j] @ gamma_[j - 1]
+
+            rhs_j = rhs_j - lower[j] @ delta_[j - 1]
+
+        try:
+
+            solution_j = np.linalg.solve(factor_j, np.column_stack((upper[j], rhs_j)))
+
+        except np.linalg.LinAlgError:
+
+            raise NumericalError("Singular block at stage %d of the block-tridiagonal system" % j)
+
+        gamma_[j] = solution_j[:, :block_size]
+
+        delta_[j] = solution_j[:, block_size]
+
+    # Back substitution
+
+    x = np.empty_like(rhs)
+
+    x[-1] = delta_[-1]
+
+    for j in range(number_of_stages - 2, -1, -1):
+
+        x[j] = delta_[j] - gamma_[j] @ x[j + 1]
+
+    return x
+
+def multiplyBlockTridiagonal(lower, diagonal, upper, x, transpose=False):
+
+    """
+    Multiply one block-tridiagonal matrix (or its transpose) by one vector
+
+    :param numpy.ndarray lower:
+        Blocks coupling each stage to the previous one (see solveBlockTridiagonal)
+
+    :param numpy.ndarray diagonal:
+        Blocks of each stage
+
+    :param numpy.ndarray upper:
+        Blocks coupling each stage to the next one
+
+    :param numpy.ndarray x:
+        Vector, with shape (number of stages, block size)
+
+    :param bool transpose:
+        If the transpose of the matrix is used. Defaults to False
+
+    :rtype numpy.ndarray:
+    """
+
+    subscripts_ = 'jba,jb->ja' if transpose is True else 'jab,jb->ja'
+
+    y = np.einsum(subscripts_, diagonal, x)
+
+    if transpose is True:
+
+        y[:-1] += np.einsum(subscripts_, lower[1:], x[1:])
+
+        y[1:] += np.einsum(subscripts_, upper[:-1], x[:-1])
+
+    else:
+
+        y[1:] += np.einsum(subscripts_, lower[1:], x[:-1])
+
+        y[:-1] += np.einsum(subscripts_, upper[:-1], x[1:])
+
+    return y
+
+def _solveNormalEquations(lower, diagonal, upper, rhs, damping):
+
+    """
+    Solve the damped normal equations (J^T*J + damping*diag(J^T*J))*x = rhs of one block-tridiagonal matrix J. The product J^T*J couples each stage to its two neighbours on each side, so the stages are taken in pairs, which turns it back into one block-tridiagonal matrix (with blocks twice as large) solved by solveBlockTridiagonal
+    """
+
+    number_of_stages, block_size = rhs.shape
+
+    transposed_ = lambda blocks: np.swapaxes(blocks, 1, 2)
+
+    # Blocks of J^T*J coupling each stage to itself, to the next stage and to the one after it
+
+    normal_0 = transposed_(diagonal) @ diagonal
+
+    normal_0[:-1] += transposed_(lower[1:]) @ lower[1:]
+
+    normal_0[1:] += transposed_(upper[:-1]) @ upper[:-1]
+
+    normal_1, normal_2 = np.zeros_like(normal_0), np.zeros_like(normal_0)
+
+    normal_1[:-1] = transposed_(diagonal[:-1]) @ upper[:-1] + transposed_(lower[1:]) @ diagonal[1:]
+
+    normal_2[:-2] = transposed_(lower[1:-1]) @ upper[1:-1]
+
+    indexes_ = np.arange(block_size)
+
+    normal_0[:, indexes_, indexes_] *= 1. + damping
+
+    # One uncoupled stage completes the last pair
+
+    if number_of_stages % 2 == 1:
+
+        normal_0 = np.concatenate((normal_0, np.eye(block_size)[None]))
+
+        normal_1, normal_2 = np.concatenate((normal_1, np.zeros((1, block_size, block_size)))), np.concatenate((normal_2, np.zeros((1, block_size, block_size))))
+
+        rhs = np.concatenate((rhs, np.zeros((1, block_size))))
+
+    number_of_pairs = normal_0.shape[0]//2
+
+    paired_diagonal, paired_upper = np.zeros((2, number_of_pairs, 2*block_size, 2*block_size))
+
+    paired_diagonal[:, :block_size, :block_size], paired_diagonal[:, block_size:, block_size:] = normal_0[0::2], normal_0[1::2]
+
+    paired_diagonal[:, :block_size, block_size:], paired_diagonal[:, block_size:, :block_size] = normal_1[0::2], transposed_(normal_1[0::2])
+
+    paired_upper[:, :block_size, :block_size], paired_upper[:, block_size:, :block_size], paired_upper[:, block_size:, block_size:] = normal_2[0::2], normal_1[1::2], normal_2[1::2]
+
+    paired_lower = np.zeros_like(paired_upper)
+
+    paired_lower[1:] = transposed_(paired_upper[:-1])
+
+    x = solveBlockTridiagonal(paired_lower, paired_diagonal, paired_upper, rhs.reshape(number_of_pairs, 2*block_size))
+
+    return x.reshape(-1, block_size)[:number_of_stages]
+
+def solveBlockTridiagonalNewton(function, x0, tolerance=1e-8, maximum_iterations=50, step_limit_function=None, maximum_backtracking=4, maximum_damping=1e20):
+
+    """
+    Solve one block-tridiagonal nonlinear system by Newton iterations, each one solving the linearised system by the block-Thomas algorithm (see solveBlockTridiagonal).
+
+    The iterations are globalised by one backtracking line search, which halves the Newton step until it decreases sufficiently either the Euclidean norm of the residuals (Armijo condition) or the norm of the simplified Newton correction at the trial point (natural monotonicity test of Deuflhard, which does not depend on the scaling of the residuals, so it lets the Newton steps through where the norm of the residuals is dominated by badly scaled equations). If no fraction of the step passes, the iteration falls back on Levenberg-Marquardt steps, whose damping is raised until the norm of the residuals decreases and is relaxed after each successful step: damped steps turn from the Newton direction towards the steepest descent of the norm, so they keep decreasing it where the Jacobian is nearly singular.
+
+    :param function function:
+        Function receiving the unknowns (with shape (number of stages, block size)) and returning the residuals (same shape) and the lower, diagonal and upper blocks of their Jacobian
+
+    :param numpy.ndarray x0:
+        Initial guess, with shape (number of stages, block size)
+
+    :param float tolerance:
+        Tolerance of the maximum absolute residual. Defaults to 1e-8
+
+    :param int maximum_iterations:
+        Maximum number of iterations. Defaults to 50
+
+    :param function step_limit_function:
+        Function receiving the unknowns and one step and returning the largest fraction of the step allowed (eg: keeping the unknowns within their bounds). Defaults to None, for which the steps are not limited
+
+    :param int maximum_backtracking:
+        Maximum number of halvings of the Newton step by the line search. Defaults to 4
+
+    :param float maximum_damping:
+        Largest damping of the Levenberg-Marquardt steps (relative to the diagonal of J^T*J), above which NumericalError is raised. Defaults to 1e20
+
+    :return:
+        Solution and number of iterations
+    :rtype tuple(numpy.ndarray, int):
+    """
+
+    x = np.array(x0, dtype=np.float64)
+
+    residuals_, lower_, diagonal_, upper_ = function(x)
+
+    damping_, damping_factor = 1e-3, 2.
+
+    def evaluateTrial(step_):
+
+        with np.errstate(all='ignore'):
+
+            trial_ = function(x + step_)
+
+        return trial_, np.sum(trial_[0]**2)
+
+    for iteration_i in range(maximum_iterations + 1):
+
+        if not np.all(np.isfinite(residuals_)):
+
+            raise NumericalError("Residuals not finite at iteration %d of the block-tridiagonal Newton iterations" % iteration_i)
+
+        if np.max(np.abs(residuals_)) <= tolerance:
+
+            return x, iteration_i
+
+        if iteration_i == maximum_iterations:
+
+            break
+
+        squared_norm = np.sum(residuals_**2)
+
+        # Line search over the Newton step
+
+        newton_ = solveBlockTridiagonal(lower_, diagonal_, upper_, -residuals_)
+
+        newton_norm = np.linalg.norm(newton_)
+
+        fraction_ = step_limit_function(x, newton_) if step_limit_function is not None else 1.
+
+        is_accepted = False
+
+        for backtracking_i in range(maximum_backtracking + 1):
+
+            step_ = fraction_*newton_
+
+            trial_, trial_squared_norm = evaluateTrial(step_)
+
+            if np.isfinite(trial_squared_norm):
+
+                is_accepted = bool(trial_squared_norm <= (1. - 1e-4*fraction_)*squared_norm) or bool(np.linalg.norm(solveBlockTridiagonal(lower_, diagonal_, upper_, -trial_[0])) <= (1. - 0.25*fraction_)*newton_norm)
+
+            if is_accepted is True:
+
+                damping_, damping_factor = damping_/3., 2.
+
+                break
+
+            fraction_ *= 0.5
+
+        # Levenberg-Marquardt steps, accepted by the ratio between the actual decrease of the squared norm and the one predicted by the linearised residuals
+
+        gradient_ = multiplyBlockTridiagonal(lower_, diagonal_, upper_, residuals_, transpose=True) if is_accepted is False else None
+
+        while is_accepted is False:
+
+            step_ = _solveNormalEquations(lower_, diagonal_, upper_, -gradient_, damping_)
+
+            if step_limit_function is not None:
+
+                step_ = step_limit_function(x, step_)*step_
+
+            trial_, trial_squared_norm = evaluateTrial(step_)
+
+            predicted_decrease = squared_norm - np.sum((residuals_ + multiplyBlockTridiagonal(lower_, diagonal_, upper_, step_))**2)
+
+            if np.isfinite(trial_squared_norm) and predicted_decrease > 0. and trial_squared_norm < squared_norm:
+
+                gain_ = (squared_norm - trial_squared_norm)/predicted_decrease
+
+                damping_, damping_factor = damping_*max(1./3., 1. - (2.*gain_ - 1.)**3), 2.
+
+                break
+
+            damping_, damping_factor = damping_*damping_factor, 2.*damping_factor
+
+            if damping_ > maximum_damping:
+
+                raise NumericalError("Damping of the block-tridiagonal Newton iterations exceeded %g at iteration %d (norm of the residuals %g)" % (maximum_damping, iteration_i, np.sqrt(squared_norm)))
+
+        x = x + step_
+
+        residuals_, lower_, diagonal_, upper_ = trial_
+
+    raise NumericalError("Block-tridiagonal Newton iterations not converged after %d iterations (maximum absolute residual %g)" % (maximum_iterations, np.max(np.abs(residuals_))))
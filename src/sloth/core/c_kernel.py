@@ -0,0 +1,407 @@
+# *coding:utf-8 *
+
+"""
+Define the native C kernel backend, which emits C code for a list of sympy expressions using the sympy code printers, builds it with the local C compiler into a shared object and loads it through ctypes.
+
+The generated shared object exports two entry points:
+
+    void <name>(const double *x, double *out)
+
+    void <name>_batch(const double *x, double *out, long n_points)
+
+The first one evaluates the expressions for one vector of arguments, while the second one evaluates them for n_points vectors stored contiguously (row-major). Both are called through ctypes.CDLL, which releases the GIL during the call, so batches may be evaluated concurrently from several threads.
+"""
+
+import os
+import stat
+import shutil
+import ctypes
+import hashlib
+import tempfile
+import subprocess
+from collections import OrderedDict
+
+import numpy as np
+import sympy as sp
+from sympy.printing.ccode import C99CodePrinter
+
+from .error_definitions import CompilationError
+
+# Private per-process directory, used only if the per-user cache directory cannot be created
+
+_fallback_kernel_dir = {'path': None}
+
+_DOUBLE_ARRAY = np.ctypeslib.ndpointer(dtype=np.float64, flags='C_CONTIGUOUS')
+
+
+def _findCCompiler():
+
+    """
+    Return the path of the local C compiler, given by the CC environment variable or found among the usual compiler names, or None if no compiler is available
+
+    :return:
+        Path of the C compiler
+    :rtype str:
+    """
+
+    for compiler_i in [os.environ.get('CC'), 'cc', 'gcc', 'clang']:
+
+        if compiler_i is not None and shutil.which(compiler_i) is not None:
+
+            return shutil.which(compiler_i)
+
+    return None
+
+
+def _getKernelDirectory():
+
+    """
+    Return the directory in which the kernels are cached: sloth/c_kernels in the per-user cache directory (XDG_CACHE_HOME or ~/.cache), created with mode 0700. If it cannot be created or is not private to the current user, one private temporary directory (mkdtemp) is used for the current process.
+
+    :return:
+        Path of the directory
+    :rtype str:
+    """
+
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+
+    kernel_dir = os.path.join(cache_home, 'sloth', 'c_kernels')
+
+    try:
+
+        os.makedirs(kernel_dir, mode=0o700, exist_ok=True)
+
+        if _isPrivate(kernel_dir):
+
+            return kernel_dir
+
+    except OSError:
+
+        pass
+
+    if _fallback_kernel_dir['path'] is None:
+
+        _fallback_kernel_dir['path'] = tempfile.mkdtemp(prefix='sloth_c_kernels_')
+
+    return _fallback_kernel_dir['path']
+
+
+def _isPrivate(path):
+
+    """
+    Return True if path is owned by the current user and cannot be written by the group or by others, so that it may be trusted (eg: a shared object before being loaded)
+
+    :param str path:
+        Path of one file or directory
+
+    :rtype bool:
+    """
+
+    try:
+
+        stat_ = os.lstat(path)
+
+    except OSError:
+
+        return False
+
+    if stat.S_ISLNK(stat_.st_mode):
+
+        return False
+
+    if hasattr(os, 'getuid') and stat_.st_uid != os.getuid():
+
+        return False
+
+    return stat_.st_mode & (stat.S_IWGRP | stat.S_IWOTH) == 0
+
+
+def isCCompilerAvailable():
+
+    """
+    Return True if a local C compiler is available for the C kernel backend
+
+    :rtype bool:
+    """
+
+    return _findCCompiler() is not None
+
+
+class _KernelCodePrinter(C99CodePrinter):
+
+    """
+    C99 code printer that replaces the arguments of the kernel by the elements of the input array
+    """
+
+    def __init__(self, argument_map, settings={}):
+
+        super().__init__(settings)
+
+        self.argument_map = argument_map
+
+    def _print_Symbol(self, expr):
+
+        if expr.name in self.argument_map:
+
+            return self.argument_map[expr.name]
+
+        return super()._print_Symbol(expr)
+
+
+def _generateCSource(kernel_name, args, expressions, cse=True):
+
+    """
+    Generate the C source code of the kernel
+
+    :param str kernel_name:
+        Name of the C function
+
+    :param list(str) args:
+        Names of the arguments, which are mapped to the elements x[0], x[1], ... of the input array
+
+    :param list expressions:
+        Sympy expressions, whose values are written to the elements out[0], out[1], ... of the output array
+
+    :param bool cse:
+        If True, perform a common subexpression elimination across all the expressions
+
+    :return:
+        Tuple containing the C source code and a dictionary reporting the number of subexpressions eliminated and the number of operations before and after the elimination (None if cse is False)
+    :rtype tuple(str, dict):
+    """
+
+    printer = _KernelCodePrinter({str(arg_i): "x[%d]" % i for (i, arg_i) in enumerate(args)})
+
+    expressions = [sp.sympify(expr_i) for expr_i in expressions]
+
+    report = None
+
+    if cse is True:
+
+        replacements, reduced = sp.cse(expressions, symbols=sp.numbered_symbols('_cse'))
+
+        ops_before = int(sum(sp.count_ops(expr_i) for expr_i in expressions))
+
+        ops_after = int(sum(sp.count_ops(expr_i) for expr_i in [r_i for _, r_i in replacements] + list(reduced)))
+
+        report = OrderedDict({'subexpressions': len(replacements),
+                              'ops_before': ops_before,
+                              'ops_after': ops_after,
+                              'ops_saved': ops_before - ops_after
+                              })
+
+    else:
+
+        replacements, reduced = [], expressions
+
+    code_lines = ["#include <math.h>",
+                  "",
+                  "void %s(const double *x, double *out)" % kernel_name,
+                  "{"]
+
+    for symbol_i, expr_i in replacements:
+
+        code_lines.append("    const double %s = %s;" % (symbol_i, printer.doprint(expr_i)))
+
+    for i, expr_i in enumerate(reduced):
+
+        code_lines.append("    out[%d] = %s;" % (i, printer.doprint(expr_i)))
+
+    code_lines.extend(["}",
+                       "",
+                       "void %s_batch(const double *x, double *out, long n_points)" % kernel_name,
+                       "{",
+                       "    long i;",
+                       "    for (i = 0; i < n_points; i++) {",
+                       "        %s(x + i*%d, out + i*%d);" % (kernel_name, len(args), len(reduced)),
+                       "    }",
+                       "}",
+                       ""])
+
+    return "\n".join(code_lines), report
+
+
+def _buildSharedObject(source, build_dir=None, extra_flags=('-O3',)):
+
+    """
+    Build the C source into a shared object, reusing a previous build of the same source if available
+
+    :param str source:
+        C source code
+
+    :param str build_dir:
+        Directory in which the sources and shared objects are stored. Defaults to None, which uses the per-user cache directory (see _getKernelDirectory)
+
+    :param tuple(str) extra_flags:
+        Additional flags passed to the compiler
+
+    :return:
+        Path of the shared object
+    :rtype str:
+    """
+
+    compiler = _findCCompiler()
+
+    if compiler is None:
+
+        raise CompilationError("No C compiler was found. Set the CC environment variable or use another compilation_mechanism.")
+
+    if build_dir is None:
+
+        build_dir = _getKernelDirectory()
+
+    else:
+
+        os.makedirs(build_dir, mode=0o700, exist_ok=True)
+
+    flags = list(extra_flags) + ['-shared', '-fPIC']
+
+    digest = hashlib.sha1((compiler + " ".join(flags) + source).encode()).hexdigest()[:16]
+
+    source_file = os.path.join(build_dir, "kernel_%s.c" % digest)
+
+    shared_object = os.path.join(build_dir, "kernel_%s.so" % digest)
+
+    # One cached shared object is reused only if nobody else could have written it (nor the directory containing it)
+
+    if os.path.isfile(shared_object) and _isPrivate(build_dir) and _isPrivate(shared_object):
+
+        return shared_object
+
+    with open(source_file, "w") as write_file:
+
+        write_file.write(source)
+
+    # Build into a temporary file and rename it, so that concurrent builds never load one incomplete shared object
+
+    temporary_object = shared_object + ".%d.tmp" % os.getpid()
+
+    process = subprocess.run([compiler] + flags + ['-o', temporary_object, source_file, '-lm'],
+                             stdout=subprocess.PIPE,
+                             stderr=subprocess.STDOUT)
+
+    if process.returncode != 0:
+
+        raise CompilationError("Compilation of %s failed:\n%s" % (source_file, process.stdout.decode(errors='replace')))
+
+    os.chmod(temporary_object, 0o700)
+
+    os.replace(temporary_object, shared_object)
+
+    return shared_object
+
+
+class CKernel:
+
+    """
+    Defines CKernel class, which wraps one compiled C function evaluating a list of expressions, with a NumPy-array calling convention
+    """
+
+    def __init__(self, args, expressions, kernel_name='kernel', cse=True, build_dir=None):
+
+        """
+        Instantiate CKernel, generating, building and loading the shared object
+
+        :ivar list(str) args:
+            Names of the arguments of the kernel
+
+        :ivar list expressions:
+            Sympy expressions evaluated by the kernel
+
+        :ivar str kernel_name:
+            Name of the C function. Defaults to 'kernel'
+
+        :ivar bool cse:
+            If True, perform a common subexpression elimination across all the expressions. Defaults to True
+
+        :ivar str build_dir:
+            Directory in which the sources and shared objects are stored. Defaults to None, which uses the per-user cache directory
+
+        :ivar dict cse_report:
+            Number of subexpressions eliminated and number of operations before and after the elimination (None if cse is False)
+        """
+
+        self.args = [str(arg_i) for arg_i in args]
+
+        self.kernel_name = "sloth_" + "".join(c if c.isalnum() else '_' for c in kernel_name)
+
+        self.n_in = len(self.args)
+
+        self.n_out = len(expressions)
+
+        self.source, self.cse_report = _generateCSource(self.kernel_name, self.args, expressions, cse)
+
+        self.shared_object = _buildSharedObject(self.source, build_dir)
+
+        # ctypes.CDLL (differently from ctypes.PyDLL) releases the GIL during the calls
+
+        self._library = ctypes.CDLL(self.shared_object)
+
+        self._function = getattr(self._library, self.kernel_name)
+
+        self._function.argtypes = [_DOUBLE_ARRAY, _DOUBLE_ARRAY]
+
+        self._function.restype = None
+
+        self._batch_function = getattr(self._library, self.kernel_name + "_batch")
+
+        self._batch_function.argtypes = [_DOUBLE_ARRAY, _DOUBLE_ARRAY, ctypes.c_long]
+
+        self._batch_function.restype = None
+
+    def __call__(self, x, out=None):
+
+        """
+        Evaluate the expressions for one vector of arguments
+
+        :param numpy.ndarray x:
+            Values of the arguments, in the order given by args
+
+        :param numpy.ndarray out:
+            Array of length n_out into which the results are written. Defaults to None, for which a new array is allocated
+
+        :return:
+            Values of the expressions
+        :rtype numpy.ndarray:
+        """
+
+        x = np.ascontiguousarray(x, dtype=np.float64)
+
+        # Trailing values beyond n_in are ignored, but missing ones would be read out of bounds by the C code
+
+        if x.shape[0] < self.n_in:
+
+            raise CompilationError("The kernel %s expects %d arguments, but %d were supplied." % (self.kernel_name, self.n_in, x.shape[0]))
+
+        if out is None:
+
+            out = np.empty(self.n_out, dtype=np.float64)
+
+        self._function(x, out)
+
+        return out
+
+    def evaluateBatch(self, x):
+
+        """
+        Evaluate the expressions for several vectors of arguments in one call to the compiled code, which runs without holding the GIL
+
+        :param numpy.ndarray x:
+            Array of shape (n_points, n_in)
+
+        :return:
+            Array of shape (n_points, n_out)
+        :rtype numpy.ndarray:
+        """
+
+        x = np.ascontiguousarray(np.atleast_2d(x), dtype=np.float64)
+
+        if x.shape[1] != self.n_in:
+
+            raise CompilationError("The kernel %s expects %d arguments per point, but %d were supplied." % (self.kernel_name, self.n_in, x.shape[1]))
+
+        out = np.empty((x.shape[0], self.n_out), dtype=np.float64)
+
+        self._batch_function(x, out, x.shape[0])
+
+        return out
@@ -0,0 +1,219 @@
+# *coding:utf-8*
+
+"""
+Define the dimensional validation pass, which verifies the dimensional coherence of finished Equation objects from their symbolic representation and the units of the quantities declared in them.
+
+It is intended for models built in trusted mode (see unit.setTrustedMode), for which no dimensional check is performed during the construction of the equations, and raises the same DimensionalCoherenceError as the construction does. The units of the subexpressions are memoised, so that subexpressions shared among the equations (eg: totalizations, connections) are visited only once per pass.
+"""
+
+import sympy as sp
+
+from .unit import Unit
+from .template_units import dimless
+from .error_definitions import DimensionalCoherenceError
+
+# Functions whose argument must be dimensionless (as enforced by equation_operators.wrapper)
+
+_DIMENSIONLESS_FUNCTIONS = (sp.log, sp.exp, sp.sin, sp.cos, sp.tan, sp.Abs)
+
+
+class DimensionalValidator:
+
+    """
+    Definition of DimensionalValidator class. Evaluates the unit of symbolic expressions, raising DimensionalCoherenceError for the first incoherence found.
+
+    Numbers (and subexpressions without symbols) have no unit (None): they are coherent with any other term of a summation, as the numerical operands of EquationNode objects, and are dimensionless factors of products. Symbols absent from the quantities supplied are handled alike.
+    """
+
+    def __init__(self, quantities={}):
+
+        """
+        Instantiate DimensionalValidator.
+
+        :ivar dict quantities:
+            Quantity objects (Variable, Parameter, Constant) by name, whose units are used for the symbols of the expressions. Defaults to {}, in which case only the symbolic maps of the equations are used.
+        """
+
+        self.quantities = dict(quantities)
+
+        self._units_of_expressions = {}
+
+    def _getSymbolUnit(self, symbol, symbolic_map):
+
+        quantity_ = self.quantities.get(symbol.name)
+
+        if quantity_ is None:
+
+            quantity_ = symbolic_map.get(symbol.name)
+
+        units_ = getattr(quantity_, 'units', None)
+
+        return units_ if isinstance(units_, Unit) else None
+
+    def getUnit(self, expression, symbolic_map={}):
+
+        """
+        Return the unit of one symbolic expression, checking the dimensional coherence of all its subexpressions
+
+        :param expression:
+            SymPy expression
+
+        :param dict symbolic_map:
+            Quantity objects by name for the symbols absent from the quantities of the validator. Defaults to {}
+
+        :return:
+            Unit of the expression, or None for numerical expressions
+        :rtype Unit:
+        """
+
+        unit_ = self._units_of_expressions.get(expression, self)
+
+        if unit_ is not self:
+
+            return unit_
+
+        unit_ = self._evaluateUnit(expression, symbolic_map)
+
+        self._units_of_expressions[expression] = unit_
+
+        return unit_
+
+    def _evaluateUnit(self, expression, symbolic_map):
+
+        if isinstance(expression, sp.Symbol):
+
+            return self._getSymbolUnit(expression, symbolic_map)
+
+        if len(expression.free_symbols) == 0:
+
+            return None
+
+        args_units = [self.getUnit(arg_i, symbolic_map) for arg_i in expression.args] if not isinstance(expression, sp.Derivative) else []
+
+        if isinstance(expression, sp.Add):
+
+            units_ = [unit_i for unit_i in args_units if unit_i is not None]
+
+            for unit_i in units_[1:]:
+
+                if unit_i._check_dimensional_coherence(units_[0]) is not True:
+
+                    raise DimensionalCoherenceError(units_[0], unit_i)
+
+            return units_[0] if len(units_) > 0 else None
+
+        if isinstance(expression, sp.Mul):
+
+            unit_ = dimless
+
+            for unit_i in args_units:
+
+                if unit_i is not None:
+
+                    unit_ = unit_*unit_i
+
+            return unit_
+
+        if isinstance(expression, sp.Pow):
+
+            (base_unit, exponent_unit) = args_units
+
+            if exponent_unit is not None and exponent_unit._is_dimensionless() is not True:
+
+                raise DimensionalCoherenceError(exponent_unit, None)
+
+            if base_unit is None:
+
+                return None
+
+            if expression.exp.is_Number:
+
+                return base_unit**float(expression.exp)
+
+            return base_unit
+
+        if isinstance(expression, sp.Derivative):
+
+            unit_ = self.getUnit(expression.expr, symbolic_map)
+
+            if len(expression.variables) == 0 or unit_ is None:
+
+                # Derivatives with respect to an unspecified independent variable are dimensionless, as in equation_operators._Diff
+
+                return dimless if unit_ is not None else None
+
+            for (ind_var_i, count_i) in expression.variable_count:
+
+                ind_var_unit = self.getUnit(ind_var_i, symbolic_map)
+
+                if ind_var_unit is None:
+
+                    return None
+
+                unit_ = unit_/ind_var_unit**count_i
+
+            return unit_
+
+        if isinstance(expression, (sp.Min, sp.Max)):
+
+            units_ = [unit_i for unit_i in args_units if unit_i is not None]
+
+            for unit_i in units_[1:]:
+
+                if unit_i._check_dimensional_coherence(units_[0]) is not True:
+
+                    raise DimensionalCoherenceError(units_[0], unit_i)
+
+            return units_[0] if len(units_) > 0 else None
+
+        if isinstance(expression, _DIMENSIONLESS_FUNCTIONS):
+
+            for unit_i in args_units:
+
+                if unit_i is not None and unit_i._is_dimensionless() is not True:
+
+                    raise DimensionalCoherenceError(unit_i, None)
+
+            return args_units[0] if len(args_units) > 0 else None
+
+        # Other expressions (eg: relationals) are not constrained
+
+        return None
+
+    def validateEquation(self, equation):
+
+        """
+        Check the dimensional coherence of one Equation object, through its symbolic representation
+
+        :param Equation equation:
+            Equation object to be validated
+
+        :return:
+            Unit of the residual of the equation, or None for numerical residuals
+        :rtype Unit:
+        """
+
+        enode_ = equation.equation_expression
+
+        return self.getUnit(sp.sympify(enode_.repr_symbolic), enode_.symbolic_map)
+
+
+def validateDimensions(equations, quantities={}):
+
+    """
+    Check the dimensional coherence of several Equation objects in one pass, raising DimensionalCoherenceError for the first incoherence found
+
+    :param list(Equation) equations:
+        Equation objects to be validated
+
+    :param dict quantities:
+        Quantity objects by name, whose units are used for the symbols of the equations. Defaults to {}, in which case the symbolic maps of the equations are used
+
+    :return:
+        Units of the residuals of the equations, by equation name
+    :rtype dict:
+    """
+
+    validator_ = DimensionalValidator(quantities)
+
+    return {eq_i.name: validator_.validateEquation(eq_i) for eq_i in equations}
@@ -13,7 +13,7 @@ from itertools import product
 class Domain:
 
     """
-    Domain class definition. Distributes equations, parameters or variables within a domain of variables (currently, only unidmensional domains are supported), storing information.
+    Domain class definition. Distributes equations, parameters or variables within a domain of variables (currently, only unidmensional domains are supported), storing information. Spatial axes, over which VariableArray objects are discretised by the method of lines, are defined by SpatialDomain.
 
     * TODO: Solve domain working process
     """
@@ -219,3 +219,133 @@ class Domain:
         for i,key in enumerate(list(self.values.keys())):
 
             self.values[key].rename(columns=variable_name_map, inplace=True)
+
+
+# Stencils of the finite-difference approximations over one uniform grid, as {offset: coefficient}, by derivative order and method. The derivatives are the sum of the coefficients times the values at the offsets, divided by spacing**order
+
+_STENCILS = {(1, 'central'): {-1: -0.5, 1: 0.5},
+             (1, 'backward'): {-1: -1., 0: 1.},
+             (1, 'forward'): {0: -1., 1: 1.},
+             (2, 'central'): {-1: 1., 0: -2., 1: 1.},
+             (2, 'backward'): {-1: 1., 0: -2., 1: 1.},
+             (2, 'forward'): {-1: 1., 0: -2., 1: 1.}
+             }
+
+
+class SpatialDomain(Domain):
+
+    """
+    SpatialDomain class definition. Defines one spatial axis, discretised in a uniform cell-centred grid, over which VariableArray objects are distributed (one element per cell) for the method of lines. The spatial derivatives (Diff with respect to the independent variable of the axis) of the elements are approximated by finite-difference stencils, whose points beyond the axis (ghost points) are given by the boundary conditions of the arrays (see VariableArray.setBoundaryCondition).
+
+    Backward differences correspond to first-order upwind (finite-volume) fluxes for flows in the positive direction of the axis, and forward ones to flows in the negative direction.
+    """
+
+    def __init__(self, name, units, independent_vars=None, description="", lower_bound=0., upper_bound=1., number_of_points=10, method='central'):
+
+        """
+        Instantiate SpatialDomain.
+
+        :ivar str name:
+            Name of the current domain
+
+        :ivar Unit units:
+            Dimensional information of the dependent variables on the current domain.
+
+        :ivar Variable independent_vars:
+            Independent variable (eg: axial position) of the axis
+
+        :ivar str description:
+            Description of the current domain.
+
+        :ivar float lower_bound:
+            Position of the lower boundary of the axis. Defaults to 0.
+
+        :ivar float upper_bound:
+            Position of the upper boundary of the axis. Defaults to 1.
+
+        :ivar int number_of_points:
+            Number of cells in which the axis is discretised. Defaults to 10
+
+        :ivar str method:
+            Default method for the first-order derivatives ('central', 'backward' or 'forward'). Defaults to 'central'
+
+        :ivar float spacing:
+            Width of the cells
+
+        :ivar numpy.ndarray points:
+            Positions of the centres of the cells
+        """
+
+        super().__init__(name, units, independent_vars, description, {'all':lower_bound}, {'all':upper_bound})
+
+        if not isinstance(number_of_points, int) or number_of_points < 1:
+
+            raise UnexpectedValueError("int (positive)")
+
+        self._checkMethod(method)
+
+        self.number_of_points = number_of_points
+
+        self.method = method
+
+        self.spacing = (upper_bound - lower_bound)/number_of_points
+
+        self.points = lower_bound + self.spacing*(np.arange(number_of_points) + 0.5)
+
+    @staticmethod
+    def _checkMethod(method):
+
+        if method not in ['central', 'backward', 'forward']:
+
+            raise UnexpectedValueError("string ('central', 'backward', 'forward')")
+
+    def isAxis(self, ind_var):
+
+        """
+        Return True if ind_var is the independent variable of the current axis
+
+        :param Variable ind_var:
+            Independent variable
+
+        :rtype bool:
+        """
+
+        return ind_var is not None and any(ind_var is var_i for var_i in self.independent_vars.values())
+
+    def getStencil(self, order=1, method=None):
+
+        """
+        Return the finite-difference stencil for the derivative of the given order
+
+        :param int order:
+            Order of the derivative (1 or 2). Defaults to 1
+
+        :param str method:
+            Method of the first-order derivative ('central', 'backward' or 'forward'). Defaults to None, for which the method of the current domain is used. Second-order derivatives are always central
+
+        :return:
+            Coefficients of the stencil by offset
+        :rtype dict:
+        """
+
+        if method is None:
+
+            method = self.method
+
+        self._checkMethod(method)
+
+        if (order, method) not in _STENCILS:
+
+            raise UnexpectedValueError("int (1, 2)")
+
+        return _STENCILS[(order, method)]
+
+    def getUnits(self):
+
+        """
+        Return the units of the independent variable of the axis
+
+        :rtype Unit:
+        """
+
+        return list(self.independent_vars.values())[-1].units
@@ -6,10 +6,9 @@ Define Equation class.Creates objects that holds equations and re-evaluates its
 Define Connection class. Special type of Equation that are used as source or sink terms (process inlet or outlet, respectively) or to connect two different Model objects.
 """
 
-from .expression_evaluation import EquationNode
+from .expression_evaluation import EquationNode, SymbolMap
 from .error_definitions import UnexpectedValueError, AbsentRequiredObjectError, UnresolvedPanicError
 import sympy as sp
-#import symengine as sp
 import threading
 
 _uid = threading.local()
@@ -69,6 +68,8 @@ class Equation:
 
         self.objects_declared = {}
 
+        self.equation_array = None
+
         if fast_expr is not None:
 
             self.setResidual(fast_expr)
@@ -277,10 +278,10 @@ class Equation:
 
         return func
 
-    def _convertEquationSymbolicExpression(self, names_map, whole_obj_map):
+    def _convertEquationSymbolicExpression(self, names_map, whole_obj_map, values_map={}, substitutions={}):
 
         """
-        Convert the symbolic representation of the equation using a dictionary for mapping
+        Convert the symbolic representation of the equation using a dictionary for mapping, through one xreplace renaming of the symbols of each EquationNode
 
         :param dict names_map:
             Dictionary for mapping the symbolic representation (names) used in the symbolic conversion
@@ -290,53 +291,39 @@ class Equation:
             Dictionary for mapping the  symbolic representation and their correspondent for ALL objects in the
                 model following form: {'a_M1':Variable(), ...}. Used for rwrite the symbolic_map of the rewrited
                 equation_expression object.
-        """
-
-        self.equation_expression.repr_symbolic = self.equation_expression.repr_symbolic.subs(names_map)
-
-        self.equation_expression.symbolic_object = self.equation_expression.symbolic_object.subs(names_map)
-
-        if self.elementary_equation_expression is not None:
-
-            elem_expr = list(self.elementary_equation_expression)
 
-            elem_expr[0].repr_symbolic = elem_expr[0].repr_symbolic.subs(names_map)
-
-            elem_expr[1].repr_symbolic = elem_expr[1].repr_symbolic.subs(names_map)
-
-            try:
-
-                elem_expr[0].symbolic_object = elem_expr[0].symbolic_object.subs(names_map)
-
-            except:
+        :param dict values_map:
+            Dictionary mapping the new names of specified objects to their values, which replace their symbols in the symbolic objects (e.g: {'k_1_M2':3.}). Defaults to {}
 
-                pass #Element does not support symbolic substitution. It is a float.
-
-            try:
+        :param dict substitutions:
+            Dictionary mapping names of symbols to the symbolic expressions which replace them (e.g: ghost points of stencils). Defaults to {}
+        """
 
-                elem_expr[1].symbolic_object = elem_expr[1].symbolic_object.subs(names_map)
+        # New EquationNode objects are built (copy-on-write), as the current ones may be shared with the Equation object from which the current one was copied
 
-            except:
+        self.equation_expression = self.equation_expression._renamed(names_map, whole_obj_map, values_map, substitutions)
 
-                pass #Element does not support symbolic substitution. It is a float.
+        if self.elementary_equation_expression is not None:
 
-            symbols_used_0 = [str(i) for i in list(elem_expr[0].repr_symbolic.free_symbols)]
+            self.elementary_equation_expression = tuple(enode_i._renamed(names_map, whole_obj_map, values_map, substitutions) for enode_i in self.elementary_equation_expression)
 
-            symbols_used_1 = [str(i) for i in list(elem_expr[1].repr_symbolic.free_symbols)]
+        self._sweepObjects()
 
-            elem_expr[0].symbolic_map = {k:whole_obj_map[k] for k in symbols_used_0}
+    def _convertExpressionsToSympy(self):
 
-            elem_expr[1].symbolic_map = {k:whole_obj_map[k] for k in symbols_used_1}
+        """
+        Convert the symbolic objects of the EquationNode objects held by the current Equation into SymPy objects, as those may have been built with another expression backend (eg: SymEngine). The analysis and the solvers work over SymPy objects.
+        """
 
-            self.elementary_equation_expression = tuple(elem_expr)
+        enodes_ = [self.equation_expression]
 
-        symbols_used_ = [str(i) for i in list(self.equation_expression.repr_symbolic.free_symbols)]
+        if self.elementary_equation_expression is not None:
 
-        new_symbolic_map = {k:whole_obj_map[k] for k in symbols_used_}
+            enodes_.extend(self.elementary_equation_expression)
 
-        self.equation_expression.symbolic_map = new_symbolic_map
+        for enode_i in enodes_:
 
-        self._sweepObjects()
+            enode_i._convertToSympy()
 
     def setResidual(self, equation_expression):
 
@@ -375,6 +362,8 @@ class Equation:
 
             self.equation_form = 'elementary'
 
+            self._convertExpressionsToSympy()
+
             self.objects_declared = self._sweepObjects()
 
             self._getTypeFromExpression()
@@ -385,6 +374,8 @@ class Equation:
 
             self.equation_expression = equation_expression
 
+            self._convertExpressionsToSympy()
+
             self.objects_declared = self._sweepObjects()
 
             self._getTypeFromExpression()
@@ -0,0 +1,257 @@
+# *coding:utf-8*
+
+"""
+Define EquationArray class, which declares one equation over whole QuantityArray objects (VariableArray, ParameterArray).
+
+The symbolic equation is derived only once (template), over one slot quantity for each array, and the element equations are obtained by renaming the slots to the elements (xreplace), instead of building one expression per element. The template is also compiled into one vectorised kernel, which evaluates the equation for all the elements at once over the contiguous values of the arrays.
+
+For VariableArray objects discretised over one SpatialDomain (method of lines), the spatial derivatives of the slots are finite-difference stencils over the slots of the neighbour elements (shifts). The shifts are renamed to the neighbour elements, or replaced by the ghost points given by the boundary conditions of the arrays at the ends of the axis, and the kernel receives the values of the arrays padded with the ghost points.
+"""
+
+import numpy as np
+import sympy as sp
+from copy import copy
+
+from .equation import Equation
+from .error_definitions import UnexpectedValueError, AbsentRequiredObjectError
+
+
+class EquationArray:
+
+    """
+    Definition of EquationArray class. Holds the template equation, the element equations (Equation objects, one for each index of the arrays) and the vectorised kernel.
+    """
+
+    def __init__(self, name, description, expr_function, arrays, owner_model_name=""):
+
+        """
+        Instantiate EquationArray.
+
+        :ivar str name:
+            Name for the current EquationArray. The element equations are named <name>_<index>, followed by _<owner_model_name> if the array belongs to a model
+
+        :ivar str description:
+            Description for the present EquationArray
+
+        :param function expr_function:
+            Function receiving one slot quantity for each array (in the order of arrays) and returning the EquationNode object of the equation for one generic index (eg: lambda x, k: x() - k()*y()). Other quantities (eg: scalar variables) are used as in any other equation
+
+        :ivar list(QuantityArray) arrays:
+            Arrays over which the equation is declared, all of them with the same size
+
+        :ivar str owner_model_name:
+            Name of the owner model of the current EquationArray object. Defaults to "", meaning that the object was created aside a model.
+
+        :ivar Equation template:
+            Equation for one generic index, declared over the slots
+
+        :ivar list(Equation) equations:
+            Element equations
+        """
+
+        if len(arrays) == 0 or any(len(array_i) != len(arrays[0]) for array_i in arrays):
+
+            raise UnexpectedValueError("list(QuantityArray) with the same size")
+
+        self.name = name
+
+        self.description = description
+
+        self.arrays = list(arrays)
+
+        self.owner_model_name = owner_model_name
+
+        self.size = len(arrays[0])
+
+        self._slots = [array_i._getSlot("_slot%d_%s" % (i, name)) for (i, array_i) in enumerate(self.arrays)]
+
+        self.template = Equation(name, description, expr_function(*self._slots), owner_model_name)
+
+        self.template._sweepObjects()
+
+        self.template._convertExpressionsToSympy()
+
+        self._shifts = [getattr(slot_i, 'shifts', {}) for slot_i in self._slots]
+
+        self.equations = [self._createElementEquation(i) for i in range(self.size)]
+
+        for eq_i in self.equations:
+
+            eq_i.equation_array = self
+
+        self._kernels = {}
+
+    def _createElementEquation(self, index):
+
+        """
+        Create the equation for one index, renaming the slots of the template to the elements of the arrays. The symbols of specified elements are replaced by their values in the symbolic objects, as for specified Quantity objects.
+
+        :param int index:
+            Index of the element
+
+        :rtype Equation:
+        """
+
+        names_map = {}
+
+        objects_map = {}
+
+        values_map = {}
+
+        substitutions_ = {}
+
+        for (slot_i, array_i, shifts_i) in zip(self._slots, self.arrays, self._shifts):
+
+            self._mapElement(slot_i.name, array_i[index], names_map, objects_map, values_map)
+
+            for (offset_j, shift_j) in shifts_i.items():
+
+                index_j = index + offset_j
+
+                if 0 <= index_j < self.size:
+
+                    self._mapElement(shift_j.name, array_i[index_j], names_map, objects_map, values_map)
+
+                    continue
+
+                # Ghost point beyond the axis, given by the boundary condition over the boundary element
+
+                if abs(offset_j) > 1:
+
+                    raise AbsentRequiredObjectError("stencil reaching a single ghost point for %s" % array_i.name)
+
+                side_ = 'lower' if index_j < 0 else 'upper'
+
+                boundary_ = array_i[index]
+
+                objects_map[boundary_.name] = boundary_
+
+                substitutions_[shift_j.name] = sp.sympify(array_i._getGhostValue(side_, sp.Symbol(boundary_.name)))
+
+        objects_map.update({k: v for (k, v) in self.template.objects_declared.items() if k not in names_map and k not in substitutions_})
+
+        eq_ = copy(self.template)
+
+        eq_.name = self.name + "_" + str(index) + ("_" + self.owner_model_name if self.owner_model_name != "" else "")
+
+        eq_._convertEquationSymbolicExpression(names_map, objects_map, values_map, substitutions_)
+
+        return eq_
+
+    def _mapElement(self, symbol_name, element, names_map, objects_map, values_map):
+
+        """
+        Map one symbol of the template (slot or shift) to one element of the arrays, for the instantiation of one element equation
+
+        :param str symbol_name:
+            Name of the symbol of the template
+
+        :param Quantity element:
+            Element of one array
+        """
+
+        names_map[symbol_name] = element.name
+
+        objects_map[element.name] = element
+
+        if element.is_specified is True:
+
+            values_map[element.name] = float(element.value)
+
+    def _getArrayArguments(self):
+
+        """
+        Return the symbols of the template given by the arrays (slots and shifts), along with the index of their array and their offset
+
+        :rtype list(tuple(Symbol, int, int)):
+        """
+
+        arguments_ = []
+
+        for (k, (slot_i, shifts_i)) in enumerate(zip(self._slots, self._shifts)):
+
+            arguments_.append((sp.Symbol(slot_i.name), k, 0))
+
+            arguments_ += [(sp.Symbol(shifts_i[offset_j].name), k, offset_j) for offset_j in sorted(shifts_i.keys())]
+
+        return arguments_
+
+    def getKernel(self, side='rhs'):
+
+        """
+        Return the vectorised kernel of the current EquationArray, compiled (once) from the template. The arguments of the kernel are the slots and their shifts (in the order of arrays), followed by the other symbols of the template, in the order given by the names returned.
+
+        :param str side:
+            Side of the template compiled, if it is defined in the elementary form (eg: differential equations). Defaults to 'rhs'
+
+        :return:
+            NumPy function of the template, and the names of its arguments
+        :rtype tuple(function, list(str)):
+        """
+
+        if side not in self._kernels:
+
+            expression_ = sp.sympify(self.template._getSymbolicObject(side=side))
+
+            slot_symbols = [symbol_i for (symbol_i, _, _) in self._getArrayArguments()]
+
+            other_symbols = sorted([s_i for s_i in expression_.free_symbols if s_i not in slot_symbols], key=lambda s_i: s_i.name)
+
+            arguments_ = slot_symbols + other_symbols
+
+            self._kernels[side] = (sp.lambdify(arguments_, expression_, 'numpy'), [s_i.name for s_i in arguments_])
+
+        return self._kernels[side]
+
+    def evaluate(self, values={}, side='rhs', array_values={}):
+
+        """
+        Evaluate the equation for all the elements at once, through the vectorised kernel
+
+        :param dict values:
+            Values of the other quantities of the template (eg: scalar variables), by name. Quantities absent from it are evaluated at their current values. Defaults to {}
+
+        :param str side:
+            Side of the template evaluated, if it is defined in the elementary form (eg: differential equations). Defaults to 'rhs'
+
+        :param dict array_values:
+            Values of the arrays (numpy.ndarray) by name of the array, used instead of their current values (eg: states of one integrator). Defaults to {}
+
+        :return:
+            Values of the residuals (or of the side evaluated) for all the elements
+        :rtype numpy.ndarray:
+        """
+
+        function_, arguments_ = self.getKernel(side)
+
+        objects_ = self.template.objects_declared
+
+        padded_ = []
+
+        for (array_i, shifts_i) in zip(self.arrays, self._shifts):
+
+            values_i = np.asarray(array_values.get(array_i.name, array_i.values), dtype=np.float64)
+
+            if len(shifts_i) > 0:
+
+                # Values padded with the ghost points, so the shift of offset o is the view of the padded values starting at 1 + o
+
+                lower_ = array_i._getGhostValue('lower', values_i[0]) if min(shifts_i) < 0 else np.nan
+
+                upper_ = array_i._getGhostValue('upper', values_i[-1]) if max(shifts_i) > 0 else np.nan
+
+                values_i = np.concatenate(([lower_], values_i, [upper_]))
+
+            padded_.append((values_i, len(shifts_i) > 0))
+
+        slot_values = []
+
+        for (_, k, offset_j) in self._getArrayArguments():
+
+            values_k, is_padded = padded_[k]
+
+            slot_values.append(values_k[1 + offset_j:1 + offset_j + self.size] if is_padded else values_k)
+
+        other_values = [values[name_i] if name_i in values else objects_[name_i].value for name_i in arguments_[len(slot_values):]]
+
+        return np.broadcast_to(np.asarray(function_(*(slot_values + other_values)), dtype=np.float64), (self.size,))
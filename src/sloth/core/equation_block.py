@@ -2,11 +2,466 @@
 # *coding:utf-8*
 import math
 import sympy as sp
-#import symengine as sp
 import numpy as np
 from numpy import array as np_array
 from collections import OrderedDict
 from numba import jit
+import prettytable
+
+try:
+
+    from sympy.printing.numpy import NumPyPrinter
+
+except ImportError:
+
+    from sympy.printing.pycode import NumPyPrinter
+
+from sympy.printing.pycode import MpmathPrinter, PythonCodePrinter
+
+from .c_kernel import CKernel
+from .symbolic_backend import se
+from .error_definitions import AbsentRequiredObjectError
+
+# Compilation mechanisms producing native kernels, which are called with the arguments unpacked and do not require numba
+
+_NATIVE_COMPILATION_MECHANISMS = ['C', 'symengine']
+
+
+def _countOperations(expressions):
+
+    """
+    Return the total number of operations needed to evaluate a list of sympy expressions
+    """
+
+    return int(sum(sp.count_ops(expr_i) for expr_i in expressions))
+
+
+def _getCodePrinter(modules):
+
+    """
+    Return the code printer that sympy.lambdify would employ for the given modules, or None if the modules are not supported for code generation with common subexpression elimination (eg: numexpr)
+
+    :param list modules:
+        Modules as supplied to sympy.lambdify (dicts and module names)
+
+    :return:
+        Code printer
+    :rtype sympy.printing.codeprinter.CodePrinter:
+    """
+
+    module_names = [m_i for m_i in modules if isinstance(m_i, str)]
+
+    user_functions = {}
+
+    for m_i in modules:
+
+        if isinstance(m_i, dict):
+
+            user_functions.update({k: k for k in m_i.keys()})
+
+    settings = {'fully_qualified_modules': False,
+                'inline': True,
+                'allow_unknown_functions': True,
+                'user_functions': user_functions
+                }
+
+    if 'numexpr' in module_names:
+
+        return None
+
+    elif 'mpmath' in module_names:
+
+        return MpmathPrinter(settings)
+
+    elif 'numpy' in module_names:
+
+        return NumPyPrinter(settings)
+
+    else:
+
+        return PythonCodePrinter(settings)
+
+
+def _lambdifyWithCSE(args, expressions, modules):
+
+    """
+    Convert a list of sympy expressions into one function returning the list of their values, as sympy.lambdify does, but performing a common subexpression elimination (CSE) across all the expressions beforehand, so that the shared subexpressions are evaluated only once per call.
+
+    :param list(str) args:
+        Names of the arguments of the generated function
+
+    :param list expressions:
+        Sympy expressions
+
+    :param list modules:
+        Modules as supplied to sympy.lambdify
+
+    :return:
+        Tuple containing the generated function and a dictionary reporting the number of subexpressions eliminated and the number of operations before and after the elimination
+    :rtype tuple(function, dict):
+    """
+
+    replacements, reduced = sp.cse(expressions, symbols=sp.numbered_symbols('_cse'))
+
+    ops_before = _countOperations(expressions)
+
+    ops_after = _countOperations([expr_i for _, expr_i in replacements]) + _countOperations(reduced)
+
+    report = OrderedDict({'subexpressions': len(replacements),
+                          'ops_before': ops_before,
+                          'ops_after': ops_after,
+                          'ops_saved': ops_before - ops_after
+                          })
+
+    printer = _getCodePrinter(modules)
+
+    if printer is None or len(replacements) == 0:
+
+        report['ops_after'], report['ops_saved'] = ops_before, 0
+
+        return sp.lambdify(args, expressions, modules), report
+
+    # Use the namespace built by lambdify for the modules, which is employed as globals by the generated function
+
+    namespace = sp.lambdify(args, 0, modules).__globals__
+
+    code_lines = ["def _cse_kernel(%s):" % ", ".join([str(arg_i) for arg_i in args])]
+
+    for symbol_i, expr_i in replacements:
+
+        code_lines.append("    %s = %s" % (printer.doprint(symbol_i), printer.doprint(expr_i)))
+
+    code_lines.append("    return [%s]" % ", ".join([printer.doprint(expr_i) for expr_i in reduced]))
+
+    function_locals = {}
+
+    exec("\n".join(code_lines), namespace, function_locals)
+
+    return function_locals['_cse_kernel'], report
+
+
+def _lambdifyWithSymEngine(args, expressions, cse=True):
+
+    """
+    Convert a list of sympy expressions into one function using SymEngine's Lambdify, with the LLVM backend if SymEngine was built with it, or the lambda-double backend otherwise. The function takes one array with the values of the arguments, and returns one array with the values of the expressions.
+
+    :param list(str) args:
+        Names of the arguments of the generated function
+
+    :param list expressions:
+        Sympy expressions
+
+    :param bool cse:
+        If True, perform a common subexpression elimination across all the expressions
+
+    :return:
+        Function evaluating the expressions
+    :rtype function:
+    """
+
+    if se is None:
+
+        raise AbsentRequiredObjectError("symengine installation")
+
+    args_ = [se.Symbol(str(arg_i)) for arg_i in args]
+
+    expressions_ = [se.sympify(expr_i) for expr_i in expressions]
+
+    try:
+
+        return se.Lambdify(args_, expressions_, backend='llvm', cse=cse)
+
+    except (RuntimeError, ValueError, TypeError):
+
+        return se.Lambdify(args_, expressions_, backend='lambda', cse=cse)
+
+
+class ResidualKernel:
+
+    """
+    Define ResidualKernel class, which evaluates the residuals of a list of equations in one call of one compiled function, returning them as one numpy array, together with their norms scaled per equation (for kernels compiled with the scales)
+    """
+
+    def __init__(self, function, args, names, number_of_equations, with_scales=True):
+
+        """
+        Instantiate ResidualKernel
+
+        :ivar function function:
+            Compiled function of the arguments (unpacked), returning the residuals followed by their scales (or the residuals only, if with_scales is False)
+
+        :ivar list(str) args:
+            Names of the arguments, in the order expected by the function
+
+        :ivar list(str) names:
+            Names of the equations
+
+        :ivar int number_of_equations:
+            Number of residuals returned
+
+        :ivar bool with_scales:
+            If the function returns the scales of the residuals, needed by getScaledResiduals and getNorms. Defaults to True
+        """
+
+        self.function = function
+
+        self.args = list(args)
+
+        self.names = list(names)
+
+        self.number_of_equations = number_of_equations
+
+        self.with_scales = with_scales
+
+    def _getArgumentValues(self, values):
+
+        # Arguments absent from a mapping (eg: unsolved parameters) give NaN residuals, instead of failing the evaluation
+
+        if isinstance(values, dict):
+
+            return [values.get(arg_i, np.nan) for arg_i in self.args]
+
+        return values
+
+    def _evaluate(self, values):
+
+        out_ = np_array(self.function(*self._getArgumentValues(values)), dtype=np.float64).ravel()
+
+        return out_[:self.number_of_equations], out_[self.number_of_equations:]
+
+    def __call__(self, values):
+
+        """
+        Evaluate the residuals
+
+        :param (dict or list(float)) values:
+            Values of the arguments, as one mapping from their names or as one sequence in the order of args
+
+        :return:
+            Residuals of the equations
+        :rtype numpy.ndarray:
+        """
+
+        return self._evaluate(values)[0]
+
+    def getScaledResiduals(self, values):
+
+        """
+        Evaluate the residuals and the residuals scaled per equation, each one divided by the sum of the magnitudes of the terms of its equation (or 1, whichever is greater), so that equations of diverse magnitudes are comparable
+
+        :param (dict or list(float)) values:
+            Values of the arguments, as one mapping from their names or as one sequence in the order of args
+
+        :return:
+            Residuals and scaled residuals
+        :rtype tuple(numpy.ndarray, numpy.ndarray):
+        """
+
+        if self.with_scales is not True:
+
+            raise AbsentRequiredObjectError("ResidualKernel compiled with the scales of the residuals (with_scales=True)")
+
+        residuals_, scales_ = self._evaluate(values)
+
+        return residuals_, residuals_/np.maximum(np.abs(scales_), 1.)
+
+    def getNorms(self, values):
+
+        """
+        Return the maximum and root mean square norms of the scaled residuals
+
+        :param (dict or list(float)) values:
+            Values of the arguments, as one mapping from their names or as one sequence in the order of args
+
+        :return:
+            Dictionary containing the 'max' and 'rms' norms
+        :rtype dict:
+        """
+
+        scaled_ = self.getScaledResiduals(values)[1]
+
+        if scaled_.shape[0] == 0:
+
+            return OrderedDict({'max': 0., 'rms': 0.})
+
+        return OrderedDict({'max': float(np.max(np.abs(scaled_))), 'rms': float(np.sqrt(np.mean(scaled_**2)))})
+
+    def isConverged(self, values, tolerance=1e-6):
+
+        """
+        Check if the maximum norm of the scaled residuals is within tolerance
+
+        :param (dict or list(float)) values:
+            Values of the arguments, as one mapping from their names or as one sequence in the order of args
+
+        :param float tolerance:
+            Tolerance for the maximum norm. Defaults to 1e-6
+
+        :rtype bool:
+        """
+
+        return self.getNorms(values)['max'] <= tolerance
+
+
+class IncidenceIndex:
+
+    """
+    Define IncidenceIndex class, the structural incidence of the variables in the equations of one EquationBlock, built once from the free symbols and the Derivative atoms of the equations, so that the analysis and the solvers look it up instead of examining the expressions
+    """
+
+    def __init__(self, equations):
+
+        """
+        Instantiate IncidenceIndex, examining the residual form of the equations
+
+        :ivar OrderedDict equation_variables:
+            Names of the symbols (variables and unspecified parameters) appearing in each equation, by equation name
+
+        :ivar OrderedDict variable_equations:
+            Names of the equations in which each symbol appears, by symbol name
+
+        :ivar OrderedDict derivative_states:
+            Name of the state (differentiated variable) of each derivative, in order of appearance in the equations
+
+        :ivar OrderedDict equation_derivatives:
+            Derivatives appearing in each equation, by equation name
+
+        :ivar OrderedDict equation_symbols_outside_derivatives:
+            Names of the symbols appearing in each equation other than inside its derivatives, by equation name
+
+        :ivar dict equation_groups:
+            Names of the equations of each type ('linear', 'nonlinear', 'differential')
+        """
+
+        self.equation_variables = OrderedDict({})
+
+        self.variable_equations = OrderedDict({})
+
+        self.derivative_states = OrderedDict({})
+
+        self.equation_derivatives = OrderedDict({})
+
+        self.equation_symbols_outside_derivatives = OrderedDict({})
+
+        self.equation_groups = {'linear': [], 'nonlinear': [], 'differential': []}
+
+        # Symbols appearing outside the derivatives, by equation type
+
+        self._symbols_outside_derivatives = {'linear': set(), 'nonlinear': set(), 'differential': set()}
+
+        for eq_i in equations:
+
+            self._addEquation(eq_i)
+
+    def _addEquation(self, equation):
+
+        expression_ = sp.sympify(equation._getSymbolicObject('residual', 'rhs'))
+
+        symbols_ = frozenset(str(symbol_i) for symbol_i in expression_.free_symbols)
+
+        self.equation_variables[equation.name] = symbols_
+
+        for symbol_i in symbols_:
+
+            self.variable_equations.setdefault(symbol_i, []).append(equation.name)
+
+        if equation.type in self.equation_groups:
+
+            self.equation_groups[equation.type].append(equation.name)
+
+        derivatives_ = []
+
+        # The derivatives are ordered by the terms in which they appear, as the previous string-based scan
+
+        for term_i in sp.Add.make_args(expression_):
+
+            derivatives_.extend(sorted(term_i.atoms(sp.Derivative), key=sp.default_sort_key))
+
+        for diff_i in derivatives_:
+
+            self.derivative_states.setdefault(diff_i, str(diff_i.expr))
+
+        if len(derivatives_) > 0:
+
+            # The derivatives are replaced by one placeholder, so that their independent variables are not taken as appearing in the equation
+
+            placeholder_ = sp.Dummy()
+
+            outside_ = expression_.xreplace({diff_i: placeholder_ for diff_i in derivatives_}).free_symbols - {placeholder_}
+
+            outside_ = set(str(symbol_i) for symbol_i in outside_)
+
+        else:
+
+            outside_ = symbols_
+
+        self.equation_derivatives[equation.name] = list(OrderedDict.fromkeys(derivatives_))
+
+        self.equation_symbols_outside_derivatives[equation.name] = frozenset(outside_)
+
+        if equation.type in self._symbols_outside_derivatives:
+
+            self._symbols_outside_derivatives[equation.type].update(outside_)
+
+    def getEquationsOfVariable(self, var_name):
+
+        """
+        Return the names of the equations in which one variable appears
+
+        :param str var_name:
+            Name of the variable
+
+        :rtype list(str):
+        """
+
+        return self.variable_equations.get(var_name, [])
+
+    def getVariablesOfEquation(self, equation_name):
+
+        """
+        Return the names of the symbols appearing in one equation
+
+        :param str equation_name:
+            Name of the equation
+
+        :rtype frozenset(str):
+        """
+
+        return self.equation_variables.get(equation_name, frozenset())
+
+    def getStateOfDerivative(self, derivative):
+
+        """
+        Return the name of the state (differentiated variable) of one derivative
+
+        :param sympy.Derivative derivative:
+            Derivative appearing in the equations
+
+        :rtype str:
+        """
+
+        return self.derivative_states.get(derivative)
+
+    def isDeclaredOutsideDerivatives(self, var_name, group=None):
+
+        """
+        Check if one variable appears in the equations (of one group) other than as the independent variable of a derivative
+
+        :param str var_name:
+            Name of the variable
+
+        :param str group:
+            Type of the equations examined ('linear', 'nonlinear', 'differential'). Defaults to None, meaning all the equations
+
+        :rtype bool:
+        """
+
+        if group is None:
+
+            return any(var_name in symbols_i for symbols_i in self._symbols_outside_derivatives.values())
+
+        return var_name in self._symbols_outside_derivatives[group]
+
 
 class EquationBlock:
 
@@ -54,6 +509,12 @@ class EquationBlock:
 
         self._fs = None
 
+        self.cse_report = OrderedDict({})
+
+        self._residual_kernels = {}
+
+        self.incidence = IncidenceIndex([])
+
     def _assignEquationGroups(self):
 
         """
@@ -111,22 +572,14 @@ class EquationBlock:
     def _getDiffList(self):
 
         """
-        Set the list for each of the occurences of Derivative objects that appear in the equations of the model
+        Set the list for each of the occurences of Derivative objects that appear in the equations of the model, retrieved from the incidence index
 
         :return:
             List of derivatives
         :rtype list(str) diff_list:
         """
 
-        diff_list = []
-
-        for eqi in self._equation_groups['differential']:
-
-            eq = eqi._getSymbolicObject('residual','rhs')
-
-            _ = [diff_list.append(abs(i).args[0]) for i in eq.args if 'Derivative' in sp.srepr(i)]
-
-        return diff_list
+        return list(self.incidence.derivative_states.keys())
 
     def _getParamList(self):
 
@@ -149,7 +602,7 @@ class EquationBlock:
 
         return var_name_list
 
-    def _getEquationBlockAsFunction(self, differential_form='residual', side='rhs', compilation_mechanism="mpmath"):
+    def _getEquationBlockAsFunction(self, differential_form='residual', side='rhs', compilation_mechanism="mpmath", cse=False):
 
         """
         Return the Equations that compose the current EquationBlock object into a monolithical function that will return an array of results.
@@ -163,6 +616,9 @@ class EquationBlock:
         :param str compilation_mechanism:
             Determination of which mechanism to use to compile the equations. Defaults to 'numpy'
 
+        :param bool cse:
+            If True, perform a common subexpression elimination across all the equations before the compilation, so that shared subexpressions are evaluated only once. The operations saved are reported in the cse_report atribute. Defaults to False
+
         :return:
             Monolithic function corresponding to all the equations defined for current EquationBlock, retuning an array of results
         :rtype function:
@@ -174,16 +630,26 @@ class EquationBlock:
 
             if differential_form == 'elementary':
 
-                fun_ = sp.lambdify(self._var_list,
-                                   np_array(self._getEquationList(differential_form,side)),
-                                   [{'Min':min, 'Max':max, 'Sin':np.sin, 'Cos':np.cos}, compilation_mechanism]
-                            )
+                fun_ = self._lambdify(self._var_list,
+                                      self._getEquationList(differential_form,side),
+                                      [{'Min':min, 'Max':max, 'Sin':np.sin, 'Cos':np.cos}, compilation_mechanism],
+                                      cse,
+                                      'elementary'
+                                      )
+
+                if compilation_mechanism in _NATIVE_COMPILATION_MECHANISMS:
+
+                    return fun_
 
                 return jit(fun_)
 
 
             if differential_form == 'residual':
 
+                if compilation_mechanism in _NATIVE_COMPILATION_MECHANISMS:
+
+                    return self._getResidualAsNativeKernel(compilation_mechanism, cse)
+
                 yd_map, y_map = self._getMapForRewriteSystemAsResidual()
 
                 # Add y_map dict to yd_map
@@ -194,10 +660,12 @@ class EquationBlock:
 
                 rewritten_eqs = [eq_i.subs(yd_map) for eq_i in original_eqs]
 
-                _fun_ = sp.lambdify(["t","y","yd"],
-                                   np_array(rewritten_eqs),
-                                   [{'Min':min, 'Max':max, 'Sin':math.sin, 'Cos':math.cos}, compilation_mechanism]
-                            )
+                _fun_ = self._lambdify(["t","y","yd"],
+                                       rewritten_eqs,
+                                       [{'Min':min, 'Max':max, 'Sin':math.sin, 'Cos':math.cos}, compilation_mechanism],
+                                       cse,
+                                       'residual'
+                                       )
 
                 #Provide result as numpy.array
 
@@ -207,98 +675,275 @@ class EquationBlock:
 
         else:
 
-            fun_ = sp.lambdify(self._var_list,
-                               np_array(self._equations_list),
-                               [{'Min': min, 'Max': max, 'Sin': np.sin, 'Cos': np.cos}, compilation_mechanism]
-                               )
+            fun_ = self._lambdify(self._var_list,
+                                  self._equations_list,
+                                  [{'Min': min, 'Max': max, 'Sin': np.sin, 'Cos': np.cos}, compilation_mechanism],
+                                  cse,
+                                  'algebraic'
+                                  )
 
             fun_unpacked_ = lambda x: fun_(*x)
 
             return fun_unpacked_
 
-    def _getBooleanDiffFlagsForEquations(self):
+    def _getResidualAndJacobianAsFunction(self, compilation_mechanism="numpy", cse=True):
 
         """
-        Return an boolean list of if each of the Equation objects contained in the current EquationBlock are differential
+        Return the algebraic equations of the current EquationBlock, and their Jacobian with respect to the variables, as one function of the vector of variables, returning a tuple (residuals, Jacobian) as expected by scipy.optimize.root with jac=True. The common subexpression elimination is performed across the residuals and the Jacobian entries altogether.
+
+        :param str compilation_mechanism:
+            Determination of which mechanism to use to compile the equations. Defaults to 'numpy'
+
+        :param bool cse:
+            If True, perform the common subexpression elimination. Defaults to True
 
         :return:
-            List of boolean flags indicating which equations are boolean
-        :rtype list(bool):
+            Function returning the residuals and the Jacobian matrix as numpy arrays
+        :rtype function:
         """
 
-        return [float(i.type == 'differential') for i in self.equations]
+        var_symbols = [sp.Symbol(var_i) for var_i in self._var_list]
 
-    def _getEquationList(self, differential_form=None, side='rhs'):
+        number_of_equations = len(self._equations_list)
+
+        jacobian = sp.Matrix(self._equations_list).jacobian(var_symbols)
+
+        fun_ = self._lambdify(self._var_list,
+                              list(self._equations_list) + list(jacobian),
+                              [{'Min': min, 'Max': max, 'Sin': np.sin, 'Cos': np.cos}, compilation_mechanism],
+                              cse,
+                              'algebraic+jacobian'
+                              )
+
+        def fun_unpacked_(x):
+
+            out_ = np_array(fun_(*x), dtype=np.float64)
+
+            return out_[:number_of_equations], out_[number_of_equations:].reshape(number_of_equations, len(var_symbols))
+
+        return fun_unpacked_
+
+    def _getElementaryJacobianAsFunction(self, wrt, compilation_mechanism="numpy", cse=True):
 
         """
-        Set the list of sympy expressions representing the equation.
+        Return the Jacobian of the differential equations in the elementary form (right-hand sides) with respect to the differential variables, as one function taking the same arguments as the function returned by _getEquationBlockAsFunction('elementary'), and returning the Jacobian matrix as numpy array
 
-     :param str differential_form:
-            Definition of which form the equations are presented, if in a 'elementary' form (y == a*x +b) or in a 'residual' form (y - a*x - b == 0). Defaults to None, for which the declared form of the equation are used.
+        :param list(str) wrt:
+            Names of the differential variables, in the order used by the solver
 
-        :param str side:
-            Side of which the equality of the equation in the elementary form should be examined ('lhs' for left, 'rhs' for right-hand side).
+        :param str compilation_mechanism:
+            Determination of which mechanism to use to compile the equations. Defaults to 'numpy'
+
+        :param bool cse:
+            If True, perform the common subexpression elimination. Defaults to True
 
         :return:
-            List of the sympy expressions representing each Equation object of the model
+            Function returning the Jacobian matrix
+        :rtype function:
+        """
+
+        jacobian = sp.Matrix(self._getEquationList('elementary', 'rhs')).jacobian([sp.Symbol(var_i) for var_i in wrt])
+
+        fun_ = self._lambdify(self._var_list,
+                              list(jacobian),
+                              [{'Min': min, 'Max': max, 'Sin': np.sin, 'Cos': np.cos}, compilation_mechanism],
+                              cse,
+                              'elementary_jacobian'
+                              )
+
+        shape_ = jacobian.shape
+
+        return lambda *x: np_array(fun_(*x), dtype=np.float64).reshape(shape_)
+
+    def _getResidualAsNativeKernel(self, compilation_mechanism='C', cse=True):
 
-        :rtype list(sympy expresion):
         """
+        Return the differential and algebraic equations in the residual form as one native kernel (C or SymEngine), called as f(t, y, yd) likewise the function returned by _getEquationBlockAsFunction('residual')
 
-        #return [eq_i.equation_expression.symbolic_object for eq_i in self.equations]
-        return [eq_i._getSymbolicObject(differential_form, side) for eq_i in self.equations]
+        :param str compilation_mechanism:
+            Native compilation mechanism ('C' or 'symengine'). Defaults to 'C'
 
-    def _hasVarBeenDeclared(self, var_name, group=None):
+        :param bool cse:
+            If True, perform the common subexpression elimination. Defaults to True
 
+        :return:
+            Function returning the residuals as numpy array
+        :rtype function:
         """
-        Check if an specific var was declared in current EquationBlock, in a specific group of equations, or through the entire set of equations
+
+        diff_list = self._getDiffList()
+
+        # Each derivative and each variable is replaced by one plain symbol, which is mapped to one element of the input array [t, y, yd]
+
+        y_symbols = ["_y%d" % i for (i, _) in enumerate(self._var_list)]
+
+        yd_symbols = ["_yd%d" % i for (i, _) in enumerate(diff_list)]
+
+        replacement_map = {diff_i: sp.Symbol(yd_i) for (diff_i, yd_i) in zip(diff_list, yd_symbols)}
+
+        replacement_map.update({sp.Symbol(var_i): sp.Symbol(y_i) for (var_i, y_i) in zip(self._var_list, y_symbols)})
+
+        rewritten_eqs = [sp.sympify(eq_i).xreplace(replacement_map) for eq_i in self._getEquationList('residual', 'rhs')]
+
+        fun_ = self._lambdify(["t"] + y_symbols + yd_symbols, rewritten_eqs, [compilation_mechanism], cse, 'residual')
+
+        return lambda t, y, yd: fun_(*np.concatenate(([t], y, yd)))
+
+    def _lambdify(self, args, expressions, modules, cse, kernel_name):
+
+        """
+        Convert a list of expressions into one function, using sympy.lambdify or, if cse is True, the common subexpression elimination, whose results are stored in cse_report under kernel_name. If the compilation mechanism (last element of modules) is 'C' or 'symengine', the expressions are compiled into one native kernel instead.
         """
 
-        has_been_declared = False
+        if modules[-1] == 'C':
 
-        if isinstance(var_name, list) is not True:
+            kernel_ = CKernel(args, expressions, kernel_name, cse)
 
-            var_name = [var_name]
+            if cse is True:
 
-        if group is not None:
+                self.cse_report[kernel_name] = kernel_.cse_report
 
-            where_to_look = self._equation_groups[group]
+            return lambda *x: kernel_(x)
 
-        else:
+        if modules[-1] == 'symengine':
+
+            kernel_ = _lambdifyWithSymEngine(args, expressions, cse)
+
+            return lambda *x: kernel_(x)
+
+        if cse is True:
+
+            fun_, self.cse_report[kernel_name] = _lambdifyWithCSE(args, expressions, modules)
+
+            return fun_
+
+        return sp.lambdify(args, np_array(expressions), modules)
+
+    def getResidualKernel(self, args=None, equations=None, differential_form=None, side='rhs', compilation_mechanism='numpy', cse=True, with_scales=True):
+
+        """
+        Return the ResidualKernel evaluating the given equations, compiled once and cached for the later calls with the same arguments
+
+        :param list(str) args:
+            Names of the arguments of the kernel. Defaults to None, for which the variables of the current EquationBlock are used
+
+        :param list(Equation) equations:
+            Equation objects to be evaluated. Defaults to None, for which all the equations of the current EquationBlock are used
+
+        :param str differential_form:
+            Form in which the equations are evaluated ('elementary' or 'residual'). Defaults to None, for which the declared form of the equations are used
+
+        :param str side:
+            Side of the equations in the elementary form to be evaluated ('lhs' or 'rhs'). Defaults to 'rhs'
+
+        :param str compilation_mechanism:
+            Determination of which mechanism to use to compile the equations. Defaults to 'numpy'
+
+        :param bool cse:
+            If True, perform the common subexpression elimination. Defaults to True
+
+        :param bool with_scales:
+            If True, the scales of the residuals are compiled within the kernel, as needed by its scaled residuals and norms (eg: for reports of convergence). Kernels evaluating the residuals only (eg: right-hand sides of differential systems at each step) should set it to False. Defaults to True
+
+        :rtype ResidualKernel:
+        """
+
+        args = list(self._var_list if args is None else args)
+
+        equations = list(self.equations if equations is None else equations)
+
+        key_ = (tuple(args), tuple(eq_i.name for eq_i in equations), differential_form, side, compilation_mechanism, cse, with_scales)
+
+        if key_ not in self._residual_kernels:
+
+            expressions_ = [sp.sympify(eq_i._getSymbolicObject(differential_form, side)) for eq_i in equations]
+
+            # The scale of each residual is the sum of the magnitudes of its terms, compiled within the same kernel
 
-            where_to_look = self._equations_list
+            scales_ = [sp.Add(*[sp.Abs(term_i) for term_i in sp.Add.make_args(expr_i)]) for expr_i in expressions_] if with_scales is True else []
 
-        for eq in where_to_look:
+            if compilation_mechanism in _NATIVE_COMPILATION_MECHANISMS:
 
-            #print("\n======>Equation: ", eq._getSymbolicObject())
+                modules_ = [compilation_mechanism]
 
-            try:
+            else:
 
-                equation_members_ = eq._getSymbolicObject().args
+                modules_ = [{'Min': min, 'Max': max, 'Sin': np.sin, 'Cos': np.cos}, compilation_mechanism]
 
-            except:
+            fun_ = self._lambdify(args, expressions_ + scales_, modules_, cse, 'residuals' if with_scales is True else 'residuals (without scales)')
 
-                equation_members_ = []
+            self._residual_kernels[key_] = ResidualKernel(fun_, args, [eq_i.name for eq_i in equations], len(expressions_), with_scales)
 
-            for eq_i in equation_members_:
+        return self._residual_kernels[key_]
 
-                #print("\n\t======>Member: ",eq_i)
+    def getCSEReport(self):
 
-                #print("\n\t\t======>Has time_var_declared? : ", [ t_i in sp.srepr(eq_i) for t_i in var_name])
+        """
+        Return a table reporting the common subexpression elimination performed for each kernel compiled from the current EquationBlock
+
+        :return:
+            Table containing the number of subexpressions eliminated and the number of operations before and after the elimination
+        :rtype str:
+        """
+
+        tab = prettytable.PrettyTable()
+
+        tab.field_names = ["Kernel", "Subexpressions", "Operations (before)", "Operations (after)", "Operations saved"]
+
+        for kernel_i, report_i in self.cse_report.items():
+
+            tab.add_row([kernel_i,
+                         report_i['subexpressions'],
+                         report_i['ops_before'],
+                         report_i['ops_after'],
+                         report_i['ops_saved']
+                         ])
+
+        return "\nCommon subexpression elimination:\n" + str(tab)
+
+    def _getBooleanDiffFlagsForEquations(self):
+
+        """
+        Return an boolean list of if each of the Equation objects contained in the current EquationBlock are differential
+
+        :return:
+            List of boolean flags indicating which equations are boolean
+        :rtype list(bool):
+        """
+
+        return [float(i.type == 'differential') for i in self.equations]
+
+    def _getEquationList(self, differential_form=None, side='rhs'):
 
-                #Will not trigger for 'Derivative' terms
+        """
+        Set the list of sympy expressions representing the equation.
 
-                if any(var_i in sp.srepr(eq_i) and 'Derivative' not in sp.srepr(eq_i) for var_i in var_name):
+     :param str differential_form:
+            Definition of which form the equations are presented, if in a 'elementary' form (y == a*x +b) or in a 'residual' form (y - a*x - b == 0). Defaults to None, for which the declared form of the equation are used.
 
-                    has_been_declared = True
+        :param str side:
+            Side of which the equality of the equation in the elementary form should be examined ('lhs' for left, 'rhs' for right-hand side).
 
-                    break
+        :return:
+            List of the sympy expressions representing each Equation object of the model
 
-            if has_been_declared is True:
+        :rtype list(sympy expresion):
+        """
 
-                break
+        #return [eq_i.equation_expression.symbolic_object for eq_i in self.equations]
+        return [eq_i._getSymbolicObject(differential_form, side) for eq_i in self.equations]
 
-        return has_been_declared
+    def _hasVarBeenDeclared(self, var_name, group=None):
+
+        """
+        Check if an specific var was declared in current EquationBlock, in a specific group of equations, or through the entire set of equations. Occurrences as the independent variable of derivatives are not considered.
+        """
+
+        if isinstance(var_name, list) is not True:
+
+            var_name = [var_name]
+
+        return any(self.incidence.isDeclaredOutsideDerivatives(var_i, group) for var_i in var_name)
 
     def __call__(self):
 
@@ -314,4 +959,6 @@ class EquationBlock:
 
         self._equations_list = self._getEquationList()
 
-        self._assignEquationGroups()
\ No newline at end of file
+        self._assignEquationGroups()
+
+        self.incidence = IncidenceIndex(self.equations)
@@ -4,8 +4,11 @@ All those functions return EquationNode objects.
 """
 import sympy as sp
 import numpy as np
-from .expression_evaluation import EquationNode
-from .template_units import dimless
+from functools import partial
+from .expression_evaluation import EquationNode, SymbolMap
+from . import symbolic_backend as sb
+from .template_units import dimless, K
+from .error_definitions import UnexpectedValueError, DimensionalCoherenceError
 # import error_definitions as errors
 
 
@@ -15,7 +18,7 @@ Transcedental functions for utilization in the equation definition
 
 def _Log10(sp_obj, evaluate=True):
 
-    return(sp.log(sp_obj,10,evaluate=evaluate))
+    return(sb.log10(sp_obj, evaluate=evaluate))
 
 def wrapper(own_func, obj, base_func, latex_func_name=None, equation_type=None, dim_check=True, ind_var=None):
 
@@ -46,7 +49,7 @@ def wrapper(own_func, obj, base_func, latex_func_name=None, equation_type=None,
                                   variable_map={},
                                   unit_object=dimless,
                                   latex_text=f_name(latex_func_name, str(obj)),
-                                  repr_symbolic=base_func(obj, *args,evaluate=False)
+                                  repr_symbolic=base_func(obj, evaluate=False)
                                 )
 
             return enode_
@@ -57,14 +60,15 @@ def wrapper(own_func, obj, base_func, latex_func_name=None, equation_type=None,
 
                 # obj is an EquationNode
 
-                enode_ = EquationNode(name=f_name(own_func.__name__, obj.name),
-                                symbolic_object=base_func(obj.symbolic_object, evaluate=False),
-                                symbolic_map={**obj.symbolic_map},
-                                variable_map={**obj.variable_map},
-                                unit_object=obj.unit_object,
-                                latex_text=f_name(latex_func_name, obj.latex_text),
-                                repr_symbolic=base_func(obj.repr_symbolic, evaluate=False)
-                                )
+                enode_ = EquationNode(symbolic_object=base_func(obj.symbolic_object, evaluate=False),
+                                symbolic_map=obj.symbolic_map,
+                                variable_map=obj.variable_map,
+                                unit_object=obj.unit_object
+                                )._setOperation((obj,),
+                                                partial(base_func, evaluate=False),
+                                                [own_func.__name__+"(", obj, ")"],
+                                                [latex_func_name+"(", obj, ")"]
+                                                )
 
                 enode_.equation_type = equation_type_
 
@@ -82,7 +86,7 @@ def wrapper(own_func, obj, base_func, latex_func_name=None, equation_type=None,
 
 def Log(obj):
 
-    return wrapper(Log, obj, sp.log)
+    return wrapper(Log, obj, sb.log)
 
 def Log10(obj):
 
@@ -90,27 +94,27 @@ def Log10(obj):
 
 def Sqrt(obj):
 
-    return wrapper(Sqrt, obj, sp.sqrt)
+    return wrapper(Sqrt, obj, sb.sqrt)
 
 def Abs(obj):
 
-    return wrapper(Abs, obj, sp.Abs)
+    return wrapper(Abs, obj, sb.Abs)
 
 def Exp(obj):
 
-    return wrapper(Exp, obj, sp.exp)
+    return wrapper(Exp, obj, sb.exp)
 
 def Sin(obj):
 
-    return wrapper(Sin, obj, sp.sin)
+    return wrapper(Sin, obj, sb.sin)
 
 def Cos(obj):
 
-    return wrapper(Cos, obj, sp.cos)
+    return wrapper(Cos, obj, sb.cos)
 
 def Tan(obj):
 
-    return wrapper(Tan, obj, sp.tan)
+    return wrapper(Tan, obj, sb.tan)
 
 def Min(*obj):
 
@@ -118,7 +122,9 @@ def Min(*obj):
 
     latex_func_name = "min"
 
-    f_name = latex_func_name+"\\right ("
+    # The name is built from the operands only when requested
+
+    name_parts = [latex_func_name+"\\right ("]
 
     obj_symb_map = {}
 
@@ -128,31 +134,13 @@ def Min(*obj):
 
     for obj_i in obj:
 
-        if hasattr(obj_i,'obj_latex_name'):
-
-            obj_latex_name = obj_i.obj_latex_name
-
-        else:
-
-            try:
-
-                obj_latex_name = obj_i.name
-
-            except:
-
-                obj_latex_name = str(obj_i)
-
         if isinstance(obj_i, EquationNode):
 
-            obj_name = obj_i.name
+            name_parts.append(obj_i)
 
         else:
 
-            obj_name = str(obj_i)
-
-            obj_latex_name = str(obj_i)
-
-        f_name+=obj_name
+            name_parts.append(str(obj_i))
 
         if hasattr(obj_i, 'symbolic_object'):
 
@@ -164,17 +152,13 @@ def Min(*obj):
 
         #Gather all the symbolic and variable map from the obj
 
-        try:
-
-            obj_symb_map = {**obj_symb_map, **obj_i.symbolic_map}
-
-            obj_var_map = {**obj_var_map, **obj_i.variable_map}
+        if isinstance(obj_i, EquationNode):
 
-        except:
+            obj_symb_map = SymbolMap.union(obj_symb_map, obj_i.symbolic_map)
 
-            pass
+            obj_var_map = SymbolMap.union(obj_var_map, obj_i.variable_map)
 
-    f_name += ")"
+    name_parts.append(")")
 
     latex_func_name+="\\right )"
 
@@ -184,7 +168,7 @@ def Min(*obj):
 
     elif all(isinstance(obj_i, EquationNode) for obj_i in obj):
 
-        if all(the_unit == obj[0].unit_object for the_unit in obj):
+        if all(obj_i.unit_object._check_dimensional_coherence(obj[0].unit_object) for obj_i in obj):
 
             obj_dims = obj[0].unit_object
 
@@ -200,14 +184,15 @@ def Min(*obj):
 
             obj_dims = dimless
 
-    enode_ = EquationNode(name=f_name,
-                          symbolic_object=sp.Min(*obj_symb_objcts, evaluate=False),
+    symbolic_object_ = sb.Min(*obj_symb_objcts)
+
+    enode_ = EquationNode(symbolic_object=symbolic_object_,
                           symbolic_map=obj_symb_map,
                           variable_map=obj_var_map,
                           unit_object=obj_dims,
                           latex_text=latex_func_name,
-                          repr_symbolic=sp.Min(*obj_symb_objcts, evaluate=False)
-                        )
+                          repr_symbolic=symbolic_object_
+                        )._setOperation((), None, name_parts, None)
 
     return enode_
 
@@ -217,7 +202,9 @@ def Max(*obj):
 
     latex_func_name = "max"
 
-    f_name = latex_func_name+"\\right ("
+    # The name is built from the operands only when requested
+
+    name_parts = [latex_func_name+"\\right ("]
 
     obj_symb_map = {}
 
@@ -227,31 +214,13 @@ def Max(*obj):
 
     for obj_i in obj:
 
-        if hasattr(obj_i,'obj_latex_name'):
-
-            obj_latex_name = obj_i.obj_latex_name
-
-        else:
-
-            try:
-
-                obj_latex_name = obj_i.name
-
-            except:
-
-                obj_latex_name = str(obj_i)
-
         if isinstance(obj_i, EquationNode):
 
-            obj_name = obj_i.name
+            name_parts.append(obj_i)
 
         else:
 
-            obj_name = str(obj_i)
-
-            obj_latex_name = str(obj_i)
-
-        f_name+=obj_name
+            name_parts.append(str(obj_i))
 
         if hasattr(obj_i, 'symbolic_object'):
 
@@ -263,17 +232,13 @@ def Max(*obj):
 
         #Gather all the symbolic and variable map from the obj
 
-        try:
-
-            obj_symb_map = {**obj_symb_map, **obj_i.symbolic_map}
-
-            obj_var_map = {**obj_var_map, **obj_i.variable_map}
+        if isinstance(obj_i, EquationNode):
 
-        except:
+            obj_symb_map = SymbolMap.union(obj_symb_map, obj_i.symbolic_map)
 
-            pass
+            obj_var_map = SymbolMap.union(obj_var_map, obj_i.variable_map)
 
-    f_name += ")"
+    name_parts.append(")")
     latex_func_name+="\\right )"
 
     if all(isinstance(obj_i, float) or isinstance(obj_i, int) for obj_i in obj):
@@ -282,7 +247,7 @@ def Max(*obj):
 
     elif all(isinstance(obj_i, EquationNode) for obj_i in obj):
 
-        if all(the_unit == obj[0].unit_object for the_unit in obj):
+        if all(obj_i.unit_object._check_dimensional_coherence(obj[0].unit_object) for obj_i in obj):
 
             obj_dims = obj[0].unit_object
 
@@ -298,17 +263,260 @@ def Max(*obj):
 
             obj_dims = dimless
 
-    enode_ = EquationNode(name=f_name,
-                          symbolic_object=sp.Max(*obj_symb_objcts, evaluate=False),
+    symbolic_object_ = sb.Max(*obj_symb_objcts)
+
+    enode_ = EquationNode(symbolic_object=symbolic_object_,
                           symbolic_map=obj_symb_map,
                           variable_map=obj_var_map,
                           unit_object=obj_dims,
                           latex_text=latex_func_name,
-                          repr_symbolic=sp.Max(*obj_symb_objcts, evaluate=False)
-                        )
+                          repr_symbolic=symbolic_object_
+                        )._setOperation((), None, name_parts, None)
+
+    return enode_
+
+def _gatherOperands(obj):
+
+    # Operands may be supplied either as arguments or as one single list (or tuple)
+
+    if len(obj) == 1 and isinstance(obj[0], (list, tuple)):
+
+        obj = obj[0]
+
+    obj = list(obj)
+
+    if len(obj) == 0 or not all(isinstance(obj_i, (EquationNode, int, float)) for obj_i in obj):
+
+        raise UnexpectedValueError("non-empty set of (int, float, EquationNode)")
+
+    return obj
+
+def Sum(*obj):
+
+    """
+    Return the sum of all the operands (EquationNode objects or numbers) as one n-ary EquationNode, built in one step, with one single check of dimensional coherence among the EquationNode operands. Equivalent to obj[0] + obj[1] + ..., without creation of the intermediate EquationNode objects.
+
+    :param obj:
+        Operands, supplied as arguments or as one list
+
+    :return:
+        EquationNode corresponding to the sum
+    :rtype EquationNode:
+    """
+
+    obj = _gatherOperands(obj)
+
+    enodes_ = [obj_i for obj_i in obj if isinstance(obj_i, EquationNode)]
+
+    if len(enodes_) == 0:
+
+        unit_object_ = dimless
+
+    else:
+
+        unit_object_ = enodes_[0].unit_object
+
+        for enode_i in enodes_[1:]:
+
+            if enode_i.unit_object._check_dimensional_coherence(unit_object_) is not True:
+
+                raise DimensionalCoherenceError(unit_object_, enode_i.unit_object)
+
+    symbolic_object_ = sb.Add(*[obj_i.symbolic_object if isinstance(obj_i, EquationNode) else obj_i for obj_i in obj])
+
+    parts_ = []
+
+    for i, obj_i in enumerate(obj):
+
+        if i > 0:
+
+            parts_.append("+")
+
+        parts_.append(obj_i if isinstance(obj_i, EquationNode) else str(obj_i))
+
+    enode_ = EquationNode(symbolic_object=symbolic_object_,
+                          symbolic_map=SymbolMap.union(*[enode_i.symbolic_map for enode_i in enodes_]),
+                          variable_map=SymbolMap.union(*[enode_i.variable_map for enode_i in enodes_]),
+                          unit_object=unit_object_
+                        )._setOperation(obj, sb.Add, parts_, parts_)
+
+    equation_type_ = {'is_linear':True, 'is_nonlinear':False, 'is_differential':False}
+
+    for enode_i in enodes_:
+
+        equation_type_ = enode_._checkEquationTypePrecedence(equation_type_, enode_i.equation_type)
+
+    enode_.equation_type = equation_type_
 
     return enode_
 
+def Product(*obj):
+
+    """
+    Return the product of all the operands (EquationNode objects or numbers) as one n-ary EquationNode, built in one step. Equivalent to obj[0] * obj[1] * ..., without creation of the intermediate EquationNode objects.
+
+    :param obj:
+        Operands, supplied as arguments or as one list
+
+    :return:
+        EquationNode corresponding to the product
+    :rtype EquationNode:
+    """
+
+    obj = _gatherOperands(obj)
+
+    enodes_ = [obj_i for obj_i in obj if isinstance(obj_i, EquationNode)]
+
+    unit_object_ = enodes_[0].unit_object if len(enodes_) > 0 else dimless
+
+    for enode_i in enodes_[1:]:
+
+        unit_object_ = unit_object_*enode_i.unit_object
+
+    symbolic_object_ = sb.Mul(*[obj_i.symbolic_object if isinstance(obj_i, EquationNode) else obj_i for obj_i in obj])
+
+    parts_ = []
+
+    for i, obj_i in enumerate(obj):
+
+        if i > 0:
+
+            parts_.append("*")
+
+        parts_.append(obj_i if isinstance(obj_i, EquationNode) else str(obj_i))
+
+    enode_ = EquationNode(symbolic_object=symbolic_object_,
+                          symbolic_map=SymbolMap.union(*[enode_i.symbolic_map for enode_i in enodes_]),
+                          variable_map=SymbolMap.union(*[enode_i.variable_map for enode_i in enodes_]),
+                          unit_object=unit_object_
+                        )._setOperation(obj, sb.Mul, parts_, parts_)
+
+    # As for binary products, the product is linear only if at most one operand holds unspecified quantities
+
+    unspecified_ = [enode_i for enode_i in enodes_ if enode_i.variable_map != {}]
+
+    if len(unspecified_) == 0:
+
+        enode_.equation_type = {**enodes_[0].equation_type} if len(enodes_) > 0 else {'is_linear':True, 'is_nonlinear':False, 'is_differential':False}
+
+    elif len(unspecified_) == 1:
+
+        enode_.equation_type = {**unspecified_[0].equation_type}
+
+    else:
+
+        enode_.equation_type = {'is_linear':False, 'is_nonlinear':True, 'is_differential':False}
+
+    return enode_
+
+"""
+Temperature-dependent property correlations, built from the elementary operators, so they are compiled into the kernels of the equations as any other expression (see PropertyPackage.getCorrelation for their coefficients from thermo)
+"""
+
+def _unitNode(value, unit_object):
+
+    # Number with dimensional unit, for the conversion of the correlations from and to dimensionless form
+
+    return EquationNode(name=str(value),
+                        symbolic_object=value,
+                        unit_object=unit_object._forExpressions(),
+                        latex_text=str(value),
+                        repr_symbolic=value
+                        )
+
+def _reducedTemperature(T):
+
+    if not isinstance(T, EquationNode) or T.unit_object._check_dimensional_coherence(K) is not True:
+
+        raise UnexpectedValueError("EquationNode (temperature, K)")
+
+    return T/_unitNode(1., K)
+
+def DIPPR100(T, coefficients, units=dimless, integral=False):
+
+    """
+    Return the DIPPR-100 polynomial correlation, sum(c_k*T**k), of one property (eg: heat capacities, liquid densities) as one EquationNode
+
+    :param EquationNode T:
+        Temperature (K)
+
+    :param list(float) coefficients:
+        Coefficients of the polynomial in increasing order of the power of T (in K)
+
+    :param Unit units:
+        Dimensional unit of the property. Defaults to dimless
+
+    :param bool integral:
+        If True, return the integral of the correlation with respect to T, from 0 to T (eg: sensible enthalpies from heat capacities), whose unit is units*K. Defaults to False
+
+    :return:
+        EquationNode corresponding to the correlation
+    :rtype EquationNode:
+    """
+
+    tau_ = _reducedTemperature(T)
+
+    if integral is True:
+
+        terms_ = [c_k/(k + 1)*tau_**(k + 1) for (k, c_k) in enumerate(coefficients) if c_k != 0.]
+
+        units = units*K
+
+    else:
+
+        terms_ = [float(coefficients[0])] + [c_k*tau_**k for (k, c_k) in enumerate(coefficients) if k > 0 and c_k != 0.]
+
+    return Sum(terms_)*_unitNode(1., units)
+
+def DIPPR101(T, A, B, C=0., D=0., E=0., units=dimless):
+
+    """
+    Return the DIPPR-101 correlation, exp(A + B/T + C*ln(T) + D*T**E), of one property (eg: vapour pressures) as one EquationNode
+
+    :param EquationNode T:
+        Temperature (K)
+
+    :param Unit units:
+        Dimensional unit of the property. Defaults to dimless
+
+    :rtype EquationNode:
+    """
+
+    tau_ = _reducedTemperature(T)
+
+    terms_ = [float(A), B/tau_]
+
+    if C != 0.:
+
+        terms_.append(C*Log(tau_))
+
+    if D != 0.:
+
+        terms_.append(D*tau_**E)
+
+    return Exp(Sum(terms_))*_unitNode(1., units)
+
+def Antoine(T, A, B, C, base=10., units=dimless):
+
+    """
+    Return the Antoine correlation, base**(A - B/(T + C)), of the vapour pressure as one EquationNode
+
+    :param EquationNode T:
+        Temperature (K)
+
+    :param float base:
+        Base of the correlation. Defaults to 10.
+
+    :param Unit units:
+        Dimensional unit of the vapour pressure given by the coefficients. Defaults to dimless
+
+    :rtype EquationNode:
+    """
+
+    tau_ = _reducedTemperature(T)
+
+    return Exp((A - B/(tau_ + C))*float(np.log(base)))*_unitNode(1., units)
+
 def _Diff(obj, ind_var_):
 
     #return wrapper(Diff, obj, sp.diff, equation_type={'is_differential':True}, dim_check=False, ind_var=ind_var_)
@@ -338,26 +546,26 @@ def _Diff(obj, ind_var_):
 
         if ind_var_ == None:
 
-            symbolic_object_ = sp.diff(obj_.symbolic_object,
-                              evaluate=False)
-            repr_symbolic_ = sp.diff(obj_.repr_symbolic, evaluate=False)
+            symbolic_object_ = sb.Derivative(obj_.symbolic_object)
+
+            repr_symbolic_ = sb.Derivative(obj_.repr_symbolic)
 
             unit_object_ = dimless
 
         else:
 
 
-            symbolic_object_ = symbolic_object=sp.diff(obj_.symbolic_object, ind_var_.__call__().symbolic_object, evaluate=False)
+            symbolic_object_ = sb.Derivative(obj_.symbolic_object, ind_var_.__call__().symbolic_object)
 
-            repr_symbolic_ = sp.diff(obj_.repr_symbolic, ind_var_.__call__().repr_symbolic, evaluate=False)
+            repr_symbolic_ = sb.Derivative(obj_.repr_symbolic, ind_var_.__call__().repr_symbolic)
 
             unit_object_ = obj_.unit_object/ind_var_.__call__().unit_object
 
 
         enode_ = EquationNode(name="Diff("+str(obj_)+")",
                               symbolic_object=symbolic_object_,
-                              symbolic_map={**obj_.symbolic_map},
-                              variable_map={**obj_.variable_map},
+                              symbolic_map=obj_.symbolic_map,
+                              variable_map=obj_.variable_map,
                               unit_object=unit_object_,
                               latex_text="Diff("+str(obj_)+")",
                               repr_symbolic=repr_symbolic_
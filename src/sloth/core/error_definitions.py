@@ -166,6 +166,28 @@ class DimensionalCoherenceError(Exception):
 
         return(msg)
 
+class StructuralSingularityError(Exception):
+
+    """
+    Error raised when the equations of one problem cannot be matched one-to-one with its unknowns (structurally singular system), even though their numbers agree
+    """
+
+    def __init__(self, unmatched_equations, unmatched_variables, overdetermined_equations=[], underdetermined_variables=[]):
+
+        self.unmatched_equations = unmatched_equations
+
+        self.unmatched_variables = unmatched_variables
+
+        self.overdetermined_equations = overdetermined_equations
+
+        self.underdetermined_variables = underdetermined_variables
+
+    def __str__(self):
+
+        msg = "The system is structurally singular. \n Unmatched equations: %s \n Unmatched variables: %s \n Over-determined subset (equations): %s \n Under-determined subset (variables): %s" % (self.unmatched_equations, self.unmatched_variables, self.overdetermined_equations, self.underdetermined_variables)
+
+        return(msg)
+
 class UnitOperationError(Exception):
 
     """
@@ -187,3 +209,17 @@ class UnitOperationError(Exception):
 def _addUnitContainingOperations(a,b):
 
     return(a._checkDimensionalCoherence(b))
+
+class CompilationError(Exception):
+
+    """
+    Error raised by failures in the generation or in the building of compiled kernels (eg: absence of a C compiler)
+    """
+
+    def __init__(self, msg=''):
+
+        self.msg = msg
+
+    def __str__(self):
+
+        return("Compilation error. %s" % self.msg)
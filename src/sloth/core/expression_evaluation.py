@@ -2,9 +2,271 @@
 
 """
 Define EquationNode class, that holds the reference to variables in the equations
+
+Define SymbolMap class, an immutable and structurally shared mapping used for the symbolic and variable maps of EquationNode objects
 """
 
+import operator
+from collections.abc import Mapping
+
 from .error_definitions import UnexpectedValueError, DimensionalCoherenceError
+from .symbolic_backend import toSympy
+
+class SymbolMap(Mapping):
+
+    """
+    Definition of SymbolMap. Immutable mapping between the names of symbolic objects and their corresponding Quantity objects. The union of SymbolMap objects is performed in constant time, by referencing the united maps instead of copying them, so that building one expression of k terms takes O(k) operations and memory. The entries are gathered (and cached) only when the map is read.
+    """
+
+    __slots__ = ('_own', '_parents', '_flat', '_is_empty')
+
+    def __init__(self, mapping=None):
+
+        """
+        Instantiate SymbolMap
+
+        :ivar dict mapping:
+            Entries of the current map. Defaults to None, for an empty map.
+        """
+
+        self._own = dict(mapping) if mapping is not None else {}
+
+        self._parents = ()
+
+        self._flat = self._own
+
+        self._is_empty = len(self._own) == 0
+
+    @classmethod
+    def _fromMapping(cls, mapping):
+
+        if isinstance(mapping, cls):
+
+            return mapping
+
+        if mapping is None or len(mapping) == 0:
+
+            return EMPTY_SYMBOL_MAP
+
+        return cls(mapping)
+
+    @classmethod
+    def union(cls, *mappings):
+
+        """
+        Return the union of the mappings supplied, with the same precedence as {**a, **b}, sharing (not copying) them
+
+        :return:
+            United map
+        :rtype SymbolMap:
+        """
+
+        maps_ = [cls._fromMapping(map_i) for map_i in mappings]
+
+        maps_ = [map_i for map_i in maps_ if map_i._is_empty is False]
+
+        if len(maps_) == 0:
+
+            return EMPTY_SYMBOL_MAP
+
+        if len(maps_) == 1:
+
+            return maps_[0]
+
+        united_ = cls.__new__(cls)
+
+        united_._own = None
+
+        united_._parents = tuple(maps_)
+
+        united_._flat = None
+
+        united_._is_empty = False
+
+        return united_
+
+    def _leafMaps(self, reverse=False):
+
+        # Iterative traversal of the shared structure (so that deep unions do not exceed the recursion limit), yielding each flat map once, at its first occurrence in the order of traversal
+
+        visited_ = set()
+
+        stack = [self]
+
+        while len(stack) > 0:
+
+            map_i = stack.pop()
+
+            if id(map_i) in visited_:
+
+                continue
+
+            visited_.add(id(map_i))
+
+            if map_i._flat is not None:
+
+                yield map_i._flat
+
+            else:
+
+                stack.extend(map_i._parents if reverse is True else reversed(map_i._parents))
+
+    def _flatten(self):
+
+        if self._flat is None:
+
+            # As in {**a, **b}, the keys keep the order of their first occurrence, and the values are those of their last occurrence (the first one in the reverse traversal)
+
+            values_ = {}
+
+            for flat_i in self._leafMaps(reverse=True):
+
+                for key_j, value_j in flat_i.items():
+
+                    if key_j not in values_:
+
+                        values_[key_j] = value_j
+
+            flat_ = {}
+
+            for flat_i in self._leafMaps():
+
+                for key_j in flat_i:
+
+                    if key_j not in flat_:
+
+                        flat_[key_j] = values_[key_j]
+
+            self._flat = flat_
+
+            self._parents = ()
+
+        return self._flat
+
+    def __getitem__(self, key):
+
+        return self._flatten()[key]
+
+    def __iter__(self):
+
+        return iter(self._flatten())
+
+    def __len__(self):
+
+        return len(self._flatten())
+
+    def __contains__(self, key):
+
+        return key in self._flatten()
+
+    def __bool__(self):
+
+        return not self._is_empty
+
+    def __eq__(self, other):
+
+        # Comparison against empty mappings (frequent during the construction of expressions) does not require gathering the entries
+
+        if isinstance(other, SymbolMap) and (self._is_empty or other._is_empty):
+
+            return self._is_empty and other._is_empty
+
+        if isinstance(other, dict) and len(other) == 0:
+
+            return self._is_empty
+
+        if isinstance(other, Mapping):
+
+            return self._flatten() == dict(other.items())
+
+        return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+
+        # Copies (eg: deepcopy of models) are flat
+
+        return (self.__class__, (self._flatten(),))
+
+    def __repr__(self):
+
+        return repr(self._flatten())
+
+
+EMPTY_SYMBOL_MAP = SymbolMap()
+
+
+class _LazyRepresentation:
+
+    """
+    Operation from which one representation (name, latex_text or repr_symbolic) of an ENODE is built when requested. Only the lazy representations of the operands (or their representations, if already built) are referenced, so that the intermediate ENODEs, with their symbolic objects and maps, are not kept alive by the result.
+
+    :ivar function function:
+        Function combining the representations of the operands (repr_symbolic only). None for texts, which are concatenated.
+
+    :ivar list parts:
+        Sequence of representations (strings, symbolic objects or numbers) and _LazyRepresentation objects
+    """
+
+    __slots__ = ('function', 'parts')
+
+    def __init__(self, function, parts):
+
+        self.function = function
+
+        self.parts = parts
+
+    def joinText(self):
+
+        # Iterative in-order traversal, so that the text is built in linear time and deep expressions do not exceed the recursion limit
+
+        tokens = []
+
+        stack = list(reversed(self.parts))
+
+        while len(stack) > 0:
+
+            item = stack.pop()
+
+            if isinstance(item, _LazyRepresentation):
+
+                stack.extend(reversed(item.parts))
+
+            else:
+
+                tokens.append(item)
+
+        return "".join(tokens)
+
+    def evaluate(self):
+
+        # Iterative post-order traversal, evaluating each operation once
+
+        values = {}
+
+        stack = [(self, False)]
+
+        while len(stack) > 0:
+
+            node, operands_evaluated = stack.pop()
+
+            if id(node) in values:
+
+                continue
+
+            if operands_evaluated is True:
+
+                values[id(node)] = node.function(*[values[id(op_i)] if isinstance(op_i, _LazyRepresentation) else op_i for op_i in node.parts])
+
+            else:
+
+                stack.append((node, True))
+
+                stack.extend((op_i, False) for op_i in node.parts if isinstance(op_i, _LazyRepresentation))
+
+        return values[id(self)]
+
 
 class EquationNode:
 
@@ -17,6 +279,9 @@ class EquationNode:
           Eg: IfThen(CONDITION, [THEN_CLAUSE,ELSE_CAUSE]) 
     """
 
+    __slots__ = ('_name', '_latex_text', '_repr_symbolic', '_lazy_name', '_lazy_latex', '_lazy_repr',
+                 'symbolic_object', 'symbolic_map', 'variable_map', 'equation_type', 'unit_object', 'args')
+
     def __init__(self, name='', symbolic_object=None, symbolic_map={}, variable_map={}, is_linear=True, is_nonlinear=False,
                  is_differential=False, unit_object=None, args=[], latex_text='', repr_symbolic=None):
 
@@ -29,11 +294,11 @@ class EquationNode:
         :ivar sympy.symbols symbolic_object:
             Base symbolic object for which arithmetical operations are evaluated. Defaults to None.
 
-        :ivar dict symbolic_map:
-            Dictionary containing the mapping beetween the symbolic objects and their corresponding Quantity objects
+        :ivar SymbolMap symbolic_map:
+            Mapping beetween the symbolic objects and their corresponding Quantity objects. Dictionaries supplied are converted to SymbolMap.
 
-        :ivar dict variable_map:
-            Dictionary containing only the mapping beetween the symbolic objects and their corresponding Quantity objects that were not specified (eg:Variable, unespecified Parameter, etc)
+        :ivar SymbolMap variable_map:
+            Mapping beetween only the symbolic objects and their corresponding Quantity objects that were not specified (eg:Variable, unespecified Parameter, etc). Dictionaries supplied are converted to SymbolMap.
 
         : ivar bool is_linear:
             If the current ENODE contains a linear expression
@@ -55,15 +320,23 @@ class EquationNode:
 
         :ivar str repr_symbolic:
             Symbolic representation of the symbolic object for which arithmetical operations are evaluated, used for ENODE conversion to string. Defaults to None.
+
+        The name, latex_text and repr_symbolic of ENODEs resulting from operations are not built upon their creation, but only when requested (see _setOperation), from the operands that originated them.
         """
-        
+
+        self._lazy_name = None
+
+        self._lazy_latex = None
+
+        self._lazy_repr = None
+
         self.name = name
 
         self.symbolic_object = symbolic_object
 
-        self.symbolic_map = symbolic_map
+        self.symbolic_map = SymbolMap._fromMapping(symbolic_map)
 
-        self.variable_map = variable_map
+        self.variable_map = SymbolMap._fromMapping(variable_map)
 
         self.equation_type = {'is_linear':is_linear,
                               'is_nonlinear':is_nonlinear,
@@ -78,6 +351,219 @@ class EquationNode:
 
         self.repr_symbolic = repr_symbolic
 
+    @property
+    def name(self):
+
+        if self._lazy_name is not None:
+
+            self._name = self._lazy_name.joinText()
+
+            self._lazy_name = None
+
+        return self._name
+
+    @name.setter
+    def name(self, value):
+
+        self._name = value
+
+        self._lazy_name = None
+
+    @property
+    def latex_text(self):
+
+        if self._lazy_latex is not None:
+
+            self._latex_text = self._lazy_latex.joinText()
+
+            self._lazy_latex = None
+
+        return self._latex_text
+
+    @latex_text.setter
+    def latex_text(self, value):
+
+        self._latex_text = value
+
+        self._lazy_latex = None
+
+    @property
+    def repr_symbolic(self):
+
+        if self._lazy_repr is not None:
+
+            self._repr_symbolic = toSympy(self._lazy_repr.evaluate())
+
+            self._lazy_repr = None
+
+        return self._repr_symbolic
+
+    @repr_symbolic.setter
+    def repr_symbolic(self, value):
+
+        self._repr_symbolic = value
+
+        self._lazy_repr = None
+
+    def _setOperation(self, operands, repr_function, name_parts, latex_parts):
+
+        """
+        Define the current ENODE as the result of one operation, from which its name, latex_text and repr_symbolic are built when requested.
+
+        :param tuple operands:
+            Operands (ENODE objects or numbers) of the operation
+
+        :param function repr_function:
+            Function combining the repr_symbolic of the operands into the repr_symbolic of the current ENODE
+
+        :param list name_parts:
+            Sequence of strings and ENODE objects, whose names are concatenated to form the name of the current ENODE
+
+        :param list latex_parts:
+            Sequence of strings and ENODE objects, whose latex texts are concatenated to form the latex_text of the current ENODE
+        """
+
+        if repr_function is not None:
+
+            self._lazy_repr = _LazyRepresentation(repr_function, [self._getLazyPart(op_i, '_lazy_repr', '_repr_symbolic') for op_i in operands])
+
+        if name_parts is not None:
+
+            self._lazy_name = _LazyRepresentation(None, [self._getLazyPart(part_i, '_lazy_name', '_name') for part_i in name_parts])
+
+        if latex_parts is not None:
+
+            self._lazy_latex = _LazyRepresentation(None, [self._getLazyPart(part_i, '_lazy_latex', '_latex_text') for part_i in latex_parts])
+
+        return self
+
+    @staticmethod
+    def _getLazyPart(item, lazy_attribute, attribute):
+
+        # ENODE operands are replaced by their lazy representation, or by their representation if already built
+
+        if not isinstance(item, EquationNode):
+
+            return item
+
+        lazy_ = getattr(item, lazy_attribute)
+
+        if lazy_ is None:
+
+            return getattr(item, attribute)
+
+        return lazy_
+
+    def __getstate__(self):
+
+        # The lazy representations are built before copying (or pickling), as their recursive copy would exceed the recursion limit for long expressions
+
+        state = {slot_i: getattr(self, slot_i) for slot_i in self.__slots__}
+
+        state.update({'_name': self.name,
+                      '_latex_text': self.latex_text,
+                      '_repr_symbolic': self.repr_symbolic,
+                      '_lazy_name': None,
+                      '_lazy_latex': None,
+                      '_lazy_repr': None
+                      })
+
+        return state
+
+    def __setstate__(self, state):
+
+        for slot_i, value_i in state.items():
+
+            setattr(self, slot_i, value_i)
+
+    def _renamed(self, names_map, whole_obj_map, values_map={}, substitutions={}):
+
+        """
+        Return a copy of the current ENODE in which the symbols are renamed through one xreplace mapping. The remaining attributes (eg: name, unit_object, the lazy representations) are shared with the current ENODE, which is left unchanged.
+
+        :param dict names_map:
+            Dictionary mapping the names of the symbols to their new names (e.g: {'a_M1':'a_M2'}). Symbols absent from it are kept
+
+        :param dict whole_obj_map:
+            Dictionary mapping the new names of the symbols to their corresponding Quantity objects, used for the symbolic_map and the variable_map of the copy
+
+        :param dict values_map:
+            Dictionary mapping the new names of the symbols of specified objects to their values, which replace the symbols in the symbolic_object of the copy (as for specified Quantity objects). Defaults to {}
+
+        :param dict substitutions:
+            Dictionary mapping the names of the symbols to symbolic expressions (over the new names of the symbols) which replace them, instead of being renamed (eg: ghost points of stencils, see EquationArray). Defaults to {}
+
+        :return:
+            Renamed copy of the current ENODE
+        :rtype EquationNode:
+        """
+
+        enode_ = self.__class__.__new__(self.__class__)
+
+        for slot_i in self.__slots__:
+
+            setattr(enode_, slot_i, getattr(self, slot_i))
+
+        repr_symbolic_ = self.repr_symbolic
+
+        symbols_ = set(getattr(repr_symbolic_, 'free_symbols', set())) | set(getattr(self.symbolic_object, 'free_symbols', set()))
+
+        renaming_ = {symbol_i: symbol_i.__class__(names_map[symbol_i.name]) for symbol_i in symbols_ if symbol_i.name in names_map}
+
+        if len(substitutions) > 0:
+
+            renaming_.update({symbol_i: substitutions[symbol_i.name] for symbol_i in symbols_ if symbol_i.name in substitutions})
+
+        if len(renaming_) > 0:
+
+            if hasattr(repr_symbolic_, 'xreplace'):
+
+                enode_.repr_symbolic = repr_symbolic_.xreplace(renaming_)
+
+            object_renaming_ = renaming_
+
+            if len(values_map) > 0:
+
+                object_renaming_ = {symbol_i: values_map.get(getattr(new_i, 'name', None), new_i) for (symbol_i, new_i) in renaming_.items()}
+
+            if self.symbolic_object is repr_symbolic_ and object_renaming_ is renaming_:
+
+                enode_.symbolic_object = enode_.repr_symbolic
+
+            elif hasattr(self.symbolic_object, 'xreplace'):
+
+                enode_.symbolic_object = self.symbolic_object.xreplace(object_renaming_)
+
+        symbols_used_ = [str(i) for i in getattr(enode_.repr_symbolic, 'free_symbols', [])]
+
+        enode_.symbolic_map = SymbolMap({k: whole_obj_map[k] for k in symbols_used_})
+
+        variable_map_ = {names_map.get(k, k): whole_obj_map.get(names_map.get(k, k), v) for (k, v) in self.variable_map.items() if names_map.get(k, k) not in values_map and k not in substitutions}
+
+        for k in self.variable_map:
+
+            if k in substitutions:
+
+                variable_map_.update({str(i): whole_obj_map[str(i)] for i in getattr(substitutions[k], 'free_symbols', []) if str(i) not in values_map})
+
+        enode_.variable_map = SymbolMap(variable_map_)
+
+        enode_.equation_type = {**self.equation_type}
+
+        return enode_
+
+    def _convertToSympy(self):
+
+        """
+        Convert the symbolic objects of the current ENODE to SymPy objects (see symbolic_backend.toSympy). The repr_symbolic not yet built is converted when requested.
+        """
+
+        self.symbolic_object = toSympy(self.symbolic_object)
+
+        if self._lazy_repr is None:
+
+            self._repr_symbolic = toSympy(self._repr_symbolic)
+
     def _checkEquationTypePrecedence(self, eq_type_1, eq_type_2):
 
         res = {'is_linear':False, 'is_nonlinear':False, 'is_differential':False}
@@ -167,14 +653,15 @@ class EquationNode:
             # other_obj is another ENODE.
 
             enode_ = self.__class__(
-                                name="+".join([self.name, other_obj.name]),
                                 symbolic_object=self.symbolic_object+other_obj.symbolic_object,
-                                symbolic_map={**self.symbolic_map, **other_obj.symbolic_map},
-                                variable_map={**self.variable_map, **other_obj.variable_map},
-                                unit_object=self.unit_object+other_obj.unit_object,
-                                latex_text="+".join([self.latex_text,other_obj.latex_text]),
-                                repr_symbolic=self.repr_symbolic+other_obj.repr_symbolic
-                                )
+                                symbolic_map=SymbolMap.union(self.symbolic_map, other_obj.symbolic_map),
+                                variable_map=SymbolMap.union(self.variable_map, other_obj.variable_map),
+                                unit_object=self.unit_object+other_obj.unit_object
+                            )._setOperation((self, other_obj),
+                                            operator.add,
+                                            [self, "+", other_obj],
+                                            [self, "+", other_obj]
+                                            )
 
             enode_.equation_type = self._checkEquationTypePrecedence(self.equation_type, other_obj.equation_type)
 
@@ -185,14 +672,15 @@ class EquationNode:
             # other_obj is a numerical value
 
             enode_ = self.__class__(
-                            name="+".join([self.name, str(other_obj)]), 
                             symbolic_object=self.symbolic_object+other_obj,
-                            symbolic_map={**self.symbolic_map}, 
-                            variable_map={**self.variable_map},
-                            unit_object=self.unit_object, 
-                            latex_text=self.latex_text+"+"+str(other_obj),
-                            repr_symbolic=self.repr_symbolic+other_obj
-                                )
+                            symbolic_map=self.symbolic_map,
+                            variable_map=self.variable_map,
+                            unit_object=self.unit_object
+                        )._setOperation((self, other_obj),
+                                        operator.add,
+                                        [self, "+"+str(other_obj)],
+                                        [self, "+"+str(other_obj)]
+                                        )
 
             enode_.equation_type = {**self.equation_type}
 
@@ -239,14 +727,15 @@ class EquationNode:
             # other_obj is another ENODE.
 
             enode_ = self.__class__(
-                                name="-".join([self.name, other_obj.name]), 
-                                symbolic_object=self.symbolic_object-other_obj.symbolic_object, 
-                                symbolic_map={**self.symbolic_map, **other_obj.symbolic_map},
-                                variable_map={**self.variable_map, **other_obj.variable_map}, 
-                                unit_object=self.unit_object-other_obj.unit_object,
-                                latex_text="-".join([self.latex_text,other_obj.latex_text]),                  
-                                repr_symbolic=self.repr_symbolic-other_obj.repr_symbolic
-                                )
+                                symbolic_object=self.symbolic_object-other_obj.symbolic_object,
+                                symbolic_map=SymbolMap.union(self.symbolic_map, other_obj.symbolic_map),
+                                variable_map=SymbolMap.union(self.variable_map, other_obj.variable_map),
+                                unit_object=self.unit_object-other_obj.unit_object
+                            )._setOperation((self, other_obj),
+                                            operator.sub,
+                                            [self, "-", other_obj],
+                                            [self, "-", other_obj]
+                                            )
 
             enode_.equation_type = self._checkEquationTypePrecedence(self.equation_type, other_obj.equation_type)
 
@@ -255,14 +744,15 @@ class EquationNode:
         elif isinstance(other_obj, int) or isinstance(other_obj, float):
 
             enode_ = self.__class__(
-                            name="-".join([self.name, str(other_obj)]), 
                             symbolic_object=self.symbolic_object-other_obj,
-                            symbolic_map={**self.symbolic_map},
-                            variable_map={**self.variable_map}, 
-                            unit_object=self.unit_object, 
-                            latex_text=self.latex_text+"-"+str(other_obj),
-                            repr_symbolic=self.repr_symbolic-other_obj
-                                )
+                            symbolic_map=self.symbolic_map,
+                            variable_map=self.variable_map,
+                            unit_object=self.unit_object
+                        )._setOperation((self, other_obj),
+                                        operator.sub,
+                                        [self, "-"+str(other_obj)],
+                                        [self, "-"+str(other_obj)]
+                                        )
 
             enode_.equation_type = {**self.equation_type}
 
@@ -307,14 +797,15 @@ class EquationNode:
             # other_obj is another ENODE.
 
             enode_ = self.__class__(
-                                name="*".join([self.name, other_obj.name]), 
-                                symbolic_object=self.symbolic_object*other_obj.symbolic_object, 
-                                symbolic_map={**self.symbolic_map, **other_obj.symbolic_map},
-                                variable_map={**self.variable_map, **other_obj.variable_map}, 
-                                unit_object=self.unit_object*other_obj.unit_object,
-                                latex_text="*".join([self.latex_text,other_obj.latex_text]),                  
-                                repr_symbolic=self.repr_symbolic*other_obj.repr_symbolic                                
-                                )
+                                symbolic_object=self.symbolic_object*other_obj.symbolic_object,
+                                symbolic_map=SymbolMap.union(self.symbolic_map, other_obj.symbolic_map),
+                                variable_map=SymbolMap.union(self.variable_map, other_obj.variable_map),
+                                unit_object=self.unit_object*other_obj.unit_object
+                            )._setOperation((self, other_obj),
+                                            operator.mul,
+                                            [self, "*", other_obj],
+                                            [self, "*", other_obj]
+                                            )
 
             if other_obj.variable_map == {}: 
 
@@ -337,14 +828,15 @@ class EquationNode:
         elif isinstance(other_obj, int) or isinstance(other_obj, float):
 
             enode_ = self.__class__(
-                            name="*".join([self.name, str(other_obj)]), 
                             symbolic_object=self.symbolic_object*other_obj,
-                            symbolic_map={**self.symbolic_map},
-                            variable_map={**self.variable_map}, 
-                            unit_object=self.unit_object, 
-                            latex_text=self.latex_text+"*"+str(other_obj),
-                            repr_symbolic=self.repr_symbolic*other_obj
-                                )
+                            symbolic_map=self.symbolic_map,
+                            variable_map=self.variable_map,
+                            unit_object=self.unit_object
+                        )._setOperation((self, other_obj),
+                                        operator.mul,
+                                        [self, "*"+str(other_obj)],
+                                        [self, "*"+str(other_obj)]
+                                        )
 
             enode_.equation_type = {**self.equation_type}
 
@@ -356,14 +848,15 @@ class EquationNode:
 
 
             enode_ = self.__class__(
-                            name="*".join([self.name, str(other_obj)]), 
                             symbolic_object=self.symbolic_object*other_obj,
-                            symbolic_map={**other_obj.symbolic_map},
-                            variable_map={**other_obj.variable_map}, 
-                            unit_object=self.unit_object*other_obj.unit_object, 
-                            latex_text=self.latex_text+"*"+str(other_obj),
-                            repr_symbolic=self.repr_symbolic*other_obj
-                    )
+                            symbolic_map=other_obj.symbolic_map,
+                            variable_map=other_obj.variable_map,
+                            unit_object=self.unit_object*other_obj.unit_object
+                        )._setOperation((self, other_obj),
+                                        operator.mul,
+                                        [self, "*"+str(other_obj)],
+                                        [self, "*"+str(other_obj)]
+                                        )
 
             enode_.equation_type = {**other_obj.equation_type}
 
@@ -408,14 +901,15 @@ class EquationNode:
             # other_obj is another ENODE.
 
             enode_ = self.__class__(
-                                name="/".join([self.name, other_obj.name]), 
-                                symbolic_object=self.symbolic_object/other_obj.symbolic_object, 
-                                symbolic_map={**self.symbolic_map, **other_obj.symbolic_map},
-                                variable_map={**self.variable_map, **other_obj.variable_map}, 
-                                unit_object=self.unit_object/other_obj.unit_object,
-                                latex_text="\\frac{"+self.latex_text+"}{"+other_obj.latex_text+"}",             
-                                repr_symbolic=self.repr_symbolic/other_obj.repr_symbolic       
-                                )
+                                symbolic_object=self.symbolic_object/other_obj.symbolic_object,
+                                symbolic_map=SymbolMap.union(self.symbolic_map, other_obj.symbolic_map),
+                                variable_map=SymbolMap.union(self.variable_map, other_obj.variable_map),
+                                unit_object=self.unit_object/other_obj.unit_object
+                            )._setOperation((self, other_obj),
+                                            operator.truediv,
+                                            [self, "/", other_obj],
+                                            ["\\frac{", self, "}{", other_obj, "}"]
+                                            )
 
             if other_obj.variable_map == {}: 
 
@@ -438,14 +932,15 @@ class EquationNode:
         elif isinstance(other_obj, int) or isinstance(other_obj, float):
 
             enode_ = self.__class__(
-                        name="/".join([self.name, str(other_obj)]),
                         symbolic_object=self.symbolic_object/other_obj,
-                        symbolic_map={**self.symbolic_map},
-                        variable_map={**self.variable_map},
-                        unit_object=self.unit_object,
-                        latex_text="\\frac{"+self.latex_text+"}{"+str(other_obj)+"}",
-                        repr_symbolic=self.repr_symbolic/other_obj
-                        )
+                        symbolic_map=self.symbolic_map,
+                        variable_map=self.variable_map,
+                        unit_object=self.unit_object
+                    )._setOperation((self, other_obj),
+                                    operator.truediv,
+                                    [self, "/"+str(other_obj)],
+                                    ["\\frac{", self, "}{"+str(other_obj)+"}"]
+                                    )
 
             enode_.equation_type = {**self.equation_type}
 
@@ -456,14 +951,15 @@ class EquationNode:
             #Current ENODE is a specified quantity and the other is NOT
 
             enode_ = self.__class__(
-                            name="/".join([self.name, str(other_obj)]), 
                             symbolic_object=self.symbolic_object/other_obj,
-                            symbolic_map={**other_obj.symbolic_map},
-                            variable_map={**other_obj.variable_map}, 
-                            unit_object=self.unit_object/other_obj.unit_object,
-                            latex_text="\\frac{"+self.latex_text+"}{"+str(other_obj)+"}",
-                            repr_symbolic=self.repr_symbolic/other_obj
-                    )
+                            symbolic_map=other_obj.symbolic_map,
+                            variable_map=other_obj.variable_map,
+                            unit_object=self.unit_object/other_obj.unit_object
+                        )._setOperation((self, other_obj),
+                                        operator.truediv,
+                                        [self, "/"+str(other_obj)],
+                                        ["\\frac{", self, "}{"+str(other_obj)+"}"]
+                                        )
 
             enode_.equation_type = {**other_obj.equation_type}
 
@@ -542,14 +1038,15 @@ class EquationNode:
                 #other_obj is dimensionless
 
                 enode_ = self.__class__(
-                                    name="**".join([self.name, other_obj.name]),
                                     symbolic_object=self.symbolic_object**other_obj.symbolic_object,
-                                    symbolic_map={**self.symbolic_map, **other_obj.symbolic_map},
-                                    variable_map={**self.variable_map, **other_obj.variable_map},
-                                    unit_object=self.unit_object**other_obj.unit_object,
-                                    latex_text=self.latex_text+"^"+other_obj.latex_text,             
-                                    repr_symbolic=self.repr_symbolic**other_obj.repr_symbolic   
-                                    )
+                                    symbolic_map=SymbolMap.union(self.symbolic_map, other_obj.symbolic_map),
+                                    variable_map=SymbolMap.union(self.variable_map, other_obj.variable_map),
+                                    unit_object=self.unit_object**other_obj.unit_object
+                                )._setOperation((self, other_obj),
+                                                operator.pow,
+                                                [self, "**", other_obj],
+                                                [self, "^", other_obj]
+                                                )
 
                 enode_.equation_type = self._checkEquationTypePrecedence(self.equation_type, {'is_linear':False, 'is_nonlinear':True, 'is_differential':False})
 
@@ -562,14 +1059,15 @@ class EquationNode:
         elif isinstance(other_obj, int) or isinstance(other_obj, float):
 
             enode_ = self.__class__(
-                            name="**".join([self.name, str(other_obj)]),
                             symbolic_object=self.symbolic_object**other_obj,
-                            symbolic_map={**self.symbolic_map},
-                            variable_map={**self.variable_map},
-                            unit_object=self.unit_object**other_obj,
-                            latex_text=self.latex_text+"^"+str(other_obj),
-                            repr_symbolic=self.repr_symbolic**other_obj
-                            )
+                            symbolic_map=self.symbolic_map,
+                            variable_map=self.variable_map,
+                            unit_object=self.unit_object**other_obj
+                        )._setOperation((self, other_obj),
+                                        operator.pow,
+                                        [self, "**"+str(other_obj)],
+                                        [self, "^"+str(other_obj)]
+                                        )
 
             enode_.equation_type = self._checkEquationTypePrecedence(self.equation_type, {'is_linear':False, 'is_nonlinear':True, 'is_differential':False})
 
@@ -0,0 +1,143 @@
+#coding:utf-8
+
+"""
+Define the vectorised Rachford-Rice flash, which solves the phase split of isothermal vapour-liquid flashes from their feed compositions and equilibrium ratios (K-values), for arrays of flashes at once.
+
+The Rachford-Rice function of each flash is monotonically decreasing in the vapour fraction, so its root is found by Newton iterations (with the analytic derivative) safeguarded by one bracket, which is narrowed at each iteration and used for bisection whenever the Newton step leaves it. Flashes outside the two-phase region (subcooled liquids and superheated vapours) are detected beforehand, through the signs of the function at the ends of the bracket [0, 1].
+"""
+
+import numpy as np
+
+from .error_definitions import UnexpectedValueError, NumericalError
+
+
+def rachfordRiceResidual(beta, z, K):
+
+    """
+    Return the Rachford-Rice function and its derivative with respect to the vapour fraction
+
+    :param numpy.ndarray beta:
+        Vapour fractions, with shape (number of flashes,)
+
+    :param numpy.ndarray z:
+        Feed molar fractions, with shape (number of flashes, number of components)
+
+    :param numpy.ndarray K:
+        Equilibrium ratios, with shape (number of flashes, number of components)
+
+    :rtype tuple(numpy.ndarray, numpy.ndarray):
+    """
+
+    K_minus_1 = K - 1.
+
+    denominator_ = 1. + beta[:, None]*K_minus_1
+
+    residual_ = np.sum(z*K_minus_1/denominator_, axis=1)
+
+    derivative_ = -np.sum(z*K_minus_1**2/denominator_**2, axis=1)
+
+    return residual_, derivative_
+
+def rachfordRice(z, K, tolerance=1e-12, maximum_iterations=100):
+
+    """
+    Solve the Rachford-Rice equation for one flash or for arrays of flashes at once
+
+    :param numpy.ndarray z:
+        Feed molar fractions, with shape (number of components,) or (number of flashes, number of components)
+
+    :param numpy.ndarray K:
+        Equilibrium ratios (y/x), with the shape of z (or broadcastable to it)
+
+    :param float tolerance:
+        Absolute tolerance of the vapour fractions. Defaults to 1e-12
+
+    :param int maximum_iterations:
+        Maximum number of iterations. Defaults to 100
+
+    :return:
+        Vapour fractions, liquid molar fractions and vapour molar fractions (with the leading dimension dropped for one flash). For single-phase flashes, the fractions of the incipient phase are not normalised
+    :rtype tuple(numpy.ndarray, numpy.ndarray, numpy.ndarray):
+    """
+
+    z = np.asarray(z, dtype=np.float64)
+
+    is_single = z.ndim == 1
+
+    z = np.atleast_2d(z)
+
+    K = np.broadcast_to(np.asarray(K, dtype=np.float64), z.shape)
+
+    if z.ndim != 2 or np.any(z < 0.) or np.any(~(K > 0.)):
+
+        raise UnexpectedValueError("arrays of non-negative molar fractions and positive K-values")
+
+    z = z/np.sum(z, axis=1, keepdims=True)
+
+    number_of_flashes = z.shape[0]
+
+    # Single-phase flashes: f(0) <= 0 (subcooled liquid) or f(1) >= 0 (superheated vapour)
+
+    f_0 = np.sum(z*(K - 1.), axis=1)
+
+    f_1 = np.sum(z*(1. - 1./K), axis=1)
+
+    beta = np.where(f_0 <= 0., 0., 1.)
+
+    active_ = np.flatnonzero((f_0 > 0.) & (f_1 < 0.))
+
+    if active_.size > 0:
+
+        z_a = z[active_]
+
+        K_a = K[active_]
+
+        # Bracket of the root within (0, 1), narrowed by the poles of the function (Whitson and Michelsen)
+
+        lower_ = np.maximum(0., 1./(1. - np.max(K_a, axis=1)))
+
+        upper_ = np.minimum(1., 1./(1. - np.min(K_a, axis=1)))
+
+        beta_a = 0.5*(lower_ + upper_)
+
+        converged_ = np.zeros(active_.size, dtype=bool)
+
+        for iteration_i in range(maximum_iterations):
+
+            residual_, derivative_ = rachfordRiceResidual(beta_a, z_a, K_a)
+
+            # The function is decreasing, so positive residuals lie left of the root
+
+            lower_ = np.where(residual_ > 0., beta_a, lower_)
+
+            upper_ = np.where(residual_ > 0., upper_, beta_a)
+
+            newton_ = beta_a - residual_/derivative_
+
+            outside_ = ~((newton_ > lower_) & (newton_ < upper_))
+
+            new_beta = np.where(outside_, 0.5*(lower_ + upper_), newton_)
+
+            converged_ = (np.abs(new_beta - beta_a) <= tolerance) | (residual_ == 0.)
+
+            beta_a = new_beta
+
+            if np.all(converged_):
+
+                break
+
+        if not np.all(converged_):
+
+            raise NumericalError("Rachford-Rice iterations not converged for %d of %d flashes after %d iterations" % (np.count_nonzero(~converged_), number_of_flashes, maximum_iterations))
+
+        beta[active_] = beta_a
+
+    x = z/(1. + beta[:, None]*(K - 1.))
+
+    y = K*x
+
+    if is_single is True:
+
+        return beta[0], x[0], y[0]
+
+    return beta, x, y
@@ -1,24 +1,29 @@
-
 """
 Define ParameterArray class
 """
 
 from .parameter import Parameter
-from .error_definitions import UnexpectedValueError, DimensionalCoherenceError
+from .quantity_array import QuantityArray, _ArrayElement
+
 
-class ParameterArray(Parameter):
+class ArrayParameter(_ArrayElement, Parameter):
 
     """
-    ParameterArray class, which aggregates all the functionality for the Parameter objects, but provide array-like capabilities
+    Parameter object that is one element of a ParameterArray, storing its value in the array of values of the ParameterArray
     """
 
-    def __init__(self, name, size, units, description="", value=0, latex_text="", is_specified=False, owner_model_name=""):
+    pass
 
-        if isinstance(value, list) and len(value) != size:
 
-            raise UnexpectedValueError("Monothonic value for ParameterArray, or a list of values with equivalent size of the ParameterArray")
+class ParameterArray(QuantityArray):
+
+    """
+    ParameterArray class, which aggregates Parameter objects with array-like capabilities. The values of the elements are stored contiguously (values atribute), and each element (ArrayParameter) is one Parameter object.
+    """
 
-        super().__init__(name, units, description, value, latex_text, owner_model_name)
+    element_class = ArrayParameter
+
+    def __init__(self, name, size, units, description="", value=0, latex_text="", is_specified=False, owner_model_name=""):
 
         """
         Initial definition.
@@ -35,35 +40,15 @@ class ParameterArray(Parameter):
         :param str description:
             Description for the present parameter. Defauls to ""
 
-        """
-
-        self._size = size
-
-        self.array = np.zeros(size, dtype=object)
+        :param [float, list(float)] value:
+            Value for all the elements, or list of values (one for each element). Defaults to 0
 
-        if isinstance(value, list):
-
-            for i in range(size):
-
-                self.array[i] = Parameter(self.name+"-"+str(i), self.units, self.description, self.value[i], self.latex_text, self.owner_model_name)
-
-        else:
-
-            for i in range(size):
-
-                self.array[i] = Parameter(self.name+"-"+str(i), self.units, self.description, self.value, self.latex_text, self.owner_model_name)
-
-
-    def __getitem__(self, id):
-
-        return self.array[id]
-
-    @property
-    def size(self):
+        :param bool is_specified:
+            If the elements are specified. Defaults to False
+        """
 
-        return  self.array.size
+        super().__init__(name, size, units, description, value, latex_text, owner_model_name, is_specified=is_specified)
 
-    @size.setter
-    self size(x):
+    def _createSlot(self, slot_name):
 
-        raise ValueError("Cannot directly set an atribute for an ParameterArray object.")
\ No newline at end of file
+        return Parameter(slot_name, self.units, self.description, 0., self.latex_text)
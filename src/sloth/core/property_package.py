@@ -1,11 +1,313 @@
 #coding:utf-8
 
 """
-Define ProperyPackage class, which holds the information about the species involved in the simulation, and act as a container for their properties
+Define ProperyPackage class, which holds the information about the species involved in the simulation, and act as a container for their properties.
+
+The properties of the species are served through PropertyBundle objects, one for each species and state (T, P), which evaluate each property through thermo once and keep it. The bundles are memoised in one bounded LRU cache (PropertyCache), shared by all the PropertyPackage objects by default, so repeated property queries across units and iterations do not evaluate the thermo correlations again.
+
+Properties may also be tabulated over one grid of states (see PropertyPackage.tabulate and PropertyTable), being then served through spline interpolation within the grid.
+
+Temperature-dependent correlations of the properties (see PropertyPackage.getCorrelation) are served as symbolic expressions, or evaluated for arrays of temperatures, from which the ideal vapour-liquid flashes of the species are solved by the vectorised Rachford-Rice sub-solver (see PropertyPackage.flash).
+
+The thermo.chemical.Chemical objects of the species are constructed once per process and shared among the PropertyPackage objects (flyweights, see getChemical), optionally being stored on disk for later runs.
 """
 
+import os
+import re
+import copy
+import pickle
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
 import thermo
 from .error_definitions import *
+from .property_table import PropertyTable
+from .flash import rachfordRice
+from .equation_operators import DIPPR100, DIPPR101, Antoine
+from .template_units import J, kg, mol, K, m, Pa
+
+
+class PropertyBundle:
+
+    """
+    Properties of one species at one state (T, P). Each property (any atribute of thermo.chemical.Chemical, eg: Cp, rho, MW) is evaluated through thermo (or through the PropertyTable given, for the properties tabulated) upon its first access, and kept afterwards.
+    """
+
+    def __init__(self, species, chemical, T, P, table=None):
+
+        """
+        Instantiate PropertyBundle
+
+        :ivar str species:
+            Name of the species
+
+        :ivar float T:
+            Temperature of the state
+
+        :ivar float P:
+            Pressure of the state
+
+        :param thermo.chemical.Chemical chemical:
+            Chemical object of the species, used for the evaluation of the properties
+
+        :param PropertyTable table:
+            Table of the properties of the species, containing the state. Defaults to None
+        """
+
+        self.species = species
+
+        self.T = T
+
+        self.P = P
+
+        self._chemical = chemical
+
+        self._table = table
+
+        self._values = {}
+
+    def __getattr__(self, name):
+
+        if name.startswith('_'):
+
+            raise AttributeError(name)
+
+        values_ = self._values
+
+        if name not in values_ and self._table is not None and name in self._table.properties:
+
+            values_[name] = float(self._table.evaluate(name, self.T, self.P if self._table.P_grid is not None else None))
+
+        if name not in values_:
+
+            chemical_ = self._chemical
+
+            # The Chemical object may be shared among bundles (and packages), thus its state is set before each evaluation
+
+            if chemical_.T != self.T or chemical_.P != self.P:
+
+                chemical_.calculate(self.T, self.P)
+
+            values_[name] = getattr(chemical_, name)
+
+        return values_[name]
+
+
+class PropertyCache:
+
+    """
+    Bounded LRU cache of PropertyBundle objects, keyed on the species and the state (T, P) rounded to the tolerances given
+    """
+
+    def __init__(self, maxsize=4096, temperature_tolerance=1e-6, pressure_tolerance=1e-3):
+
+        """
+        Instantiate PropertyCache
+
+        :ivar int maxsize:
+            Maximum number of bundles kept. The least recently used bundles are discarded. Defaults to 4096
+
+        :ivar float temperature_tolerance:
+            Resolution of the temperatures of the keys, below which states share the same bundle. Defaults to 1e-6
+
+        :ivar float pressure_tolerance:
+            Resolution of the pressures of the keys, below which states share the same bundle. Defaults to 1e-3
+
+        :ivar int hits:
+            Number of queries served by one bundle already kept
+
+        :ivar int misses:
+            Number of queries for which one bundle was created
+        """
+
+        if not isinstance(maxsize, int) or maxsize < 1:
+
+            raise UnexpectedValueError("int (positive)")
+
+        if temperature_tolerance <= 0. or pressure_tolerance <= 0.:
+
+            raise UnexpectedValueError("float (positive)")
+
+        self.maxsize = maxsize
+
+        self.temperature_tolerance = temperature_tolerance
+
+        self.pressure_tolerance = pressure_tolerance
+
+        self.hits = 0
+
+        self.misses = 0
+
+        self._bundles = OrderedDict()
+
+    def __len__(self):
+
+        return len(self._bundles)
+
+    def getBundle(self, species, chemical, T, P):
+
+        """
+        Return the PropertyBundle of one species at one state, creating it if absent
+
+        :param str species:
+            Name of the species
+
+        :param thermo.chemical.Chemical chemical:
+            Chemical object of the species
+
+        :param float T:
+            Temperature
+
+        :param float P:
+            Pressure
+
+        :rtype PropertyBundle:
+        """
+
+        key_ = (species, round(T/self.temperature_tolerance), round(P/self.pressure_tolerance))
+
+        bundle_ = self._bundles.get(key_)
+
+        if bundle_ is not None:
+
+            self.hits += 1
+
+            self._bundles.move_to_end(key_)
+
+            return bundle_
+
+        self.misses += 1
+
+        bundle_ = PropertyBundle(species, chemical, T, P)
+
+        self._bundles[key_] = bundle_
+
+        if len(self._bundles) > self.maxsize:
+
+            self._bundles.popitem(last=False)
+
+        return bundle_
+
+    def getHitRate(self):
+
+        """
+        Return the fraction of the queries served by bundles already kept
+
+        :rtype float:
+        """
+
+        queries_ = self.hits + self.misses
+
+        return self.hits/queries_ if queries_ > 0 else 0.
+
+    def getStats(self):
+
+        """
+        Return the statistics of the current cache
+
+        :rtype dict:
+        """
+
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.getHitRate(), 'size': len(self._bundles), 'maxsize': self.maxsize}
+
+    def clear(self):
+
+        """
+        Discard all the bundles and reset the statistics
+        """
+
+        self._bundles.clear()
+
+        self.hits = 0
+
+        self.misses = 0
+
+
+# PropertyCache shared by the PropertyPackage objects by default
+
+_property_cache = PropertyCache()
+
+
+def getPropertyCache():
+
+    """
+    Return the PropertyCache shared by the PropertyPackage objects by default
+
+    :rtype PropertyCache:
+    """
+
+    return _property_cache
+
+
+# Chemical objects shared by the PropertyPackage objects, by species
+
+_species_registry = {}
+
+
+def getChemical(species, cache_directory=None):
+
+    """
+    Return the thermo.chemical.Chemical object of one species, constructed only once per process and shared among the PropertyPackage objects. The state (T, P) of the object is not owned by any package, thus it is set before each evaluation (see PropertyBundle).
+
+    :param str species:
+        Name (or any other identifier accepted by thermo) of the species
+
+    :param str cache_directory:
+        Directory in which the Chemical objects are stored (pickled, one file for each species and version of thermo), and from which they are loaded instead of being constructed in later runs. Only trusted directories should be given, as the files are unpickled. Defaults to None
+
+    :rtype thermo.chemical.Chemical:
+    """
+
+    chemical_ = _species_registry.get(species)
+
+    if chemical_ is not None:
+
+        return chemical_
+
+    path_ = None
+
+    if cache_directory is not None:
+
+        path_ = os.path.join(cache_directory, "%s-thermo-%s.pkl" % (re.sub(r'[^\w.-]', '_', species), thermo.__version__))
+
+        if os.path.isfile(path_):
+
+            with open(path_, 'rb') as file_:
+
+                chemical_ = pickle.load(file_)
+
+    if chemical_ is None:
+
+        chemical_ = thermo.chemical.Chemical(species)
+
+        if path_ is not None:
+
+            os.makedirs(cache_directory, exist_ok=True)
+
+            # Written to one temporary file first, so concurrent runs never read one partial file
+
+            descriptor_, temporary_path = tempfile.mkstemp(dir=cache_directory, suffix='.tmp')
+
+            with os.fdopen(descriptor_, 'wb') as file_:
+
+                pickle.dump(chemical_, file_)
+
+            os.replace(temporary_path, path_)
+
+    _species_registry[species] = chemical_
+
+    return chemical_
+
+
+def clearSpeciesRegistry():
+
+    """
+    Discard the Chemical objects shared by the PropertyPackage objects
+    """
+
+    _species_registry.clear()
+
 
 class PropertyPackage:
 
@@ -13,12 +315,30 @@ class PropertyPackage:
     Class that defines the PropertyPackage object, which constains information about the species involved in the simulation and their properties
     """
 
-    def __init__(self, phases=1, phase_names=['water'], ws=[.1], zs=None):
+    def __init__(self, phases=1, phase_names=['water'], ws=[.1], zs=None, property_cache=None, species_cache_directory=None):
 
         """
         Instantiate PropertyPackage
+
+        :ivar PropertyCache property_cache:
+            Cache of the PropertyBundle objects served by the current package. Defaults to None, for which the shared cache (see getPropertyCache) is used. If False, the thermo.chemical.Chemical objects are served instead, being calculated at each call of calculate
+
+        :param str species_cache_directory:
+            Directory in which the Chemical objects of the species are stored on disk (see getChemical). Defaults to None
         """
 
+        if property_cache is None:
+
+            property_cache = _property_cache
+
+        self.property_cache = property_cache if property_cache is not False else None
+
+        self.tables = {}
+
+        self._table_bundles = {}
+
+        self._correlations = {}
+
         self.number_of_phases = phases
 
         self.phase_names = phase_names
@@ -27,7 +347,15 @@ class PropertyPackage:
 
         self.P = 101325
 
-        self.phases = {phase_i: thermo.chemical.Chemical(phase_i, self.T, self.P) for phase_i in phase_names if phase_i is not None}
+        # The Chemical objects are shared among the packages, except for packages serving them directly (whose states are set by calculate), which get private copies
+
+        self.phases = {phase_i: getChemical(phase_i, species_cache_directory) for phase_i in phase_names if phase_i is not None}
+
+        if self.property_cache is None:
+
+            self.phases = {phase_i: copy.deepcopy(chemical_i) for (phase_i, chemical_i) in self.phases.items()}
+
+            _ = [chemical_i.calculate(self.T, self.P) for chemical_i in self.phases.values()]
 
         self.ws = ws
 
@@ -110,13 +438,422 @@ class PropertyPackage:
 
             phase_name = list(self.phases.keys())[-1]
 
-        return self.phases[phase_name]
+        table_ = self.tables.get(phase_name)
+
+        if table_ is not None and table_.contains(self.T, self.P):
+
+            bundle_ = self._table_bundles.get(phase_name)
+
+            if bundle_ is None or bundle_.T != self.T or bundle_.P != self.P:
+
+                bundle_ = PropertyBundle(phase_name, self.phases[phase_name], self.T, self.P, table_)
+
+                self._table_bundles[phase_name] = bundle_
+
+            return bundle_
+
+        if self.property_cache is None:
+
+            return self.phases[phase_name]
+
+        return self.property_cache.getBundle(phase_name, self.phases[phase_name], self.T, self.P)
+
+    def tabulate(self, T_grid, P_grid=None, properties=['Cp', 'rho', 'mu', 'k', 'H'], phase_names=None, rtol=1e-4, check_tolerance=True, directory=None):
+
+        """
+        Tabulate properties of the species over one grid of states, sampling thermo only once. Within the grid, the properties tabulated are then served through spline interpolation (see PropertyTable), and the others through thermo.
+
+        :param list(float) T_grid:
+            Temperatures of the grid, in increasing order
+
+        :param list(float) P_grid:
+            Pressures of the grid, in increasing order. Defaults to None, for which the properties are tabulated over the temperatures only, at the current pressure of the package
+
+        :param list(str) properties:
+            Names of the properties tabulated. Defaults to ['Cp', 'rho', 'mu', 'k', 'H']
+
+        :param list(str) phase_names:
+            Species tabulated. Defaults to None, for which all the species are tabulated
+
+        :param float rtol:
+            Relative tolerance of the check of the splines against thermo. Defaults to 1e-4
+
+        :param bool check_tolerance:
+            If True, check the splines of the tables sampled against thermo at the midpoints of the grid, raising NumericalError beyond rtol. Defaults to True
+
+        :param str directory:
+            Directory in which the tables are stored (one <species>.npz file for each species), and from which tables matching the grid and the properties are loaded instead of being sampled. Defaults to None
+
+        :return:
+            Tables by species
+        :rtype dict:
+        """
+
+        for phase_i in (phase_names if phase_names is not None else list(self.phases.keys())):
+
+            path_i = os.path.join(directory, "%s.npz" % phase_i) if directory is not None else None
+
+            table_i = None
+
+            if path_i is not None and os.path.isfile(path_i):
+
+                table_i = PropertyTable.load(path_i)
+
+                if not table_i.matches(phase_i, properties, T_grid, P_grid, self.P):
+
+                    table_i = None
+
+            if table_i is None:
+
+                table_i = PropertyTable(phase_i, properties, T_grid, P_grid, self.P, chemical=self.phases[phase_i])
+
+                if check_tolerance is True:
+
+                    table_i.checkTolerance(self.phases[phase_i], rtol)
+
+                if path_i is not None:
+
+                    table_i.save(path_i)
+
+            self.tables[phase_i] = table_i
+
+            self._table_bundles.pop(phase_i, None)
+
+        return {phase_i: self.tables[phase_i] for phase_i in self.tables}
+
+    def evaluate(self, phase_name, name, T, P=None, dT=0, dP=0):
+
+        """
+        Evaluate one tabulated property (or one of its derivatives) of one species for arrays of states at once (see PropertyTable.evaluate)
+
+        :param str phase_name:
+            Name of the species ("*" for the last one)
+
+        :param str name:
+            Name of the property
+
+        :rtype [float, numpy.ndarray]:
+        """
+
+        if phase_name == "*":
+
+            phase_name = list(self.phases.keys())[-1]
+
+        if phase_name not in self.tables:
+
+            raise AbsentRequiredObjectError("table of properties for %s (see PropertyPackage.tabulate)" % phase_name)
+
+        return self.tables[phase_name].evaluate(name, T, P, dT, dP)
+
+    def getCorrelationCoefficients(self, phase_name, property_name, T_range=(273.15, 373.15), state='l', degree=4, rtol=1e-2):
+
+        """
+        Return the coefficients of the temperature-dependent correlation of one property of one species, taken from thermo. The correlations of thermo with closed forms (DIPPR-100 polynomials of ideal gas heat capacities, Antoine and DIPPR-101 vapour pressures) are checked against the property evaluated through thermo over the range of temperatures given, and the closest one is used if it lies within rtol. Otherwise, one DIPPR-100 polynomial is fitted to the property over the range (heat capacities and densities), raising NumericalError if no correlation lies within rtol.
+
+        :param str phase_name:
+            Name of the species ("*" for the last one)
+
+        :param str property_name:
+            Name of the property: 'Cp' (J/(kg*K)), 'Cpm' (J/(mol*K)), 'rho' (kg/m**3, liquid only) or 'Psat' (Pa)
+
+        :param tuple(float) T_range:
+            Range of temperatures (K) over which the correlation is used. Defaults to (273.15, 373.15)
+
+        :param str state:
+            State of aggregation ('l' or 'g') of the heat capacities. Defaults to 'l'
+
+        :param int degree:
+            Degree of the polynomials fitted. Defaults to 4
+
+        :param float rtol:
+            Relative tolerance of the correlations. Defaults to 1e-2
+
+        :return:
+            Form of the correlation ('DIPPR100', 'DIPPR101' or 'Antoine'), its coefficients (as keyword arguments of the corresponding equation operator) and the Unit of the property
+        :rtype tuple(str, dict, Unit):
+        """
+
+        if phase_name == "*":
+
+            phase_name = list(self.phases.keys())[-1]
+
+        key_ = (phase_name, property_name, tuple(T_range), state, degree, rtol)
+
+        if key_ in self._correlations:
+
+            return self._correlations[key_]
+
+        chemical_ = self.phases[phase_name]
+
+        T_ = np.linspace(T_range[0], T_range[1], 8*(degree + 1))
+
+        # Closed forms available in thermo, as (form, coefficients, values over T_)
+
+        candidates_ = []
+
+        if property_name == 'Psat':
+
+            units_ = Pa
+
+            reference_ = chemical_.VaporPressure
+
+            antoine_ = getattr(reference_, 'Antoine_parameters', {}).get('ANTOINE_POLING')
+
+            dippr_ = getattr(reference_, 'DIPPR101_parameters', {}).get('DIPPR_PERRY_8E')
+
+            if antoine_ is not None:
+
+                coefficients_ = {name_i: antoine_[name_i] for name_i in ['A', 'B', 'C', 'base']}
+
+                candidates_.append(('Antoine', coefficients_, coefficients_['base']**(coefficients_['A'] - coefficients_['B']/(T_ + coefficients_['C']))))
+
+            if dippr_ is not None:
+
+                coefficients_ = {name_i: dippr_[name_i] for name_i in ['A', 'B', 'C', 'D', 'E']}
+
+                candidates_.append(('DIPPR101', coefficients_, np.exp(coefficients_['A'] + coefficients_['B']/T_ + coefficients_['C']*np.log(T_) + coefficients_['D']*T_**coefficients_['E'])))
+
+        elif property_name in ['Cp', 'Cpm']:
+
+            # Heat capacities from thermo are molar (J/(mol*K)), and converted to mass basis through the molar mass (g/mol)
+
+            scale_ = 1e3/chemical_.MW if property_name == 'Cp' else 1.
+
+            units_ = J/(kg*K) if property_name == 'Cp' else J/(mol*K)
+
+            heat_capacity_ = chemical_.HeatCapacityGas if state == 'g' else chemical_.HeatCapacityLiquid
+
+            reference_ = lambda T: scale_*heat_capacity_(T)
+
+            polynomial_ = getattr(heat_capacity_, 'DIPPR100_parameters', {}).get('POLING_POLY')
+
+            if polynomial_ is not None:
+
+                coefficients_ = [scale_*polynomial_.get(name_i, 0.) for name_i in ['A', 'B', 'C', 'D', 'E']]
+
+                candidates_.append(('DIPPR100', {'coefficients': coefficients_}, np.polynomial.polynomial.polyval(T_, coefficients_)))
+
+        elif property_name == 'rho':
+
+            # Liquid molar volumes from thermo (m**3/mol), converted to mass densities through the molar mass (g/mol)
+
+            units_ = kg/(m**3)
+
+            P_ = self.P
+
+            reference_ = lambda T: 1e-3*chemical_.MW/chemical_.VolumeLiquid(T, P_)
+
+        else:
+
+            raise UnexpectedValueError("property name ('Cp', 'Cpm', 'rho', 'Psat')")
+
+        values_ = np.array([reference_(T_i) for T_i in T_], dtype=np.float64)
+
+        if not np.all(np.isfinite(values_)):
+
+            raise NumericalError("%s of %s undefined over %s K" % (property_name, phase_name, T_range))
+
+        if property_name != 'Psat':
+
+            coefficients_ = np.polynomial.Polynomial.fit(T_, values_, degree).convert().coef
+
+            candidates_.append(('DIPPR100', {'coefficients': [float(c_k) for c_k in coefficients_]}, np.polynomial.polynomial.polyval(T_, coefficients_)))
+
+        deviations_ = [np.max(np.abs(candidate_i[2] - values_)/np.abs(values_)) for candidate_i in candidates_]
+
+        if len(candidates_) == 0 or min(deviations_) > rtol:
+
+            raise NumericalError("No correlation of %s for %s within rtol=%g over %s K. Narrow the range or raise the degree." % (property_name, phase_name, rtol, T_range))
+
+        form_, coefficients_, _ = candidates_[int(np.argmin(deviations_))]
+
+        self._correlations[key_] = (form_, coefficients_, units_)
+
+        return self._correlations[key_]
+
+    def getCorrelation(self, phase_name, property_name, T, integral=False, **kwargs):
+
+        """
+        Return the temperature-dependent correlation of one property of one species as one EquationNode (see equation_operators.DIPPR100, DIPPR101 and Antoine), which is compiled into the kernels of the equations with no calls to thermo. The coefficients are given by getCorrelationCoefficients.
+
+        :param str phase_name:
+            Name of the species ("*" for the last one)
+
+        :param str property_name:
+            Name of the property ('Cp', 'Cpm', 'rho' or 'Psat')
+
+        :param EquationNode T:
+            Temperature (K)
+
+        :param bool integral:
+            If True, return the integral of the correlation with respect to T (polynomial correlations only, eg: sensible enthalpies from heat capacities). Defaults to False
+
+        :param kwargs:
+            Additional arguments of getCorrelationCoefficients (eg: T_range, state)
+
+        :rtype EquationNode:
+        """
+
+        form_, coefficients_, units_ = self.getCorrelationCoefficients(phase_name, property_name, **kwargs)
+
+        if form_ == 'DIPPR100':
+
+            return DIPPR100(T, units=units_, integral=integral, **coefficients_)
+
+        if integral is True:
+
+            raise UnexpectedValueError("polynomial correlation (DIPPR100) for integration")
+
+        if form_ == 'DIPPR101':
+
+            return DIPPR101(T, units=units_, **coefficients_)
+
+        return Antoine(T, units=units_, **coefficients_)
+
+    def evaluateCorrelation(self, phase_name, property_name, T, dT=0, **kwargs):
+
+        """
+        Evaluate the temperature-dependent correlation of one property of one species (see getCorrelationCoefficients), or its first derivative with respect to the temperature, for arrays of temperatures at once, with no calls to thermo
+
+        :param str phase_name:
+            Name of the species ("*" for the last one)
+
+        :param str property_name:
+            Name of the property ('Cp', 'Cpm', 'rho' or 'Psat')
+
+        :param [float, numpy.ndarray] T:
+            Temperatures (K)
+
+        :param int dT:
+            Order of the derivative with respect to the temperature (0 or 1). Defaults to 0
+
+        :param kwargs:
+            Additional arguments of getCorrelationCoefficients (eg: T_range, state)
+
+        :rtype [float, numpy.ndarray]:
+        """
+
+        if dT not in [0, 1]:
+
+            raise UnexpectedValueError("int (0, 1)")
+
+        form_, coefficients_, _ = self.getCorrelationCoefficients(phase_name, property_name, **kwargs)
+
+        T = np.asarray(T, dtype=np.float64)
+
+        if form_ == 'DIPPR100':
+
+            polynomial_ = coefficients_['coefficients']
+
+            return np.polynomial.polynomial.polyval(T, np.polynomial.polynomial.polyder(polynomial_) if dT == 1 else polynomial_)
+
+        c_ = coefficients_
+
+        if form_ == 'DIPPR101':
+
+            values_ = np.exp(c_['A'] + c_['B']/T + c_['C']*np.log(T) + c_['D']*T**c_['E'])
+
+            # Derivatives of the exponential forms, through the derivatives of their logarithms
+
+            return values_*(-c_['B']/T**2 + c_['C']/T + c_['D']*c_['E']*T**(c_['E'] - 1.)) if dT == 1 else values_
+
+        values_ = c_['base']**(c_['A'] - c_['B']/(T + c_['C']))
+
+        return values_*np.log(c_['base'])*c_['B']/(T + c_['C'])**2 if dT == 1 else values_
+
+    def getKValues(self, T=None, P=None, phase_names=None, **kwargs):
+
+        """
+        Return the vapour-liquid equilibrium ratios (K-values) of the species by Raoult's law (K = Psat/P), from their vapour pressure correlations, for arrays of states at once
+
+        :param [float, numpy.ndarray] T:
+            Temperatures (K). Defaults to None, for which the current temperature of the package is used
+
+        :param [float, numpy.ndarray] P:
+            Pressures (Pa), broadcastable to T. Defaults to None, for which the current pressure of the package is used
+
+        :param list(str) phase_names:
+            Species, in the order of the K-values. Defaults to None, for which all the species are used
+
+        :param kwargs:
+            Additional arguments of getCorrelationCoefficients (eg: T_range)
+
+        :return:
+            K-values, with shape (number of states, number of species), or (number of species,) for one state
+        :rtype numpy.ndarray:
+        """
+
+        T = np.asarray(self.T if T is None else T, dtype=np.float64)
+
+        P = np.asarray(self.P if P is None else P, dtype=np.float64)
+
+        T, P = np.broadcast_arrays(T, P)
+
+        phase_names = phase_names if phase_names is not None else list(self.phases.keys())
+
+        return np.stack([self.evaluateCorrelation(phase_i, 'Psat', T, **kwargs)/P for phase_i in phase_names], axis=-1)
+
+    def flash(self, T=None, P=None, zs=None, **kwargs):
+
+        """
+        Solve the isothermal vapour-liquid flash of the species (ideal phases, see getKValues) through the vectorised Rachford-Rice sub-solver (see flash.rachfordRice), for one state or for arrays of states and feeds at once (eg: property sweeps)
+
+        :param [float, numpy.ndarray] T:
+            Temperatures (K). Defaults to None, for which the current temperature of the package is used
+
+        :param [float, numpy.ndarray] P:
+            Pressures (Pa). Defaults to None, for which the current pressure of the package is used
+
+        :param numpy.ndarray zs:
+            Feed molar fractions, in the order of the species, with shape (number of species,) or (number of flashes, number of species). Defaults to None, for which the molar fractions of the package (zs atribute) are used
+
+        :param kwargs:
+            Additional arguments of getCorrelationCoefficients (eg: T_range)
+
+        :return:
+            Vapour fractions, liquid molar fractions and vapour molar fractions
+        :rtype tuple(numpy.ndarray, numpy.ndarray, numpy.ndarray):
+        """
+
+        zs = zs if zs is not None else self.zs
+
+        if zs is None:
+
+            raise AbsentRequiredObjectError("molar fractions of the feed (zs)")
+
+        zs = np.asarray(zs, dtype=np.float64)
+
+        K_ = self.getKValues(T, P, **kwargs)
+
+        if K_.ndim == 1 and zs.ndim == 2:
+
+            K_ = np.broadcast_to(K_, zs.shape)
+
+        elif K_.ndim == 2 and zs.ndim == 1:
+
+            zs = np.broadcast_to(zs, K_.shape)
+
+        return rachfordRice(zs, K_)
 
     def calculate(self, T=298.15, P=101325):
 
         """
         """
 
+        if T < 0 or P < 0:
+
+            raise UnexpectedValueError("float (non-negative)")
+
+        self.T = T
+
+        self.P = P
+
+        if self.property_cache is not None:
+
+            # Properties are evaluated upon their access, through the bundles of the current state
+
+            return
+
         #Update properties of all phases
 
-        _ = [self.phases[i].calculate(T,P) for i in self.phase_names]
\ No newline at end of file
+        _ = [self.phases[i].calculate(T,P) for i in self.phase_names]
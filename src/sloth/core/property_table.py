@@ -0,0 +1,279 @@
+#coding:utf-8
+
+"""
+Define PropertyTable class, which tabulates the properties of one species over one grid of temperatures (and, optionally, pressures), sampling the thermo correlations only once.
+
+The properties and their derivatives are then served through vectorised spline interpolation (cubic, where the grid allows it). The tables may be checked against thermo at the midpoints of the grid, and stored on disk (NumPy .npz files) for reuse across runs.
+"""
+
+import os
+
+import numpy as np
+from scipy.interpolate import CubicSpline, RectBivariateSpline
+
+from .error_definitions import UnexpectedValueError, NumericalError
+
+
+class PropertyTable:
+
+    """
+    Definition of PropertyTable class. Holds the sampled values of the properties of one species and their splines.
+    """
+
+    def __init__(self, species, properties, T_grid, P_grid=None, P=101325., values=None, chemical=None):
+
+        """
+        Instantiate PropertyTable, sampling the properties through thermo if their values are not given
+
+        :ivar str species:
+            Name of the species
+
+        :ivar list(str) properties:
+            Names of the properties tabulated (atributes of thermo.chemical.Chemical, eg: Cp, rho, mu)
+
+        :ivar numpy.ndarray T_grid:
+            Temperatures of the grid, in increasing order
+
+        :ivar numpy.ndarray P_grid:
+            Pressures of the grid, in increasing order. Defaults to None, for which the properties are tabulated over the temperatures only, at the pressure P
+
+        :ivar float P:
+            Pressure of the tables over the temperatures only. Defaults to 101325.
+
+        :param numpy.ndarray values:
+            Values of the properties, with shape (number of properties, number of temperatures[, number of pressures]). Defaults to None, for which they are sampled through chemical
+
+        :param thermo.chemical.Chemical chemical:
+            Chemical object of the species, used for sampling the properties. Defaults to None
+        """
+
+        self.species = species
+
+        self.properties = list(properties)
+
+        self.T_grid = np.asarray(T_grid, dtype=np.float64)
+
+        self.P_grid = np.asarray(P_grid, dtype=np.float64) if P_grid is not None else None
+
+        self.P = float(P)
+
+        for grid_i in [self.T_grid, self.P_grid]:
+
+            if grid_i is not None and (grid_i.ndim != 1 or grid_i.size < 2 or np.any(np.diff(grid_i) <= 0.)):
+
+                raise UnexpectedValueError("sequence of floats (increasing, at least two points)")
+
+        if values is None:
+
+            if chemical is None:
+
+                raise UnexpectedValueError("thermo.chemical.Chemical")
+
+            values = self._sample(chemical, self.T_grid, self.P_grid)
+
+        self.values = np.asarray(values, dtype=np.float64)
+
+        if not np.all(np.isfinite(self.values)):
+
+            raise NumericalError("Properties of %s undefined (or not finite) over the grid: %s" % (self.species, [name_i for (name_i, values_i) in zip(self.properties, self.values) if not np.all(np.isfinite(values_i))]))
+
+        self._splines = {name_i: self._createSpline(values_i) for (name_i, values_i) in zip(self.properties, self.values)}
+
+    def _sample(self, chemical, T_grid, P_grid=None):
+
+        """
+        Sample the properties through thermo over one grid
+
+        :rtype numpy.ndarray:
+        """
+
+        pressures_ = P_grid if P_grid is not None else [self.P]
+
+        # Properties undefined by thermo (None) are stored as NaN
+
+        values_ = np.full((len(self.properties), len(T_grid), len(pressures_)), np.nan)
+
+        for (i, T_i) in enumerate(T_grid):
+
+            for (j, P_j) in enumerate(pressures_):
+
+                chemical.calculate(float(T_i), float(P_j))
+
+                values_[:, i, j] = [getattr(chemical, name_k) for name_k in self.properties]
+
+        return values_ if P_grid is not None else values_[:, :, 0]
+
+    def _createSpline(self, values):
+
+        if self.P_grid is None:
+
+            return CubicSpline(self.T_grid, values)
+
+        return RectBivariateSpline(self.T_grid, self.P_grid, values, kx=min(3, self.T_grid.size - 1), ky=min(3, self.P_grid.size - 1))
+
+    def contains(self, T, P=None):
+
+        """
+        Return True if the state (T, P) lies within the grid
+
+        :rtype bool:
+        """
+
+        is_inside = self.T_grid[0] <= T <= self.T_grid[-1]
+
+        if self.P_grid is not None:
+
+            return is_inside and P is not None and self.P_grid[0] <= P <= self.P_grid[-1]
+
+        return is_inside and (P is None or P == self.P)
+
+    def evaluate(self, name, T, P=None, dT=0, dP=0):
+
+        """
+        Evaluate one property (or one of its derivatives) through the splines, for one state or for arrays of states at once
+
+        :param str name:
+            Name of the property
+
+        :param [float, numpy.ndarray] T:
+            Temperatures
+
+        :param [float, numpy.ndarray] P:
+            Pressures (tables over temperatures and pressures only). Defaults to None
+
+        :param int dT:
+            Order of the derivative with respect to the temperature. Defaults to 0
+
+        :param int dP:
+            Order of the derivative with respect to the pressure (tables over temperatures and pressures only). Defaults to 0
+
+        :rtype [float, numpy.ndarray]:
+        """
+
+        if name not in self._splines:
+
+            raise UnexpectedValueError("property tabulated (%s)" % ", ".join(self.properties))
+
+        spline_ = self._splines[name]
+
+        if self.P_grid is None:
+
+            if dP != 0:
+
+                raise UnexpectedValueError("table over temperatures and pressures")
+
+            return spline_(T, dT)
+
+        T_, P_ = np.broadcast_arrays(np.asarray(T, dtype=np.float64), np.asarray(P, dtype=np.float64))
+
+        values_ = spline_.ev(T_, P_, dx=dT, dy=dP)
+
+        return values_ if values_.ndim > 0 else float(values_)
+
+    def checkTolerance(self, chemical, rtol=1e-4, atol=0.):
+
+        """
+        Check the splines against thermo at the midpoints of the grid, raising NumericalError if any property deviates beyond the tolerances given
+
+        :param thermo.chemical.Chemical chemical:
+            Chemical object of the species
+
+        :param float rtol:
+            Relative tolerance. Defaults to 1e-4
+
+        :param float atol:
+            Absolute tolerance. Defaults to 0.
+
+        :return:
+            Maximum relative deviation of each property
+        :rtype dict:
+        """
+
+        T_mid = 0.5*(self.T_grid[1:] + self.T_grid[:-1])
+
+        P_mid = 0.5*(self.P_grid[1:] + self.P_grid[:-1]) if self.P_grid is not None else None
+
+        exact_ = self._sample(chemical, T_mid, P_mid)
+
+        if P_mid is not None:
+
+            T_, P_ = np.meshgrid(T_mid, P_mid, indexing='ij')
+
+        else:
+
+            T_, P_ = T_mid, None
+
+        deviations_ = {}
+
+        failures_ = []
+
+        for (name_i, exact_i) in zip(self.properties, exact_):
+
+            interpolated_i = self.evaluate(name_i, T_, P_)
+
+            error_i = np.abs(interpolated_i - exact_i)
+
+            deviations_[name_i] = float(np.nanmax(error_i/np.maximum(np.abs(exact_i), np.finfo(float).tiny)))
+
+            if not np.all(error_i <= atol + rtol*np.abs(exact_i)):
+
+                failures_.append(name_i)
+
+        if len(failures_) > 0:
+
+            raise NumericalError("Tabulated properties of %s beyond the tolerance (rtol=%g): %s. Refine the grid or narrow its range." % (self.species, rtol, ", ".join("%s (%.3g)" % (name_i, deviations_[name_i]) for name_i in failures_)))
+
+        return deviations_
+
+    def save(self, path):
+
+        """
+        Store the current table on disk (NumPy .npz file)
+
+        :param str path:
+            Path of the file
+        """
+
+        directory_ = os.path.dirname(os.path.abspath(path))
+
+        os.makedirs(directory_, exist_ok=True)
+
+        arrays_ = {'species': np.array(self.species), 'properties': np.array(self.properties), 'T_grid': self.T_grid, 'P': np.array(self.P), 'values': self.values}
+
+        if self.P_grid is not None:
+
+            arrays_['P_grid'] = self.P_grid
+
+        with open(path, 'wb') as file_:
+
+            np.savez(file_, **arrays_)
+
+    @classmethod
+    def load(cls, path):
+
+        """
+        Load one table stored on disk (see save)
+
+        :param str path:
+            Path of the file
+
+        :rtype PropertyTable:
+        """
+
+        with np.load(path, allow_pickle=False) as data_:
+
+            return cls(str(data_['species']), [str(name_i) for name_i in data_['properties']], data_['T_grid'],
+                       data_['P_grid'] if 'P_grid' in data_.files else None, float(data_['P']), values=data_['values'])
+
+    def matches(self, species, properties, T_grid, P_grid=None, P=101325.):
+
+        """
+        Return True if the current table was built for the species, properties and grid given (eg: tables loaded from disk)
+
+        :rtype bool:
+        """
+
+        same_P_grid = (self.P_grid is None and P_grid is None) or (self.P_grid is not None and P_grid is not None and np.array_equal(self.P_grid, np.asarray(P_grid, dtype=np.float64)))
+
+        return (self.species == species and self.properties == list(properties) and np.array_equal(self.T_grid, np.asarray(T_grid, dtype=np.float64))
+                and same_P_grid and (P_grid is not None or self.P == float(P)))
@@ -6,9 +6,8 @@ Define the Quantity (QTY), base-class for all unit-containg objects (Variables,
 
 import copy
 from .error_definitions import DimensionalCoherenceError, UnexpectedValueError
-import sympy as sp
-#import symengine as sp
 from .expression_evaluation import EquationNode
+from . import symbolic_backend as sb
 
 # Null dimension dict
 null_dimension = {'m':0.0,'kg':0.0,'s':0.0,'A':0.0,'K':0.0,'mol':0.0,'cd':0.0}
@@ -119,12 +118,12 @@ class Quantity:  # New-style class syntax
         if self.is_specified == False:
 
             return EquationNode(name=self.name,
-                                symbolic_object=sp.symbols(self.name),
+                                symbolic_object=sb.Symbol(self.name),
                                 symbolic_map={self.name:self},
                                 variable_map={self.name:self},
-                                unit_object=self.units,
+                                unit_object=self.units._forExpressions(),
                                 latex_text=self.latex_text,
-                                repr_symbolic=sp.symbols(self.name)
+                                repr_symbolic=sb.Symbol(self.name)
                                 )
 
         # If the object is specified (eg:specified param)
@@ -135,9 +134,9 @@ class Quantity:  # New-style class syntax
                                 symbolic_object=self.value,
                                 symbolic_map={self.name:self},
                                 variable_map={},
-                                unit_object=self.units,
+                                unit_object=self.units._forExpressions(),
                                 latex_text=self.latex_text,
-                                repr_symbolic=sp.symbols(self.name)
+                                repr_symbolic=sb.Symbol(self.name)
                                 )
 
     def __add__(self, other_obj):
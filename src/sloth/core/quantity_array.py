@@ -0,0 +1,238 @@
+# *coding:utf-8*
+
+"""
+Define the QuantityArray class, base-class for the array-backed quantities (VariableArray, ParameterArray).
+
+The values of all the elements of one QuantityArray are stored contiguously in a single NumPy array (values atribute). Each element is one Quantity object (eg: Variable, Parameter) whose value is read from and written to its position in that array, so that the elements may be used in scalar equations as any other Quantity object, while the whole array may be read or set at once (eg: by vectorised kernels, see EquationArray).
+"""
+
+import numpy as np
+from copy import copy
+from numbers import Number
+
+from .error_definitions import UnexpectedValueError
+from . import symbolic_backend as sb
+
+
+class _ArrayElement:
+
+    """
+    Mixin for the elements of QuantityArray objects, which store their value in one position of the array of values of the QuantityArray. Must precede the Quantity class in the bases of the element classes.
+    """
+
+    def __init__(self, storage, index, *args, **kwargs):
+
+        self._storage = storage
+
+        self._index = index
+
+        super().__init__(*args, **kwargs)
+
+    @property
+    def value(self):
+
+        return self._storage[self._index]
+
+    @value.setter
+    def value(self, value):
+
+        self._storage[self._index] = value
+
+    def __copy__(self):
+
+        # Copies (eg: incorporated into other models) hold their own storage, so that they do not modify the QuantityArray from which they were copied
+
+        obj_ = self.__class__.__new__(self.__class__)
+
+        obj_.__dict__.update(self.__dict__)
+
+        obj_._storage = np.array([self.value], dtype=self._storage.dtype)
+
+        obj_._index = 0
+
+        return obj_
+
+
+class QuantityArray:
+
+    """
+    Definition of QuantityArray class. Holds the elements of one array of quantities and the contiguous storage of their values.
+
+    * Note:
+
+        Subclasses must define the element_class atribute (class of the elements, combining _ArrayElement and one Quantity class) and the _createSlot method (see EquationArray).
+    """
+
+    element_class = None
+
+    def __init__(self, name, size, units, description="", value=0., latex_text="", owner_model_name="", **element_kwargs):
+
+        """
+        Instantiate QuantityArray.
+
+        :ivar str name:
+            Name for the current QuantityArray. The elements are named <name>_<index>, followed by _<owner_model_name> if the array belongs to a model
+
+        :ivar int size:
+            Number of elements of the current QuantityArray
+
+        :ivar Unit units:
+            Definition of dimensional unit of all the elements
+
+        :ivar str description:
+            Description for the present QuantityArray. Defaults to ""
+
+        :ivar float value:
+            Value for all the elements, or sequence of values (one for each element). Defaults to 0.
+
+        :ivar str latex_text:
+            Text for latex representation. The elements are represented as <latex_text>_{<index>}
+
+        :ivar str owner_model_name:
+            Name of the owner model of the current QuantityArray object. Defaults to "", meaning that the object was created aside a model.
+
+        :ivar numpy.ndarray values:
+            Contiguous storage of the values of the elements
+
+        :ivar numpy.ndarray array:
+            Elements of the current QuantityArray
+        """
+
+        if not isinstance(size, int) or size < 0:
+
+            raise UnexpectedValueError("int (non-negative)")
+
+        self.name = name
+
+        self.units = units
+
+        self.description = description
+
+        self.latex_text = latex_text if latex_text != "" else name
+
+        self.owner_model_name = owner_model_name
+
+        self.values = np.zeros(size, dtype=np.float64)
+
+        self._setValues(value)
+
+        suffix_ = "_" + owner_model_name if owner_model_name != "" else ""
+
+        self.array = np.empty(size, dtype=object)
+
+        for i in range(size):
+
+            self.array[i] = self.element_class(self.values, i, name + "_" + str(i) + suffix_, units, description=description, value=self.values[i], latex_text="{%s}_{%d}" % (self.latex_text, i), owner_model_name=owner_model_name, **element_kwargs)
+
+    def _setValues(self, value):
+
+        if isinstance(value, Number):
+
+            self.values[:] = value
+
+        elif len(value) == self.values.size:
+
+            self.values[:] = np.asarray(value, dtype=np.float64)
+
+        else:
+
+            raise UnexpectedValueError("Monothonic value for %s, or a list of values with equivalent size of the %s" % ((self.__class__.__name__,)*2))
+
+    def setValue(self, value):
+
+        """
+        Set the values of all the elements at once, marking them as specified
+
+        :param [float, list(float), numpy.ndarray] value:
+            Value for all the elements, or sequence of values (one for each element)
+        """
+
+        self._setValues(value)
+
+        for element_i in self.array:
+
+            element_i.is_specified = True
+
+    @property
+    def size(self):
+
+        return self.values.size
+
+    @size.setter
+    def size(self, x):
+
+        raise ValueError("Cannot directly set an atribute for an %s object." % self.__class__.__name__)
+
+    @property
+    def names(self):
+
+        """
+        Names of the elements of the current QuantityArray
+
+        :rtype list(str):
+        """
+
+        return [element_i.name for element_i in self.array]
+
+    def __len__(self):
+
+        return self.values.size
+
+    def __iter__(self):
+
+        return iter(self.array)
+
+    def __getitem__(self, id):
+
+        if isinstance(id, slice):
+
+            return list(self.array[id])
+
+        return self.array[id]
+
+    def __call__(self, id):
+
+        """
+        Return the EquationNode object corresponding to one element of the current QuantityArray
+
+        :param int id:
+            Index of the element
+        :rtype EquationNode:
+        """
+
+        return self.array[id]()
+
+    def _getSpecifiedValues(self):
+
+        """
+        Return the values of the elements that are specified, by element name
+
+        :rtype dict:
+        """
+
+        return {element_i.name: element_i.value for element_i in self.array if element_i.is_specified is True}
+
+    def _getSlot(self, slot_name):
+
+        """
+        Return one scalar Quantity object standing for any element of the current QuantityArray in the declaration of one EquationArray. Its symbol is replaced by the symbol (or value, if specified) of each element upon the instantiation of the element equations. The slot is declared as specified (with a symbolic value) if all the elements are specified, so that the template equation is classified as the element equations are.
+
+        :param str slot_name:
+            Name of the slot
+
+        :rtype Quantity:
+        """
+
+        slot_ = self._createSlot(slot_name)
+
+        if len(self.array) > 0 and all(element_i.is_specified is True for element_i in self.array):
+
+            slot_.value = sb.Symbol(slot_name)
+
+            slot_.is_specified = True
+
+        return slot_
+
+    def _createSlot(self, slot_name):
+
+        raise NotImplementedError
@@ -0,0 +1,273 @@
+# *coding:utf-8*
+
+"""
+Define the expression backend used for the symbolic objects of the EquationNode objects. The default backend is SymPy. SymEngine may be selected (setExpressionBackend('symengine')) for faster construction of large models, as its arithmetic is much cheaper than the SymPy one.
+
+SymEngine expressions are converted to SymPy when they are stored in Equation objects (toSympy), so the analysis, the equation blocks and the solvers work always over SymPy expressions. Features lacking in SymEngine are handled by the SymPy fallback: derivatives of variables with respect to independent variables (that SymEngine evaluates to zero) are represented by placeholder symbols, which are replaced by the SymPy derivatives upon conversion.
+
+The backend may also be defined through the SLOTH_EXPRESSION_BACKEND environment variable.
+"""
+
+import os
+import sympy as sp
+
+from .error_definitions import UnexpectedValueError, AbsentRequiredObjectError
+
+try:
+
+    import symengine as se
+
+except ImportError:
+
+    se = None
+
+_backend = {'name': 'sympy'}
+
+# Placeholder symbols (symengine) for derivatives, mapped to the corresponding SymPy derivatives. Placeholders are numbered in order of creation, and each derivative keeps always the same placeholder
+
+_derivative_placeholders = {}
+
+_placeholder_of_derivative = {}
+
+
+def isSymEngineAvailable():
+
+    """
+    Return True if SymEngine is installed
+
+    :rtype bool:
+    """
+
+    return se is not None
+
+
+def setExpressionBackend(backend_name):
+
+    """
+    Set the expression backend used for construction of the symbolic objects. Only expressions created afterwards are affected, so it should be set before the declaration of the models.
+
+    :param str backend_name:
+        Name of the backend ('sympy' or 'symengine')
+    """
+
+    _checkBackendName(backend_name)
+
+    _backend['name'] = backend_name
+
+
+def _checkBackendName(backend_name):
+
+    if backend_name not in ['sympy', 'symengine']:
+
+        raise UnexpectedValueError("string ('sympy', 'symengine')")
+
+    if backend_name == 'symengine' and se is None:
+
+        raise AbsentRequiredObjectError("symengine installation")
+
+
+def getExpressionBackend():
+
+    """
+    Return the name of the expression backend currently in use
+
+    :rtype str:
+    """
+
+    return _backend['name']
+
+
+def _usingSymEngine():
+
+    return _backend['name'] == 'symengine'
+
+
+def Symbol(name):
+
+    """
+    Return one symbol for the current backend
+    """
+
+    if _usingSymEngine():
+
+        return se.Symbol(name)
+
+    return sp.Symbol(name)
+
+
+def _applyFunction(sympy_func, symengine_func, *args):
+
+    # SymPy functions are kept unevaluated, as the original definition of the equations
+
+    if _usingSymEngine():
+
+        return symengine_func(*args)
+
+    return sympy_func(*args, evaluate=False)
+
+
+def log(obj, evaluate=False):
+
+    return _applyFunction(sp.log, se.log if se is not None else None, obj)
+
+
+def log10(obj, evaluate=False):
+
+    if _usingSymEngine():
+
+        return se.log(obj)/se.log(10)
+
+    return sp.log(obj, 10, evaluate=False)
+
+
+def sqrt(obj, evaluate=False):
+
+    return _applyFunction(sp.sqrt, se.sqrt if se is not None else None, obj)
+
+
+def Abs(obj, evaluate=False):
+
+    return _applyFunction(sp.Abs, se.Abs if se is not None else None, obj)
+
+
+def exp(obj, evaluate=False):
+
+    return _applyFunction(sp.exp, se.exp if se is not None else None, obj)
+
+
+def sin(obj, evaluate=False):
+
+    return _applyFunction(sp.sin, se.sin if se is not None else None, obj)
+
+
+def cos(obj, evaluate=False):
+
+    return _applyFunction(sp.cos, se.cos if se is not None else None, obj)
+
+
+def tan(obj, evaluate=False):
+
+    return _applyFunction(sp.tan, se.tan if se is not None else None, obj)
+
+
+def Min(*args, evaluate=False):
+
+    return _applyFunction(sp.Min, se.Min if se is not None else None, *args)
+
+
+def Max(*args, evaluate=False):
+
+    return _applyFunction(sp.Max, se.Max if se is not None else None, *args)
+
+
+def _hasSymEngineArgument(args):
+
+    # The class of the arguments (not the current backend) defines the result, as the lazy representations may be built after the backend is changed
+
+    return se is not None and any(isinstance(arg_i, se.Basic) for arg_i in args)
+
+
+def Add(*args):
+
+    """
+    Return the sum of all the arguments, built in one step (n-ary) instead of one binary sum per argument
+    """
+
+    if _hasSymEngineArgument(args):
+
+        return se.Add(*args)
+
+    return sp.Add(*args)
+
+
+def Mul(*args):
+
+    """
+    Return the product of all the arguments, built in one step (n-ary) instead of one binary product per argument
+    """
+
+    if _hasSymEngineArgument(args):
+
+        return se.Mul(*args)
+
+    return sp.Mul(*args)
+
+
+def Derivative(obj, ind_var=None):
+
+    """
+    Return the derivative of obj with respect to ind_var. For the SymEngine backend, one placeholder symbol is returned (SymPy fallback), which is replaced by the SymPy derivative in toSympy
+
+    :param obj:
+        Symbolic object (symbol) to be differentiated
+
+    :param ind_var:
+        Independent variable (symbol). Defaults to None, meaning an unspecified independent variable
+
+    :return:
+        Derivative
+    """
+
+    args_ = [sp.sympify(obj)] if ind_var is None else [sp.sympify(obj), sp.sympify(ind_var)]
+
+    derivative_ = sp.Derivative(*args_, evaluate=False)
+
+    if _usingSymEngine():
+
+        if derivative_ not in _placeholder_of_derivative:
+
+            placeholder_name = "_Derivative%d" % len(_placeholder_of_derivative)
+
+            _placeholder_of_derivative[derivative_] = placeholder_name
+
+            _derivative_placeholders[sp.Symbol(placeholder_name)] = derivative_
+
+        return se.Symbol(_placeholder_of_derivative[derivative_])
+
+    return derivative_
+
+
+def toSympy(obj):
+
+    """
+    Convert one symbolic object (or number) from the current backend into the corresponding SymPy object, replacing the derivative placeholders
+
+    :return:
+        SymPy object, or the object unchanged if it is a number or already a SymPy object
+    """
+
+    if isinstance(obj, sp.Basic):
+
+        obj_ = obj
+
+    elif se is not None and isinstance(obj, se.Basic):
+
+        obj_ = sp.sympify(obj)
+
+    else:
+
+        return obj
+
+    if len(_derivative_placeholders) == 0:
+
+        return obj_
+
+    placeholders_ = {s_i: _derivative_placeholders[s_i] for s_i in obj_.free_symbols if s_i in _derivative_placeholders}
+
+    if len(placeholders_) > 0:
+
+        obj_ = obj_.xreplace(placeholders_)
+
+    return obj_
+
+
+def _getDefaultBackend():
+
+    backend_name = os.environ.get('SLOTH_EXPRESSION_BACKEND', 'sympy')
+
+    _checkBackendName(backend_name)
+
+    return backend_name
+
+
+_backend['name'] = _getDefaultBackend()
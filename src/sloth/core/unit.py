@@ -2,15 +2,106 @@
 
 """
 Define Unit class, for ulterior utilization (eg:Variable,Parameter)
+
+The dimensions of each Unit are stored as one tuple of indexes (int, or Fraction for non-integer indexes) in the order of DIMENSION_NAMES. The tuples are interned, the results of the arithmetical operations are memoised, and the unnamed units resulting from them are shared, so that the dimensional bookkeeping performed for each EquationNode operation reduces to dictionary lookups and tuple comparisons.
+
+For already validated models, the trusted mode (setTrustedMode, or the SLOTH_TRUSTED_MODEL=1 environment variable) skips this bookkeeping altogether: the EquationNode objects created afterwards hold the unchecked unit, whose operations return itself without any check. The dimensional coherence of the finished equations may then be verified on demand by one validation pass (see dimensional_validation).
 """
 
-import copy
+import os
+from fractions import Fraction
 from .error_definitions import DimensionalCoherenceError, UnexpectedValueError
 from .quantity import Quantity
 from collections import OrderedDict
 # Null dimension dict
 null_dimension = OrderedDict({'m':0.0,'kg':0.0,'s':0.0,'A':0.0,'K':0.0,'mol':0.0,'cd':0.0})
 
+DIMENSION_NAMES = ('m', 'kg', 's', 'A', 'K', 'mol', 'cd')
+
+_DIMENSION_POSITIONS = {dim_i: i for (i, dim_i) in enumerate(DIMENSION_NAMES)}
+
+_interned_dimensions = {}
+
+# Unnamed units shared among the results of arithmetical operations, by dimensions tuple
+
+_unnamed_units = {}
+
+# Memoised results (dimensions tuples) of the arithmetical operations
+
+_product_cache = {}
+
+_quotient_cache = {}
+
+_power_cache = {}
+
+
+def _normalizeIndex(idx):
+
+    # Integer-valued indexes are stored as int, the remaining ones as Fraction (eg: 0.5 -> 1/2), so that equal dimensions give equal tuples
+
+    if isinstance(idx, int):
+
+        return idx
+
+    idx = Fraction(idx).limit_denominator(10**6)
+
+    if idx.denominator == 1:
+
+        return int(idx.numerator)
+
+    return idx
+
+
+def _internDimensions(dimensions):
+
+    dimensions = tuple(_normalizeIndex(idx_i) for idx_i in dimensions)
+
+    return _interned_dimensions.setdefault(dimensions, dimensions)
+
+
+def _dimensionsFromMapping(dimension_dict):
+
+    dimensions = [0]*len(DIMENSION_NAMES)
+
+    for (dim_i, idx_i) in dimension_dict.items():
+
+        if dim_i not in _DIMENSION_POSITIONS:
+
+            raise UnexpectedValueError("dimension from %s" % (DIMENSION_NAMES,))
+
+        dimensions[_DIMENSION_POSITIONS[dim_i]] = idx_i
+
+    return _internDimensions(dimensions)
+
+
+_NULL_DIMENSIONS = _internDimensions([0]*len(DIMENSION_NAMES))
+
+_trusted_mode = {'active': os.environ.get('SLOTH_TRUSTED_MODEL', '0') == '1'}
+
+
+def setTrustedMode(active=True):
+
+    """
+    Set the trusted mode, in which no dimensional check nor unit propagation is performed during the construction of the equations. Only expressions created afterwards are affected, so it should be set before the declaration of the models.
+
+    :param bool active:
+        If True, activate the trusted mode. Defaults to True
+    """
+
+    _trusted_mode['active'] = bool(active)
+
+
+def isTrustedMode():
+
+    """
+    Return True if the trusted mode is active
+
+    :rtype bool:
+    """
+
+    return _trusted_mode['active']
+
+
 class Unit:  # New-style class syntax
     """
     Unit class definition, that holds the capabilities:
@@ -35,7 +126,7 @@ class Unit:  # New-style class syntax
             Description of the present unit. Defaults to "". 
         """
 
-        self.dimension = OrderedDict({'m':0,'kg':0,'s':0,'A':0,'K':0,'mol':0,'cd':0})
+        self._dimensions = _NULL_DIMENSIONS
 
         self.name = name
 
@@ -43,6 +134,62 @@ class Unit:  # New-style class syntax
 
         self._re_eval_dimensions(dimension_dict)
 
+    @classmethod
+    def _fromDimensions(cls, dimensions):
+
+        """
+        Return the unnamed Unit with the given (interned) dimensions tuple, shared among all the arithmetical operations resulting in it
+
+        :param tuple dimensions:
+            Dimensions tuple, in the order of DIMENSION_NAMES
+
+        :rtype Unit:
+        """
+
+        unit_ = _unnamed_units.get(dimensions)
+
+        if unit_ is None:
+
+            unit_ = cls.__new__(cls)
+
+            unit_._dimensions = dimensions
+
+            unit_.name = ""
+
+            unit_.description = ""
+
+            _unnamed_units[dimensions] = unit_
+
+        return unit_
+
+    @property
+    def dimension(self):
+
+        """
+        Dictionary containing the dimensional index for each SI dimension. It is built from the dimensions tuple, thus changes to the dictionary returned do not affect the Unit.
+        """
+
+        return OrderedDict(zip(DIMENSION_NAMES, self._dimensions))
+
+    @dimension.setter
+    def dimension(self, dimension_dict):
+
+        self._dimensions = _dimensionsFromMapping(dimension_dict)
+
+    def _forExpressions(self):
+
+        """
+        Return the unit to be held by the EquationNode objects built from quantities of the present unit: the present unit itself, or the unchecked unit in trusted mode
+
+        :rtype Unit:
+        """
+
+        if _trusted_mode['active']:
+
+            return unchecked
+
+        return self
+
     def _is_dimensionless(self):
         """
         Check if the current Unit object is adimensional.
@@ -52,11 +199,7 @@ class Unit:  # New-style class syntax
         :rtype Bool _is_dimensionless:
         """
 
-        #is_dimless = all([float(self.dimension[idx_i]) == 0. for idx_i in keys_])
-
-        is_dimless = all(float(d_i) == 0. for d_i in self.dimension.values())
-
-        return is_dimless
+        return self._dimensions == _NULL_DIMENSIONS
 
     def _reset_dimensions(self, null_dimension):
         """
@@ -68,7 +211,7 @@ class Unit:  # New-style class syntax
         Defaults to null_dimension predefined.
         """
 
-        self.dimension = null_dimension
+        self._dimensions = _dimensionsFromMapping(null_dimension)
 
     def _re_eval_dimensions(self, dimension_dict):
         """
@@ -81,21 +224,23 @@ class Unit:  # New-style class syntax
 
         if isinstance(dimension_dict,dict) != True: #dimension_dict holds an Unit
 
-            dimension_dict = dimension_dict.dimension
+            self._dimensions = dimension_dict._dimensions
+
+            return
+
+        # Dimensions absent from dimension_dict are kept
+
+        dimensions = list(self._dimensions)
 
-        dimension_dict = OrderedDict(sorted(dimension_dict.items(), key=lambda x: x[0]))
+        for (dim_i, idx_i) in dimension_dict.items():
 
-        for (dim_i, idx_i) in zip(dimension_dict.keys(), dimension_dict.values()):
+            if dim_i not in _DIMENSION_POSITIONS:
 
-            try:
+                raise UnexpectedValueError("dimension from %s" % (DIMENSION_NAMES,))
 
-                self.dimension[dim_i] = idx_i
-                
-            # If the present unit (self) does not contain the dimension 'dim_i', 
-            # revert to null_dimension
-            except KeyError:
+            dimensions[_DIMENSION_POSITIONS[dim_i]] = idx_i
 
-                self.dimension[dim_i] = null_dimension[dim_i]
+        self._dimensions = _internDimensions(dimensions)
 
     def __str__(self):
 
@@ -109,9 +254,7 @@ class Unit:  # New-style class syntax
 
         output=''
 
-        dimension_ = {key:self.dimension[key] for key in null_dimension.keys()}
-
-        output = [dim_i+"^"+str(dimension_[dim_i]) for dim_i in list(dimension_.keys()) if dimension_[dim_i] != 0]
+        output = [dim_i+"^"+str(idx_i) for (dim_i, idx_i) in zip(DIMENSION_NAMES, self._dimensions) if idx_i != 0]
 
         output = " ".join(output)
 
@@ -183,21 +326,15 @@ class Unit:  # New-style class syntax
 
             # other_unit is an Unit object
 
-            new_dimension = copy.copy(other_unit.dimension)
-
-            for (dim_i, idx_i) in zip(self.dimension.keys(), self.dimension.values()):
-
-                try:
-
-                    new_dimension[dim_i] = new_dimension[dim_i] + idx_i
+            key_ = (self._dimensions, other_unit._dimensions)
 
-                except KeyError:  # Second unit (other_unit) has no dimension 'dim_i' defined
+            new_dimensions = _product_cache.get(key_)
 
-                    new_dimension[dim_i] = idx_i
+            if new_dimensions is None:
 
-            new_unit = self.__class__(name="", dimension_dict=new_dimension, description="") 
+                new_dimensions = _product_cache[key_] = _internDimensions([idx_1 + idx_2 for (idx_1, idx_2) in zip(*key_)])
 
-            return new_unit
+            return self._fromDimensions(new_dimensions)
 
         elif isinstance(other_unit, float) or isinstance(other_unit, int):
 
@@ -210,6 +347,18 @@ class Unit:  # New-style class syntax
             raise UnexpectedValueError("(Unit, float, int)")
 
 
+    def _divide(self, other_unit):
+
+        key_ = (self._dimensions, other_unit._dimensions)
+
+        new_dimensions = _quotient_cache.get(key_)
+
+        if new_dimensions is None:
+
+            new_dimensions = _quotient_cache[key_] = _internDimensions([idx_1 - idx_2 for (idx_1, idx_2) in zip(*key_)])
+
+        return self._fromDimensions(new_dimensions)
+
     def __div__(self, other_unit):
         """
         Overloaded function for division of two units with subsequent subtraction of its
@@ -229,21 +378,7 @@ class Unit:  # New-style class syntax
 
             # other_unit is an Unit object
 
-            new_dimension = copy.copy(other_unit.dimension)
-
-            for (dim_i, idx_i) in zip(new_dimension.keys(), new_dimension.values()):
-
-                try:
-
-                    new_dimension[dim_i] = self.dimension[dim_i] - idx_i
-
-                except KeyError:  # First unit (self) has no dimension 'dim_i' defined
-
-                    new_dimension[dim_i] = -idx_i
-
-            new_unit = self.__class__(name="", dimension_dict=new_dimension, description="") 
-
-            return new_unit
+            return self._divide(other_unit)
 
         elif isinstance(other_unit, float) or isinstance(other_unit, int):
 
@@ -276,21 +411,7 @@ class Unit:  # New-style class syntax
 
             # other_unit is an Unit object
 
-            new_dimension = copy.copy(other_unit.dimension)
-
-            for (dim_i, idx_i) in zip(new_dimension.keys(), new_dimension.values()):
-
-                try:
-
-                    new_dimension[dim_i] = self.dimension[dim_i] - idx_i
-
-                except KeyError:  # First unit (self) has no dimension 'dim_i' defined
-
-                    new_dimension[dim_i] = -idx_i
-
-            new_unit = self.__class__(name="", dimension_dict=new_dimension, description="") 
-
-            return new_unit
+            return self._divide(other_unit)
 
         elif isinstance(other_unit, float) or isinstance(other_unit, int):
 
@@ -320,23 +441,21 @@ class Unit:  # New-style class syntax
 
             # power is a number.
 
-            new_dimension = copy.copy(self.dimension)
+            key_ = (self._dimensions, power)
 
-            for (dim_i, idx_i) in zip(self.dimension.keys(), self.dimension.values()):
+            new_dimensions = _power_cache.get(key_)
 
-                new_dimension[dim_i] = idx_i*power
+            if new_dimensions is None:
 
-            new_unit = self.__class__(name="", dimension_dict=new_dimension, description="") 
+                new_dimensions = _power_cache[key_] = _internDimensions([idx_i*_normalizeIndex(power) for idx_i in self._dimensions])
 
-            return new_unit
+            return self._fromDimensions(new_dimensions)
 
         elif isinstance(power, self.__class__) and power._is_dimensionless():
 
             # power is another unit, presumably dimensionless
 
-            new_unit = self.__class__(name="", dimension_dict=self.dimension, description="") 
-
-            return new_unit
+            return self._fromDimensions(self._dimensions)
 
         else:
 
@@ -356,24 +475,30 @@ class Unit:  # New-style class syntax
         :rtype bool:
         """
 
-        #keys_ = sorted(self.dimension.keys())
+        # One tuple comparison (which is one identity test for interned tuples)
 
-        """
-        TODO: Deprecated ortographic comparison in favor of numerical comparison of all dimensions. Remove deprecated code in future versions
-        
-        Syntatic convenience vodoo for conversion of dimensions of both units to one single str object.
-        Thus the comparison between the two Unit objects is easy
+        return self._dimensions == other_unit._dimensions
 
-        [str() for ...] -> List of each dimension converted to str
 
-        "".join() -> Concatenation of str objects in one single string
-        
-        """
+class _UncheckedUnit(Unit):
+
+    """
+    Unit held by the EquationNode objects built in trusted mode. Every operation returns the unchecked unit itself, and it is coherent with any other unit, so that no dimensional work is performed during the construction of the equations.
+    """
+
+    def _is_dimensionless(self):
+
+        return True
+
+    def _check_dimensional_coherence(self, other_unit):
+
+        return True
+
+    def _returnSelf(self, other_unit):
 
-        #dim_1 = "".join([str(float(self.dimension[idx_i])) for idx_i in keys_])
+        return self
 
-        #dim_2 = "".join([str(float(other_unit.dimension[idx_i])) for idx_i in keys_])
+    __add__ = __sub__ = __mul__ = __div__ = __truediv__ = __pow__ = _returnSelf
 
-        #return dim_1 == dim_2
 
-        return all(self.dimension[idx] == other_unit.dimension[idx] for idx in sorted(self.dimension.keys()))
\ No newline at end of file
+unchecked = _UncheckedUnit("unchecked", null_dimension, "Unit of the expressions built in trusted mode")
@@ -0,0 +1,245 @@
+"""
+Define VariableArray class
+"""
+
+from .variable import Variable
+from .quantity_array import QuantityArray, _ArrayElement
+from .domain import SpatialDomain
+from .expression_evaluation import EquationNode
+from .error_definitions import UnexpectedValueError, AbsentRequiredObjectError
+
+
+class ArrayVariable(_ArrayElement, Variable):
+
+    """
+    Variable object that is one element of a VariableArray, storing its value in the array of values of the VariableArray
+    """
+
+    pass
+
+
+class _SpatialSlot(Variable):
+
+    """
+    Slot of one VariableArray distributed on a SpatialDomain (see QuantityArray._getSlot). Its derivatives with respect to the axis are built from the finite-difference stencils over the slots of the neighbour elements (shifts), which are replaced by the elements (or by the ghost points given by the boundary conditions) upon the instantiation of the element equations.
+    """
+
+    def __init__(self, name, units, description="", latex_text="", domain=None, spatial_domain=None):
+
+        super().__init__(name, units, description, latex_text=latex_text, domain=domain)
+
+        self.spatial_domain = spatial_domain
+
+        self.shifts = {}
+
+    def _getShift(self, offset):
+
+        """
+        Return the slot of the element at one offset from the current one
+
+        :param int offset:
+            Offset of the element (eg: -1 for the previous one)
+
+        :rtype Variable:
+        """
+
+        if offset == 0:
+
+            return self
+
+        if offset not in self.shifts:
+
+            self.shifts[offset] = Variable("%s_%s%d" % (self.name, 'p' if offset > 0 else 'm', abs(offset)), self.units, self.description,
+                                           latex_text="{%s}_{i%+d}" % (self.latex_text, offset), domain=self.domain)
+
+        return self.shifts[offset]
+
+    def Diff(self, ind_var=None, order=1, method=None):
+
+        """
+        Return the derivative of the current slot. Derivatives with respect to the independent variable of the SpatialDomain are approximated by its finite-difference stencils, the others are handled as for Variable objects.
+
+        :param Variable ind_var:
+            Independent variable
+
+        :param int order:
+            Order of the spatial derivative (1 or 2). Defaults to 1
+
+        :param str method:
+            Method of the first-order spatial derivative ('central', 'backward' or 'forward'). Defaults to None, for which the method of the SpatialDomain is used
+
+        :rtype EquationNode:
+        """
+
+        if not self.spatial_domain.isAxis(ind_var):
+
+            return super().Diff(ind_var)
+
+        stencil_ = self.spatial_domain.getStencil(order, method)
+
+        enode_ = None
+
+        for (offset_i, coefficient_i) in stencil_.items():
+
+            term_i = coefficient_i*self._getShift(offset_i)()
+
+            enode_ = term_i if enode_ is None else enode_ + term_i
+
+        spacing_ = self.spatial_domain.spacing**order
+
+        spacing_node = EquationNode(name=str(spacing_),
+                                    symbolic_object=spacing_,
+                                    unit_object=(self.spatial_domain.getUnits()**order)._forExpressions(),
+                                    latex_text=str(spacing_),
+                                    repr_symbolic=spacing_
+                                    )
+
+        return enode_/spacing_node
+
+
+class VariableArray(QuantityArray):
+
+    """
+    VariableArray class, which aggregates Variable objects with array-like capabilities (eg: discretised holdups, tray profiles, multi-component fractions). The values of the elements are stored contiguously (values atribute), and each element (ArrayVariable) is one Variable object.
+    """
+
+    element_class = ArrayVariable
+
+    def __init__(self, name, size, units, description="", is_lower_bounded=False, is_upper_bounded=False, lower_bound=None, upper_bound=None, value=0., is_exposed=False, type='', latex_text="", owner_model_name=""):
+
+        """
+        Initial definition.
+
+        :param str name:
+            Name for the current VariableArray
+
+        :param int size:
+            Size for the current VariableArray object
+
+        :param Unit units:
+            Definition of dimensional unit of all the elements
+
+        :param str description:
+            Description for the present VariableArray. Defauls to ""
+
+        :param float lower_bound:
+            Minimum value for all the elements
+
+        :param float upper_bound:
+            Maximum value for all the elements
+
+        :param [float, list(float)] value:
+            Value for all the elements, or list of values (one for each element). Defaults to 0.
+
+        :param bool is_exposed:
+            If the elements are exposed in their owner model or not. Defaults to False.
+
+        :param str type:
+            The exposure type of the elements in their owner model. Defaults to ''.
+        """
+
+        self.domain = None
+
+        self.spatial_domain = None
+
+        self.boundary_conditions = {}
+
+        super().__init__(name, size, units, description, value, latex_text, owner_model_name,
+                         is_lower_bounded=is_lower_bounded, is_upper_bounded=is_upper_bounded, lower_bound=lower_bound, upper_bound=upper_bound,
+                         is_exposed=is_exposed, type=type)
+
+    def distributeOnDomain(self, domain):
+
+        """
+        Distribute all the elements of the current VariableArray into one Domain object (see Variable.distributeOnDomain), or discretise the current VariableArray over one SpatialDomain (one element per cell)
+
+        :param Domain domain:
+            Domain in which the elements should be distributed
+        """
+
+        if isinstance(domain, SpatialDomain):
+
+            if domain.number_of_points != self.size:
+
+                raise UnexpectedValueError("SpatialDomain with %d points" % self.size)
+
+            self.spatial_domain = domain
+
+            return
+
+        self.domain = domain
+
+        for element_i in self.array:
+
+            element_i.domain = domain
+
+            domain._distributeOnDomain(element_i)
+
+        domain._setDomain()
+
+    def setBoundaryCondition(self, side, kind='dirichlet', value=0.):
+
+        """
+        Set the boundary condition at one side of the SpatialDomain of the current VariableArray, which gives the values at the ghost points of the stencils
+
+        :param str side:
+            Side of the axis ('lower' or 'upper')
+
+        :param [str, function] kind:
+            'dirichlet' (value at the boundary), 'neumann' (derivative with respect to the axis at the boundary), or one function (hook) receiving the value at the boundary cell and the spacing and returning the value at the ghost point. Hooks are called with symbolic values (element equations) and with numerical ones (kernels). Defaults to 'dirichlet'
+
+        :param float value:
+            Value of the dirichlet or neumann condition. Defaults to 0.
+        """
+
+        if side not in ['lower', 'upper']:
+
+            raise UnexpectedValueError("string ('lower', 'upper')")
+
+        if callable(kind):
+
+            hook_ = kind
+
+        elif kind == 'dirichlet':
+
+            # The boundary is the face between the boundary cell and the ghost point
+
+            hook_ = lambda x, h: 2.*value - x
+
+        elif kind == 'neumann':
+
+            direction_ = -1. if side == 'lower' else 1.
+
+            hook_ = lambda x, h: x + direction_*h*value
+
+        else:
+
+            raise UnexpectedValueError("string ('dirichlet', 'neumann') or function")
+
+        self.boundary_conditions[side] = hook_
+
+    def _getGhostValue(self, side, boundary_value):
+
+        """
+        Return the value at the ghost point beyond one side of the SpatialDomain
+
+        :param str side:
+            Side of the axis ('lower' or 'upper')
+
+        :param boundary_value:
+            Value (symbolic or numerical) at the boundary cell
+        """
+
+        if side not in self.boundary_conditions:
+
+            raise AbsentRequiredObjectError("boundary condition (%s) for %s" % (side, self.name))
+
+        return self.boundary_conditions[side](boundary_value, self.spatial_domain.spacing)
+
+    def _createSlot(self, slot_name):
+
+        if self.spatial_domain is not None:
+
+            return _SpatialSlot(slot_name, self.units, self.description, latex_text=self.latex_text, domain=self.domain, spatial_domain=self.spatial_domain)
+
+        return Variable(slot_name, self.units, self.description, latex_text=self.latex_text, domain=self.domain)
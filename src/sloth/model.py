@@ -11,13 +11,43 @@ from .core.equation_operators import *
 from .core.variable import Variable
 from .core.constant import Constant
 from .core.parameter import Parameter
+from .core.variable_array import VariableArray
+from .core.parameter_array import ParameterArray
+from .core.equation_array import EquationArray
+from .core.dimensional_validation import validateDimensions
 from . import connection
 from . import analysis
 from .core.template_units import *
 
 import prettytable
 
-from copy import deepcopy
+from copy import copy, deepcopy
+
+
+def _cloneObject(obj):
+
+    """
+    Return a shallow copy of one Variable, Parameter, Constant or Equation object, used for incorporation of objects from external models. Their attributes are either immutable (names, units, values) or replaced upon renaming (the EquationNode objects of the Equation, see Equation._convertEquationSymbolicExpression), so they are shared by the copy. Variable objects distributed on a Domain are deep-copied, as the Domain keeps track of them.
+    """
+
+    if getattr(obj, 'domain', None) is not None:
+
+        return deepcopy(obj)
+
+    return copy(obj)
+
+# Equation templates, by model class and template key (see Model.getTemplateKey). Each template holds the name of the model from which it was derived, shallow copies of the Equation objects declared by its DeclareEquations and the values of the specified objects in them (which are replaced by their values in the symbolic objects)
+
+_equation_templates = {}
+
+
+def clearEquationTemplates():
+
+    """
+    Discard the equation templates stored for all the Model classes, so that their next instances declare the equations again
+    """
+
+    _equation_templates.clear()
 
 def _totalizeInletsFunction_genericMaterialStreams(main_model, set_P_by_min=True, set_T_by_min=True):
 
@@ -176,6 +206,11 @@ class Model:
         except:
             self.variables = {}
 
+        try:
+            len(self.variable_arrays)
+        except:
+            self.variable_arrays = {}
+
         try:
             len(self.constants)
         except:
@@ -185,6 +220,11 @@ class Model:
         except:
             self.equations = {}
 
+        try:
+            len(self.equation_arrays)
+        except:
+            self.equation_arrays = {}
+
         try:
             len(self.connections)
         except:
@@ -349,10 +389,24 @@ class Model:
 
             return(True)
 
+    def validateDimensions(self):
+
+        """
+        Check the dimensional coherence of all the equations of the current Model in one pass, raising DimensionalCoherenceError for the first incoherence found. Intended for models built in trusted mode (see unit.setTrustedMode), whose equations are not checked during their construction.
+
+        :return:
+            Units of the residuals of the equations, by equation name
+        :rtype dict:
+        """
+
+        quantities_ = {obj_i.name: obj_i for obj_i in list(self.variables.values()) + list(self.parameters.values()) + list(self.constants.values())}
+
+        return validateDimensions(list(self.equations.values()), quantities_)
+
     def incorporateFromExternalModel(self, model_to_incorporate, incorporate_variables=True, incorporate_parameters=True, incorporate_constants=True, incorporate_equations=True, incorporate_ports=False, rewrite_name=True):
 
         """
-        Incorporate objects from a external Model
+        Incorporate objects from a external Model. The objects are shallow-copied and renamed, and the equations are rewritten through one xreplace renaming of their symbols, so that the incorporation takes time proportional to the size of the incorporated model.
         """
 
         if incorporate_variables is True:
@@ -401,9 +455,7 @@ class Model:
 
         #Object has  a owner model. Need to change the model ownership
 
-        var_ = var
-
-        var_ = deepcopy(var)
+        var_ = _cloneObject(var)
 
         if var.owner_model_name is not "":
 
@@ -438,9 +490,7 @@ class Model:
 
         #Object has  a owner model. Need to change the model ownership
 
-        par_ = par
-
-        par_ = deepcopy(par)
+        par_ = _cloneObject(par)
 
         if par.owner_model_name is not "":
 
@@ -471,9 +521,7 @@ class Model:
 
         #Object has  a owner model. Need to change the model ownership
 
-        con_ = con
-
-        con_ = deepcopy(con)
+        con_ = _cloneObject(con)
 
         if con.owner_model_name is not "":
 
@@ -504,9 +552,7 @@ class Model:
 
         #Object has  a owner model. Need to change the model ownership
 
-        eq_ = eq
-
-        eq_ = deepcopy(eq)
+        eq_ = _cloneObject(eq)
 
         if eq.owner_model_name is not "":
 
@@ -559,7 +605,7 @@ class Model:
 
             self.totalizeInletsFunction(main_model=self)
 
-        self.DeclareEquations()
+        self._declareEquationsWithTemplate()
 
         if len(self.variables) == 0 and self.ignore_variable_warning is False:
 
@@ -569,6 +615,130 @@ class Model:
 
             print("Warning: No equations were declared.")
 
+    def getTemplateKey(self):
+
+        """
+        Return the key that identifies, along with the model class, the equations declared by DeclareEquations, so that the symbolic equations are derived only once for all the instances sharing it and each further instance is obtained by renaming the symbols of the template (see _declareEquationsWithTemplate). Models whose equations depend only on their class and construction arguments (eg: phases of the property package, orientation) may override it.
+
+        :return:
+            Hashable key, or None (default) if the equations of the current model should always be declared by DeclareEquations
+        """
+
+        return None
+
+    def _declareEquationsWithTemplate(self):
+
+        """
+        Declare the equations of the current model, from the equation template of its class and template key if available, or through DeclareEquations otherwise (storing the template for the next instances). A template is stored only if DeclareEquations neither created objects (including EquationArray objects) nor declared objects owned by other models in its equations.
+        """
+
+        template_key = self.getTemplateKey()
+
+        if template_key is None:
+
+            self.DeclareEquations()
+
+            return
+
+        template_key = (self.__class__, template_key)
+
+        template_ = _equation_templates.get(template_key)
+
+        if template_ is not None and self._addEquationsFromTemplate(*template_) is True:
+
+            return
+
+        previous_equations = dict(self.equations)
+
+        previous_equation_arrays = len(self.equation_arrays)
+
+        previous_objects = set(self.variables) | set(self.parameters) | set(self.constants)
+
+        self.DeclareEquations()
+
+        own_objects = set(self.variables) | set(self.parameters) | set(self.constants)
+
+        new_equations = [eq_i for (name_i, eq_i) in self.equations.items() if previous_equations.get(name_i) is not eq_i]
+
+        is_template = own_objects == previous_objects and len(self.equation_arrays) == previous_equation_arrays and \
+                      all(eq_i.owner_model_name == self.name and all(obj_i in own_objects for obj_i in eq_i.objects_declared) for eq_i in new_equations)
+
+        if is_template is True:
+
+            suffix_length = 1 + len(self.name)
+
+            specified_values = {obj_i[:-suffix_length]: self._getSpecifiedValue(obj_i) for eq_i in new_equations for obj_i in eq_i.objects_declared}
+
+            _equation_templates[template_key] = (self.name, [copy(eq_i) for eq_i in new_equations], specified_values)
+
+    def _getSpecifiedValue(self, obj_name):
+
+        """
+        Return the value of one object of the current model if it is specified, or None otherwise
+
+        :param str obj_name:
+            Name of the object
+
+        :rtype float:
+        """
+
+        obj_ = {**self.constants, **self.parameters, **self.variables}[obj_name]
+
+        return obj_.value if getattr(obj_, 'is_specified', False) is True else None
+
+    def _addEquationsFromTemplate(self, template_model_name, template_equations, specified_values={}):
+
+        """
+        Add to the current model the equations of one template, renaming their symbols from the template model to the current one (eg: 'T_in_<template model name>' to 'T_in_<current model name>')
+
+        :param str template_model_name:
+            Name of the model from which the template was derived
+
+        :param list(Equation) template_equations:
+            Equation objects of the template
+
+        :param dict specified_values:
+            Values of the specified objects of the template model (None for the others), by name without the suffix of the model
+
+        :return:
+            True if the equations were added, or False if the current model lacks some of the objects declared in the template, or if its specified objects differ from those of the template model (whose values are kept in the symbolic objects)
+        :rtype bool:
+        """
+
+        whole_objects_map = {**self.constants, **self.parameters, **self.variables}
+
+        suffix_length = 1 + len(template_model_name)
+
+        names_map = {}
+
+        for eq_i in template_equations:
+
+            for obj_i in eq_i.objects_declared:
+
+                names_map[obj_i] = obj_i[:-suffix_length] + '_' + self.name
+
+        if any(obj_i not in whole_objects_map for obj_i in names_map.values()):
+
+            return False
+
+        if any(self._getSpecifiedValue(obj_i + '_' + self.name) != value_i for (obj_i, value_i) in specified_values.items()):
+
+            return False
+
+        for eq_i in template_equations:
+
+            eq_ = copy(eq_i)
+
+            eq_.name = eq_i.name[:-suffix_length] + '_' + self.name
+
+            eq_.owner_model_name = self.name
+
+            eq_._convertEquationSymbolicExpression(names_map, whole_objects_map)
+
+            self.equations[eq_.name] = eq_
+
+        return True
+
     def _setInlets(self, inlets, inlet_name='in'):
 
         try:
@@ -750,8 +920,61 @@ class Model:
 
         self.parameter_arrays[par_array.name] = par_array
 
+        #The elements are Parameter objects of the current model
+
+        self.parameters.update({par_i.name: par_i for par_i in par_array})
+
         return par_array
 
+    def createVariableArray(self, name, size, units, description = "", is_lower_bounded = False, is_upper_bounded = False, lower_bound = None, upper_bound = None, is_exposed = False, type = '', latex_text="", value = 0.):
+
+        """
+        Function for creation of an VariableArray object. Store the VariableArray object in '.variable_arrays' dict, and its elements (Variable objects named <name>_<index>_<model name>, whose values are stored contiguously) in '.variables' dict.
+
+        :param str name:
+            Name for the current VariableArray
+
+        :param int size:
+            Size for the current VariableArray
+
+        :param Unit units:
+            Definition of dimensional unit of current VariableArray
+
+        :param str description:
+            Description for the present VariableArray. Defauls to ""
+
+        :param float lower_bound:
+            Minimum value for the elements
+
+        :param float upper_bound:
+            Maximum value for the elements
+
+        :param str latex_text:
+            Latex text to represent the variable array
+
+        :param [float, list(float)] value:
+            Value of the elements, or list of values (one for each element). Defaults to 0.
+        """
+
+        if latex_text is "":
+            latex_text = name
+
+        var_array = VariableArray(name, size, units, description, is_lower_bounded, is_upper_bounded, lower_bound, upper_bound, value, is_exposed, type, latex_text, self.name)
+
+        var_array.name=var_array.name+'_'+self.name
+
+        self.variable_arrays[var_array.name] = var_array
+
+        #The elements are Variable objects of the current model
+
+        self.variables.update({var_i.name: var_i for var_i in var_array})
+
+        if is_exposed == True:
+
+            self.exposed_vars[type].extend(var_array)
+
+        return var_array
+
     def createParameter(self, name, units , description = "", value = 0, latex_text=""):
 
         """
@@ -866,6 +1089,44 @@ class Model:
             return eq
 
 
+    def createEquationArray(self, name, description="", expr=None, arrays=[], check_equation=True):
+
+        """
+        Function for creation of an EquationArray object, which declares one equation over whole VariableArray and ParameterArray objects. The symbolic equation is derived only once, and the element equations (named <name>_<index>_<model name>) are obtained by renaming it. Store the EquationArray object in '.equation_arrays' dict, and the element equations in '.equations' dict.
+
+        :ivar str name:
+            Name for the current equation array
+
+        :ivar str description:
+            Description for the present equation array. Defaults to ""
+
+        :param function expr:
+            Function receiving one slot quantity for each array and returning the EquationNode object of the equation for one generic index (eg: lambda x, k: x() - k()*self.y())
+
+        :param list(QuantityArray) arrays:
+            Arrays over which the equation is declared, all of them with the same size
+
+        :return:
+            EquationArray object
+        :rtype EquationArray:
+        """
+
+        eq_array = EquationArray(name, description, expr, arrays, owner_model_name=self.name)
+
+        eq_array.name = eq_array.name+'_'+self.name
+
+        for eq_i in eq_array.equations:
+
+            if check_equation is True:
+
+                self._checkEquation_(eq_i)
+
+            self.equations[eq_i.name] = eq_i
+
+        self.equation_arrays[eq_array.name] = eq_array
+
+        return eq_array
+
     #==== FUNCTIONS THAT SHOULD BE PROVIDED BY THE USER ====
 
     def DeclareVariables(self):
@@ -14,6 +14,7 @@ import pandas as pd
 
 from .core.error_definitions import *
 from .core.quantity import Quantity
+from .profiler import _createProfiler
 
 import matplotlib.pyplot as plt
 from datetime import datetime
@@ -285,6 +286,8 @@ class Optimization:
 
         self.run_sucessful = False
 
+        self.profiler = None
+
     def saveConfigurations(self, file_name):
 
         with open(file_name, "w") as write_file:
@@ -526,17 +529,42 @@ class Optimization:
 
         return self.optimization_log
 
-    def runOptimization(self, print_output=True, report_frequency=0, optimization_log=True, save_optimization_graph=False):
+    def runOptimization(self, print_output=True, report_frequency=0, optimization_log=True, save_optimization_graph=False, profile=False):
+
+        """
+        Run the optimization
+
+        :param bool print_output:
+            If True, print the best individual found. Defaults to True
+
+        :param int report_frequency:
+            Verbosity of the pygmo algorithm. Defaults to 0
+
+        :param bool optimization_log:
+            If True, store the optimization log. Defaults to True
+
+        :param bool save_optimization_graph:
+            If True, save a graph containing the optimization progress. Defaults to False
+
+        :param [bool, str, Profiler] profile:
+            If True, capture cProfile data for each stage of the run (setup, evolution, log), writing .prof and collapsed-stack files into the 'prof' directory and printing the hottest functions from the sloth package. A str is used as the output directory, and a Profiler object may be supplied for custom settings. Defaults to False
+        """
+
+        profiler = _createProfiler(profile, 'optimization-' + self.optimizer)
+
+        self.profiler = profiler
 
         if self._performSaneTests() == True:
 
-            self.optimization_problem._setSimulationInstance(self.simulation)
+            with profiler.stage('setup'):
 
-            self.optimization_problem._setSimulationConfiguration(self.simulation_configuration)
+                self.optimization_problem._setSimulationInstance(self.simulation)
 
-            self.optimization_problem.setBounds(self.constraints)
+                self.optimization_problem._setSimulationConfiguration(self.simulation_configuration)
 
-            self.optimization_mechanism.set_verbosity(report_frequency)
+                self.optimization_problem.setBounds(self.constraints)
+
+                self.optimization_mechanism.set_verbosity(report_frequency)
 
             # Print information
 
@@ -546,11 +574,15 @@ class Optimization:
 
             # Run optimization
 
-            prob = pg.problem(self.optimization_problem)
+            with profiler.stage('population'):
+
+                prob = pg.problem(self.optimization_problem)
 
-            pop = pg.population(prob, size=self.optimization_configuration['number_of_individuals'])
+                pop = pg.population(prob, size=self.optimization_configuration['number_of_individuals'])
 
-            pop = self.optimization_mechanism.evolve(pop)
+            with profiler.stage('evolve'):
+
+                pop = self.optimization_mechanism.evolve(pop)
 
             self.best_parameters = pop.champion_x
 
@@ -562,9 +594,11 @@ class Optimization:
 
             if optimization_log is True:
 
-                self.optimization_log = self.optimization_mechanism.extract(self._pagmo_selected_algorithm).get_log()
+                with profiler.stage('log'):
+
+                    self.optimization_log = self.optimization_mechanism.extract(self._pagmo_selected_algorithm).get_log()
 
-                self.optimization_log = pd.DataFrame(self.optimization_log, columns=self._pagmo_selected_algorithm_log_columns)
+                    self.optimization_log = pd.DataFrame(self.optimization_log, columns=self._pagmo_selected_algorithm_log_columns)
 
             if save_optimization_graph is True:
 
@@ -612,6 +646,10 @@ class Optimization:
 
             self.run_sucessful=True
 
+            profiler.dump()
+
+            profiler.printSummary()
+
         else:
 
             raise Exception("Ill-formed optimization configuration")
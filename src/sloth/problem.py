@@ -7,6 +7,7 @@ Define Problem class. Unite several Model classes through Connections, forming o
 from .core.error_definitions import ExposedVariableError, AbsentRequiredObjectError
 from .core.equation_block import EquationBlock
 from .core.expression_evaluation import EquationNode
+from .core.equation_operators import Sum
 from collections import OrderedDict
 from .core.variable import Variable
 from .core.parameter import Parameter
@@ -254,7 +255,7 @@ class Problem:
 
                 if expr is None:
 
-                    expr = sum([in_var_i.__call__() for in_var_i in input_var_]) - sum([out_var_i.__call__() for out_var_i in output_var_])
+                    expr = Sum([in_var_i.__call__() for in_var_i in input_var_]) - Sum([out_var_i.__call__() for out_var_i in output_var_])
 
                 # The process of connection creation
 
@@ -377,6 +378,24 @@ class Problem:
 
             self.parameter_dict.update(model_list.parameters)
 
+    def validateDimensions(self):
+
+        """
+        Check the dimensional coherence of the equations of all the models of the current Problem, raising DimensionalCoherenceError for the first incoherence found (see Model.validateDimensions). The models must have been declared already (eg: by resolve)
+
+        :return:
+            Units of the residuals of the equations, by equation name
+        :rtype dict:
+        """
+
+        units_ = {}
+
+        for model_i in self.models.values():
+
+            units_.update(model_i.validateDimensions())
+
+        return units_
+
     def resolve(self):
 
         """
@@ -0,0 +1,345 @@
+# *coding:utf-8 *
+
+"""
+Define profiling mechanisms for simulation and optimization runs
+"""
+
+import os
+import cProfile
+import pstats
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import prettytable
+
+from .core.error_definitions import UnexpectedValueError
+
+
+def _createProfiler(profile, name):
+
+    """
+    Create a Profiler object given the value supplied for the 'profile' argument of Simulation.runSimulation or Optimization.runOptimization, and return it.
+
+    :param [bool, str, Profiler] profile:
+        If False or None, a disabled Profiler is returned. If True, a Profiler writing into the default output directory is returned. If str, it is used as the output directory. A Profiler object is returned as is.
+
+    :param str name:
+        Name used as prefix of the files written by the Profiler
+
+    :return:
+        Profiler object
+    :rtype Profiler:
+    """
+
+    if profile is None or profile is False:
+
+        return Profiler(name, enabled=False)
+
+    elif profile is True:
+
+        return Profiler(name)
+
+    elif isinstance(profile, str):
+
+        return Profiler(name, output_dir=profile)
+
+    elif isinstance(profile, Profiler):
+
+        return profile
+
+    else:
+
+        raise UnexpectedValueError("[bool, str, Profiler]")
+
+
+class Profiler:
+
+    """
+    Defines Profiler class, which captures cProfile data for each stage of one run, writing .prof files and collapsed-stack files (usable by flamegraph tools such as flamegraph.pl or speedscope), and reporting the hottest functions from the sloth package
+    """
+
+    def __init__(self, name, output_dir='prof', top_n=20, package='sloth', enabled=True):
+
+        """
+        Instantiate Profiler
+
+        :ivar str name:
+            Name used as prefix of the files written
+
+        :ivar str output_dir:
+            Directory in which the profiling files will be written. Defaults to 'prof'
+
+        :ivar int top_n:
+            Number of functions reported in the hot-function summary
+
+        :ivar str package:
+            Name of the package to which the hot-function summary is scoped. Defaults to 'sloth'
+
+        :ivar bool enabled:
+            If False, the stages are executed without profiling
+
+        :ivar OrderedDict profiles:
+            cProfile.Profile objects captured for each stage, in execution order
+        """
+
+        self.name = name
+
+        self.output_dir = output_dir
+
+        self.top_n = top_n
+
+        self.package = package
+
+        self.enabled = enabled
+
+        self.profiles = OrderedDict({})
+
+    @contextmanager
+    def stage(self, stage_name):
+
+        """
+        Context manager that profiles the code executed within it as the stage stage_name. Re-entering one stage accumulates the profiling data.
+
+        :param str stage_name:
+            Name of the stage
+        """
+
+        if self.enabled is not True:
+
+            yield
+
+            return
+
+        if stage_name not in self.profiles:
+
+            self.profiles[stage_name] = cProfile.Profile()
+
+        profile_ = self.profiles[stage_name]
+
+        profile_.enable()
+
+        try:
+
+            yield
+
+        finally:
+
+            profile_.disable()
+
+    def getStats(self, stage_name=None):
+
+        """
+        Return the pstats.Stats object for one stage, or the combined one for all the stages
+
+        :param str stage_name:
+            Name of the stage. Defaults to None, which combines all the stages
+
+        :return:
+            Profiling statistics
+        :rtype pstats.Stats:
+        """
+
+        if stage_name is not None:
+
+            return pstats.Stats(self.profiles[stage_name])
+
+        profiles_ = list(self.profiles.values())
+
+        stats_ = pstats.Stats(profiles_[0])
+
+        for profile_i in profiles_[1:]:
+
+            stats_.add(profile_i)
+
+        return stats_
+
+    def _isFromPackage(self, func):
+
+        file_name = func[0].replace('\\', '/')
+
+        return ('/' + self.package + '/') in file_name
+
+    @staticmethod
+    def _labelFunction(func):
+
+        file_name, line_number, func_name = func
+
+        if file_name == '~':
+
+            return func_name
+
+        return "%s:%d(%s)" % (os.path.basename(file_name), line_number, func_name)
+
+    def _getCollapsedStacks(self, stats, min_time=1e-6, max_depth=64):
+
+        """
+        Convert the profiling data into collapsed stacks ('caller;callee;... microseconds'). As cProfile only records caller-callee pairs, the time of each function is distributed among the call paths proportionally to the time spent through each caller.
+
+        :param pstats.Stats stats:
+            Profiling statistics
+
+        :param float min_time:
+            Paths whose time is lower than this value (in seconds) are discarded
+
+        :param int max_depth:
+            Maximum depth of the stacks
+
+        :return:
+            Collapsed stacks
+        :rtype list(str):
+        """
+
+        raw_stats = stats.stats
+
+        children = {}
+
+        for func_i, (_, _, _, _, callers_i) in raw_stats.items():
+
+            for caller_j, edge_j in callers_i.items():
+
+                children.setdefault(caller_j, []).append((func_i, edge_j[3]))
+
+        roots = [func_i for func_i, stat_i in raw_stats.items() if len(stat_i[4]) == 0]
+
+        collapsed = OrderedDict({})
+
+        def walk(func, stack, path_time):
+
+            total_time = raw_stats[func][3]
+
+            scale = path_time / total_time if total_time > 0 else 0.
+
+            stack = stack + [self._labelFunction(func)]
+
+            key_ = ';'.join(stack)
+
+            collapsed[key_] = collapsed.get(key_, 0.) + raw_stats[func][2] * scale
+
+            if len(stack) >= max_depth:
+
+                return
+
+            for child_i, edge_time_i in children.get(func, []):
+
+                child_time_i = edge_time_i * scale
+
+                if child_time_i >= min_time and self._labelFunction(child_i) not in stack:
+
+                    walk(child_i, stack, child_time_i)
+
+        for root_i in roots:
+
+            walk(root_i, [], raw_stats[root_i][3])
+
+        return ["%s %d" % (k, int(round(v * 1e6))) for k, v in collapsed.items() if int(round(v * 1e6)) > 0]
+
+    def dump(self):
+
+        """
+        Write the .prof and the collapsed-stack (.folded) files for each stage, and for all the stages combined
+
+        :return:
+            Names of the files written
+        :rtype list(str):
+        """
+
+        if self.enabled is not True or len(self.profiles) == 0:
+
+            return []
+
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        written_files = []
+
+        stages_ = [(stage_i, self.getStats(stage_i)) for stage_i in self.profiles.keys()]
+
+        stages_.append(('combined', self.getStats()))
+
+        for stage_i, stats_i in stages_:
+
+            prefix_ = os.path.join(self.output_dir, self.name + '-' + stage_i)
+
+            stats_i.dump_stats(prefix_ + '.prof')
+
+            with open(prefix_ + '.folded', 'w') as write_file:
+
+                write_file.write('\n'.join(self._getCollapsedStacks(stats_i)) + '\n')
+
+            written_files.extend([prefix_ + '.prof', prefix_ + '.folded'])
+
+        return written_files
+
+    def getHotFunctions(self, top_n=None, sort_key='tottime'):
+
+        """
+        Return the hottest functions from the package, considering all the stages
+
+        :param int top_n:
+            Number of functions to be returned. Defaults to None, which uses the value defined in the instantiation
+
+        :param str sort_key:
+            Key used for sorting the functions ('tottime', 'cumtime', 'ncalls')
+
+        :return:
+            List of tuples (function label, ncalls, tottime, cumtime)
+        :rtype list(tuple):
+        """
+
+        if top_n is None:
+
+            top_n = self.top_n
+
+        sort_index = {'ncalls': 1, 'tottime': 2, 'cumtime': 3}
+
+        if sort_key not in sort_index:
+
+            raise UnexpectedValueError("string ('tottime', 'cumtime', 'ncalls')")
+
+        if len(self.profiles) == 0:
+
+            return []
+
+        hot_functions = [(self._labelFunction(func_i), stat_i[1], stat_i[2], stat_i[3])
+                         for func_i, stat_i in self.getStats().stats.items()
+                         if self._isFromPackage(func_i)
+                         ]
+
+        hot_functions.sort(key=lambda x: x[sort_index[sort_key]], reverse=True)
+
+        return hot_functions[:top_n]
+
+    def printSummary(self, top_n=None, sort_key='tottime'):
+
+        """
+        Print the time spent in each stage, and the top-N hottest functions from the package
+
+        :param int top_n:
+            Number of functions to be reported. Defaults to None, which uses the value defined in the instantiation
+
+        :param str sort_key:
+            Key used for sorting the functions ('tottime', 'cumtime', 'ncalls')
+        """
+
+        if self.enabled is not True or len(self.profiles) == 0:
+
+            return
+
+        tab_stages = prettytable.PrettyTable()
+
+        tab_stages.field_names = ["Stage", "Time (s)"]
+
+        for stage_i in self.profiles.keys():
+
+            tab_stages.add_row([stage_i, "%.6f" % self.getStats(stage_i).total_tt])
+
+        tab = prettytable.PrettyTable()
+
+        tab.field_names = ["Function", "ncalls", "tottime (s)", "cumtime (s)"]
+
+        for label_i, ncalls_i, tottime_i, cumtime_i in self.getHotFunctions(top_n, sort_key):
+
+            tab.add_row([label_i, ncalls_i, "%.6f" % tottime_i, "%.6f" % cumtime_i])
+
+        print("\nProfiling stages:\n" + str(tab_stages))
+
+        print("\nHot functions (%s package, sorted by %s):\n" % (self.package, sort_key) + str(tab))
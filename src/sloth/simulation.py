@@ -16,6 +16,7 @@ from collections import OrderedDict
 import json
 from .core.quantity import Quantity
 from .print_headings import print_heading
+from .profiler import _createProfiler
 
 
 class Simulation:
@@ -57,6 +58,12 @@ class Simulation:
 
         self.status = None
 
+        self.solver_stats = None
+
+        self.profiler = None
+
+        self.residual_norms = None
+
     def report(self, object):
 
         """
@@ -115,14 +122,29 @@ class Simulation:
                           output_headers=None,
                           variable_name_map={},
                           compilation_mechanism="numpy",
+                          common_subexpression_elimination=True,
                           definition_dict=None,
                           configurations_file=None,
                           number_parameters_to_optimize=0,
-                          times_for_solution=None):
+                          times_for_solution=None,
+                          residual_tolerance=1e-6,
+                          use_stencil_kernels=True):
 
         """
         Set the configurations of the current simulation using the defined parameters
 
+        :ivar str compilation_mechanism:
+            Mechanism used to compile the equations ('numpy', 'mpmath', 'math', 'numexpr', 'C' or 'symengine'). 'C' generates native C kernels for the residuals, right-hand sides and Jacobians, which are built with the local C compiler and loaded through ctypes. 'symengine' compiles them through SymEngine's Lambdify (LLVM backend, if available). Defaults to 'numpy'
+
+        :ivar bool common_subexpression_elimination:
+            If True, perform a common subexpression elimination across the equations (and Jacobian entries) before their compilation. Defaults to True
+
+        :ivar float residual_tolerance:
+            Tolerance for the maximum norm of the final residuals scaled per equation, used in the convergence check reported by runSimulation (algebraic problems only). Defaults to 1e-6
+
+        :ivar bool use_stencil_kernels:
+            If True, differential systems declared entirely by EquationArray objects (eg: method of lines over one SpatialDomain) are evaluated through the vectorised kernels of the arrays, and their banded structure is supplied to ODEINT. Defaults to True
+
         :ivar dict definition_dict:
             Dictionary containing configurations for override all Simulation.runSimulation arguments with those defined in it. Tipically used for performing consecutive simulations (eg: optimization) or using predefined simulation configurations
         """
@@ -149,8 +171,11 @@ class Simulation:
                                              'output_headers': output_headers,
                                              'variable_name_map': variable_name_map,
                                              'compilation_mechanism': compilation_mechanism,
+                                             'common_subexpression_elimination': common_subexpression_elimination,
                                              'number_parameters_to_optimize': number_parameters_to_optimize,
-                                             'times_for_solution': times_for_solution
+                                             'times_for_solution': times_for_solution,
+                                             'residual_tolerance': residual_tolerance,
+                                             'use_stencil_kernels': use_stencil_kernels
                                }
 
 
@@ -191,8 +216,11 @@ class Simulation:
                                'output_headers': output_headers,
                                'variable_name_map': variable_name_map,
                                'compilation_mechanism': compilation_mechanism,
+                               'common_subexpression_elimination': common_subexpression_elimination,
                                'number_parameters_to_optimize': number_parameters_to_optimize,
-                               'times_for_solution': times_for_solution
+                               'times_for_solution': times_for_solution,
+                               'residual_tolerance': residual_tolerance,
+                               'use_stencil_kernels': use_stencil_kernels
                                }
 
         # print("additional_conf is: %s"%additional_conf)
@@ -203,10 +231,30 @@ class Simulation:
 
         self.configurations = additional_conf
 
-    def runSimulation(self, sanity_check=True, show_output_msg=True, show_final_residuals=True):
+    def runSimulation(self, sanity_check=True, show_output_msg=True, show_final_residuals=True, profile=False):
+
+        """
+        Run the current simulation
+
+        :param bool sanity_check:
+            If True, perform the degrees of freedom sanity check prior to the solution. Defaults to True
+
+        :param bool show_output_msg:
+            If True, print the exit status of the simulation. Defaults to True
+
+        :param bool show_final_residuals:
+            If True, print the final residuals for the equations, scaled per equation, and their norms, which are stored in the residual_norms atribute together with the convergence check (algebraic problems only). Defaults to True
+
+        :param [bool, str, Profiler] profile:
+            If True, capture cProfile data for each stage of the run (solver creation, sanity check, solution, final residuals), writing .prof and collapsed-stack files into the 'prof' directory and printing the hottest functions from the sloth package. A str is used as the output directory, and a Profiler object may be supplied for custom settings. Defaults to False
+        """
 
         print_heading()
 
+        profiler = _createProfiler(profile, self.name)
+
+        self.profiler = profiler
+
         problem_type = self.configurations['problem_type']
 
         number_parameters_to_optimize = self.configurations['number_parameters_to_optimize']
@@ -214,32 +262,38 @@ class Simulation:
         if problem_type == None:
             problem_type = self.problem._getProblemType()
 
-        if problem_type == "linear":
+        with profiler.stage('solver_creation'):
 
-            solver_mechanism = solvers._createSolver(self.problem, self.configurations)
+            if problem_type == "linear":
 
-        elif problem_type == "nonlinear":
+                solver_mechanism = solvers._createSolver(self.problem, self.configurations)
 
-            solver_mechanism = solvers._createSolver(self.problem, self.configurations)
+            elif problem_type == "nonlinear":
 
-        elif problem_type == "differential":
+                solver_mechanism = solvers._createSolver(self.problem, self.configurations)
 
-            solver_mechanism = solvers._createSolver(self.problem, self.configurations)
+            elif problem_type == "differential":
 
-        elif problem_type == "differential-algebraic":
+                solver_mechanism = solvers._createSolver(self.problem, self.configurations)
 
-            solver_mechanism = solvers._createSolver(self.problem, self.configurations)
-        else:
+            elif problem_type == "differential-algebraic":
+
+                solver_mechanism = solvers._createSolver(self.problem, self.configurations)
+            else:
 
-            raise UnexpectedValueError("EquationBlock")
+                raise UnexpectedValueError("EquationBlock")
 
         dof_analist = analysis.DOF_Analysis(self.problem, number_parameters_to_optimize)
 
         if sanity_check is True:
 
-            dof_analist._makeSanityChecks()
+            with profiler.stage('sanity_check'):
+
+                dof_analist._makeSanityChecks()
 
-        out = solver_mechanism.solve(self.configurations)
+        with profiler.stage('solve'):
+
+            out = solver_mechanism.solve(self.configurations)
 
         '''
         if print_output==True and problem_type != 'differential':
@@ -249,6 +303,8 @@ class Simulation:
 
         self.output = out
 
+        self.solver_stats = solver_mechanism.stats
+
         self.domain = self.configurations['domain']
 
         if show_output_msg is True:
@@ -267,24 +323,46 @@ class Simulation:
 
             if problem_type not in ['differential', 'differential-algebraic']:
 
-                header = "\nFinal residuals from equations:\n"
+                with profiler.stage('final_residuals'):
+
+                    header = "\nFinal residuals from equations:\n"
+
+                    tab = prettytable.PrettyTable()
 
-                tab = prettytable.PrettyTable()
+                    tab.field_names = ["Equation", "Residual", "Scaled residual"]
 
-                tab.field_names = ["Equation", "Residual"]
+                    residual_kernel = self.problem.equation_block.getResidualKernel(compilation_mechanism=self.configurations.get('compilation_mechanism', 'numpy'),
+                                                                                    cse=self.configurations.get('common_subexpression_elimination', True))
 
-                for i,_ in enumerate(self.problem.equation_block.equations):
+                    results_ = self.getResults('dict')
 
-                    tab.add_row([self.problem.equation_block.equations[i].name,
-                                 self.problem.equation_block._equations_list[i].subs(self.getResults('dict'))]
-                                )
+                    residuals_, scaled_residuals_ = residual_kernel.getScaledResiduals(results_)
+
+                    for (name_i, residual_i, scaled_residual_i) in zip(residual_kernel.names, residuals_, scaled_residuals_):
+
+                        tab.add_row([name_i, residual_i, scaled_residual_i])
+
+                    self.residual_norms = residual_kernel.getNorms(results_)
+
+                    tolerance_ = self.configurations.get('residual_tolerance', 1e-6)
+
+                    self.residual_norms['converged'] = self.residual_norms['max'] <= tolerance_
 
                 print(header + str(tab))
 
+                print("Scaled residual norms: max = %.3e, RMS = %.3e (%s within the tolerance %g)." % (self.residual_norms['max'],
+                                                                                                 self.residual_norms['rms'],
+                                                                                                 "converged" if self.residual_norms['converged'] else "NOT converged",
+                                                                                                 tolerance_))
+
             else:
 
                 print("\nThe final results for equation residuals were not printed, as the current problem is "+problem_type.upper()+".")
 
+        profiler.dump()
+
+        profiler.printSummary()
+
 
     def getStatus(self):
 
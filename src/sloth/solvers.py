@@ -9,7 +9,6 @@ from collections import OrderedDict
 import prettytable
 import numpy as np
 from sympy import solve as sp_solve
-#import symengine as sp
 import scipy.integrate as integrate
 from scipy.optimize import root as scp_root
 
@@ -76,6 +75,178 @@ def _createSolver(problem, additional_configurations):
         raise UnexpectedValueError("EquationBlock")
 
 
+class SolverStats:
+
+    """
+    Defines SolverStats class, which gathers the statistics reported by the numerical solvers (eg: number of function and Jacobian evaluations, number of steps) together with the number of calls performed to the compiled kernels
+    """
+
+    # Names used by each solver backend for the same statistic (scipy root/pyneqsys, odeint and assimulo, respectively)
+
+    _stat_aliases = OrderedDict({'nfev': ('nfev', 'nfe', 'nfcns'),
+                                 'njev': ('njev', 'nje', 'njacs'),
+                                 'nsteps': ('nsteps', 'nst', 'nit')
+                                 })
+
+    def __init__(self, solver_name=None):
+
+        """
+        Instantiate SolverStats
+
+        :ivar str solver_name:
+            Name of the solver mechanism whose statistics are being collected
+
+        :ivar int nfev:
+            Number of function (rhs or residual) evaluations reported by the solver
+
+        :ivar int njev:
+            Number of Jacobian evaluations reported by the solver
+
+        :ivar int nsteps:
+            Number of steps (or iterations) reported by the solver
+
+        :ivar int rhs_calls:
+            Number of calls performed to the right-hand side kernel of differential systems
+
+        :ivar int residual_calls:
+            Number of calls performed to the residual kernel
+
+        :ivar int jacobian_calls:
+            Number of calls performed to the Jacobian kernel
+
+        :ivar dict raw:
+            Statistics as reported by the solver, without any post-processing
+        """
+
+        self.solver_name = solver_name
+
+        self.nfev = 0
+
+        self.njev = 0
+
+        self.nsteps = 0
+
+        self.rhs_calls = 0
+
+        self.residual_calls = 0
+
+        self.jacobian_calls = 0
+
+        self.success = None
+
+        self.message = ''
+
+        self.raw = OrderedDict({})
+
+    def _update(self, reported_stats):
+
+        """
+        Update current statistics with those reported by one solver. Counters are accumulated, so successive solver runs (eg: root polishing followed by the main solver) are summed up.
+
+        :param dict reported_stats:
+            Dict-like object containing the statistics reported by the solver (scipy OptimizeResult, pyneqsys info dict, odeint infodict or assimulo statistics)
+        """
+
+        if reported_stats is None:
+
+            return
+
+        for key_i in list(reported_stats.keys()):
+
+            val_i = reported_stats[key_i]
+
+            # odeint reports cumulative arrays (one entry per time step), thus only the last value is kept
+
+            if isinstance(val_i, np.ndarray) and val_i.ndim == 1 and val_i.size > 0 and key_i in ('nfe', 'nje', 'nst'):
+
+                val_i = val_i[-1]
+
+            self.raw[key_i] = val_i
+
+        for stat_i, aliases_i in self._stat_aliases.items():
+
+            for alias_j in aliases_i:
+
+                if alias_j in self.raw and alias_j in list(reported_stats.keys()):
+
+                    setattr(self, stat_i, getattr(self, stat_i) + int(self.raw[alias_j]))
+
+                    break
+
+        if 'success' in list(reported_stats.keys()):
+
+            self.success = bool(reported_stats['success'])
+
+        if 'message' in list(reported_stats.keys()):
+
+            self.message = str(reported_stats['message'])
+
+    def _countCalls(self, fun, kind):
+
+        """
+        Wrap one kernel in order to count the number of calls performed to it
+
+        :param function fun:
+            Kernel to be wrapped
+
+        :param str kind:
+            Kind of the kernel ('rhs', 'residual', 'jacobian'), or tuple of kinds for kernels evaluating several of them at once (eg: ('residual', 'jacobian')), for which every counter is incremented
+
+        :return:
+            Wrapped kernel, with the same signature of the original one
+        :rtype function:
+        """
+
+        counter_names = [kind_i + '_calls' for kind_i in ((kind,) if isinstance(kind, str) else kind)]
+
+        if not all(hasattr(self, counter_i) for counter_i in counter_names):
+
+            raise UnexpectedValueError("string ('rhs', 'residual', 'jacobian')")
+
+        def counted_fun(*args, **kwargs):
+
+            for counter_i in counter_names:
+
+                setattr(self, counter_i, getattr(self, counter_i) + 1)
+
+            return fun(*args, **kwargs)
+
+        return counted_fun
+
+    def asDict(self):
+
+        """
+        Return the current statistics as a dictionary
+
+        :return:
+            Dictionary containing the statistics
+        :rtype dict:
+        """
+
+        return OrderedDict({'solver': self.solver_name,
+                            'nfev': self.nfev,
+                            'njev': self.njev,
+                            'nsteps': self.nsteps,
+                            'rhs_calls': self.rhs_calls,
+                            'residual_calls': self.residual_calls,
+                            'jacobian_calls': self.jacobian_calls,
+                            'success': self.success,
+                            'message': self.message
+                            })
+
+    def __str__(self):
+
+        tab = prettytable.PrettyTable()
+
+        tab.field_names = ["Statistic", "Value"]
+
+        for key_i, val_i in self.asDict().items():
+
+            tab.add_row([key_i, val_i])
+
+        return "\nSolver statistics:\n" + str(tab)
+
+
 class Solver:
 
     """
@@ -105,6 +276,34 @@ class Solver:
 
         self.additional_configurations = additional_configurations
 
+        self.stats = SolverStats(solver)
+
+        self._prepared = {}
+
+    def prepare(self):
+
+        """
+        Build the symbolic systems and kernels used by the solver mechanism ahead of the solution, so that solve() performs only numerical work. Solvers whose kernels are compiled in the instantiation have nothing left to prepare.
+        """
+
+        pass
+
+    def _getSymbolicSys(self, var_names, equations_list):
+
+        """
+        Return the pyneqsys SymbolicSys for the current equation block, building it only in the first call
+
+        :return:
+            SymbolicSys with counted callbacks
+        :rtype SymbolicSys:
+        """
+
+        if 'symbolic_sys' not in self._prepared:
+
+            self._prepared['symbolic_sys'] = self._countSymbolicSysCalls(SymbolicSys(var_names, equations_list))
+
+        return self._prepared['symbolic_sys']
+
     def _printSolvingInfo(self, solution_dict):
 
         """
@@ -114,17 +313,58 @@ class Solver:
 
         pass
 
-    def _polishRoot(self, initial_guess, polisher='hybr'):
+    def _getPolisherFunction(self, polisher='hybr'):
 
-        fun = self.problem.equation_block._getEquationBlockAsFunction()
+        """
+        Return the kernel used by the root polisher, building it only in the first call
+
+        :param str polisher:
+            Name of the polisher ('hybr' or 'anderson')
+
+        :return:
+            Kernel with counted calls
+        :rtype function:
+        """
+
+        if ('polisher', polisher) in self._prepared:
+
+            return self._prepared[('polisher', polisher)]
+
+        use_cse = self.additional_configurations.get('common_subexpression_elimination', True)
+
+        # The polishers always work on numpy arrays, unless native (C or SymEngine) kernels were requested
+
+        compilation_mechanism = self.additional_configurations.get('compilation_mechanism')
+
+        if compilation_mechanism not in ['C', 'symengine']:
+
+            compilation_mechanism = 'numpy'
+
+        if polisher == 'hybr':
+
+            # Residuals and Jacobian share the common subexpressions, thus one kernel evaluates both of them
+
+            fun = self.stats._countCalls(self.problem.equation_block._getResidualAndJacobianAsFunction(compilation_mechanism, use_cse), ('residual', 'jacobian'))
+
+        else:
+
+            fun = self.stats._countCalls(self.problem.equation_block._getEquationBlockAsFunction(cse=use_cse), 'residual')
+
+        self._prepared[('polisher', polisher)] = fun
+
+        return fun
+
+    def _polishRoot(self, initial_guess, polisher='hybr'):
 
         if polisher is None or polisher == '' or polisher == 'hybr':
 
-            # Default option is scipy's HYBR method
+            # Default option is scipy's HYBR method, supplied with the analytic Jacobian
 
             # initial_guess = nparray(initial_guess)
 
-            polished_root = scp_root(fun, x0=initial_guess, method='hybr')
+            polished_root = scp_root(self._getPolisherFunction('hybr'), x0=initial_guess, jac=True, method='hybr')
+
+            self.stats._update(polished_root)
 
             if polished_root.success is True:
 
@@ -136,9 +376,9 @@ class Solver:
 
         if polisher == 'anderson':
 
-            # Default option is scipy's HYBR method
+            polished_root = scp_root(self._getPolisherFunction('anderson'), initial_guess, method='anderson')
 
-            polished_root = scp_root(fun, initial_guess, method='anderson')
+            self.stats._update(polished_root)
 
             if polished_root.success is True:
 
@@ -149,6 +389,28 @@ class Solver:
                 return None
 
 
+    def _countSymbolicSysCalls(self, eq_sys):
+
+        """
+        Wrap the residual and Jacobian callbacks of one pyneqsys SymbolicSys in order to count the calls performed to them
+
+        :param SymbolicSys eq_sys:
+            System whose callbacks will be wrapped
+
+        :return:
+            The same SymbolicSys object, with wrapped callbacks
+        :rtype SymbolicSys:
+        """
+
+        eq_sys.f_cb = self.stats._countCalls(eq_sys.f_cb, 'residual')
+
+        if eq_sys.j_cb is not None:
+
+            eq_sys.j_cb = self.stats._countCalls(eq_sys.j_cb, 'jacobian')
+
+        return eq_sys
+
+
 class LASolver(Solver):
 
     """
@@ -179,6 +441,12 @@ class LASolver(Solver):
 
             return self._symbolicSysSolveMechanism
 
+    def prepare(self):
+
+        if self.solver_mechanism == self._symbolicSysSolveMechanism:
+
+            self._getSymbolicSys([i for i in self.problem.equation_block._var_list], self.problem.equation_block._equations_list)
+
     def _sympySolveMechanism(self):
 
         var_names = [str(i) for i in self.problem.equation_block._var_list]
@@ -217,10 +485,12 @@ class LASolver(Solver):
 
             initial_guess = [self.additional_configurations['initial_guess'][v_i] for v_i in var_names]
 
-        eqSys = SymbolicSys(var_names, equations_list)
+        eqSys = self._getSymbolicSys(var_names, equations_list)
 
         x_out, sol_state = eqSys.solve(initial_guess, solver='scipy', tol=1e-12, method='hybr')
 
+        self.stats._update(sol_state)
+
         #print(sol_state)
 
         if sol_state['success'] is True:
@@ -284,6 +554,17 @@ class NLASolver(Solver):
 
             raise AbsentRequiredObjectError("element from {}" % self.expected_solver_names, self.solver)
 
+    def prepare(self):
+
+        if self.solver_mechanism == self._symbolicSysSolveMechanism:
+
+            polisher = self.additional_configurations.get('initial_guess_solver')
+
+            if polisher in ['', 'hybr', 'anderson']:
+
+                self._getPolisherFunction(polisher or 'hybr')
+
+            self._getSymbolicSys([str(i) for i in self.problem.equation_block._var_list], self.problem.equation_block._equations_list)
 
     def _sympySolveMechanism(self):
 
@@ -327,12 +608,14 @@ class NLASolver(Solver):
 
                 initial_guess = polished_initial_guess
 
-        eqSys = SymbolicSys(var_names, equations_list)
+        eqSys = self._getSymbolicSys(var_names, equations_list)
 
         #REMOVE ME:print("\n ->initial_guess={}".format(initial_guess))
 
         x_out, sol_state = eqSys.solve(initial_guess, solver='scipy', tol=1e-8,  method='lm', options={'maxiter':5000})
 
+        self.stats._update(sol_state)
+
         #print(sol_state)
 
         if sol_state['success'] is True:
@@ -410,12 +693,114 @@ class DSolver(Solver):
 
         self.compiled_equations = None
 
+        self.compiled_jacobian = None
+
         self.compilation_mechanism = additional_configurations['compilation_mechanism']
 
         if self.additional_configurations['compile_equations']==True:
 
             self.compiled_equations = self._compileDiffSystemIntoFunction()
 
+            # The analytic Jacobian is supplied to the integrator only by the native (C or SymEngine) backends, for which its evaluation is cheap
+
+            if self.compilation_mechanism in ['C', 'symengine']:
+
+                self.compiled_jacobian = self.problem.equation_block._getElementaryJacobianAsFunction(self._getDiffYinOrder(), self.compilation_mechanism,
+                                                                                                      self.additional_configurations.get('common_subexpression_elimination', True))
+
+        self.stencil_kernel = None
+
+        if self.additional_configurations.get('use_stencil_kernels', True) == True:
+
+            self.stencil_kernel = self._setUpStencilKernel()
+
+    def _setUpStencilKernel(self):
+
+        """
+        Set up the evaluation of the differential system through the vectorised kernels of the EquationArray objects declaring it (eg: method of lines over one SpatialDomain), instead of through the element equations
+
+        :return:
+            Function receiving the states and the time and returning the derivatives (in the order of the differential system), or None if any differential equation is not declared by one EquationArray whose element equations all belong to the differential system
+        :rtype function:
+        """
+
+        y_positions = {name_i: i for (i, name_i) in enumerate(self._getDiffYinOrder())}
+
+        eq_positions = {eq_i.name: i for (i, eq_i) in enumerate(self.diffSystem)}
+
+        equation_arrays = OrderedDict()
+
+        for eq_i in self.diffSystem:
+
+            if eq_i.equation_array is None:
+
+                return None
+
+            equation_arrays[id(eq_i.equation_array)] = eq_i.equation_array
+
+        time_names = self.problem.time_variable_name if isinstance(self.problem.time_variable_name, list) else [self.problem.time_variable_name]
+
+        blocks_ = []
+
+        for eq_array_i in equation_arrays.values():
+
+            if any(eq_j.name not in eq_positions for eq_j in eq_array_i.equations):
+
+                return None
+
+            rows_ = np.array([eq_positions[eq_j.name] for eq_j in eq_array_i.equations])
+
+            states_ = {array_j.name: np.array([y_positions[name_k] for name_k in array_j.names]) for array_j in eq_array_i.arrays
+                       if all(name_k in y_positions for name_k in array_j.names)}
+
+            _, arguments_ = eq_array_i.getKernel('rhs')
+
+            scalars_ = {name_j: y_positions[name_j] for name_j in arguments_ if name_j in y_positions}
+
+            times_ = [name_j for name_j in arguments_ if name_j in time_names]
+
+            blocks_.append((eq_array_i, rows_, states_, scalars_, times_))
+
+        def stencilKernel(Y, t):
+
+            res = np.empty(len(Y))
+
+            for (eq_array_i, rows_, states_, scalars_, times_) in blocks_:
+
+                values_ = {name_j: Y[k] for (name_j, k) in scalars_.items()}
+
+                values_.update({name_j: t for name_j in times_})
+
+                res[rows_] = eq_array_i.evaluate(values_, 'rhs', {name_j: Y[k] for (name_j, k) in states_.items()})
+
+            return res
+
+        return stencilKernel
+
+    def _getBandwidths(self):
+
+        """
+        Return the lower and upper bandwidths of the Jacobian of the differential system, from the incidence of the states in the right-hand sides
+
+        :rtype tuple(int, int):
+        """
+
+        y_positions = {name_i: i for (i, name_i) in enumerate(self._getDiffYinOrder())}
+
+        lower_, upper_ = 0, 0
+
+        for (i, eq_i) in enumerate(self.diffSystem):
+
+            for name_j in eq_i.elementary_equation_expression[1].symbolic_map.keys():
+
+                if name_j in y_positions:
+
+                    lower_ = max(lower_, i - y_positions[name_j])
+
+                    upper_ = max(upper_, y_positions[name_j] - i)
+
+        return lower_, upper_
+
     def lookUpForSolver(self):
 
         """
@@ -462,7 +847,8 @@ class DSolver(Solver):
         return compiled_diff_equations_
         '''
 
-        return self.problem.equation_block._getEquationBlockAsFunction('elementary','rhs', self.compilation_mechanism)
+        return self.problem.equation_block._getEquationBlockAsFunction('elementary','rhs', self.compilation_mechanism,
+                                                                      self.additional_configurations.get('common_subexpression_elimination', True))
 
     def _createMappingFromValues(self, var_names, var_vals):
 
@@ -496,12 +882,21 @@ class DSolver(Solver):
 
         :return res:
             Values evaluated for the differential equations forming the differential system
-        :rtype list:
+        :rtype numpy.ndarray:
         """
 
         y_map_ = {**y_dict, **args_dict}
 
-        res = [eq_i.eval(y_map_, side='rhs') for eq_i in self.diffSystem]
+        # The differential system is compiled once into one residual kernel (without the scales of the residuals, used only by the reports of convergence), as the names of the values are the same for all the steps
+
+        if 'residual_kernel' not in self._prepared:
+
+            self._prepared['residual_kernel'] = self.problem.equation_block.getResidualKernel(list(y_map_.keys()), self.diffSystem, 'elementary', 'rhs',
+                                                                                              self.compilation_mechanism,
+                                                                                              self.additional_configurations.get('common_subexpression_elimination', True),
+                                                                                              with_scales=False)
+
+        res = self._prepared['residual_kernel'](list(y_map_.values()))
 
         return res
 
@@ -602,6 +997,10 @@ class DSolver(Solver):
 
         def diffYinterfaceForScipySolvers(Y, t, args=()):
 
+            if self.stencil_kernel is not None and len(args) == 0:
+
+                return self.stencil_kernel(Y, t)
+
             Y_ = self._createMappingFromValues(self.diffY.keys(), Y)
 
             for t_i in self.problem.time_variable_name:
@@ -655,6 +1054,25 @@ class DSolver(Solver):
 
             return res
 
+        def jacobianInterfaceForScipySolvers(Y, t, args=()):
+
+            Y_ = self._createMappingFromValues(self.diffY.keys(), Y)
+
+            for t_i in self.problem.time_variable_name:
+
+                if self.problem.equation_block._hasVarBeenDeclared(t_i, "differential") is True:
+
+                    Y_.update({t_i:t})
+
+            if len(args)>0:
+                args_ = self._createMappingFromValues(self.args_names, args)
+            else:
+                args_ = {}
+
+            global_dict = {**Y_, **args_}
+
+            return self.compiled_jacobian(*[global_dict[k] for k in self.problem.equation_block._var_list])
+
         def diffYinterfaceForAssimuloSolvers(t, Y, args=()):
 
             Y_ = self._createMappingFromValues(self.diffY.keys(), Y)
@@ -731,15 +1149,33 @@ class DSolver(Solver):
 
         if self.solver == None or self.solver == 'ODEINT':
 
-            Y = solver( diffYinterfaceForScipySolvers,
-                        Y_0,
-                        time_points,
-                        **conf_args_
-                       )
+            # full_output is always requested, so that the integrator statistics could be collected
+
+            if self.compiled_jacobian is not None and 'Dfun' not in conf_args_:
+
+                conf_args_ = {**conf_args_, 'Dfun': self.stats._countCalls(jacobianInterfaceForScipySolvers, 'jacobian')}
+
+            # Systems evaluated through stencil kernels are banded (method of lines), thus the Jacobian approximated by ODEINT is banded as well
+
+            if self.stencil_kernel is not None and 'Dfun' not in conf_args_ and 'ml' not in conf_args_ and 'mu' not in conf_args_:
+
+                lower_, upper_ = self._getBandwidths()
+
+                if lower_ + upper_ + 1 < len(Y_0):
+
+                    conf_args_ = {**conf_args_, 'ml': lower_, 'mu': upper_}
+
+            Y, infodict = solver( self.stats._countCalls(diffYinterfaceForScipySolvers, 'rhs'),
+                                  Y_0,
+                                  time_points,
+                                  **{**conf_args_, 'full_output': True}
+                                 )
+
+            self.stats._update(infodict)
 
         if self.solver == 'CVODE':
 
-            exp_mod = Explicit_Problem(diffYinterfaceForAssimuloSolvers,
+            exp_mod = Explicit_Problem(self.stats._countCalls(diffYinterfaceForAssimuloSolvers, 'rhs'),
                                         Y_0,
                                         name='CVODE')
             exp_sim = CVode(exp_mod)
@@ -751,6 +1187,8 @@ class DSolver(Solver):
 
             time_points, Y = exp_sim.simulate(end_time, ncp_list=time_points)
 
+            self.stats._update(exp_sim.statistics)
+
             time_points = np.array(time_points)
             Y = np.array(Y)
 
@@ -854,7 +1292,9 @@ class DaeSolver(Solver):
         :rtype function:
         """
 
-        return self.problem.equation_block._getEquationBlockAsFunction('residual','rhs', self.compilation_mechanism)
+        use_cse = self.additional_configurations.get('common_subexpression_elimination', True)
+
+        return self.stats._countCalls(self.problem.equation_block._getEquationBlockAsFunction('residual','rhs', self.compilation_mechanism, use_cse), 'residual')
 
     def _createMappingFromValues(self, var_names, var_vals):
 
@@ -959,6 +1399,8 @@ class DaeSolver(Solver):
 
             Time, Y, Yd = solver_instance.simulate(end_time, 0, time_points)
 
+            self.stats._update(solver_instance.statistics)
+
             #================================================
 
         to_register_ = np.hstack((np.array(time_points).reshape(-1,1), Y))
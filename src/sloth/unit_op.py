@@ -177,9 +177,9 @@ class UnitOp:
 
             for phase_i in self.model.property_package.phase_names:
 
-                mdot_phase_i = 0.
+                mdot_phase_terms = []
 
-                ndot_phase_i = 0.
+                ndot_phase_terms = []
 
                 all_mdot = 0.
 
@@ -195,9 +195,15 @@ class UnitOp:
 
                         if stream_phase_i == phase_i:
 
-                            mdot_phase_i += eval("stream.mdot()*stream.w_{}()".format(stream_phase_i))
+                            mdot_phase_terms.append(eval("stream.mdot()*stream.w_{}()".format(stream_phase_i)))
 
-                            ndot_phase_i += eval("stream.ndot()*stream.z_{}()".format(stream_phase_i))
+                            ndot_phase_terms.append(eval("stream.ndot()*stream.z_{}()".format(stream_phase_i)))
+
+                # The totalization is built as one n-ary sum over the inlets
+
+                mdot_phase_i = Sum(mdot_phase_terms)
+
+                ndot_phase_i = Sum(ndot_phase_terms)
 
                 #As the symbolic_object of an Parameter is in fact its value, the value from the EquationNode object could be extracted used this attribute
 
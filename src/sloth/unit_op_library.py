@@ -4,13 +4,68 @@
 Define Models of some unit operations to be used in the model declaration
 """
 
+import numpy as np
+
 from . import model
+from .core.block_tridiagonal import solveBlockTridiagonal, solveBlockTridiagonalNewton
+from .core.error_definitions import UnexpectedValueError
 from .core.equation_operators import *
 from .core.template_units import *
 from .core.domain import *
 
 #from .unit_op import UnitOp, MaterialStream
 
+def _sensibleHeat(unit_model, T_in, T_out):
+
+    """
+    Return the mass-specific sensible heat between two temperatures, from the integrals of the heat capacity correlations of the species (see PropertyPackage.getCorrelation), weighted by the mass fractions of the output for multiphasic models
+
+    :param Model unit_model:
+        Unit model, holding the property package and the range of temperatures of the correlations (T_range atribute)
+
+    :param EquationNode T_in:
+        Input temperature
+
+    :param EquationNode T_out:
+        Output temperature
+
+    :rtype EquationNode:
+    """
+
+    pp_ = unit_model.property_package
+
+    def _integral(phase_name):
+
+        return pp_.getCorrelation(phase_name, 'Cp', T_out, integral=True, T_range=unit_model.T_range) - pp_.getCorrelation(phase_name, 'Cp', T_in, integral=True, T_range=unit_model.T_range)
+
+    if pp_.number_of_phases >= 2:
+
+        return Sum([getattr(unit_model, "w_{}_out".format(phase_i))()*_integral(phase_i) for phase_i in pp_.phase_names])
+
+    return _integral("*")
+
+def _liquidDensity(unit_model, T):
+
+    """
+    Return the liquid density at one temperature from the density correlations of the species (see PropertyPackage.getCorrelation), mixed by the mass fractions of the output for multiphasic models (ideal mixing of volumes)
+
+    :param Model unit_model:
+        Unit model, holding the property package and the range of temperatures of the correlations (T_range atribute)
+
+    :param EquationNode T:
+        Temperature
+
+    :rtype EquationNode:
+    """
+
+    pp_ = unit_model.property_package
+
+    if pp_.number_of_phases >= 2:
+
+        return 1./Sum([getattr(unit_model, "w_{}_out".format(phase_i))()/pp_.getCorrelation(phase_i, 'rho', T, T_range=unit_model.T_range) for phase_i in pp_.phase_names])
+
+    return pp_.getCorrelation("*", 'rho', T, T_range=unit_model.T_range)
+
 class HomogeneousMaterialStream(model.Model):
 
     """
@@ -228,17 +283,10 @@ class Mixer(model.Model):
 
         if self.property_package.number_of_phases >=2:
 
-            _sum_molar_frac_in = -1.
-            _sum_mass_frac_in = -1.
-            _sum_molar_frac_out = -1.
-            _sum_mass_frac_out = -1.
-
-            for phase_i in self.property_package.phase_names:
-
-                _sum_molar_frac_in += eval("self.z_{}_in()".format(phase_i))
-                _sum_mass_frac_in += eval("self.w_{}_in()".format(phase_i))
-                _sum_molar_frac_out += eval("self.z_{}_out()".format(phase_i))
-                _sum_mass_frac_out += eval("self.w_{}_out()".format(phase_i))
+            _sum_molar_frac_in = Sum([-1.] + [getattr(self, "z_{}_in".format(phase_i))() for phase_i in self.property_package.phase_names])
+            _sum_mass_frac_in = Sum([-1.] + [getattr(self, "w_{}_in".format(phase_i))() for phase_i in self.property_package.phase_names])
+            _sum_molar_frac_out = Sum([-1.] + [getattr(self, "z_{}_out".format(phase_i))() for phase_i in self.property_package.phase_names])
+            _sum_mass_frac_out = Sum([-1.] + [getattr(self, "w_{}_out".format(phase_i))() for phase_i in self.property_package.phase_names])
 
             self.createEquation("molar_frac_sum_in", "Molar fraction summation for input", _sum_molar_frac_in)
             self.createEquation("mass_frac_sum_in", "Mass fraction summation for input", _sum_mass_frac_in)
@@ -302,22 +350,28 @@ class Splitter(Mixer):
 class Tank(model.Model):
 
 
-    def __init__(self, name, description="Tank", property_package=None, orientation='vertical'):
+    def __init__(self, name, description="Tank", property_package=None, orientation='vertical', temperature_dependent_properties=False, T_range=(273.15, 373.15)):
 
         """
         Defines a generic tank
 
-        *INPUTS: ndot_in, mdot_in, h_in, P_in
+        *INPUTS: ndot_in, mdot_in, h_in, P_in (and T, if temperature_dependent_properties is True)
         *OUTPUTS: mdot_out, mdot_out, h_out, P_out
         *PARAMETERS: area_sec, Q
 
         *REQUIRES: PropertyPackage
+
+        If temperature_dependent_properties is True, the liquid density is given by the density correlations of the species at the temperature T (over T_range, see PropertyPackage.getCorrelation), compiled with the equations, instead of its value at construction
         """
 
         super().__init__(name, description, property_package)
 
         self.orientation = orientation
 
+        self.temperature_dependent_properties = temperature_dependent_properties
+
+        self.T_range = T_range
+
         if self.property_package.number_of_phases>=2:
 
             for phase_i in self.property_package.phase_names:
@@ -347,7 +401,7 @@ class Tank(model.Model):
         self.H_out = self.createVariable("H_out", J/mol, "molar enthalpy output", latex_text="H_{out}", is_exposed=True, type='output')
         self.E = self.createVariable("E", J, "Internal energy", latex_text="E")
 
-        self.Q = self.createParameter("Q", J, "Heat rate", latex_text="Q", value=0.)
+        self.Q = self.createParameter("Q", J/s, "Heat rate", latex_text="Q", value=0.)
 
         self.E.distributeOnDomain(self.time_domain)
 
@@ -359,22 +413,43 @@ class Tank(model.Model):
         self.P_In = self.createVariable("P_In", Pa, "p_in")
         self.P_Out = self.createVariable("P_Out", Pa, "p_out")
 
+        if self.temperature_dependent_properties is True:
+
+            self.T = self.createVariable("T", K, "liquid temperature", latex_text="T", is_exposed=True, type='input')
+
+        else:
+
+            self.rho = self.createParameter("rho", kg/m**3, "liquid density", latex_text="\\rho")
+
+            self.rho.setValue(self.property_package["*"].rho)
+
+    def getTemplateKey(self):
+
+        return (self.property_package.number_of_phases, tuple(self.property_package.phase_names), self.temperature_dependent_properties, tuple(self.T_range))
 
     def DeclareEquations(self):
 
-        _molar_conservation = self.N.Diff(self.t) == self. self.ndot_in() - self.ndot_out()
+        _molar_conservation = self.N.Diff(self.t) == self.ndot_in() - self.ndot_out()
 
         self.createEquation("molar_conservation", "Molar consevation", _molar_conservation)
 
-        _mass_conservation = self.M.Diff(self.t) ==  self. self.mdot_in() - self.mdot_out()
+        _mass_conservation = self.M.Diff(self.t) == self.mdot_in() - self.mdot_out()
 
         self.createEquation("mass_conservation", "Mass conservation", _mass_conservation)
 
-        _energy_balance = self.E.Diff(self.t) == self.n_dot_in()*self.H_in() - self.n_dot_out()*self.H_out() + self.Q()
+        _energy_balance = self.E.Diff(self.t) == self.ndot_in()*self.H_in() - self.ndot_out()*self.H_out() + self.Q()
 
         self.createEquation("energy_balance", "Energy balance", _energy_balance)
 
-        _level_balance = self.level.Diff(self.t) == (1./(self.property_package["*"].rho*self.area_sec()))*(self.mdot_in()-self.mdot_out())
+        if self.temperature_dependent_properties is True:
+
+            _rho = _liquidDensity(self, self.T())
+
+        else:
+
+            _rho = self.rho()
+
+        _level_balance = self.level.Diff(self.t) == (1./(_rho*self.area_sec()))*(self.mdot_in()-self.mdot_out())
 
         self.createEquation("_level_balance", "Liquid level balance", _level_balance)
 
@@ -384,9 +459,9 @@ class Tank(model.Model):
 
 class Fermenter(Tank):
 
-    def __init__(self, name, description="Fermenter", property_package=None):
+    def __init__(self, name, description="Fermenter", property_package=None, temperature_dependent_properties=False, T_range=(273.15, 373.15)):
 
-        super().__init__(name, description, property_package)
+        super().__init__(name, description, property_package, temperature_dependent_properties=temperature_dependent_properties, T_range=T_range)
 
 class Valve(model.Model):
     """
@@ -442,6 +517,25 @@ class Valve(model.Model):
                 exec("self.z_{}_out = self.createVariable('z_{}_out',dimless,'Molar fraction for {} phase in the output', is_exposed='True', type='output')".format(phase_i,phase_i, phase_i))
                 exec("self.w_{}_out = self.createVariable('w_{}_out',dimless,'Mass fraction for {} phase in the output', is_exposed='True', type='output')".format(phase_i, phase_i, phase_i))
 
+        self.mix_rho = self.createParameter("mix_rho",kg/(m**3),"Density for the mixture of components")
+
+        if self.property_package.number_of_phases>=2:
+
+            mix_rho_ = 0.
+
+            for phase_i in self.property_package.phase_names:
+
+                mix_rho_ += eval("self.w_{}_out()*self.property_package['{}'].rho".format(phase_i, phase_i))
+
+            self.mix_rho.setValue(mix_rho_)
+
+        else:
+
+            self.mix_rho.setValue(self.property_package["*"].rho)
+
+    def getTemplateKey(self):
+
+        return (self.property_package.number_of_phases, tuple(self.property_package.phase_names))
 
     def DeclareEquations(self):
 
@@ -466,23 +560,7 @@ class Valve(model.Model):
 
         self.createEquation("energy_balance", "Energy balance", _energy_balance)
 
-        mix_rho = self.createParameter("mix_rho",kg/(m**3),"Density for the mixture of components")
-
-        if self.property_package.number_of_phases>=2:
-
-            mix_rho_ = 0.
-
-            for phase_i in self.property_package.phase_names:
-
-                mix_rho_ += eval("self.w_{}_out()*self.property_package['{}'].rho".format(phase_i, phase_i))
-
-            mix_rho.setValue(mix_rho_)
-
-        else:
-
-            mix_rho.setValue(self.property_package["*"].rho)
-
-        _volumetric_flux = self.Qdot_out() - self.perc_open()*(self.mdot_out()/mix_rho())
+        _volumetric_flux = self.Qdot_out() - self.perc_open()*(self.mdot_out()/self.mix_rho())
 
         self.createEquation("vol_flux_balance", "Volumetric flux balance", _volumetric_flux)
 
@@ -552,6 +630,9 @@ class SimplePump(model.Model):
                 exec("self.z_{}_out = self.createVariable('z_{}_out',dimless,'Molar fraction for {} phase in the output', is_exposed='True', type='output')".format(phase_i,phase_i, phase_i))
                 exec("self.w_{}_out = self.createVariable('w_{}_out',dimless,'Mass fraction for {} phase in the output', is_exposed='True', type='output')".format(phase_i, phase_i, phase_i))
 
+    def getTemplateKey(self):
+
+        return (self.property_package.number_of_phases, tuple(self.property_package.phase_names))
 
     def DeclareEquations(self):
 
@@ -591,7 +672,7 @@ class SimplePump(model.Model):
 
 class Heater(model.Model):
 
-    def __init__(self, name, description="Heater", property_package=None):
+    def __init__(self, name, description="Heater", property_package=None, temperature_dependent_properties=False, T_range=(273.15, 373.15)):
 
         """
         Defines a generic heater
@@ -605,14 +686,20 @@ class Heater(model.Model):
         If multiphasic (property_package has 2+ phases):
 
         *INPUTS: ndot_in, mdot_in, H_in, P_in,  T_in, x_<phase1>_in, w_<phase1>_in, ..., x_<phaseN>_in, w_<phaseN>_in
-        *OUTPUTS: mdot_out, mdot_out, H_out, P_out,  T_out, x_<phase1>_out, w_<phase1>_out, ..., x_<phaseN>_out, w_<phaseN>_out
-        *PARAMETERS: Q, Delta_P
+        *OUTPUTS: mdot_out, mdot_out, H_out, P_out,  T_out, x_<phase1>_out, w_<phase1>_out, ..., x_<phaseN>_out, w_<phaseN>_out, cp_mix
+        *PARAMETERS: Q, Delta_P, cp_<phase1>, ..., cp_<phaseN>
 
         *REQUIRES: -
+
+        If temperature_dependent_properties is True, the temperature balance uses the integrals of the heat capacity correlations of the species between the input and output temperatures (over T_range, see PropertyPackage.getCorrelation), compiled with the equations, instead of the heat capacity at construction (cp_mix)
         """
 
         super().__init__(name, description, property_package)
 
+        self.temperature_dependent_properties = temperature_dependent_properties
+
+        self.T_range = T_range
+
         if self.property_package.number_of_phases>=2:
 
             for phase_i in self.property_package.phase_names:
@@ -641,24 +728,30 @@ class Heater(model.Model):
         self.T_in  = self.createVariable("T_in", K, "temperature from input", latex_text="T_{in}", is_exposed=True, type='input')
         self.T_out = self.createVariable("T_out", K, "temperature from output", latex_text="T_{out}", is_exposed=True, type='output')
 
-        self.cp_mix = self.createParameter("cp_mix",J/(kg*K),"Mass specific capacity for the mixture of components")
-
         if self.property_package.number_of_phases>=2:
 
-            cp_mix_ = 0.
+            # The heat capacity of the mixture depends on the mass fractions of the output, so it is one variable given by the heat capacities of the species
+
+            self.cp_mix = self.createVariable("cp_mix",J/(kg*K),"Mass specific capacity for the mixture of components")
 
             for phase_i in self.property_package.phase_names:
 
-                cp_mix_ += eval("self.w_{}_out()*self.property_package['{}'].Cp".format(phase_i, phase_i))
+                exec("self.cp_{} = self.createParameter('cp_{}',J/(kg*K),'Mass specific capacity for {} phase')".format(phase_i, phase_i, phase_i))
 
-            self.cp_mix.setValue(mix_rho_)
+                getattr(self, "cp_{}".format(phase_i)).setValue(self.property_package[phase_i].Cp)
 
         else:
 
+            self.cp_mix = self.createParameter("cp_mix",J/(kg*K),"Mass specific capacity for the mixture of components")
+
             self.cp_mix.setValue(self.property_package["*"].Cp)
 
         #Assume heat rate (Q) for heating is positive
 
+    def getTemplateKey(self):
+
+        return (self.property_package.number_of_phases, tuple(self.property_package.phase_names), self.temperature_dependent_properties, tuple(self.T_range))
+
     def DeclareEquations(self):
 
         if self.property_package.number_of_phases>=2:
@@ -675,6 +768,10 @@ class Heater(model.Model):
 
                 exec("self.createEquation('mass_fraction_conservation_for_{}', 'Mass conservation for {} phase', _mass_conservation_i)".format(phase_i, phase_i))
 
+            _heat_capacity = self.cp_mix() - Sum([getattr(self, "w_{}_out".format(phase_i))()*getattr(self, "cp_{}".format(phase_i))() for phase_i in self.property_package.phase_names])
+
+            self.createEquation("heat_capacity", "Heat capacity of the mixture", _heat_capacity)
+
         _molar_conservation = self.ndot_in() - self.ndot_out()
 
         self.createEquation("molar_conservation", "Molar consevation", _molar_conservation)
@@ -691,13 +788,19 @@ class Heater(model.Model):
 
         self.createEquation("energy_balance", "Energy balance", _energy_balance)
 
-        _temperature_balance = self.T_out() - self.T_in() - (self.Q()/(self.mdot_out()*self.cp_mix()))
+        if self.temperature_dependent_properties is True:
+
+            _temperature_balance = self.mdot_out()*_sensibleHeat(self, self.T_in(), self.T_out()) - self.Q()
+
+        else:
+
+            _temperature_balance = self.T_out() - self.T_in() - (self.Q()/(self.mdot_out()*self.cp_mix()))
 
         self.createEquation("temperature_balance", "Temperature balance", _temperature_balance)
 
 class Cooler(Heater):
 
-    def __init__(self, name, description="Cooler", property_package=None):
+    def __init__(self, name, description="Cooler", property_package=None, temperature_dependent_properties=False, T_range=(273.15, 373.15)):
 
         """
         Defines a generic cooler
@@ -711,13 +814,13 @@ class Cooler(Heater):
         If multiphasic (property_package has 2+ phases):
 
         *INPUTS: ndot_in, mdot_in, H_in, P_in,  T_in, x_<phase1>_in, w_<phase1>_in, ..., x_<phaseN>_in, w_<phaseN>_in
-        *OUTPUTS: mdot_out, mdot_out, H_out, P_out,  T_out, x_<phase1>_out, w_<phase1>_out, ..., x_<phaseN>_out, w_<phaseN>_out
-        *PARAMETERS: Q, Delta_P
+        *OUTPUTS: mdot_out, mdot_out, H_out, P_out,  T_out, x_<phase1>_out, w_<phase1>_out, ..., x_<phaseN>_out, w_<phaseN>_out, cp_mix
+        *PARAMETERS: Q, Delta_P, cp_<phase1>, ..., cp_<phaseN>
 
         *REQUIRES: -
         """
 
-        super().__init__(name, description, property_package)
+        super().__init__(name, description, property_package, temperature_dependent_properties=temperature_dependent_properties, T_range=T_range)
 
 class HeatExchanger:
 
@@ -725,15 +828,21 @@ class HeatExchanger:
 
 class Flash_Dynamic(model.Model):
 
-    def __init__(self, name, description="Flash_Dynamic", property_package=None, orientation='vertical'):
+    def __init__(self, name, description="Flash_Dynamic", property_package=None, orientation='vertical', temperature_dependent_properties=False, T_range=(273.15, 373.15)):
 
         """
         Flash model
+
+        If temperature_dependent_properties is True, the temperature balance uses the integrals of the heat capacity correlations of the species between the input and output temperatures (over T_range, see PropertyPackage.getCorrelation), compiled with the equations, instead of the heat capacity at construction (cp_mix)
         """
         super().__init__(name, description, property_package)
 
         self.orientation = orientation
 
+        self.temperature_dependent_properties = temperature_dependent_properties
+
+        self.T_range = T_range
+
         if self.property_package.number_of_phases>=2:
 
             for phase_i in self.property_package.phase_names:
@@ -752,11 +861,13 @@ class Flash_Dynamic(model.Model):
         self.ndot_V_out = self.createVariable("ndot_V_out", mol/s, "molar vapour output flux", latex_text="\\dot{{n}_v}_{out}", is_exposed=True, type='output')
         self.ndot_L_out = self.createVariable("ndo_L_out", mol/s, "molar liquid output flux", latex_text="\\dot{{n}_l}_{out}", is_exposed=True, type='output')
         self.N = self.createVariable("N", mol, "molar holdup", latex_text="N", is_exposed=True, type="output")
+        self.N.distributeOnDomain(self.time_domain)
 
         self.mdot_in  = self.createVariable("mdot_in", kg/s, "mass input flux", latex_text="\\dot{m}_{in}", is_exposed=True, type='input')
         self.mdot_V_out = self.createVariable("mdot_V_out", kg/s, "mass vapour output flux", latex_text="\\dot{{m}_v}_{out}", is_exposed=True, type='output')
         self.mdot_L_out = self.createVariable("mdot_L_out", kg/s, "mass liquid output flux", latex_text="\\dot{{m}_l}_{out}", is_exposed=True, type='output')
         self.M = self.createVariable("M", kg, "mass holdup", latex_text="M", is_exposed=True, type='output')
+        self.M.distributeOnDomain(self.time_domain)
 
         self.P_in = self.createVariable("P_in", Pa, "pressure from input", latex_text="P_{in}", is_exposed=True, type="input")
         self.P_out = self.createVariable("P_out", Pa, "pressure from output", latex_text="P_{out}", is_exposed=True, type="output")
@@ -767,26 +878,29 @@ class Flash_Dynamic(model.Model):
         self.H_V_out = self.createVariable("H_V_out", J/mol, "molar vapour enthalpy output", latex_text="{H_v}_{out}", is_exposed=True, type='output')
         self.H_L_out = self.createVariable("H_L_out", J/mol, "molar liquid enthalpy output", latex_text="{H_l}_{out}", is_exposed=True, type='output')
         self.E = self.createVariable("E", J, "energy holdup", latex_text="E", is_exposed=True, type='output')
+        self.E.distributeOnDomain(self.time_domain)
 
         self.Q = self.createParameter("Q", J/s, "Heat rate", latex_text="Q")
 
         self.T_in  = self.createVariable("T_in", K, "temperature from input", latex_text="T_{in}", is_exposed=True, type='input')
         self.T_out = self.createVariable("T_out", K, "temperature from output", latex_text="T_{out}", is_exposed=True, type='output')
 
-        self.cp_mix = self.createParameter("cp_mix",J/(kg*K),"Mass specific capacity for the mixture of components")
-
         if self.property_package.number_of_phases>=2:
 
-            cp_mix_ = 0.
+            # The heat capacity of the mixture depends on the mass fractions of the output, so it is one variable given by the heat capacities of the species
+
+            self.cp_mix = self.createVariable("cp_mix",J/(kg*K),"Mass specific capacity for the mixture of components")
 
             for phase_i in self.property_package.phase_names:
 
-                cp_mix_ += eval("self.w_{}_out()*self.property_package['{}'].Cp".format(phase_i, phase_i))
+                exec("self.cp_{} = self.createParameter('cp_{}',J/(kg*K),'Mass specific capacity for {} phase')".format(phase_i, phase_i, phase_i))
 
-            self.cp_mix.setValue(mix_rho_)
+                getattr(self, "cp_{}".format(phase_i)).setValue(self.property_package[phase_i].Cp)
 
         else:
 
+            self.cp_mix = self.createParameter("cp_mix",J/(kg*K),"Mass specific capacity for the mixture of components")
+
             self.cp_mix.setValue(self.property_package["*"].Cp)
 
     def DeclareEquations(self):
@@ -805,7 +919,11 @@ class Flash_Dynamic(model.Model):
 
                 exec("self.createEquation('mass_fraction_conservation_for_{}', 'Mass conservation for {} phase', _mass_conservation_i)".format(phase_i, phase_i))
 
-        _molar_conservation = delf.M.Diff(self.time) == self.ndot_in() - self.ndot_L_out() - self.ndot_V_out()
+            _heat_capacity = self.cp_mix() - Sum([getattr(self, "w_{}_out".format(phase_i))()*getattr(self, "cp_{}".format(phase_i))() for phase_i in self.property_package.phase_names])
+
+            self.createEquation("heat_capacity", "Heat capacity of the mixture", _heat_capacity)
+
+        _molar_conservation = self.N.Diff(self.t) == self.ndot_in() - self.ndot_L_out() - self.ndot_V_out()
 
         self.createEquation("molar_conservation", "Molar consevation", _molar_conservation)
 
@@ -817,26 +935,39 @@ class Flash_Dynamic(model.Model):
 
         self.createEquation("mechanical_equilibrium", "Mechanical Equilibrium", _mechanical_equilibrium)
 
-        _energy_balance = self.E.Diff(self.t) == self.n_dot_in()*self.H_in() - self.n_dot_V_out()*self.H_V_out() - self.n_dot_L_out()*self.H_L_out() + self.Q()
+        _energy_balance = self.E.Diff(self.t) == self.ndot_in()*self.H_in() - self.ndot_V_out()*self.H_V_out() - self.ndot_L_out()*self.H_L_out() + self.Q()
 
         self.createEquation("energy_balance", "Energy balance", _energy_balance)
 
-        _temperature_balance = self.T_out() - self.T_in() - (self.Q()/(self.mdot_out()*self.cp_mix()))
+        if self.temperature_dependent_properties is True:
+
+            _temperature_balance = (self.mdot_V_out() + self.mdot_L_out())*_sensibleHeat(self, self.T_in(), self.T_out()) - self.Q()
+
+        else:
+
+            _temperature_balance = self.T_out() - self.T_in() - (self.Q()/((self.mdot_V_out() + self.mdot_L_out())*self.cp_mix()))
 
         self.createEquation("temperature_balance", "Temperature balance", _temperature_balance)
 
 class Flash_SteadyState(model.Model):
 
-    def __init__(self, name, description="Flash_SteadyState", property_package=None, orientation='vertical'):
+    def __init__(self, name, description="Flash_SteadyState", property_package=None, orientation='vertical', T_range=(273.15, 373.15)):
 
         """
         Flash model (steady version)
-        Assumes: both phases are well-mixed
+        Assumes: both phases are well-mixed, ideal vapour-liquid equilibrium (Raoult's law)
+
+        The equilibrium ratios (K_<species>) and the vapour fraction (vap_frac) are parameters given by the vectorised Rachford-Rice sub-solver of the property package (see PropertyPackage.flash), at the state of the property package and for its molar fractions (zs atribute), upon construction. They are evaluated at the temperature and pressure of the property package, not at the temperature and pressure variables of the current model, which do not enter them. They may be updated for other states and feeds through solveFlash.
+
+        :param tuple(float) T_range:
+            Range of temperatures (K) of the vapour pressure correlations. Defaults to (273.15, 373.15)
         """
         super().__init__(name, description, property_package)
 
         self.orientation = orientation
 
+        self.T_range = T_range
+
         if self.property_package.number_of_phases>=2:
 
             for phase_i in self.property_package.phase_names:
@@ -844,9 +975,10 @@ class Flash_SteadyState(model.Model):
                 exec("self.z_{}_in = self.createVariable('z_{}_in',dimless,'Molar fraction for {} phase in the input', is_exposed='True', type='output')".format(phase_i,phase_i, phase_i))
                 exec("self.w_{}_in = self.createVariable('w_{}_in',dimless,'Mass fraction for {} phase in the input', is_exposed='True', type='output')".format(phase_i,phase_i, phase_i))
                 exec("self.z_{}_L_out = self.createVariable('z_{}_L_out',dimless,'Molar fraction for {} phase in liquid output', is_exposed='True', type='output')".format(phase_i,phase_i, phase_i))
-                exec("self.w_{}_L_out = self.createVariable('w_{}_out',dimless,'Mass fraction for {} phase in the liquid output', is_exposed='True', type='output')".format(phase_i, phase_i, phase_i))
-                exec("self.z_{}_V_out = self.createVariable('z_{}_out',dimless,'Molar fraction for {} phase in the output', is_exposed='True', type='output')".format(phase_i,phase_i, phase_i))
-                exec("self.w_{}_V_out = self.createVariable('w_{}_out',dimless,'Mass fraction for {} phase in the output', is_exposed='True', type='output')".format(phase_i, phase_i, phase_i))
+                exec("self.w_{}_L_out = self.createVariable('w_{}_L_out',dimless,'Mass fraction for {} phase in the liquid output', is_exposed='True', type='output')".format(phase_i, phase_i, phase_i))
+                exec("self.z_{}_V_out = self.createVariable('z_{}_V_out',dimless,'Molar fraction for {} phase in the vapour output', is_exposed='True', type='output')".format(phase_i,phase_i, phase_i))
+                exec("self.w_{}_V_out = self.createVariable('w_{}_V_out',dimless,'Mass fraction for {} phase in the vapour output', is_exposed='True', type='output')".format(phase_i, phase_i, phase_i))
+                exec("self.K_{} = self.createParameter('K_{}',dimless,'Equilibrium ratio for {} phase', latex_text='K_{{{}}}')".format(phase_i, phase_i, phase_i, phase_i))
 
 
         self.t = self.createVariable("t",s,"time",latex_text="t")
@@ -855,7 +987,7 @@ class Flash_SteadyState(model.Model):
 
         self.ndot_in  = self.createVariable("ndot_in", mol/s, "molar input flux", latex_text="\\dot{n}_{in}", is_exposed=True, type='input')
         self.ndot_V_out = self.createVariable("ndot_V_out", mol/s, "molar vapour output flux", latex_text="\\dot{{n}_v}_{out}", is_exposed=True, type='output')
-        self.ndot_L_out = self.createVariable("ndo_L_out", mol/s, "molar liquid output flux", latex_text="\\dot{{n}_l}_{out}", is_exposed=True, type='output')
+        self.ndot_L_out = self.createVariable("ndot_L_out", mol/s, "molar liquid output flux", latex_text="\\dot{{n}_l}_{out}", is_exposed=True, type='output')
         self.N = self.createVariable("N", mol, "molar holdup", latex_text="N", is_exposed=True, type="output")
 
         self.mdot_in  = self.createVariable("mdot_in", kg/s, "mass input flux", latex_text="\\dot{m}_{in}", is_exposed=True, type='input')
@@ -878,33 +1010,96 @@ class Flash_SteadyState(model.Model):
         self.T_V_out = self.createVariable("T_V_out", K, "temperature from vapour output", latex_text="{T_v}_{out}", is_exposed=True, type='output')
         self.T_L_out = self.createVariable("T_L_out", K, "temperature from liquid output", latex_text="{T_l}_{out}", is_exposed=True, type='output')
 
+        self.vap_frac = self.createParameter("vap_frac", dimless, "Vapour fraction", latex_text="\\phi")
+
+        self.solveFlash()
+
+    def getTemplateKey(self):
+
+        return (self.property_package.number_of_phases, tuple(self.property_package.phase_names))
+
+    def solveFlash(self, T=None, P=None, zs=None):
+
+        """
+        Solve the phase split through the vectorised Rachford-Rice sub-solver of the property package (see PropertyPackage.flash), setting the equilibrium ratios and the vapour fraction of the current model for the last flash solved. The K-values are those of the property package at the temperatures and pressures given (not at the temperature and pressure variables of the current model). If the equations of the current model were already declared, the ones depending on these parameters (phase equilibria and molar vaporization) are declared again with the new values, since the values of the parameters are substituted in the equations upon declaration (problems already built from the current model keep the former equations)
+
+        :param [float, numpy.ndarray] T:
+            Temperatures (K). Defaults to None, for which the current temperature of the property package is used
+
+        :param [float, numpy.ndarray] P:
+            Pressures (Pa). Defaults to None, for which the current pressure of the property package is used
+
+        :param numpy.ndarray zs:
+            Feed molar fractions, in the order of the species, for one flash or for arrays of flashes. Defaults to None, for which the molar fractions of the property package are used (or the pure species, for one species)
+
+        :return:
+            Vapour fractions, liquid molar fractions and vapour molar fractions
+        :rtype tuple(numpy.ndarray, numpy.ndarray, numpy.ndarray):
+        """
+
+        if zs is None and self.property_package.zs is None and len(self.property_package.phases) == 1:
+
+            zs = [1.]
+
+        beta_, x_, y_ = self.property_package.flash(T, P, zs, T_range=self.T_range)
+
+        K_ = self.property_package.getKValues(T, P, T_range=self.T_range)
+
+        self.vap_frac.setValue(float(beta_.flat[-1]))
+
+        if self.property_package.number_of_phases>=2:
+
+            for (phase_i, K_i) in zip(self.property_package.phases.keys(), K_.reshape(-1, K_.shape[-1])[-1]):
+
+                getattr(self, "K_{}".format(phase_i)).setValue(float(K_i))
+
+        if "molar_vaporization_" + self.name in self.equations:
+
+            if self.property_package.number_of_phases>=2:
+
+                for phase_i in self.property_package.phase_names:
+
+                    self._declarePhaseEquilibrium(phase_i)
+
+            self._declareMolarVaporization()
+
+        return beta_, x_, y_
+
+    def _declarePhaseEquilibrium(self, phase_i):
+
+        _phase_equilibrium_i = getattr(self, "z_{}_V_out".format(phase_i))() - getattr(self, "K_{}".format(phase_i))()*getattr(self, "z_{}_L_out".format(phase_i))()
+
+        self.createEquation("phase_equilibrium_for_{}".format(phase_i), "Phase equilibrium for {} phase".format(phase_i), _phase_equilibrium_i)
+
+    def _declareMolarVaporization(self):
+
+        _molar_vaporization = self.ndot_V_out() - self.vap_frac()*self.ndot_in()
+
+        self.createEquation("molar_vaporization", "Molar vaporization", _molar_vaporization)
+
     def DeclareEquations(self):
 
         if self.property_package.number_of_phases>=2:
 
             for phase_i in self.property_package.phase_names:
 
-                exec("_molar_conservation_i = self.z_{}_out() - self.z_{}_in()".format(phase_i, phase_i))
+                _component_balance = self.ndot_in()*getattr(self, "z_{}_in".format(phase_i))() - self.ndot_L_out()*getattr(self, "z_{}_L_out".format(phase_i))() - self.ndot_V_out()*getattr(self, "z_{}_V_out".format(phase_i))()
 
-                exec("self.createEquation('molar_fraction_conservation_for_{}_liquid', 'Molar conservation for {} phase in liquid form', _molar_conservation_i)".format(phase_i, phase_i))
+                self.createEquation("molar_fraction_conservation_for_{}".format(phase_i), "Molar conservation for {} phase".format(phase_i), _component_balance)
 
                 #Create mass conservation for each component
 
-                exec("_mass_conservation_i = self.w_{}_out() - self.w_{}_in()".format(phase_i, phase_i))
+                _mass_conservation_i = self.mdot_in()*getattr(self, "w_{}_in".format(phase_i))() - self.mdot_L_out()*getattr(self, "w_{}_L_out".format(phase_i))() - self.mdot_V_out()*getattr(self, "w_{}_V_out".format(phase_i))()
 
-                exec("self.createEquation('mass_fraction_conservation_for_{}', 'Mass conservation for {} phase', _mass_conservation_i)".format(phase_i, phase_i))
+                self.createEquation("mass_fraction_conservation_for_{}".format(phase_i), "Mass conservation for {} phase".format(phase_i), _mass_conservation_i)
+
+                self._declarePhaseEquilibrium(phase_i)
 
         _molar_conservation = self.ndot_in() - self.ndot_L_out() - self.ndot_V_out()
 
         self.createEquation("molar_conservation", "Molar consevation", _molar_conservation)
 
-        vapour_fraction = createParameter("vap_frac", dimless, "Vapour fraction", latex_text="\\phi")
-
-        vapour_fraction.setValue(self.property_package)
-
-        _molar_vaporization = self.ndot_V_out() - self.ndot_in()/vapour_fraction()
-
-        self.createEquation("molar_conservation", "Molar consevation", _molar_conservation)
+        self._declareMolarVaporization()
 
         _mass_conservation = self.mdot_in() - self.mdot_V_out() - self.mdot_L_out()
 
@@ -914,7 +1109,7 @@ class Flash_SteadyState(model.Model):
 
         self.createEquation("mechanical_equilibrium", "Mechanical Equilibrium", _mechanical_equilibrium)
 
-        _energy_balance = self.n_dot_in()*self.H_in() - self.n_dot_V_out()*self.H_V_out() - self.n_dot_L_out()*self.H_L_out() + self.Q()
+        _energy_balance = self.ndot_in()*self.H_in() - self.ndot_V_out()*self.H_V_out() - self.ndot_L_out()*self.H_L_out() + self.Q()
 
         self.createEquation("energy_balance", "Energy balance", _energy_balance)
 
@@ -934,6 +1129,496 @@ class CentrifugalPump:
 
     pass
 
-class DistillationColumn:
+class DistillationColumn(model.Model):
 
-    pass
+    def __init__(self, name, description="DistillationColumn", property_package=None, number_of_stages=10, feed_stage=5, T_range=(273.15, 373.15)):
+
+        """
+        Stage-wise distillation column (MESH equations: material balances, equilibrium, summation through the component flows, and heat balances), with one partial condenser (stage 0, vapour distillate) and one reboiler (last stage, liquid bottoms)
+        Assumes: equilibrium stages, ideal vapour-liquid equilibrium (Raoult's law), saturated liquid feed, constant molar heat capacities and heats of vaporization of the species (at the state of the property package)
+
+        *UNKNOWNS (stage-wise VariableArrays): l_<species>, v_<species> (component flows of the liquid and vapour leaving each stage), T
+        *OUTPUTS: Q_condenser, Q_reboiler
+        *PARAMETERS: P, reflux_ratio, B, F, T_feed, z_<species>_feed, cp_<species>, Hvap_<species>
+
+        *REQUIRES: PropertyPackage
+
+        Each stage is coupled only to its neighbours, so the Jacobian of the equations is block-tridiagonal (blocks of 2*<number of species>+1 unknowns), which is exploited by solveColumn (Naphtali-Sandholm Newton iterations over the block-Thomas algorithm), at one cost linear in the number of stages. The energy balances of the condenser and of the reboiler are replaced by the specifications of the reflux ratio and of the bottoms flow, the duties being given by them afterwards.
+
+        :param int number_of_stages:
+            Number of stages, including the condenser and the reboiler. Defaults to 10
+
+        :param int feed_stage:
+            Index of the feed stage (0 for the condenser). Defaults to 5
+
+        :param tuple(float) T_range:
+            Range of temperatures (K) of the vapour pressure correlations. Defaults to (273.15, 373.15)
+        """
+
+        super().__init__(name, description, property_package)
+
+        if number_of_stages < 3 or not 0 < feed_stage < number_of_stages - 1:
+
+            raise UnexpectedValueError("number of stages (at least 3) and feed stage between the condenser and the reboiler")
+
+        self.number_of_stages = number_of_stages
+
+        self.feed_stage = feed_stage
+
+        self.T_range = T_range
+
+        self.species = [phase_i for phase_i in self.property_package.phase_names if phase_i is not None]
+
+        zs_ = self.property_package.zs if self.property_package.zs is not None else [1./len(self.species)]*len(self.species)
+
+        for (phase_i, z_i) in zip(self.species, zs_):
+
+            chemical_i = self.property_package[phase_i]
+
+            setattr(self, "l_{}".format(phase_i), self.createVariableArray("l_{}".format(phase_i), number_of_stages, mol/s, "Liquid flow of {} leaving each stage".format(phase_i), latex_text="l_{{{}}}".format(phase_i)))
+            setattr(self, "v_{}".format(phase_i), self.createVariableArray("v_{}".format(phase_i), number_of_stages, mol/s, "Vapour flow of {} leaving each stage".format(phase_i), latex_text="v_{{{}}}".format(phase_i)))
+
+            setattr(self, "z_{}_feed".format(phase_i), self.createParameter("z_{}_feed".format(phase_i), dimless, "Molar fraction of {} in the feed".format(phase_i), latex_text="z_{{{}}}".format(phase_i)))
+            setattr(self, "cp_{}".format(phase_i), self.createParameter("cp_{}".format(phase_i), J/(mol*K), "Molar heat capacity of liquid {}".format(phase_i), latex_text="{{c_p}}_{{{}}}".format(phase_i)))
+            setattr(self, "Hvap_{}".format(phase_i), self.createParameter("Hvap_{}".format(phase_i), J/mol, "Molar heat of vaporization of {}".format(phase_i), latex_text="{{\\Delta H_{{vap}}}}_{{{}}}".format(phase_i)))
+
+            getattr(self, "z_{}_feed".format(phase_i)).setValue(float(z_i))
+            getattr(self, "cp_{}".format(phase_i)).setValue(float(chemical_i.Cplm))
+            getattr(self, "Hvap_{}".format(phase_i)).setValue(float(chemical_i.Hvapm))
+
+        self.T = self.createVariableArray("T", number_of_stages, K, "Temperature of each stage", latex_text="T")
+
+        self.Q_condenser = self.createVariable("Q_condenser", J/s, "Heat rate removed at the condenser", latex_text="Q_c", is_exposed=True, type='output')
+        self.Q_reboiler = self.createVariable("Q_reboiler", J/s, "Heat rate supplied at the reboiler", latex_text="Q_r", is_exposed=True, type='output')
+
+        self.P = self.createParameter("P", Pa, "Pressure of the column", latex_text="P")
+        self.reflux_ratio = self.createParameter("reflux_ratio", dimless, "Reflux ratio", latex_text="R")
+        self.B = self.createParameter("B", mol/s, "Bottoms flow", latex_text="B")
+        self.F = self.createParameter("F", mol/s, "Feed flow", latex_text="F")
+        self.T_feed = self.createParameter("T_feed", K, "Feed temperature", latex_text="T_F")
+
+        self.P.setValue(float(self.property_package.P))
+        self.T_feed.setValue(float(self.property_package.T))
+
+    def getTemplateKey(self):
+
+        return (tuple(self.species), self.number_of_stages, self.feed_stage, tuple(self.T_range))
+
+    def _getFlow(self, phase_name, kind, j):
+
+        """
+        Return the EquationNode of one component flow of one stage, or 0 beyond the column
+        """
+
+        if 0 <= j < self.number_of_stages:
+
+            return getattr(self, "{}_{}".format(kind, phase_name))(j)
+
+        return 0.
+
+    def DeclareEquations(self):
+
+        N = self.number_of_stages
+
+        for j in range(N):
+
+            L_j = Sum([self._getFlow(phase_i, 'l', j) for phase_i in self.species])
+
+            V_j = Sum([self._getFlow(phase_i, 'v', j) for phase_i in self.species])
+
+            for phase_i in self.species:
+
+                feed_i = self.F()*getattr(self, "z_{}_feed".format(phase_i))() if j == self.feed_stage else 0.
+
+                _material_balance = self._getFlow(phase_i, 'l', j) + self._getFlow(phase_i, 'v', j) - self._getFlow(phase_i, 'l', j - 1) - self._getFlow(phase_i, 'v', j + 1) - feed_i
+
+                self.createEquation("material_balance_{}_{}".format(phase_i, j), "Material balance of {} at stage {}".format(phase_i, j), _material_balance)
+
+                K_i = self.property_package.getCorrelation(phase_i, 'Psat', self.T(j), T_range=self.T_range)/self.P()
+
+                _phase_equilibrium = K_i*self._getFlow(phase_i, 'l', j)*V_j/L_j - self._getFlow(phase_i, 'v', j)
+
+                self.createEquation("phase_equilibrium_{}_{}".format(phase_i, j), "Phase equilibrium of {} at stage {}".format(phase_i, j), _phase_equilibrium)
+
+            _heat_balance = self._getStageEnthalpyFlow(j - 1, 'l') + self._getStageEnthalpyFlow(j + 1, 'v') - self._getStageEnthalpyFlow(j, 'l') - self._getStageEnthalpyFlow(j, 'v')
+
+            if j == self.feed_stage:
+
+                _heat_balance = _heat_balance + Sum([self.F()*getattr(self, "z_{}_feed".format(phase_i))()*getattr(self, "cp_{}".format(phase_i))()*self.T_feed() for phase_i in self.species])
+
+            if j == 0:
+
+                self.createEquation("reflux_specification", "Reflux ratio specification", L_j - self.reflux_ratio()*V_j)
+
+                self.createEquation("condenser_heat_balance", "Heat balance of the condenser", _heat_balance - self.Q_condenser())
+
+            elif j == N - 1:
+
+                self.createEquation("bottoms_specification", "Bottoms flow specification", L_j - self.B())
+
+                self.createEquation("reboiler_heat_balance", "Heat balance of the reboiler", _heat_balance + self.Q_reboiler())
+
+            else:
+
+                self.createEquation("heat_balance_{}".format(j), "Heat balance at stage {}".format(j), _heat_balance)
+
+    def _getStageEnthalpyFlow(self, j, kind):
+
+        """
+        Return the EquationNode of the enthalpy flow of the liquid (kind='l') or vapour (kind='v') leaving one stage, or 0 beyond the column
+        """
+
+        if not 0 <= j < self.number_of_stages:
+
+            return 0.
+
+        terms_ = []
+
+        for phase_i in self.species:
+
+            molar_enthalpy_i = getattr(self, "cp_{}".format(phase_i))()*self.T(j)
+
+            if kind == 'v':
+
+                molar_enthalpy_i = molar_enthalpy_i + getattr(self, "Hvap_{}".format(phase_i))()
+
+            terms_.append(self._getFlow(phase_i, kind, j)*molar_enthalpy_i)
+
+        return Sum(terms_)
+
+    def _getColumnParameters(self):
+
+        """
+        Return the values of the parameters of the current column, as (P, reflux_ratio, B, F, T_feed, z_feed, cp, Hvap), the last three as arrays over the species
+        """
+
+        values_ = lambda prefix, suffix="": np.array([getattr(self, "{}_{}{}".format(prefix, phase_i, suffix)).value for phase_i in self.species], dtype=np.float64)
+
+        return (self.P.value, self.reflux_ratio.value, self.B.value, self.F.value, self.T_feed.value, values_("z", "_feed"), values_("cp"), values_("Hvap"))
+
+    def _getStageResiduals(self, X):
+
+        """
+        Return the residuals of the MESH equations of all the stages and the lower, diagonal and upper blocks of their Jacobian. The residuals are scaled to be dimensionless and to keep the trace flows of the species determined: the material balances of each species by its flows in and out of each stage, the equilibrium relations in logarithmic form (ln(K*x) - ln(y)), the heat balances by the feed flow and the mean heat of vaporization, and the specifications by the feed flow
+
+        :param numpy.ndarray X:
+            Unknowns of the stages, with shape (number of stages, 2*<number of species>+1), ordered as the liquid component flows, the vapour component flows and the temperature
+
+        :rtype tuple(numpy.ndarray):
+        """
+
+        P_, R_, B_, F_, T_F, z_, cp_, Hvap_ = self._getColumnParameters()
+
+        N, n = X.shape
+
+        c = len(self.species)
+
+        l, v, T = X[:, :c], X[:, c:2*c], X[:, 2*c]
+
+        K_ = np.stack([self.property_package.evaluateCorrelation(phase_i, 'Psat', T, T_range=self.T_range) for phase_i in self.species], axis=1)/P_
+
+        dK_ = np.stack([self.property_package.evaluateCorrelation(phase_i, 'Psat', T, dT=1, T_range=self.T_range) for phase_i in self.species], axis=1)/P_
+
+        L_, V_ = l.sum(axis=1), v.sum(axis=1)
+
+        feed_ = np.zeros((N, c))
+
+        feed_[self.feed_stage] = F_*z_
+
+        # Streams entering each stage from its neighbours (none beyond the column)
+
+        l_prev, T_prev = np.vstack((np.zeros((1, c)), l[:-1])), np.concatenate(([0.], T[:-1]))
+
+        v_next, T_next = np.vstack((v[1:], np.zeros((1, c)))), np.concatenate((T[1:], [0.]))
+
+        scale_ = F_*np.mean(Hvap_)
+
+        residuals_ = np.empty((N, n))
+
+        throughput_ = l + v + l_prev + v_next + feed_
+
+        residuals_[:, :c] = (l + v - l_prev - v_next - feed_)/throughput_
+
+        residuals_[:, c:2*c] = np.log(K_*l/L_[:, None]) - np.log(v/V_[:, None])
+
+        residuals_[:, 2*c] = ((l_prev*cp_).sum(axis=1)*T_prev + (v_next*(cp_*T_next[:, None] + Hvap_)).sum(axis=1) + (feed_*cp_).sum(axis=1)*T_F
+                              - (l*cp_).sum(axis=1)*T - (v*(cp_*T[:, None] + Hvap_)).sum(axis=1))/scale_
+
+        residuals_[0, 2*c] = (L_[0] - R_*V_[0])/F_
+
+        residuals_[-1, 2*c] = (L_[-1] - B_)/F_
+
+        lower_, diagonal_, upper_ = np.zeros((N, n, n)), np.zeros((N, n, n)), np.zeros((N, n, n))
+
+        identity_ = np.eye(c)
+
+        # Material balances
+
+        # Material balances, through the derivatives of the quotients by the throughputs (whose derivatives are 1 for all the flows)
+
+        balance_ = residuals_[:, :c]
+
+        diagonal_[:, :c, :c] = ((1. - balance_)/throughput_)[:, :, None]*identity_
+
+        diagonal_[:, :c, c:2*c] = ((1. - balance_)/throughput_)[:, :, None]*identity_
+
+        lower_[:, :c, :c] = ((-1. - balance_)/throughput_)[:, :, None]*identity_
+
+        upper_[:, :c, c:2*c] = ((-1. - balance_)/throughput_)[:, :, None]*identity_
+
+        # Equilibrium relations
+
+        diagonal_[:, c:2*c, :c] = identity_/l[:, :, None] - (1./L_)[:, None, None]
+
+        diagonal_[:, c:2*c, c:2*c] = (1./V_)[:, None, None] - identity_/v[:, :, None]
+
+        diagonal_[:, c:2*c, 2*c] = dK_/K_
+
+        # Heat balances
+
+        diagonal_[:, 2*c, :c] = -cp_*T[:, None]/scale_
+
+        diagonal_[:, 2*c, c:2*c] = -(cp_*T[:, None] + Hvap_)/scale_
+
+        diagonal_[:, 2*c, 2*c] = -((l + v)*cp_).sum(axis=1)/scale_
+
+        lower_[:, 2*c, :c] = cp_*T_prev[:, None]/scale_
+
+        lower_[:, 2*c, 2*c] = (l_prev*cp_).sum(axis=1)/scale_
+
+        upper_[:, 2*c, c:2*c] = (cp_*T_next[:, None] + Hvap_)/scale_
+
+        upper_[:, 2*c, 2*c] = (v_next*cp_).sum(axis=1)/scale_
+
+        # Specifications of the condenser and of the reboiler
+
+        for j in [0, N - 1]:
+
+            lower_[j, 2*c], diagonal_[j, 2*c], upper_[j, 2*c] = 0., 0., 0.
+
+            diagonal_[j, 2*c, :c] = 1./F_
+
+        diagonal_[0, 2*c, c:2*c] = -R_/F_
+
+        return residuals_, lower_, diagonal_, upper_
+
+    def _getKValues(self, T, P, dT=0):
+
+        """
+        Return the equilibrium ratios of the species (or their derivatives with respect to the temperature) for arrays of temperatures, with shape (number of temperatures, number of species)
+        """
+
+        return np.stack([self.property_package.evaluateCorrelation(phase_i, 'Psat', T, dT=dT, T_range=self.T_range) for phase_i in self.species], axis=-1)/P
+
+    def _getBubbleTemperatures(self, x, P, T):
+
+        """
+        Return the bubble temperatures of arrays of liquid compositions (with shape (number of stages, number of species)), by Newton iterations over sum(K*x) = 1 from the temperatures given
+        """
+
+        T = np.array(T, dtype=np.float64)
+
+        for iteration_i in range(50):
+
+            step_ = np.clip((1. - np.sum(self._getKValues(T, P)*x, axis=-1))/np.sum(self._getKValues(T, P, dT=1)*x, axis=-1), -20., 20.)
+
+            T += step_
+
+            if np.max(np.abs(step_)) < 1e-8:
+
+                break
+
+        return T
+
+    def _getInitialGuess(self, maximum_iterations=50):
+
+        """
+        Return the initial guess of the unknowns of the stages by the bubble-point method (Wang and Henke), starting from constant molar overflow: for the current flows and temperatures, the component balances of each species form one tridiagonal linear system over the stages, the temperatures of the stages are then updated to the bubble temperatures of their liquids, and the flows to the heat balances, until the temperatures settle
+
+        :param int maximum_iterations:
+            Maximum number of iterations of the bubble-point method. Defaults to 50
+
+        :rtype numpy.ndarray:
+        """
+
+        P_, R_, B_, F_, T_F, z_, cp_, Hvap_ = self._getColumnParameters()
+
+        N, c = self.number_of_stages, len(self.species)
+
+        D_ = F_ - B_
+
+        if not 0. < D_ < F_ or R_ <= 0.:
+
+            raise UnexpectedValueError("bottoms flow between 0 and the feed flow, and positive reflux ratio")
+
+        L_ = np.where(np.arange(N) < self.feed_stage, R_*D_, R_*D_ + F_)
+
+        L_[-1] = B_
+
+        V_ = np.full(N, (R_ + 1.)*D_)
+
+        V_[0] = D_
+
+        feed_ = np.zeros((N, c))
+
+        feed_[self.feed_stage] = F_*z_
+
+        # Feed flows accumulated down to each stage, which give the liquid flows from the vapour flows (L_j = V_(j+1) + cumulative feed - D)
+
+        cumulative_feed = feed_.sum(axis=1).cumsum()
+
+        T_ = self._getBubbleTemperatures(z_[None, :], P_, np.full(1, T_F))*np.ones(N)
+
+        for iteration_i in range(maximum_iterations):
+
+            # Stripping factors: v = S*l at each stage, so l_j*(1 + S_j) - l_(j-1) - S_(j+1)*l_(j+1) = f_j
+
+            S_ = self._getKValues(T_, P_)*(V_/L_)[:, None]
+
+            # Solved for all the species at once as one block-tridiagonal system of diagonal blocks, whose elimination without pivoting keeps the trace flows positive
+
+            identity_ = np.eye(c)
+
+            l_ = solveBlockTridiagonal(-identity_*np.ones((N, 1, 1)), (1. + S_)[:, :, None]*identity_, -np.roll(S_, -1, axis=0)[:, :, None]*identity_, feed_)
+
+            x_ = np.maximum(l_, 1e-300)
+
+            x_ = x_/x_.sum(axis=1, keepdims=True)
+
+            new_T = self._getBubbleTemperatures(x_, P_, T_)
+
+            converged_ = np.max(np.abs(new_T - T_)) < 1e-6
+
+            T_ = new_T
+
+            y_ = self._getKValues(T_, P_)*x_
+
+            y_ = y_/y_.sum(axis=1, keepdims=True)
+
+            # Vapour flows from the heat balances of the stages between the condenser and the reboiler, from the top down
+
+            h_ = (x_*cp_).sum(axis=1)*T_
+
+            H_ = (y_*(cp_*T_[:, None] + Hvap_)).sum(axis=1)
+
+            h_feed = np.sum(z_*cp_)*T_F
+
+            for j in range(1, N - 1):
+
+                V_[j + 1] = (V_[j]*(H_[j] - h_[j - 1]) + (cumulative_feed[j] - D_)*h_[j] - (cumulative_feed[j - 1] - D_)*h_[j - 1] - feed_[j].sum()*h_feed)/(H_[j + 1] - h_[j])
+
+            V_ = np.maximum(V_, 1e-6*F_)
+
+            L_[:-1] = np.maximum(V_[1:] + cumulative_feed[:-1] - D_, 1e-6*F_)
+
+            if converged_:
+
+                break
+
+        y_ = self._getKValues(T_, P_)*x_
+
+        y_ = y_/y_.sum(axis=1, keepdims=True)
+
+        return np.hstack((L_[:, None]*x_, V_[:, None]*y_, T_[:, None]))
+
+    def _getTransformedResiduals(self, Z):
+
+        """
+        Return the residuals and the Jacobian blocks of the MESH equations (see _getStageResiduals) with respect to the logarithms of the component flows and the temperatures, so the flows stay positive along the Newton iterations, including the trace flows of the species in the products
+
+        :param numpy.ndarray Z:
+            Logarithms of the liquid and vapour component flows and temperatures of the stages, with shape (number of stages, 2*<number of species>+1)
+
+        :rtype tuple(numpy.ndarray):
+        """
+
+        c = len(self.species)
+
+        X = np.array(Z)
+
+        X[:, :2*c] = np.exp(Z[:, :2*c])
+
+        residuals_, lower_, diagonal_, upper_ = self._getStageResiduals(X)
+
+        # Chain rule: the columns of the flows are scaled by the flows of the stage they belong to
+
+        scales_ = np.ones_like(X)
+
+        scales_[:, :2*c] = X[:, :2*c]
+
+        lower_[1:] *= scales_[:-1, None, :]
+
+        diagonal_ *= scales_[:, None, :]
+
+        upper_[:-1] *= scales_[1:, None, :]
+
+        return residuals_, lower_, diagonal_, upper_
+
+    def _limitStep(self, Z, step):
+
+        """
+        Return the largest fraction of one step of the iterations (in the direction of the step) changing the logarithms of the component flows by at most 5 and the temperatures by at most 20 K
+
+        :rtype float:
+        """
+
+        c = len(self.species)
+
+        return min(1., 5./max(np.max(np.abs(step[:, :2*c])), 1e-300), 20./max(np.max(np.abs(step[:, 2*c])), 1e-300))
+
+    def solveColumn(self, tolerance=1e-10, maximum_iterations=100, initial_guess=None):
+
+        """
+        Solve the MESH equations of all the stages by Newton iterations over the block-Thomas algorithm, falling back on Levenberg-Marquardt steps whenever the Newton step does not decrease the norm of the residuals (see block_tridiagonal.solveBlockTridiagonalNewton), storing the solution in the stage-wise VariableArrays and the duties of the condenser and of the reboiler. The unknowns of the iterations are the logarithms of the component flows and the temperatures (see _getTransformedResiduals). The cost of each iteration is linear in the number of stages.
+
+        :param float tolerance:
+            Tolerance of the maximum absolute residual, scaled to be dimensionless (see _getStageResiduals). Defaults to 1e-10
+
+        :param int maximum_iterations:
+            Maximum number of iterations. Defaults to 100
+
+        :param numpy.ndarray initial_guess:
+            Initial guess of the unknowns of the stages (see _getStageResiduals). Defaults to None, for which the guess is given by the bubble-point method (see _getInitialGuess)
+
+        :return:
+            Number of iterations
+        :rtype int:
+        """
+
+        X0 = np.array(initial_guess if initial_guess is not None else self._getInitialGuess(), dtype=np.float64)
+
+        c = len(self.species)
+
+        if np.any(X0[:, :2*c] <= 0.):
+
+            raise UnexpectedValueError("initial guess with positive component flows")
+
+        Z0 = np.array(X0)
+
+        Z0[:, :2*c] = np.log(X0[:, :2*c])
+
+        Z, iterations_ = solveBlockTridiagonalNewton(self._getTransformedResiduals, Z0, tolerance, maximum_iterations, self._limitStep)
+
+        X = np.array(Z)
+
+        X[:, :2*c] = np.exp(Z[:, :2*c])
+
+        for (k, phase_i) in enumerate(self.species):
+
+            getattr(self, "l_{}".format(phase_i)).values[:] = X[:, k]
+
+            getattr(self, "v_{}".format(phase_i)).values[:] = X[:, c + k]
+
+        self.T.values[:] = X[:, 2*c]
+
+        _, _, _, _, _, _, cp_, Hvap_ = self._getColumnParameters()
+
+        h_l = lambda j: np.sum(X[j, :c]*cp_)*X[j, 2*c]
+
+        h_v = lambda j: np.sum(X[j, c:2*c]*(cp_*X[j, 2*c] + Hvap_))
+
+        self.Q_condenser.value = float(h_v(1) - h_l(0) - h_v(0))
+
+        self.Q_reboiler.value = float(h_l(-1) + h_v(-1) - h_l(-2))
+
+        return iterations_
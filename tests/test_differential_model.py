@@ -16,8 +16,15 @@ from src.sloth.simulation import Simulation
 from src.sloth.core.equation_operators import *
 from src.sloth.core.template_units import *
 from src.sloth.core.domain import *
+from src.sloth.core.c_kernel import isCCompilerAvailable
+from src.sloth.core import c_kernel
+from src.sloth.core import symbolic_backend
+from src.sloth.core.error_definitions import UnexpectedValueError
 
 import copy
+import numpy as np
+import scipy.linalg
+import sympy as sp
 
 
 @pytest.fixture
@@ -234,6 +241,29 @@ def test_simulation_result(mod, prob, sim, compile_equations):
     sim.showResults()
 
 
+def test_incidence_index(mod, prob):
+
+    prob.addModels(mod)
+
+    prob.resolve()
+
+    block_ = prob.equation_block
+
+    incidence_ = block_.incidence
+
+    eq_u = [eq_i.name for eq_i in block_.equations if 'u_D0' in incidence_.getVariablesOfEquation(eq_i.name) and 'v_D0' in incidence_.getVariablesOfEquation(eq_i.name)]
+
+    assert set(eq_u) <= set(incidence_.getEquationsOfVariable('v_D0')) and len(eq_u) == 2
+
+    assert [incidence_.getStateOfDerivative(diff_i) for diff_i in block_._getDiffList()] == ['u_D0', 'v_D0']
+
+    # The time variable appears only as the independent variable of the derivatives
+
+    assert block_._hasVarBeenDeclared('u_D0', 'differential') is True and \
+           block_._hasVarBeenDeclared('t_D0', 'differential') is False and \
+           block_._hasVarBeenDeclared(['w_D0', 'v_D0']) is True
+
+
 @pytest.mark.parametrize("compile_equations",[True, False])
 
 def test_equation_zero_variable(mod_zero, prob, sim, compile_equations):
@@ -286,4 +316,251 @@ def test_equation_zero_variable(mod_zero, prob, sim, compile_equations):
 
     #assert False
 
-    #Removed ridiculously wrong test for zero-valued differential equations
\ No newline at end of file
+    #Removed ridiculously wrong test for zero-valued differential equations
+
+def test_simulation_solver_stats(mod, prob, sim):
+
+    prob.addModels(mod)
+
+    prob.setTimeVariableName(['t_D0'])
+
+    prob.resolve()
+
+    prob.setInitialConditions({'t_D0':0., 'u_D0':10.,'v_D0':5.})
+
+    sim.setProblem(prob)
+
+    sim.setConfigurations(initial_time=0.,
+                      end_time=16.,
+                      is_dynamic=True,
+                      domain=mod.dom,
+                      print_output=False,
+                      output_headers=["Time","Preys(u)","Predators(v)"]
+                )
+
+    sim.runSimulation()
+
+    stats = sim.solver_stats.asDict()
+
+    assert prob.equation_block.cse_report['elementary']['ops_saved'] > 0
+
+    assert stats['nfev'] > 0
+
+    assert stats['nsteps'] > 0
+
+    assert stats['rhs_calls'] == stats['nfev']
+
+    print(sim.solver_stats)
+
+
+@pytest.mark.skipif(not isCCompilerAvailable(), reason="No C compiler available")
+
+def test_simulation_c_kernel(mod_zero, prob, sim):
+
+    prob.addModels(mod_zero)
+
+    prob.setTimeVariableName(['t_D0'])
+
+    prob.resolve()
+
+    prob.setInitialConditions({'t_D0':0., 'u_D0':10.,'v_D0':5., 'y_D0':0.})
+
+    sim.setProblem(prob)
+
+    sim.setConfigurations(initial_time=0.,
+                      end_time=16.,
+                      is_dynamic=True,
+                      domain=mod_zero.dom,
+                      print_output=False,
+                      compilation_mechanism='C',
+                      output_headers=["Time", "Preys(u)", "Predators(v)", "Scum(y)"],
+                      variable_name_map={"t_D0":"Time(t)",
+                                         "u_D0":"Preys(u)",
+                                         "v_D0":"Predators(v)",
+                                         "y_D0":"Scum(y)"
+                                }
+                )
+
+    sim.runSimulation()
+
+    result = sim.getResults('dict')
+
+    assert result['t_D0']['Scum(y)'][-1] == pytest.approx(0.)
+
+    assert result['t_D0']['Preys(u)'][-1] == pytest.approx(8.38505427, rel=1e-4)
+
+    assert result['t_D0']['Predators(v)'][-1] == pytest.approx(7.1602100083, rel=1e-4)
+
+    assert sim.solver_stats.success is not False
+
+    # The C kernel performs its own common subexpression elimination, reported as for the other mechanisms
+
+    assert prob.equation_block.cse_report['elementary']['ops_saved'] == prob.equation_block.cse_report['elementary']['ops_before'] - prob.equation_block.cse_report['elementary']['ops_after']
+
+
+@pytest.fixture
+def symengine_backend():
+    """
+    Use SymEngine as expression backend during the test
+    """
+
+    previous_backend = symbolic_backend.getExpressionBackend()
+
+    symbolic_backend.setExpressionBackend('symengine')
+
+    yield
+
+    symbolic_backend.setExpressionBackend(previous_backend)
+
+
+@pytest.mark.skipif(not symbolic_backend.isSymEngineAvailable(), reason="SymEngine is not installed")
+
+def test_simulation_symengine(symengine_backend, mod_zero, prob, sim, monkeypatch):
+
+    # The SymEngine kernels (residuals and Jacobian) must not depend on the C compiler
+
+    monkeypatch.setattr(c_kernel, '_findCCompiler', lambda: None)
+
+    prob.addModels(mod_zero)
+
+    prob.setTimeVariableName(['t_D0'])
+
+    prob.resolve()
+
+    assert all(eq_i.equation_expression.symbolic_object.has(sp.Derivative) for eq_i in prob.equation_block.equations)
+
+    prob.setInitialConditions({'t_D0':0., 'u_D0':10.,'v_D0':5., 'y_D0':0.})
+
+    sim.setProblem(prob)
+
+    sim.setConfigurations(initial_time=0.,
+                      end_time=16.,
+                      is_dynamic=True,
+                      domain=mod_zero.dom,
+                      print_output=False,
+                      compilation_mechanism='symengine',
+                      output_headers=["Time", "Preys(u)", "Predators(v)", "Scum(y)"],
+                      variable_name_map={"t_D0":"Time(t)",
+                                         "u_D0":"Preys(u)",
+                                         "v_D0":"Predators(v)",
+                                         "y_D0":"Scum(y)"
+                                }
+                )
+
+    sim.runSimulation()
+
+    result = sim.getResults('dict')
+
+    assert result['t_D0']['Scum(y)'][-1] == pytest.approx(0.)
+
+    assert result['t_D0']['Preys(u)'][-1] == pytest.approx(8.38505427, rel=1e-4)
+
+    assert result['t_D0']['Predators(v)'][-1] == pytest.approx(7.1602100083, rel=1e-4)
+
+    assert sim.solver_stats.success is not False
+
+
+@pytest.mark.skipif(not symbolic_backend.isSymEngineAvailable(), reason="SymEngine is not installed")
+
+def test_symengine_derivative_placeholders(symengine_backend):
+
+    x_a, t, x, a_t = sp.symbols("x_a t x a_t")
+
+    # Derivatives whose names would collide if joined by "_" are given distinct placeholders
+
+    d_1 = symbolic_backend.Derivative(x_a, t)
+
+    d_2 = symbolic_backend.Derivative(x, a_t)
+
+    assert d_1 != d_2 and symbolic_backend.Derivative(x_a, t) == d_1
+
+    assert symbolic_backend.toSympy(d_1) == sp.Derivative(x_a, t) and symbolic_backend.toSympy(d_2) == sp.Derivative(x, a_t)
+
+
+def test_default_backend_validation(monkeypatch):
+
+    monkeypatch.setenv('SLOTH_EXPRESSION_BACKEND', 'unknown')
+
+    with pytest.raises(UnexpectedValueError):
+
+        symbolic_backend._getDefaultBackend()
+
+
+@pytest.mark.parametrize("use_stencil_kernels",[True, False])
+
+def test_method_of_lines(prob, sim, use_stencil_kernels):
+
+    class diffusion_model(Model):
+
+        def __init__(self, name, description):
+
+            super().__init__(name, description)
+
+            self.t = self.createVariable("t", s, "t")
+            self.z = self.createVariable("z", m, "z")
+            self.D = self.createConstant("D", m**2/s, "D")
+            self.D.setValue(0.1)
+
+            self.dom = Domain("domain", s, self.t, "time domain")
+            self.axis = SpatialDomain("axis", m, self.z, "axial domain", 0., 1., 5)
+
+            self.c = self.createVariableArray("c", 5, dimless, "C")
+            self.c.distributeOnDomain(self.axis)
+            self.c.distributeOnDomain(self.dom)
+            self.c.setBoundaryCondition('lower', 'dirichlet', 0.)
+            self.c.setBoundaryCondition('upper', 'neumann', 0.)
+
+        def DeclareEquations(self):
+
+            self.createEquationArray("eq_c", "Diffusion", lambda c: c.Diff(self.t) == self.D()*c.Diff(self.z, 2), [self.c])
+
+    mod = diffusion_model("D0", "Diffusion model")
+
+    mod()
+
+    # Ghost points: -c_0 (dirichlet) at the lower boundary and c_4 (neumann) at the upper one, with D/h**2 = 2.5
+
+    c_0, c_1, c_3, c_4 = sp.symbols("c_0_D0 c_1_D0 c_3_D0 c_4_D0")
+
+    assert sp.expand(sp.sympify(mod.equations["eq_c_0_D0"]._getSymbolicObject(side='rhs')) - (-7.5*c_0 + 2.5*c_1)) == 0
+
+    assert sp.expand(sp.sympify(mod.equations["eq_c_4_D0"]._getSymbolicObject(side='rhs')) - (2.5*c_3 - 2.5*c_4)) == 0
+
+    # The kernel agrees with the element equations
+
+    values_ = [1., 2., 3., 4., 5.]
+
+    element_values = {n_i: v_i for (n_i, v_i) in zip(mod.c.names, values_)}
+
+    assert mod.equation_arrays["eq_c_D0"].evaluate(array_values={mod.c.name: np.array(values_)}) == pytest.approx([float(sp.sympify(eq_i._getSymbolicObject(side='rhs')).subs(element_values))
+                                                                      for eq_i in mod.equation_arrays["eq_c_D0"].equations])
+
+    prob.addModels(mod)
+
+    prob.setTimeVariableName(['t_D0'])
+
+    prob.resolve()
+
+    prob.setInitialConditions({'t_D0':0., **{n_i:1. for n_i in mod.c.names}})
+
+    sim.setProblem(prob)
+
+    sim.setConfigurations(initial_time=0.,
+                      end_time=1.,
+                      is_dynamic=True,
+                      domain=mod.dom,
+                      print_output=False,
+                      use_stencil_kernels=use_stencil_kernels
+                )
+
+    sim.runSimulation()
+
+    result = sim.getResults('dict')
+
+    # Exact solution of the semi-discrete system, c(1) = expm(A)*c(0)
+
+    A = np.diag([-7.5, -5., -5., -5., -2.5]) + np.diag([2.5]*4, 1) + np.diag([2.5]*4, -1)
+
+    expected = scipy.linalg.expm(A) @ np.ones(5)
+
+    assert [result['t_D0'][n_i][-1] for n_i in mod.c.names] == pytest.approx(expected, rel=1e-5)
@@ -0,0 +1,136 @@
+#test_distillation_column.py
+
+from pathlib import Path
+import sys
+
+root_dir = Path(Path.cwd()).parent
+
+sys.path.append(str(root_dir))#+'/src/')
+
+import pytest
+
+from src.sloth.core.block_tridiagonal import solveBlockTridiagonal, multiplyBlockTridiagonal
+from src.sloth.core.property_package import PropertyPackage
+from src.sloth.core.error_definitions import UnexpectedValueError
+from src.sloth.unit_op_library import DistillationColumn
+
+import numpy as np
+import sympy as sp
+
+
+@pytest.fixture
+def column():
+    """
+    Create one benzene-toluene column, with 8 stages and equimolar feed
+    """
+
+    pp = PropertyPackage(phases=2, phase_names=['benzene', 'toluene'], zs=[0.5, 0.5])
+
+    pp.calculate(T=360.)
+
+    col = DistillationColumn('col', property_package=pp, number_of_stages=8, feed_stage=4, T_range=(340., 400.))
+
+    col.reflux_ratio.setValue(1.5)
+
+    col.B.setValue(50.)
+
+    col.F.setValue(100.)
+
+    return col
+
+def test_block_tridiagonal():
+
+    rng = np.random.default_rng(0)
+
+    N, n = 20, 3
+
+    lower, diagonal, upper = rng.normal(size=(N, n, n)), rng.normal(size=(N, n, n)) + 5.*np.eye(n), rng.normal(size=(N, n, n))
+
+    rhs = rng.normal(size=(N, n))
+
+    dense = np.zeros((N*n, N*n))
+
+    for j in range(N):
+
+        dense[j*n:(j + 1)*n, j*n:(j + 1)*n] = diagonal[j]
+
+        if j > 0:
+
+            dense[j*n:(j + 1)*n, (j - 1)*n:j*n] = lower[j]
+
+        if j < N - 1:
+
+            dense[j*n:(j + 1)*n, (j + 1)*n:(j + 2)*n] = upper[j]
+
+    assert np.allclose(solveBlockTridiagonal(lower, diagonal, upper, rhs).ravel(), np.linalg.solve(dense, rhs.ravel()))
+
+    assert np.allclose(multiplyBlockTridiagonal(lower, diagonal, upper, rhs).ravel(), dense @ rhs.ravel())
+
+    assert np.allclose(multiplyBlockTridiagonal(lower, diagonal, upper, rhs, transpose=True).ravel(), dense.T @ rhs.ravel())
+
+def test_distillation_column(column):
+
+    iterations = column.solveColumn()
+
+    assert iterations < 20
+
+    # Overall balances, and benzene enriched at the top
+
+    distillate = column.v_benzene.values[0] + column.v_toluene.values[0]
+
+    assert distillate == pytest.approx(50.) and column.l_benzene.values[0] + column.l_toluene.values[0] == pytest.approx(1.5*distillate)
+
+    assert column.v_benzene.values[0] + column.l_benzene.values[-1] == pytest.approx(50.)
+
+    assert column.v_benzene.values[0]/distillate > 0.8 and np.all(np.diff(column.T.values) > 0.)
+
+    assert column.Q_condenser.value > 0. and column.Q_reboiler.value > 0.
+
+    # The solution satisfies the symbolic MESH equations of the model
+
+    column()
+
+    values_ = {sp.Symbol(name_i): var_i.value for (name_i, var_i) in column.variables.items()}
+
+    residuals_ = [float(sp.sympify(eq_i._getSymbolicObject()).xreplace(values_)) for eq_i in column.equations.values()]
+
+    assert len(column.equations) == len(column.variables) == 8*5 + 2
+
+    assert np.allclose(residuals_, 0., atol=1e-6*column.Q_reboiler.value)
+
+@pytest.mark.parametrize("number_of_stages, reflux_ratio", [(100, 1.5), (200, 1.5), (400, 1.5), (100, 3.)])
+def test_distillation_column_many_stages(number_of_stages, reflux_ratio):
+
+    pp = PropertyPackage(phases=2, phase_names=['benzene', 'toluene'], zs=[0.5, 0.5])
+
+    pp.calculate(T=360.)
+
+    col = DistillationColumn('col', property_package=pp, number_of_stages=number_of_stages, feed_stage=number_of_stages//2, T_range=(340., 400.))
+
+    col.reflux_ratio.setValue(reflux_ratio)
+
+    col.B.setValue(50.)
+
+    col.F.setValue(100.)
+
+    iterations = col.solveColumn()
+
+    assert iterations < 100
+
+    # Overall balances, and products of high purity, with the trace flows kept positive
+
+    assert col.v_benzene.values[0] + col.v_toluene.values[0] == pytest.approx(50.)
+
+    assert col.v_benzene.values[0] + col.l_benzene.values[-1] == pytest.approx(50.)
+
+    assert col.v_toluene.values[0] < 1e-6 and col.l_benzene.values[-1] < 1e-6
+
+    assert np.all(col.v_toluene.values > 0.) and np.all(col.l_benzene.values > 0.) and col.T.values[0] < col.T.values[-1]
+
+def test_distillation_column_specifications(column):
+
+    column.B.setValue(150.)
+
+    with pytest.raises(UnexpectedValueError):
+
+        column.solveColumn()
@@ -0,0 +1,107 @@
+#test_flash.py
+
+from pathlib import Path
+import sys
+
+root_dir = Path(Path.cwd()).parent
+
+sys.path.append(str(root_dir))#+'/src/')
+
+import pytest
+
+from src.sloth.core.flash import rachfordRice, rachfordRiceResidual
+from src.sloth.core.property_package import PropertyPackage
+from src.sloth.core.error_definitions import UnexpectedValueError
+from src.sloth.unit_op_library import Flash_SteadyState
+
+import numpy as np
+from scipy.optimize import brentq
+
+
+def test_rachford_rice():
+
+    rng = np.random.default_rng(0)
+
+    z = rng.random((2000, 5))
+
+    K = np.exp(rng.normal(0., 1.5, (2000, 5)))
+
+    beta, x, y = rachfordRice(z, K)
+
+    z = z/z.sum(axis=1, keepdims=True)
+
+    two_phase = (beta > 0.) & (beta < 1.)
+
+    assert np.any(two_phase) and np.any(beta == 0.) and np.any(beta == 1.)
+
+    # Roots of the Rachford-Rice function, with fractions summing up to one in both phases
+
+    assert np.allclose(rachfordRiceResidual(beta[two_phase], z[two_phase], K[two_phase])[0], 0., atol=1e-10)
+
+    assert np.allclose(x[two_phase].sum(axis=1), 1.) and np.allclose(y[two_phase].sum(axis=1), 1.)
+
+    assert np.allclose(beta[:, None]*y + (1. - beta[:, None])*x, z)
+
+    i = int(np.flatnonzero(two_phase)[0])
+
+    assert beta[i] == pytest.approx(brentq(lambda b: rachfordRiceResidual(np.array([b]), z[i:i + 1], K[i:i + 1])[0][0], 0., 1., xtol=1e-14), abs=1e-10)
+
+    # Single flashes keep their shapes
+
+    beta_0, x_0, y_0 = rachfordRice(z[i], K[i])
+
+    assert beta_0 == pytest.approx(beta[i]) and x_0.shape == (5,)
+
+    with pytest.raises(UnexpectedValueError):
+
+        rachfordRice([0.5, 0.5], [1., -1.])
+
+def test_flash_steady_state():
+
+    pp = PropertyPackage(phases=2, phase_names=['benzene', 'toluene'], zs=[0.5, 0.5])
+
+    pp.calculate(T=368.)
+
+    flash = Flash_SteadyState('flash', property_package=pp)
+
+    # Vapour fraction and K-values given by the sub-solver, at the state of the property package
+
+    beta, x, y = pp.flash()
+
+    assert 0. < beta < 1. and flash.vap_frac.value == pytest.approx(beta)
+
+    assert flash.K_benzene.value == pytest.approx(y[0]/x[0])
+
+    # The parameters are substituted in the declared equations
+
+    flash()
+
+    molar_vaporization = flash.equations['molar_vaporization_flash'].equation_expression.symbolic_object
+
+    phase_equilibrium = flash.equations['phase_equilibrium_for_benzene_flash'].equation_expression.symbolic_object
+
+    assert float(molar_vaporization.coeff(flash.ndot_in().symbolic_object)) == pytest.approx(-beta)
+
+    assert float(phase_equilibrium.coeff(flash.z_benzene_L_out().symbolic_object)) == pytest.approx(-y[0]/x[0])
+
+    # Sweeps of states at once, from subcooled liquids to superheated vapours
+
+    beta_sweep, _, _ = flash.solveFlash(T=np.linspace(350., 390., 41))
+
+    assert beta_sweep[0] == 0. and beta_sweep[-1] == 1. and np.all(np.diff(beta_sweep) >= 0.)
+
+    assert flash.vap_frac.value == 1.
+
+    # Equations declared again with the values of the last flash
+
+    beta_1, x_1, y_1 = flash.solveFlash(T=370.)
+
+    molar_vaporization = flash.equations['molar_vaporization_flash'].equation_expression.symbolic_object
+
+    phase_equilibrium = flash.equations['phase_equilibrium_for_benzene_flash'].equation_expression.symbolic_object
+
+    assert 0. < beta_1 < 1. and beta_1 != pytest.approx(beta)
+
+    assert float(molar_vaporization.coeff(flash.ndot_in().symbolic_object)) == pytest.approx(-beta_1)
+
+    assert float(phase_equilibrium.coeff(flash.z_benzene_L_out().symbolic_object)) == pytest.approx(-y_1[0]/x_1[0])
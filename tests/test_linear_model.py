@@ -190,6 +190,28 @@ def test_simulation_result(mod1, prob, sim):
 
     assert sim.getResults(return_type='dict') == pytest.approx({'a_L0': 2.00000000000000, 'b_L0': 0.0, 'c_L0': 6.00000000000000, 'd_L0': 5.00000000000000})
 
+def test_simulation_profile(mod1, prob, sim, tmp_path):
+
+    prob.addModels(mod1)
+
+    prob.resolve()
+
+    sim.setProblem(prob)
+
+    sim.setConfigurations()
+
+    sim.runSimulation(profile=str(tmp_path))
+
+    assert sim.getResults(return_type='dict') == pytest.approx({'a_L0': 2.00000000000000, 'b_L0': 0.0, 'c_L0': 6.00000000000000, 'd_L0': 5.00000000000000})
+
+    assert list(sim.profiler.profiles.keys()) == ['solver_creation', 'sanity_check', 'solve', 'final_residuals']
+
+    assert (tmp_path / 'simul-solve.prof').exists()
+
+    assert (tmp_path / 'simul-combined.folded').read_text().strip() != ''
+
+    assert all('(' in f_i[0] for f_i in sim.profiler.getHotFunctions(5))
+
 def test_model_connection(mod1, mod2, prob, sim):
 
     prob.addModels([mod1, mod2])
@@ -273,4 +295,53 @@ def test_model_multi_connection_2(mod1, mod2, prob, sim):
 
     expected = {'a_L0': 2.0, 'b_L0': 0.0, 'c_L0': 6.0, 'd_L0': 5.0, 'a_L1':5.16, 'b_L1':12.76, 'c_L1':11.0}
 
-    assert results == pytest.approx(expected)
\ No newline at end of file
+    assert results == pytest.approx(expected)
+
+def test_variable_array_model(prob, sim):
+
+    class array_model(Model):
+
+        def __init__(self, name, description):
+
+            super().__init__(name, description)
+
+            self.x = self.createVariableArray("x", 4, kg, "X")
+            self.k = self.createParameterArray("k", 4, dimless, "K")
+            self.k.setValue([1., 2., 3., 4.])
+            self.y = self.createVariable("y", kg, "Y")
+
+        def DeclareEquations(self):
+
+            self.createEquationArray("eq_x", "Equation for X", lambda x, k: x() - k()*self.y(), [self.x, self.k])
+
+            self.createEquation("eq_y", "Equation for Y", self.y() - 2.)
+
+    mod = array_model("A0", "Array model")
+
+    mod()
+
+    assert mod.x.names == ["x_0_A0", "x_1_A0", "x_2_A0", "x_3_A0"] and mod.variables["x_2_A0"] is mod.x[2]
+
+    assert mod.equations["eq_x_2_A0"].type == 'linear' and set(mod.equations["eq_x_2_A0"].objects_declared.keys()) == {"x_2_A0", "k_2_A0", "y_A0"}
+
+    assert mod.equation_arrays["eq_x_A0"].evaluate({"y_A0": 2.}) == pytest.approx([-2., -4., -6., -8.])
+
+    prob.addModels(mod)
+
+    prob.resolve()
+
+    sim.setProblem(prob)
+
+    sim.setConfigurations()
+
+    sim.runSimulation()
+
+    results = sim.getResults(return_type='dict')
+
+    assert [results[name_i] for name_i in mod.x.names] == pytest.approx([2., 4., 6., 8.])
+
+    # The values are stored contiguously in the array
+
+    mod.x[1].value = 5.
+
+    assert mod.x.values[1] == 5. and mod.equation_arrays["eq_x_A0"].evaluate()[1] == pytest.approx(5. - 2.*mod.y.value)
@@ -292,3 +292,80 @@ def test_incorporateFromExternalModel_feature(prob, mod_, sim):
 
 
 
+
+
+def test_incorporated_objects_are_renamed_copies(mod_):
+
+    m1 = mod1("M1", "Model 1")
+
+    m1()
+
+    eq_ = mod_.equations['eq1a_M4']
+
+    assert mod_.variables['d_M4'] is not m1.variables['d_M1'] and mod_.parameters['f_M4'] is not m1.parameters['f_M1']
+
+    assert set(eq_.equation_expression.symbolic_map.keys()) == {'d_M4', 'f_M4'} and \
+           eq_.equation_expression.symbolic_map['d_M4'] is mod_.variables['d_M4'] and \
+           set(str(s_i) for s_i in eq_.equation_expression.repr_symbolic.free_symbols) == {'d_M4', 'f_M4'}
+
+    # The incorporated equations are rewritten without modifying the original ones
+
+    mod_.incorporateFromExternalModel(m1)
+
+    assert set(m1.equations['eq1a_M1'].equation_expression.symbolic_map.keys()) == {'d_M1', 'f_M1'} and \
+           m1.equations['eq1a_M1'].equation_expression is not mod_.equations['eq1a_M4'].equation_expression
+
+def test_equation_templates():
+
+    from src.sloth import model
+
+    class templated(Model):
+
+        def __init__(self, name, description="", n=2):
+
+            super().__init__(name, description)
+
+            self.n = n
+
+            self.x = self.createVariable("x", dimless, "x")
+            self.y = self.createVariable("y", dimless, "y")
+            self.k = self.createParameter("k", dimless, "k")
+
+        def getTemplateKey(self):
+
+            return self.n
+
+        def DeclareEquations(self):
+
+            self.createEquation("eq1", "Generic equation 1", self.x()**self.n - self.k()*self.y())
+            self.createEquation("eq2", "Generic equation 2", self.x() + self.y())
+
+    model.clearEquationTemplates()
+
+    t1, t2, t3 = templated("T1"), templated("T2"), templated("T3", n=3)
+
+    _ = [t_i() for t_i in (t1, t2, t3)]
+
+    assert (templated, 2) in model._equation_templates and (templated, 3) in model._equation_templates
+
+    eq_ = t2.equations['eq1_T2']
+
+    assert str(eq_.equation_expression.symbolic_object) == str(t1.equations['eq1_T1'].equation_expression.symbolic_object).replace('T1', 'T2')
+
+    assert set(eq_.objects_declared.keys()) == {'x_T2', 'y_T2', 'k_T2'} and eq_.objects_declared['x_T2'] is t2.x
+
+    assert set(str(s_i) for s_i in t3.equations['eq1_T3'].equation_expression.symbolic_object.free_symbols) == {'x_T3', 'y_T3', 'k_T3'} and \
+           '3' in str(t3.equations['eq1_T3'].equation_expression.symbolic_object)
+
+    # Specified objects are replaced by their values in the template, which is reused only for the same values
+
+    t4, t5 = templated("T4"), templated("T5")
+
+    t4.k.setValue(2.)
+
+    t5.k.setValue(5.)
+
+    _ = [t_i() for t_i in (t4, t5)]
+
+    assert '2.0*y_T4' in str(t4.equations['eq1_T4'].equation_expression.symbolic_object) and \
+           '5.0*y_T5' in str(t5.equations['eq1_T5'].equation_expression.symbolic_object)
@@ -13,11 +13,16 @@ import pytest
 from src.sloth.model import Model
 from src.sloth.problem import Problem
 from src.sloth.simulation import Simulation
+from src.sloth import solvers
 
 from src.sloth.core.equation_operators import *
 from src.sloth.core.template_units import *
+from src.sloth.core.error_definitions import DimensionalCoherenceError, AbsentRequiredObjectError
+from src.sloth.core.c_kernel import isCCompilerAvailable, CKernel, _getKernelDirectory, _isPrivate
 
 import copy
+import os
+import sympy as sp
 
 @pytest.fixture
 def mod():
@@ -126,3 +131,285 @@ def test_simulation_result(mod, prob, sim):
     print("sim.getResults('dict') = ", sim.getResults(return_type='dict'))
 
     assert sim.getResults(return_type='dict') == pytest.approx({'a_NL0': 0.148556835804896, 'b_NL0': 99.8514431641951, 'c_NL0': 5.50206166313586}) or sim.getResults(return_type='dict') == pytest.approx({'a_NL0': 53.85144316, 'b_NL0': 46.14855684, 'c_NL0': -71.21634738})
+
+    assert sim.residual_norms['converged'] is True and sim.residual_norms['rms'] <= sim.residual_norms['max'] <= 1e-6
+
+
+def test_simulation_solver_stats(mod, prob, sim):
+
+    prob.addModels(mod)
+
+    prob.resolve()
+
+    sim.setProblem(prob)
+
+    sim.setConfigurations(initial_guess_solver='anderson', initial_guess={'a_NL0':1e+8, 'b_NL0':1e+8, 'c_NL0':1e+8})
+
+    sim.runSimulation()
+
+    stats = sim.solver_stats.asDict()
+
+    assert stats['success'] is True
+
+    assert stats['nfev'] > 0
+
+    assert stats['residual_calls'] > 0
+
+    assert stats['jacobian_calls'] > 0
+
+    print(sim.solver_stats)
+
+
+@pytest.mark.parametrize("common_subexpression_elimination",[True, False])
+
+def test_simulation_result_hybr_polisher(mod, prob, sim, common_subexpression_elimination):
+
+    prob.addModels(mod)
+
+    prob.resolve()
+
+    sim.setProblem(prob)
+
+    sim.setConfigurations(initial_guess_solver='hybr', common_subexpression_elimination=common_subexpression_elimination)
+
+    sim.runSimulation()
+
+    # The residuals and the Jacobian are evaluated by the same kernel in the polisher, counted as both
+
+    polisher = solvers.NLASolver(prob, additional_configurations=sim.configurations)
+
+    polisher._polishRoot([1., 1., 1.], 'hybr')
+
+    assert polisher.stats.residual_calls == polisher.stats.jacobian_calls > 0
+
+    assert sim.getResults(return_type='dict') == pytest.approx({'a_NL0': 0.148556835804896, 'b_NL0': 99.8514431641951, 'c_NL0': 5.50206166313586}) or sim.getResults(return_type='dict') == pytest.approx({'a_NL0': 53.85144316, 'b_NL0': 46.14855684, 'c_NL0': -71.21634738})
+
+    if common_subexpression_elimination is True:
+
+        report = prob.equation_block.cse_report['algebraic+jacobian']
+
+        assert report['ops_saved'] >= 0
+
+        assert report['ops_saved'] == report['ops_before'] - report['ops_after']
+
+        print(prob.equation_block.getCSEReport())
+
+    else:
+
+        assert prob.equation_block.cse_report == {}
+
+
+def test_cse_kernel_against_plain_kernel(prob):
+
+    class shared_subexpressions_model(Model):
+
+        def __init__(self, name, description):
+
+            super().__init__(name, description)
+
+            self.x = self.createVariable("x", dimless, "X")
+            self.y = self.createVariable("y", dimless, "Y")
+            self.z = self.createVariable("z", dimless, "Z")
+
+        def DeclareEquations(self):
+
+            # exp(x*y) and (x + y)**2 are shared among the equations and the Jacobian entries
+
+            shared_1 = Exp(self.x()*self.y())
+
+            shared_2 = (self.x() + self.y())**2
+
+            self.eq1 = self.createEquation("eq1", "Equation 1", shared_1 + shared_2 - self.z())
+            self.eq2 = self.createEquation("eq2", "Equation 2", shared_1*self.z() - shared_2 + 1.)
+            self.eq3 = self.createEquation("eq3", "Equation 3", shared_2/shared_1 - self.x()*self.z())
+
+    mod_ = shared_subexpressions_model("SH0", "Model with shared subexpressions")
+
+    mod_()
+
+    prob.addModels(mod_)
+
+    prob.resolve()
+
+    fun_cse = prob.equation_block._getResidualAndJacobianAsFunction('numpy', True)
+
+    report = prob.equation_block.cse_report['algebraic+jacobian']
+
+    assert report['ops_saved'] > 0 and report['ops_after'] < report['ops_before']
+
+    fun_plain = prob.equation_block._getResidualAndJacobianAsFunction('numpy', False)
+
+    for x_i in [[0.1, 0.2, 0.3], [1.5, -0.7, 2.], [-2., 3., 0.5]]:
+
+        res_cse, jac_cse = fun_cse(x_i)
+
+        res_plain, jac_plain = fun_plain(x_i)
+
+        assert res_cse == pytest.approx(res_plain) and jac_cse.flatten() == pytest.approx(jac_plain.flatten())
+
+
+@pytest.mark.skipif(not isCCompilerAvailable(), reason="No C compiler available")
+
+def test_simulation_result_hybr_polisher_c_kernel(mod, prob, sim):
+
+    prob.addModels(mod)
+
+    prob.resolve()
+
+    sim.setProblem(prob)
+
+    sim.setConfigurations(initial_guess_solver='hybr', compilation_mechanism='C')
+
+    sim.runSimulation()
+
+    assert sim.getResults(return_type='dict') == pytest.approx({'a_NL0': 0.148556835804896, 'b_NL0': 99.8514431641951, 'c_NL0': 5.50206166313586}) or sim.getResults(return_type='dict') == pytest.approx({'a_NL0': 53.85144316, 'b_NL0': 46.14855684, 'c_NL0': -71.21634738})
+
+    assert sim.solver_stats.residual_calls >= sim.solver_stats.jacobian_calls > 0
+
+
+@pytest.mark.skipif(not isCCompilerAvailable(), reason="No C compiler available")
+
+def test_c_kernel_cache_is_private(tmp_path):
+
+    assert _isPrivate(_getKernelDirectory())
+
+    kernel = CKernel(['x'], [sp.Symbol('x')**2], 'square', build_dir=str(tmp_path))
+
+    assert kernel([3.])[0] == pytest.approx(9.)
+
+    # One shared object writable by others is never loaded, but rebuilt
+
+    os.chmod(kernel.shared_object, 0o777)
+
+    kernel = CKernel(['x'], [sp.Symbol('x')**2], 'square', build_dir=str(tmp_path))
+
+    assert _isPrivate(kernel.shared_object) and kernel([4.])[0] == pytest.approx(16.)
+
+
+def test_trusted_mode_and_dimensional_validation(mod):
+
+    from src.sloth.core import unit
+
+    residual_units = mod.validateDimensions()
+
+    assert residual_units["eq1_NL0"]._check_dimensional_coherence(kg_s) and residual_units["eq3_NL0"]._check_dimensional_coherence(kg_s**2)
+
+    class incoherent_model(Model):
+
+        def __init__(self, name, description):
+
+            super().__init__(name, description)
+
+            self.a = self.createVariable("a", kg_s, "A")
+            self.c = self.createVariable("c", kg, "C")
+
+        def DeclareEquations(self):
+
+            self.createEquation("eq1", "Incoherent equation", Exp(self.a()/self.c()) + self.a() - self.c())
+
+    unit.setTrustedMode(True)
+
+    try:
+
+        trusted_mod = incoherent_model("T0", "Model built in trusted mode")
+
+        trusted_mod()
+
+        assert list(trusted_mod.equations.values())[0].equation_expression.unit_object is unit.unchecked
+
+    finally:
+
+        unit.setTrustedMode(False)
+
+    with pytest.raises(DimensionalCoherenceError):
+
+        trusted_mod.validateDimensions()
+
+    with pytest.raises((DimensionalCoherenceError, TypeError)):
+
+        incoherent_model("U0", "Model built with dimensional checks")()
+
+
+def test_residual_kernel(mod, prob):
+
+    prob.addModels(mod)
+
+    prob.resolve()
+
+    residual_kernel = prob.equation_block.getResidualKernel()
+
+    values_ = {'a_NL0': 1., 'b_NL0': 2., 'c_NL0': 3.}
+
+    expected_ = [float(eq_i.subs(values_)) for eq_i in prob.equation_block._equations_list]
+
+    residuals_, scaled_residuals_ = residual_kernel.getScaledResiduals(values_)
+
+    assert residual_kernel is prob.equation_block.getResidualKernel() and \
+           residual_kernel(values_) == pytest.approx(expected_) and \
+           residual_kernel([values_[k] for k in residual_kernel.args]) == pytest.approx(expected_)
+
+    # eq1: a + b - 100, whose terms sum up to 103 in magnitude
+
+    assert scaled_residuals_[0] == pytest.approx(-97./103.) and \
+           residual_kernel.getNorms(values_)['max'] == pytest.approx(max(abs(scaled_residuals_))) and \
+           residual_kernel.isConverged(values_) is False
+
+    # Kernels of the residuals only, compiled separately from the ones with the scales
+
+    residual_only_kernel = prob.equation_block.getResidualKernel(with_scales=False)
+
+    assert residual_only_kernel is not residual_kernel and residual_only_kernel(values_) == pytest.approx(expected_)
+
+    with pytest.raises(AbsentRequiredObjectError):
+
+        residual_only_kernel.getNorms(values_)
+
+
+def test_structural_analysis(mod, prob, sim):
+
+    from src.sloth.analysis import DOF_Analysis
+    from src.sloth.core.error_definitions import StructuralSingularityError
+
+    prob.addModels(mod)
+
+    prob.resolve()
+
+    structure_ = DOF_Analysis(prob).getStructuralAnalysis()
+
+    assert structure_['rank'] == 3 and structure_['unmatched_equations'] == [] and sorted(structure_['matching'].values()) == ["a_NL0", "b_NL0", "c_NL0"]
+
+    class singular_model(Model):
+
+        def __init__(self, name, description):
+
+            super().__init__(name, description)
+
+            self.a = self.createVariable("a", kg_s, "A")
+            self.b = self.createVariable("b", kg_s, "B")
+            self.c = self.createVariable("c", kg_s, "C")
+
+        def DeclareEquations(self):
+
+            self.createEquation("eq1", "Equation 1", self.a() + self.b() - self.c())
+            self.createEquation("eq2", "Equation 2", self.a() - 2.)
+            self.createEquation("eq3", "Equation 3", self.a()*self.a() - 4.)
+
+    singular_prob = Problem("singular_prob", "Structurally singular problem")
+
+    singular_prob.addModels(singular_model("S0", "Structurally singular model"))
+
+    singular_prob.resolve()
+
+    structure_ = DOF_Analysis(singular_prob).getStructuralAnalysis()
+
+    assert structure_['rank'] == 2 and len(structure_['unmatched_equations']) == 1 and len(structure_['unmatched_variables']) == 1
+
+    assert set(structure_['overdetermined_equations']) == {"eq2_S0", "eq3_S0"} and set(structure_['underdetermined_variables']) == {"b_S0", "c_S0"}
+
+    sim.setProblem(singular_prob)
+
+    sim.setConfigurations()
+
+    with pytest.raises(StructuralSingularityError):
+
+        sim.runSimulation()
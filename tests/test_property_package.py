@@ -0,0 +1,224 @@
+#test_property_package.py
+
+from pathlib import Path
+import sys
+
+root_dir = Path(Path.cwd()).parent
+
+sys.path.append(str(root_dir))#+'/src/')
+
+import pytest
+
+from src.sloth.core.property_package import PropertyPackage, PropertyCache, getChemical, clearSpeciesRegistry
+from src.sloth.core.property_table import PropertyTable
+from src.sloth.core.error_definitions import UnexpectedValueError, NumericalError
+from src.sloth.core.variable import Variable
+from src.sloth.core.template_units import K
+from src.sloth.unit_op_library import Heater, Tank, Flash_Dynamic
+
+import numpy as np
+import sympy as sp
+import thermo
+
+
+@pytest.fixture
+def cache():
+    """
+    Create one PropertyCache, apart from the shared one
+    """
+
+    return PropertyCache(maxsize=2, temperature_tolerance=1e-3)
+
+def test_memoised_properties(cache):
+
+    pp = PropertyPackage(phases=1, phase_names=['water'], property_cache=cache)
+
+    pp.calculate(T=350.)
+
+    bundle_ = pp['*']
+
+    assert bundle_.Cp == pytest.approx(thermo.chemical.Chemical('water', 350., 101325.).Cp)
+
+    # Repeated queries (and states within the tolerance) are served by the same bundle
+
+    pp.calculate(T=350.0001)
+
+    assert pp['water'] is bundle_ and cache.hits == 1 and cache.misses == 1
+
+    assert cache.getStats()['hit_rate'] == pytest.approx(0.5)
+
+    # Properties of other states are not mixed up, even if the Chemical object is shared
+
+    pp.calculate(T=300.)
+
+    assert pp['water'].Cp == pytest.approx(thermo.chemical.Chemical('water', 300., 101325.).Cp)
+
+    assert bundle_.Cp == pytest.approx(thermo.chemical.Chemical('water', 350., 101325.).Cp)
+
+    # The least recently used bundles are discarded
+
+    pp.calculate(T=320.)
+
+    _ = pp['water']
+
+    assert len(cache) == 2 and cache.getBundle('water', pp.phases['water'], 350., 101325.) is not bundle_
+
+def test_unmemoised_properties():
+
+    pp = PropertyPackage(phases=1, phase_names=['water'], property_cache=False)
+
+    pp.calculate(T=350.)
+
+    assert isinstance(pp['water'], thermo.chemical.Chemical) and pp['water'].T == 350.
+
+def test_species_registry(tmp_path):
+
+    clearSpeciesRegistry()
+
+    pp_1 = PropertyPackage(phases=1, phase_names=['water'], species_cache_directory=str(tmp_path))
+
+    pp_2 = PropertyPackage(phases=1, phase_names=['water'])
+
+    # The Chemical objects are constructed once and shared, except by packages serving them directly
+
+    assert pp_1.phases['water'] is pp_2.phases['water'] is getChemical('water')
+
+    assert PropertyPackage(phases=1, phase_names=['water'], property_cache=False).phases['water'] is not pp_1.phases['water']
+
+    # The Chemical objects stored on disk are loaded in later runs
+
+    assert len(list(tmp_path.glob("water-thermo-*.pkl"))) == 1
+
+    clearSpeciesRegistry()
+
+    chemical_ = getChemical('water', str(tmp_path))
+
+    assert chemical_ is not pp_1.phases['water'] and chemical_.MW == pytest.approx(pp_1.phases['water'].MW)
+
+def test_cache_validation():
+
+    with pytest.raises(UnexpectedValueError):
+
+        PropertyCache(maxsize=0)
+
+def test_tabulated_properties(tmp_path):
+
+    pp = PropertyPackage(phases=1, phase_names=['water'], property_cache=False)
+
+    tables = pp.tabulate(np.linspace(300., 360., 31), properties=['Cp', 'H', 'rho'], directory=str(tmp_path))
+
+    pp.calculate(T=333.3)
+
+    water = thermo.chemical.Chemical('water', 333.3, 101325.)
+
+    # Tabulated properties are interpolated, the others are evaluated through thermo
+
+    assert pp['water'].Cp == pytest.approx(water.Cp, rel=1e-6) and pp['water'].MW == pytest.approx(water.MW)
+
+    assert pp.evaluate('water', 'H', 333.3, dT=1) == pytest.approx(water.Cp, rel=1e-6)
+
+    assert pp.evaluate('water', 'rho', np.array([310., 333.3])) == pytest.approx([thermo.chemical.Chemical('water', 310., 101325.).rho, water.rho], rel=1e-6)
+
+    # The tables stored are reused
+
+    assert (tmp_path / "water.npz").is_file()
+
+    loaded = PropertyTable.load(str(tmp_path / "water.npz"))
+
+    assert loaded.matches('water', ['Cp', 'H', 'rho'], np.linspace(300., 360., 31)) and np.array_equal(loaded.values, tables['water'].values)
+
+def test_tabulated_properties_tolerance():
+
+    pp = PropertyPackage(phases=1, phase_names=['water'], property_cache=False)
+
+    # The boiling point lies within the grid
+
+    with pytest.raises(NumericalError):
+
+        pp.tabulate(np.linspace(300., 400., 5), properties=['Cp'])
+
+def test_temperature_dependent_correlations():
+
+    pp = PropertyPackage(phases=1, phase_names=['water'], property_cache=False)
+
+    T = Variable("T", K, "temperature")
+
+    water = thermo.chemical.Chemical('water', 350., 101325.)
+
+    # The correlations are symbolic, and match thermo over the range of temperatures
+
+    for (name_i, expected_i) in [('Cp', water.Cp), ('rho', water.rho), ('Psat', water.Psat)]:
+
+        node_i = pp.getCorrelation('water', name_i, T())
+
+        assert float(sp.sympify(node_i.symbolic_object).subs(sp.Symbol(T.name), 350.)) == pytest.approx(expected_i, rel=1e-2)
+
+    integral_ = pp.getCorrelation('water', 'Cp', T(), integral=True)
+
+    sensible_heat = float(sp.sympify(integral_.symbolic_object).subs(sp.Symbol(T.name), 350.) - sp.sympify(integral_.symbolic_object).subs(sp.Symbol(T.name), 300.))
+
+    assert sensible_heat == pytest.approx(water.HeatCapacityLiquid.T_dependent_property_integral(300., 350.)/water.MW*1e3, rel=1e-2)
+
+def test_heater_temperature_dependent_properties():
+
+    pp = PropertyPackage(phases=1, phase_names=['water'])
+
+    heater = Heater('heater', property_package=pp, temperature_dependent_properties=True)
+
+    heater()
+
+    balance_ = sp.sympify(heater.equations['temperature_balance_heater']._getSymbolicObject())
+
+    assert sp.Symbol(heater.T_out.name) in balance_.free_symbols and sp.Symbol(heater.cp_mix.name) not in balance_.free_symbols
+
+def test_tank_temperature_dependent_properties():
+
+    pp = PropertyPackage(phases=1, phase_names=['water'])
+
+    tank = Tank('tank', property_package=pp, temperature_dependent_properties=True)
+
+    tank()
+
+    balance_ = sp.sympify(tank.equations['_level_balance_tank']._getSymbolicObject())
+
+    assert sp.Symbol(tank.T.name) in balance_.free_symbols
+
+    # Without the correlations, the density at construction is one parameter, so tanks at other states do not share it
+
+    tank_1 = Tank('tank_1', property_package=pp)
+
+    tank_1()
+
+    pp.calculate(T=350.)
+
+    tank_2 = Tank('tank_2', property_package=pp)
+
+    tank_2()
+
+    assert tank_2.rho.value < tank_1.rho.value
+
+    for tank_i in (tank_1, tank_2):
+
+        balance_i = sp.sympify(tank_i.equations['_level_balance_{}'.format(tank_i.name)]._getSymbolicObject())
+
+        assert float(balance_i.subs({sp.Symbol(tank_i.mdot_in.name): 1., sp.Symbol(tank_i.mdot_out.name): 0., sp.Symbol(tank_i.area_sec.name): 1.})) == pytest.approx(1./tank_i.rho.value)
+
+def test_flash_dynamic_temperature_dependent_properties():
+
+    pp = PropertyPackage(phases=2, phase_names=['benzene', 'toluene'], zs=[0.5, 0.5])
+
+    for temperature_dependent_properties in (False, True):
+
+        flash = Flash_Dynamic('flash_{}'.format(int(temperature_dependent_properties)), property_package=pp, temperature_dependent_properties=temperature_dependent_properties)
+
+        flash()
+
+        balance_ = sp.sympify(flash.equations['temperature_balance_{}'.format(flash.name)]._getSymbolicObject())
+
+        assert (sp.Symbol(flash.cp_mix.name) in balance_.free_symbols) is not temperature_dependent_properties
+
+        # Heat capacity of the mixture from the ones of the species, weighted by the mass fractions of the output
+
+        heat_capacity = sp.sympify(flash.equations['heat_capacity_{}'.format(flash.name)]._getSymbolicObject())
+
+        assert float(heat_capacity.coeff(sp.Symbol(flash.w_benzene_out.name))) == pytest.approx(-pp['benzene'].Cp)
@@ -11,6 +11,10 @@ import pytest
 
 from src.sloth.core import variable
 from src.sloth.core import template_units
+from src.sloth.core import equation_operators
+from src.sloth.core import symbolic_backend
+from src.sloth.core.expression_evaluation import SymbolMap
+from src.sloth.core.error_definitions import UnexpectedValueError, DimensionalCoherenceError
 
 import copy
 
@@ -121,4 +125,139 @@ def test_operation_with_numeric_and_enodes(var):
            2*var() == var() + var()
 
 
+@pytest.mark.parametrize("function", [equation_operators.Min, equation_operators.Max])
+def test_min_max_units(var, function):
 
+    other = variable.Variable("other_var", template_units.kg_s, "Another var")
+
+    result = function(var(), other())
+
+    assert str(result.unit_object) == str(var.units) and \
+           str(symbolic_backend.toSympy(result.symbolic_object)) == "%s(generic_var, other_var)" % function.__name__
+
+    mismatched = variable.Variable("mismatched_var", template_units.K, "A var with other units")
+
+    with pytest.raises(UnexpectedValueError):
+
+        function(var(), mismatched())
+
+
+
+
+def test_nary_sum_and_product(var):
+
+    other = variable.Variable("other_var", template_units.kg_s, "Another var")
+
+    result_sum = equation_operators.Sum(var(), other(), 2.)
+
+    assert result_sum.name == "generic_var+other_var+2.0" and \
+           str(result_sum.unit_object) == str(var.units) and \
+           symbolic_backend.toSympy(result_sum.symbolic_object) == symbolic_backend.toSympy((var() + other() + 2.).symbolic_object) and \
+           set(result_sum.symbolic_map.keys()) == {"generic_var", "other_var"}
+
+    result_product = equation_operators.Product([var(), other(), 2.])
+
+    assert str(result_product.unit_object) == str(var.units*other.units) and \
+           symbolic_backend.toSympy(result_product.symbolic_object) == symbolic_backend.toSympy((var()*other()*2.).symbolic_object) and \
+           result_product.equation_type['is_nonlinear'] is True
+
+    mismatched = variable.Variable("mismatched_var", template_units.K, "A var with other units")
+
+    with pytest.raises(DimensionalCoherenceError):
+
+        equation_operators.Sum(var(), other(), mismatched())
+
+
+def test_lazy_representations_of_long_sum(var):
+
+    result = var()
+
+    for _ in range(5000):
+
+        result = result + var()
+
+    # The name, latex text and fully symbolic representation are built only when requested
+
+    assert result._lazy_name is not None and result._lazy_repr is not None
+
+    assert result.name == "+".join([var.name]*5001)
+
+    assert result.latex_text == "+".join([var.latex_text]*5001)
+
+    assert repr(result) == "5001*generic_var"
+
+
+def test_deepcopy_of_lazy_long_sum(var):
+
+    result = var()
+
+    for _ in range(1500):
+
+        result = result + var()
+
+    result_copy = copy.deepcopy(result)
+
+    assert result_copy.name == result.name and \
+           result_copy.latex_text == result.latex_text and \
+           repr(result_copy) == repr(result) == "1501*generic_var"
+
+
+def test_symbol_map_union_precedence():
+
+    a = {'x': 1, 'y': 2}
+
+    b = {'y': 3, 'z': 4}
+
+    c = {'x': 5}
+
+    united = SymbolMap.union(SymbolMap.union(a, b), c, SymbolMap.union(b, a))
+
+    expected = {**{**a, **b}, **c, **{**b, **a}}
+
+    assert dict(united) == expected and list(united.keys()) == list(expected.keys())
+
+
+def test_symbol_map_deep_union():
+
+    united = SymbolMap({'x_0': 0})
+
+    for i in range(1, 5000):
+
+        united = SymbolMap.union(united, {'x_%d' % i: i})
+
+    assert len(united) == 5000 and united['x_4999'] == 4999
+
+
+def test_symbol_map_copies_are_flat():
+
+    united = SymbolMap.union({'x': 1}, {'y': 2})
+
+    for united_copy in [copy.copy(united), copy.deepcopy(united)]:
+
+        assert isinstance(united_copy, SymbolMap) and united_copy._parents == () and dict(united_copy) == {'x': 1, 'y': 2}
+
+
+def test_enode_slots(var):
+
+    with pytest.raises(AttributeError):
+
+        var().undeclared_attribute = 1.
+
+
+def test_interned_unit_dimensions():
+
+    from src.sloth.core.unit import Unit
+
+    velocity = template_units.m/template_units.s
+
+    assert velocity is template_units.m/template_units.s and \
+           velocity._dimensions is Unit("velocity", {'m': 1, 's': -1.})._dimensions and \
+           velocity._check_dimensional_coherence(Unit("velocity", {'s': -1, 'm': 1.0}))
+
+    root_ = template_units.m**0.5
+
+    assert root_ is template_units.m**0.5 and str(root_) == "m^1/2" and (root_*root_)._check_dimensional_coherence(template_units.m)
+
+    assert dict(velocity.dimension) == pytest.approx({'m': 1., 'kg': 0., 's': -1., 'A': 0., 'K': 0., 'mol': 0., 'cd': 0.})
+
+    assert (velocity/velocity)._is_dimensionless() and copy.deepcopy(velocity)._check_dimensional_coherence(velocity)